@@ -0,0 +1,50 @@
+# SPDX-FileCopyrightText: 2026 pySMART contributors
+# SPDX-License-Identifier: LGPL-2.1-or-later
+
+"""
+Cost of `pySMART.anomaly.AnomalyDetector.observe` on a fleet of ATA drives
+polled every hour, and the size of its state (which must not grow with the
+number of polls).
+
+Usage:
+    python benchmarks/bench_anomaly.py [drives] [polls]
+"""
+
+import json
+import os
+import sys
+import time
+
+from pySMART import Device
+from pySMART.anomaly import AnomalyDetector
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+from tests.smartctlfile import SmartctlFile  # noqa: E402
+
+FOLDER = os.path.join(os.path.dirname(__file__), '..', 'tests', 'dataset', 'singletests',
+                      'sata_hdd_0_issue42')
+
+
+def main(drives: int = 1000, polls: int = 50) -> None:
+    with open(os.path.join(FOLDER, 'device.json')) as f:
+        data = json.load(f)
+    device = Device(data['name'], interface=data.get('interface'), smartctl=SmartctlFile(FOLDER))
+    snapshots = [device.snapshot.replace(serial='SN{0:06d}'.format(i)) for i in range(drives)]
+
+    detector = AnomalyDetector()
+    start = time.perf_counter()
+    for poll in range(polls):
+        for snapshot in snapshots:
+            detector.observe(snapshot.replace(collected_at=1.7e9 + poll * 3600))
+        if poll == 0:
+            size = sum(state.itemsize * len(state) for state in detector._states.values())
+    elapsed = time.perf_counter() - start
+    after = sum(state.itemsize * len(state) for state in detector._states.values())
+
+    print('{0} drives x {1} polls, {2} series tracked per drive'.format(drives, polls, len(detector._slots)))
+    print('observe: {0:.1f} us per device update'.format(elapsed / (drives * polls) * 1e6))
+    print('state: {0} bytes per drive after 1 poll, {1} after {2}'.format(size // drives, after // drives, polls))
+
+
+if __name__ == '__main__':
+    main(*(int(arg) for arg in sys.argv[1:3]))
@@ -0,0 +1,92 @@
+# SPDX-FileCopyrightText: 2026 pySMART contributors
+# SPDX-License-Identifier: LGPL-2.1-or-later
+
+"""
+Memory and lookup benchmark of the ATA attribute table: the legacy 256-slot
+list of `Attribute` objects against `AtaAttributeTable`.
+
+Usage:
+    python benchmarks/bench_attribute_table.py [drives]
+"""
+
+import os
+import sys
+import timeit
+import tracemalloc
+from typing import Any, Callable, List
+
+from pySMART import Attribute
+from pySMART.interface.ata import AtaAttributes
+
+DATASET = os.path.join(os.path.dirname(__file__), '..', 'tests', 'dataset',
+                       'singletests', 'sata_hdd_0_issue42', '_-d_ata_--all__dev_sdau')
+
+
+def load_table() -> Any:
+    with open(DATASET) as f:
+        return AtaAttributes(iter(f.read().splitlines())).legacyAttributes
+
+
+def legacy_list(table) -> List[Any]:
+    """Builds the pre-table representation from a table."""
+    legacy: List[Any] = [None] * 256
+    for row in table.rows():
+        legacy[row[0]] = Attribute(*row)
+    return legacy
+
+
+def measure(factory: Callable[[], Any], drives: int) -> float:
+    """Returns the bytes allocated per drive."""
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    objects = [factory() for _ in range(drives)]
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+
+    total = sum(stat.size_diff for stat in after.compare_to(before, 'filename'))
+    total -= sys.getsizeof(objects)
+    return total / drives
+
+
+def main(drives: int = 10000) -> None:
+    table = load_table()
+    rows = table.rows()
+    print('{0} attributes per drive, {1} drives'.format(len(rows), drives))
+
+    # Copies of the rows, as a parser would create them for each drive
+    def fresh_rows():
+        return [tuple(''.join(f) if isinstance(f, str) else f for f in row) for row in rows]
+
+    def make_list():
+        legacy: List[Any] = [None] * 256
+        for row in fresh_rows():
+            legacy[row[0]] = Attribute(*row)
+        return legacy
+
+    def make_table():
+        return type(table)(fresh_rows())
+
+    list_size = measure(make_list, drives)
+    table_size = measure(make_table, drives)
+    print('{0:<24}{1:>10.0f} B/drive'.format('list of Attribute', list_size))
+    print('{0:<24}{1:>10.0f} B/drive ({2:.0%} saved)'.format(
+        'AtaAttributeTable', table_size, 1 - table_size / list_size))
+
+    legacy = legacy_list(table)
+    name = rows[len(rows) // 2][1]
+    timings = [
+        ('list by id', lambda: legacy[194]),
+        ('table by id', lambda: table[194]),
+        ('list by name', lambda: next(a for a in legacy if a is not None and a.name == name)),
+        ('table by name', lambda: table.by_name(name)),
+        ('table raw_int', lambda: table.raw_int(194)),
+        ('Attribute.raw_value', lambda: legacy[194].raw_value),
+        ('table decoded', lambda: table.decoded(194)),
+    ]
+    for label, fn in timings:
+        seconds = min(timeit.repeat(fn, number=10000, repeat=3)) / 10000
+        print('{0:<24}{1:>10.2f} us'.format(label, seconds * 1e6))
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 10000)
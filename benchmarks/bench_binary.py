@@ -0,0 +1,76 @@
+# SPDX-FileCopyrightText: 2026 pySMART contributors
+# SPDX-License-Identifier: LGPL-2.1-or-later
+
+"""
+Size and speed of a fleet snapshot: json of `Device.__getstate__` against
+`pySMART.binary`, using every device of the test dataset (repeated to
+build a bigger fleet).
+
+Usage:
+    python benchmarks/bench_binary.py [copies]
+"""
+
+import json
+import os
+import sys
+import timeit
+import zlib
+
+from pySMART import Device, DeviceList, binary
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+from tests.smartctlfile import SmartctlFile  # noqa: E402
+
+SINGLETESTS = os.path.join(os.path.dirname(__file__), '..', 'tests', 'dataset', 'singletests')
+
+
+def load_fleet(copies: int) -> DeviceList:
+    devices = []
+    for folder in sorted(os.listdir(SINGLETESTS)):
+        path = os.path.join(SINGLETESTS, folder)
+        with open(os.path.join(path, 'device.json')) as f:
+            data = json.load(f)
+        devices.append(Device(data['name'], interface=data.get('interface'),
+                              smartctl=SmartctlFile(path)))
+
+    devlist = DeviceList(init=False)
+    devlist.devices = devices * copies
+    return devlist
+
+
+def json_dumps(devlist: DeviceList) -> bytes:
+    return json.dumps([device.__getstate__() for device in devlist.devices]).encode('utf-8')
+
+
+def json_loads(payload: bytes) -> DeviceList:
+    devlist = DeviceList(init=False)
+    for state in json.loads(payload):
+        device = Device.__new__(Device)
+        device.__setstate__(state)
+        devlist.devices.append(device)
+    return devlist
+
+
+def main(copies: int = 10) -> None:
+    devlist = load_fleet(copies)
+    payloads = {
+        'json': json_dumps(devlist),
+        'binary': binary.dumps(devlist),
+    }
+    print('{0} devices'.format(len(devlist.devices)))
+    print('{0:<10}{1:>12}{2:>16}{3:>12}{4:>12}'.format(
+        'format', 'bytes', 'zlib bytes', 'dumps ms', 'loads ms'))
+
+    for label, dumps, loads in [('json', json_dumps, json_loads),
+                                ('binary', binary.dumps, binary.loads)]:
+        payload = payloads[label]
+        dump_time = min(timeit.repeat(lambda: dumps(devlist), number=1, repeat=5))
+        load_time = min(timeit.repeat(lambda: loads(payload), number=1, repeat=5))
+        print('{0:<10}{1:>12}{2:>16}{3:>12.1f}{4:>12.1f}'.format(
+            label, len(payload), len(zlib.compress(payload)), dump_time * 1e3, load_time * 1e3))
+
+    print('binary is {0:.1f}x smaller'.format(len(payloads['json']) / len(payloads['binary'])))
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 10)
@@ -0,0 +1,60 @@
+# SPDX-FileCopyrightText: 2026 pySMART contributors
+# SPDX-License-Identifier: LGPL-2.1-or-later
+
+"""
+Cost of the `pySMART.daemon` queries of a fleet: fetching every device
+(decoded into `RemoteDevice` objects), one device, and a refresh when the
+daemon has no new collection.
+
+Usage:
+    python benchmarks/bench_daemon.py [drives]
+"""
+
+import json
+import os
+import sys
+import tempfile
+import timeit
+
+from pySMART import Device, DeviceList
+from pySMART.daemon import Client, Daemon
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+from tests.smartctlfile import SmartctlFile  # noqa: E402
+
+DATASET = os.path.join(os.path.dirname(__file__), '..', 'tests', 'dataset', 'singletests')
+
+
+def load(folder: str) -> Device:
+    folder = os.path.join(DATASET, folder)
+    with open(os.path.join(folder, 'device.json')) as f:
+        data = json.load(f)
+    return Device(data['name'], interface=data.get('interface'), smartctl=SmartctlFile(folder))
+
+
+def main(drives: int = 1000) -> None:
+    folders = ['sata_hdd_0_issue42', 'nvme_0', 'sas_hdd_0_issue_51']
+    devlist = DeviceList(init=False)
+    for i in range(drives):
+        device = load(folders[i % len(folders)])
+        device.name = 'sd{0:06d}'.format(i)
+        devlist.devices.append(device)
+
+    with tempfile.TemporaryDirectory() as folder:
+        path = os.path.join(folder, 's.sock')
+        daemon = Daemon(path, devlist)
+        daemon.listen()
+        try:
+            with Client(path) as client:
+                remote = client.devices()
+                print('{0} drives, {1} KiB devices frame'.format(drives, len(daemon._view[3]) // 1024))
+                for name, fn in [('all devices', client.devices), ('one device', lambda: client.device('sd000000')),
+                                 ('no new data', remote.update)]:
+                    elapsed = min(timeit.repeat(fn, number=1, repeat=5))
+                    print('{0:<14} {1:9.2f} ms'.format(name, elapsed * 1e3))
+        finally:
+            daemon.stop()
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 1000)
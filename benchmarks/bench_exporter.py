@@ -0,0 +1,59 @@
+# SPDX-FileCopyrightText: 2026 pySMART contributors
+# SPDX-License-Identifier: LGPL-2.1-or-later
+
+"""
+Cost of rendering the `pySMART.exporter` metrics of a fleet (once per
+collection) against serving a scrape from the cached exposition over HTTP.
+
+Usage:
+    python benchmarks/bench_exporter.py [drives]
+"""
+
+import json
+import os
+import sys
+import timeit
+import urllib.request
+
+from pySMART import Device, DeviceList
+from pySMART.exporter import Exporter
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+from tests.smartctlfile import SmartctlFile  # noqa: E402
+
+DATASET = os.path.join(os.path.dirname(__file__), '..', 'tests', 'dataset', 'singletests')
+
+
+def load(folder: str) -> Device:
+    folder = os.path.join(DATASET, folder)
+    with open(os.path.join(folder, 'device.json')) as f:
+        data = json.load(f)
+    return Device(data['name'], interface=data.get('interface'), smartctl=SmartctlFile(folder))
+
+
+def main(drives: int = 1000) -> None:
+    models = [load(folder) for folder in ['sata_hdd_0_issue42', 'nvme_0', 'sas_hdd_0_issue_51']]
+    devlist = DeviceList(init=False)
+    devlist.devices = [models[i % len(models)].snapshot.replace(serial='SN{0:06d}'.format(i))
+                       for i in range(drives)]
+
+    exporter = Exporter(devlist)
+    server = exporter.serve(port=0)
+    url = 'http://127.0.0.1:{0}/metrics'.format(server.server_address[1])
+
+    def scrape():
+        with urllib.request.urlopen(url) as response:
+            return response.read()
+
+    try:
+        print('{0} drives, {1} KiB exposition ({2} KiB gzipped)'.format(
+            drives, len(exporter.exposition()) // 1024, len(exporter.exposition(compressed=True)) // 1024))
+        for name, fn in [('render', exporter._render), ('cached scrape', scrape)]:
+            elapsed = min(timeit.repeat(fn, number=1, repeat=5))
+            print('{0:<14} {1:9.2f} ms'.format(name, elapsed * 1e3))
+    finally:
+        exporter.stop()
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 1000)
@@ -0,0 +1,69 @@
+# SPDX-FileCopyrightText: 2026 pySMART contributors
+# SPDX-License-Identifier: LGPL-2.1-or-later
+
+"""
+Fleet queries over thousands of ATA and NVMe drives: Python loops over the
+`Device` objects against `pySMART.fleet.FleetMatrix` expressions (the time
+to build the matrices is reported apart), population outliers and health
+scores of the whole fleet. Requires numpy.
+
+Usage:
+    python benchmarks/bench_fleet.py [drives]
+"""
+
+import json
+import os
+import sys
+import timeit
+
+import numpy as np
+
+from pySMART import Device, FleetMatrix
+from pySMART.health import score
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+from tests.smartctlfile import SmartctlFile  # noqa: E402
+
+DATASET = os.path.join(os.path.dirname(__file__), '..', 'tests', 'dataset', 'singletests')
+
+
+def load(folder: str) -> Device:
+    folder = os.path.join(DATASET, folder)
+    with open(os.path.join(folder, 'device.json')) as f:
+        data = json.load(f)
+    return Device(data['name'], interface=data.get('interface'), smartctl=SmartctlFile(folder))
+
+
+def main(drives: int = 10000) -> None:
+    models = [load(folder) for folder in ['sata_hdd_0_issue42', 'sata_ssd_0_issue_49', 'nvme_0']]
+    snapshots = [models[i % len(models)].snapshot.replace(serial='SN{0:06d}'.format(i))
+                 for i in range(drives)]
+
+    def loop():
+        reallocated = [s.serial for s in snapshots
+                       if s.if_attributes.__class__.__name__ == 'AtaAttributes' and
+                       s.if_attributes.legacyAttributes[5] is not None and
+                       s.if_attributes.legacyAttributes[5].raw_int > 0]
+        worn = sorted((s for s in snapshots if s.if_attributes.__class__.__name__ == 'NvmeAttributes'),
+                      key=lambda s: -s.if_attributes.percentageUsed)[:10]
+        return reallocated, worn
+
+    fleet = FleetMatrix(snapshots)
+
+    def vectorized():
+        reallocated = fleet.serials[fleet.attribute(5) > 0]
+        used = fleet.counter('percentageUsed')
+        worn = fleet.serials[np.argsort(-np.nan_to_num(used, nan=-1))[:10]]
+        return reallocated, worn
+
+    assert len(loop()[0]) == len(vectorized()[0])
+    print('{0} drives, {1} ATA attribute columns'.format(drives, len(fleet.ata_ids)))
+    for name, fn in [('python loop', loop), ('matrix build', lambda: FleetMatrix(snapshots)),
+                     ('matrix query', vectorized), ('outliers', fleet.outliers),
+                     ('health scores', lambda: score(fleet))]:
+        elapsed = min(timeit.repeat(fn, number=1, repeat=5))
+        print('{0:<14} {1:9.2f} ms'.format(name, elapsed * 1e3))
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 10000)
@@ -0,0 +1,96 @@
+# SPDX-FileCopyrightText: 2026 pySMART contributors
+# SPDX-License-Identifier: LGPL-2.1-or-later
+
+"""
+Wear forecasts of a fleet. First the trend fits alone (90 days of hourly
+points per drive): `pySMART.forecast.fit_trends` against a per-drive
+`numpy.polyfit` loop. Then `pySMART.forecast.forecast` end to end, over a
+`pySMART.history.HistoryStore` holding `hours` hourly samples of every drive
+(a mix of ATA SSDs and HDDs and NVMe drives): cold (a store just opened, as
+after a restart) and warm, from the hourly rollups and from the samples.
+Requires numpy.
+
+Usage:
+    python benchmarks/bench_forecast.py [drives] [hours]
+"""
+
+import json
+import os
+import sys
+import tempfile
+import timeit
+
+import numpy as np
+
+from pySMART import Device
+from pySMART.forecast import DAY, fit_trends, forecast
+from pySMART.history import HistoryStore
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+from tests.smartctlfile import SmartctlFile  # noqa: E402
+
+FOLDERS = [os.path.join(os.path.dirname(__file__), '..', 'tests', 'dataset', 'singletests', folder)
+           for folder in ['sata_ssd_0_issue_49', 'nvme_0', 'sata_hdd_0_issue42']]
+
+
+def bench_fits(drives: int) -> None:
+    rng = np.random.default_rng(0)
+    now = 1.8e9
+    times = now - 90 * DAY + np.arange(90 * 24) * 3600.0
+    rates = rng.uniform(0, 0.05, drives)
+    series = [(times, 100 - rate * (times - times[0]) / DAY + rng.normal(0, 0.3, len(times)))
+              for rate in rates]
+
+    def loop():
+        return [np.polyfit((t - now) / DAY, v, 1)[0] for t, v in series]
+
+    def vectorized():
+        return fit_trends(series, now).slope
+
+    assert np.allclose(loop(), vectorized())
+    print('Trend fits: {0} drives, {1} points each'.format(drives, len(times)))
+    for name, fn in [('polyfit loop', loop), ('fit_trends', vectorized)]:
+        elapsed = min(timeit.repeat(fn, number=1, repeat=3))
+        print('  {0:<14} {1:9.2f} ms'.format(name, elapsed * 1e3))
+
+
+def bench_forecast(drives: int, hours: int) -> None:
+    models = []
+    for folder in FOLDERS:
+        with open(os.path.join(folder, 'device.json')) as f:
+            data = json.load(f)
+        models.append(Device(data['name'], interface=data.get('interface'),
+                             smartctl=SmartctlFile(folder)).snapshot)
+    snapshots = [models[i % len(models)].replace(serial='SN{0:06d}'.format(i)) for i in range(drives)]
+    now = 1.8e9
+
+    with tempfile.TemporaryDirectory() as path:
+        store = HistoryStore(path)
+        for hour in range(hours):
+            for snapshot in snapshots:
+                store.append(snapshot.replace(collected_at=now - (hours - hour) * 3600))
+
+        print('forecast(): {0} drives, {1} hourly samples each, store {2:.2f} MB'.format(
+            drives, hours, store.size() / 2 ** 20))
+        for step in [3600.0, None]:
+            def cold():
+                return forecast(HistoryStore(path), snapshots, now=now, step=step)
+
+            opened = HistoryStore(path)
+
+            def warm():
+                return forecast(opened, snapshots, now=now, step=step)
+
+            assert len(cold()) == drives
+            for name, fn in [('cold', cold), ('warm', warm)]:
+                elapsed = min(timeit.repeat(fn, number=1, repeat=3))
+                print('  step={0!s:<7} {1:<5} {2:9.2f} ms'.format(step, name, elapsed * 1e3))
+
+
+def main(drives: int = 1000, hours: int = 48) -> None:
+    bench_fits(drives)
+    bench_forecast(drives, hours)
+
+
+if __name__ == '__main__':
+    main(*(int(arg) for arg in sys.argv[1:3]))
@@ -0,0 +1,92 @@
+# SPDX-FileCopyrightText: 2026 pySMART contributors
+# SPDX-License-Identifier: LGPL-2.1-or-later
+
+"""
+Range queries on a `pySMART.history.HistoryStore` holding months of samples
+of an ATA disk (one every 5 minutes, with some jitter), against a scan of the
+same samples kept as json lines. Both segment encodings are measured, and
+daily aggregates of the whole range are computed from the rollups and from
+the samples.
+
+Usage:
+    python benchmarks/bench_history.py [days]
+"""
+
+import json
+import os
+import random
+import sys
+import tempfile
+import timeit
+
+from pySMART import Device
+from pySMART.history import HistoryStore, samples
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+from tests.smartctlfile import SmartctlFile  # noqa: E402
+
+FOLDER = os.path.join(os.path.dirname(__file__), '..', 'tests', 'dataset', 'singletests',
+                      'sata_hdd_0_issue42')
+STEP = 300.0
+
+
+def main(days: int = 180) -> None:
+    with open(os.path.join(FOLDER, 'device.json')) as f:
+        data = json.load(f)
+    device = Device(data['name'], interface=data.get('interface'), smartctl=SmartctlFile(FOLDER))
+    rows = int(days * 86400 / STEP)
+    start = 1.7e9
+
+    rng = random.Random(0)
+    snapshots = [device.snapshot.replace(collected_at=start + i * STEP + rng.random() / 10,
+                                         _temperature=35 + rng.randint(0, 3))
+                 for i in range(rows)]
+    week = (start + rows * STEP / 2, start + rows * STEP / 2 + 7 * 86400)
+
+    with tempfile.TemporaryDirectory() as path:
+        jsonl = os.path.join(path, 'plain.jsonl')
+        with open(jsonl, 'w') as f:
+            for snapshot in snapshots:
+                f.write(json.dumps([snapshot.collected_at, samples(snapshot)]) + '\n')
+
+        def scan():
+            ret = []
+            with open(jsonl) as f:
+                for line in f:
+                    timestamp, row = json.loads(line)
+                    if week[0] <= timestamp <= week[1]:
+                        ret.append(row.get('temperature'))
+            return ret
+
+        print('{0} samples ({1} days), {2} series, json lines {3:.2f} MB'.format(
+            rows, days, len(samples(snapshots[0])), os.path.getsize(jsonl) / 2 ** 20))
+        elapsed = min(timeit.repeat(scan, number=1, repeat=3))
+        print('{0:<16} one week of one series: {1:8.2f} ms'.format('json scan', elapsed * 1e3))
+
+        for compress in [False, True]:
+            store = HistoryStore(os.path.join(path, str(compress)), segment_rows=4096, compress=compress)
+            for snapshot in snapshots:
+                store.append(snapshot)
+            store.flush()
+
+            def query():
+                return store.query(device.serial, 'temperature', *week)
+
+            assert len(scan()) == len(query())
+            elapsed = min(timeit.repeat(query, number=1, repeat=5))
+            print('{0:<16} one week of one series: {1:8.2f} ms, store {2:.2f} MB'.format(
+                'compressed' if compress else 'raw', elapsed * 1e3, store.size() / 2 ** 20))
+
+        store = HistoryStore(os.path.join(path, 'True'))
+        for rollups, name in [((3600, 86400), 'daily rollups'), ((), 'daily from raw')]:
+            store.rollups = rollups
+
+            def aggregate():
+                return store.aggregate(device.serial, 'temperature', step=86400)
+
+            elapsed = min(timeit.repeat(aggregate, number=1, repeat=5))
+            print('{0:<16} {1} days of one series: {2:8.2f} ms'.format(name, len(aggregate()), elapsed * 1e3))
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 180)
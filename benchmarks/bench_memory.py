@@ -0,0 +1,76 @@
+# SPDX-FileCopyrightText: 2026 pySMART contributors
+# SPDX-License-Identifier: LGPL-2.1-or-later
+
+"""
+Memory benchmark of the pySMART record classes (`Attribute`, `TestEntry`,
+`NvmeError` and `NvmeSelfTest`).
+
+Compares the slotted classes against an equivalent subclass that gets a
+per-instance `__dict__` back (the layout used before `__slots__`).
+
+Usage:
+    python benchmarks/bench_memory.py [count]
+"""
+
+import sys
+import tracemalloc
+from typing import Any, Callable, List
+
+from pySMART import Attribute, TestEntry
+from pySMART.interface.nvme import NvmeError, NvmeSelfTest
+
+
+def _with_dict(cls: type) -> type:
+    """Returns a subclass of cls that has a per-instance __dict__ again."""
+    return type(cls.__name__ + 'WithDict', (cls,), {})
+
+
+def _factories() -> List[Any]:
+    def attribute(cls):
+        return lambda i: cls(i % 256, 'Raw_Read_Error_Rate', 0x000f, '082', '066',
+                             '044', 'Pre-fail', 'Always', '-', str(i))
+
+    def testentry(cls):
+        return lambda i: cls('ata', i % 21, 'Short offline', 'Completed without error',
+                             str(i), '-', remain='00%')
+
+    def nvmeerror(cls):
+        return lambda i: cls(i, i, 0, 0x12, 0xc005, 0x28, nsid=1)
+
+    def nvmeselftest(cls):
+        return lambda i: cls(i % 20, 'Short', 'Completed without error', i)
+
+    return [
+        (Attribute, attribute),
+        (TestEntry, testentry),
+        (NvmeError, nvmeerror),
+        (NvmeSelfTest, nvmeselftest),
+    ]
+
+
+def measure(factory: Callable[[int], Any], count: int) -> float:
+    """Returns the bytes allocated per object when creating count objects."""
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    objects = [factory(i) for i in range(count)]
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+
+    # Do not count the list holding the objects
+    total = sum(stat.size_diff for stat in after.compare_to(before, 'filename'))
+    total -= sys.getsizeof(objects)
+    return total / count
+
+
+def main(count: int = 100000) -> None:
+    print('{0:<14}{1:>14}{2:>14}{3:>10}'.format(
+        'class', '__dict__ (B)', '__slots__ (B)', 'saved'))
+    for cls, make in _factories():
+        with_dict = measure(make(_with_dict(cls)), count)
+        slotted = measure(make(cls), count)
+        print('{0:<14}{1:>14.1f}{2:>14.1f}{3:>9.0%}'.format(
+            cls.__name__, with_dict, slotted, 1 - slotted / with_dict))
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100000)
@@ -0,0 +1,64 @@
+# SPDX-FileCopyrightText: 2026 pySMART contributors
+# SPDX-License-Identifier: LGPL-2.1-or-later
+
+"""
+Cost of `pySMART.rules.RuleEngine.evaluate` on a fleet of ATA drives polled
+every hour, where one counter moves between polls, compared with evaluating
+every rule on every field (`pySMART.rules.check`).
+
+Usage:
+    python benchmarks/bench_rules.py [drives] [polls]
+"""
+
+import copy
+import json
+import os
+import sys
+import time
+
+from pySMART import Device
+from pySMART.rules import DEFAULT_RULES, RuleEngine, _Index, check
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+from tests.smartctlfile import SmartctlFile  # noqa: E402
+
+FOLDER = os.path.join(os.path.dirname(__file__), '..', 'tests', 'dataset', 'singletests',
+                      'sata_hdd_0_issue42')
+
+
+def main(drives: int = 1000, polls: int = 20) -> None:
+    with open(os.path.join(FOLDER, 'device.json')) as f:
+        data = json.load(f)
+    device = Device(data['name'], interface=data.get('interface'), smartctl=SmartctlFile(FOLDER))
+
+    # Power on hours grow by one per poll
+    polled = []
+    for poll in range(polls):
+        if_attributes = copy.deepcopy(device.if_attributes)
+        table = if_attributes.legacyAttributes
+        row = next(row for row in table.rows() if row[0] == 9)
+        table.set(*row[:9], str(1000 + poll))
+        polled.append(device.snapshot.replace(if_attributes=if_attributes, collected_at=1.7e9 + poll * 3600))
+    updates = [[snapshot.replace(serial='SN{0:06d}'.format(i)) for snapshot in polled] for i in range(drives)]
+
+    engine = RuleEngine(DEFAULT_RULES)
+    start = time.perf_counter()
+    for poll in range(polls):
+        for snapshots in updates:
+            engine.evaluate(snapshots[poll])
+    incremental = time.perf_counter() - start
+
+    index = _Index(DEFAULT_RULES)
+    start = time.perf_counter()
+    for poll in range(polls):
+        for snapshots in updates:
+            check(index, snapshots[poll])
+    full = time.perf_counter() - start
+
+    print('{0} drives x {1} polls, {2} rules'.format(drives, polls, len(DEFAULT_RULES)))
+    print('evaluate (changed fields): {0:.1f} us per device update'.format(incremental / (drives * polls) * 1e6))
+    print('check (every field):       {0:.1f} us per device update'.format(full / (drives * polls) * 1e6))
+
+
+if __name__ == '__main__':
+    main(*(int(arg) for arg in sys.argv[1:3]))
@@ -0,0 +1,57 @@
+# SPDX-FileCopyrightText: 2026 pySMART contributors
+# SPDX-License-Identifier: LGPL-2.1-or-later
+
+"""
+Serialization benchmark: `pySMART.utils.get_object_properties` (deep copy and
+reflection) against the schema-driven `pySMART.serialize.to_dict`, for a few
+devices of the test dataset.
+
+Usage:
+    python benchmarks/bench_serialize.py [iterations]
+"""
+
+import json
+import os
+import sys
+import timeit
+
+from pySMART import Device
+from pySMART.serialize import from_dict, to_dict
+from pySMART.utils import get_object_properties
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+from tests.smartctlfile import SmartctlFile  # noqa: E402
+
+SINGLETESTS = os.path.join(os.path.dirname(__file__), '..', 'tests', 'dataset', 'singletests')
+
+DEVICES = ['sata_hdd_0_issue42', 'nvme_0', 'sas_hdd_0_issue_51']
+
+
+def load_device(folder: str) -> Device:
+    path = os.path.join(SINGLETESTS, folder)
+    with open(os.path.join(path, 'device.json')) as f:
+        data = json.load(f)
+    return Device(data['name'], interface=data.get('interface'), smartctl=SmartctlFile(path))
+
+
+def main(iterations: int = 200) -> None:
+    for folder in DEVICES:
+        dev = load_device(folder)
+        payload = json.loads(json.dumps(to_dict(dev)))
+        timings = [
+            ('get_object_properties', lambda: get_object_properties(dev, deep_copy=True)),
+            ('to_dict', lambda: to_dict(dev)),
+            ('from_dict', lambda: from_dict(Device, payload)),
+        ]
+        print(folder)
+        results = {}
+        for label, fn in timings:
+            seconds = min(timeit.repeat(fn, number=iterations, repeat=3)) / iterations
+            results[label] = seconds
+            print('  {0:<24}{1:>10.1f} us'.format(label, seconds * 1e6))
+        print('  {0:<24}{1:>10.1f}x'.format(
+            'speedup', results['get_object_properties'] / results['to_dict']))
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 200)
@@ -133,14 +133,26 @@ from .interface.ata.attribute import Attribute
 from . import utils
 utils.configure_trace_logging()
 from .smartctl import SMARTCTL
-from .device_list import DeviceList
+from .device_list import DeviceList, DeviceError
+from .quarantine import Quarantine
+from .history import HistoryStore
+from .anomaly import AnomalyDetector
+from .rules import RuleEngine
 from .device import Device, smart_health_assement
+from . import serialize
+from . import binary
+from . import diff
+from . import codec
+from .fleet import FleetMatrix
+from . import forecast
+from . import health
 from .version import __version__,__version_tuple__
 # autopep8: on
 
 
 __all__ = [
     '__version__', '__version_tuple__',
-    'TestEntry', 'Attribute', 'utils', 'SMARTCTL', 'DeviceList', 'Device',
+    'TestEntry', 'Attribute', 'utils', 'serialize', 'binary', 'diff', 'codec', 'forecast', 'health', 'SMARTCTL', 'DeviceList', 'DeviceError', 'Quarantine', 'HistoryStore', 'AnomalyDetector', 'RuleEngine', 'FleetMatrix',
+    'Device',
     'smart_health_assement'
 ]
@@ -0,0 +1,276 @@
+# SPDX-FileCopyrightText: 2026 pySMART contributors
+# SPDX-License-Identifier: LGPL-2.1-or-later
+
+"""
+This module contains the `AnomalyDetector` class, which flags sudden changes
+of device values as they are collected, without reading any history back:
+every series of every device keeps an exponentially weighted moving average
+(EWMA) of its mean and variance, and a sample far from them (in standard
+deviations) is an `Anomaly`.
+
+Series are the ones of `pySMART.history.samples`. Two kinds are tracked:
+    * Levels (temperatures): the value itself.
+    * Counters (ATA raw values, NVMe error counts, SCSI corrected and
+      uncorrected errors...): their increase per hour, so a counter that
+      starts moving faster than usual stands out, not one that keeps growing
+      at its usual pace.
+
+The state of a series is 4 floats (mean, variance, samples and last value)
+in a per device array, whatever the number of updates.
+
+    #!bash
+    >>> from pySMART import DeviceList
+    >>> from pySMART.anomaly import AnomalyDetector
+    >>> detector = AnomalyDetector(callback=print)
+    >>> devlist = DeviceList(detector=detector)   # every update() is checked
+    >>> devlist.update()
+    <Anomaly ZA20VNPT ata.199.raw 120/h (expected 0.02/h +- 0.1) score:1198.8>
+"""
+
+import math
+import threading
+from array import array
+from collections import deque
+from fnmatch import fnmatchcase
+from typing import TYPE_CHECKING, Callable, Deque, Dict, List, Optional, Sequence, Tuple, Union
+
+from .history import _device_key, samples
+from .snapshot import DeviceSnapshot
+
+if TYPE_CHECKING:
+    from .device import Device
+
+LEVELS = ('temperature', 'temperatures.*', 'ata.190.raw', 'ata.194.raw')
+"""Series tracked by value (`fnmatch` patterns)."""
+COUNTERS = ('ata.*.raw', 'nvme.errorEntries', 'nvme.integrityErrors', 'nvme.warningTemperatureTime',
+            'nvme.criticalTemperatureTime', 'scsi.Corrected_*', 'scsi.Uncorrected_*',
+            'scsi.Non_Medium_Errors', 'scsi.Reallocated_Sector_Ct')
+"""Series tracked by increase per hour (`fnmatch` patterns)."""
+
+_IGNORED = 0
+_LEVEL = 1
+_COUNTER = 2
+
+# Floats per series in the state arrays: mean, variance, samples, last value
+_MEAN = 0
+_VARIANCE = 1
+_COUNT = 2
+_LAST = 3
+_WIDTH = 4
+_EMPTY = (0.0, 0.0, 0.0, math.nan)
+
+
+class Anomaly(object):
+    """
+    A device value far from the recent behaviour of its series (see
+    `AnomalyDetector`).
+    """
+    __slots__ = ('key', 'series', 'timestamp', 'value', 'expected', 'std', 'score', 'rate')
+
+    def __init__(self, key: str, series: str, timestamp: float, value: float, expected: float,
+                 std: float, score: float, rate: bool):
+        self.key: str = key
+        """**(str):** The device key (see `pySMART.history.HistoryStore`)."""
+        self.series: str = series
+        """**(str):** The series name (see `pySMART.history.samples`)."""
+        self.timestamp: float = timestamp
+        """**(float):** `time.time()` of the sample."""
+        self.value: float = value
+        """**(float):** The value (or increase per hour, for counters)."""
+        self.expected: float = expected
+        """**(float):** The moving average of the series before this sample."""
+        self.std: float = std
+        """**(float):** The moving standard deviation of the series before this sample."""
+        self.score: float = score
+        """**(float):** Standard deviations from the moving average (negative if below)."""
+        self.rate: bool = rate
+        """**(bool):** True if the series is a counter, and values are increases per hour."""
+
+    def __repr__(self):
+        """Define a basic representation of the class object."""
+        unit = '/h' if self.rate else ''
+        return "<Anomaly {0} {1} {2:g}{5} (expected {3:.3g}{5} +- {4:.2g}) score:{6:.1f}>".format(
+            self.key, self.series, self.value, self.expected, self.std, unit, self.score)
+
+
+class AnomalyDetector(object):
+    """
+    Streaming detector of anomalous device values, with constant state per
+    series. Feed it with `observe` or by setting `pySMART.device.Device.detector`
+    (or `pySMART.device_list.DeviceList(detector=...)`): every successful
+    `pySMART.device.Device.update()` is then checked.
+
+    The detector is safe to use from several threads.
+    """
+
+    def __init__(self, alpha: float = 0.05, threshold: float = 4.0, warmup: int = 12, min_std: float = 1.0,
+                 levels: Sequence[str] = LEVELS, counters: Sequence[str] = COUNTERS,
+                 callback: Optional[Callable[[Anomaly], None]] = None, keep: int = 100):
+        """Instantiates a detector.
+
+        Args:
+            alpha (float, optional): Weight of each new sample in the moving averages.
+                About 2 / alpha - 1 samples are remembered. Defaults to 0.05.
+            threshold (float, optional): Standard deviations from the moving average
+                that make an anomaly. Defaults to 4.
+            warmup (int, optional): Samples of a series seen before flagging it. Defaults to 12.
+            min_std (float, optional): Floor of the standard deviation, so steady series
+                do not flag tiny changes (ie: one degree). Defaults to 1.
+            levels (Sequence[str], optional): Series tracked by value. Defaults to `LEVELS`.
+            counters (Sequence[str], optional): Series tracked by increase per hour.
+                Defaults to `COUNTERS`.
+            callback (Callable[[Anomaly], None], optional): Called with every anomaly found.
+            keep (int, optional): Number of anomalies kept in `recent`. Defaults to 100.
+        """
+        if not 0 < alpha <= 1:
+            raise ValueError('alpha must be in (0, 1]')
+        self.alpha: float = alpha
+        """**(float):** Weight of each new sample in the moving averages."""
+        self.threshold: float = threshold
+        """**(float):** Standard deviations from the moving average that make an anomaly."""
+        self.warmup: int = warmup
+        """**(int):** Samples of a series seen before flagging it."""
+        self.min_std: float = min_std
+        """**(float):** Floor of the standard deviation."""
+        self.levels: Tuple[str, ...] = tuple(levels)
+        """**(tuple of str):** Series tracked by value (`fnmatch` patterns)."""
+        self.counters: Tuple[str, ...] = tuple(counters)
+        """**(tuple of str):** Series tracked by increase per hour (`fnmatch` patterns)."""
+        self.callback: Optional[Callable[[Anomaly], None]] = callback
+        """**(callable):** Called with every anomaly found, if set."""
+        self.recent: Deque[Anomaly] = deque(maxlen=keep)
+        """**(deque of `Anomaly`):** The latest anomalies found, oldest first."""
+
+        self._lock = threading.Lock()
+        # Series kind and slot, shared by every device
+        self._kinds: Dict[str, int] = {}
+        self._slots: Dict[str, int] = {}
+        # State arrays and last sample time, by device key
+        self._states: Dict[str, array] = {}
+        self._times: Dict[str, float] = {}
+
+    def __repr__(self):
+        """Define a basic representation of the class object."""
+        return "<AnomalyDetector devices:{0} series:{1} recent:{2}>".format(
+            len(self._states), len(self._slots), len(self.recent))
+
+    def _kind(self, name: str) -> int:
+        kind = self._kinds.get(name)
+        if kind is None:
+            if any(fnmatchcase(name, pattern) for pattern in self.levels):
+                kind = _LEVEL
+            elif any(fnmatchcase(name, pattern) for pattern in self.counters):
+                kind = _COUNTER
+            else:
+                kind = _IGNORED
+            self._kinds[name] = kind
+            if kind != _IGNORED:
+                self._slots[name] = len(self._slots)
+        return kind
+
+    def observe(self, device: Union['Device', DeviceSnapshot], key: Optional[str] = None) -> List[Anomaly]:
+        """Checks the current values of a device against their moving averages,
+        then adds them to the averages.
+
+        Args:
+            device (Union[Device, DeviceSnapshot]): The device (its current snapshot
+                is checked) or a snapshot.
+            key (str, optional): The device key. Defaults to its serial number
+                (or WWN, or name).
+
+        Returns:
+            List[Anomaly]: The anomalies found (also added to `recent`)
+        """
+        snapshot = getattr(device, 'snapshot', device)
+        if key is None:
+            key = _device_key(device)
+        timestamp = snapshot.collected_at
+        values = samples(snapshot)
+        alpha = self.alpha
+
+        found = []
+        with self._lock:
+            previous = self._times.get(key)
+            if timestamp is not None and previous is not None and timestamp <= previous:
+                return found  # Already seen (ie: an update that reused the last parse)
+            hours = None if timestamp is None or previous is None else (timestamp - previous) / 3600
+            if timestamp is not None:
+                self._times[key] = timestamp
+
+            state = self._states.get(key)
+            if state is None:
+                state = self._states[key] = array('d')
+            for name, value in values.items():
+                kind = self._kind(name)
+                if kind == _IGNORED:
+                    continue
+                offset = self._slots[name] * _WIDTH
+                if offset >= len(state):
+                    state.extend(_EMPTY * (offset // _WIDTH + 1 - len(state) // _WIDTH))
+
+                if kind == _COUNTER:
+                    last = state[offset + _LAST]
+                    state[offset + _LAST] = value
+                    if math.isnan(last) or not hours or value < last:
+                        continue  # First sample, unknown interval or counter reset
+                    value = (value - last) / hours
+
+                mean = state[offset + _MEAN]
+                variance = state[offset + _VARIANCE]
+                count = state[offset + _COUNT]
+                if count >= self.warmup:
+                    std = max(math.sqrt(variance), self.min_std)
+                    score = (value - mean) / std
+                    if abs(score) >= self.threshold:
+                        found.append(Anomaly(key, name, timestamp or 0.0, value, mean, std, score,
+                                             kind == _COUNTER))
+
+                if count:
+                    diff = value - mean
+                    increment = alpha * diff
+                    state[offset + _MEAN] = mean + increment
+                    state[offset + _VARIANCE] = (1 - alpha) * (variance + diff * increment)
+                else:
+                    state[offset + _MEAN] = value
+                state[offset + _COUNT] = count + 1
+
+            self.recent.extend(found)
+
+        if self.callback is not None:
+            for anomaly in found:
+                self.callback(anomaly)
+        return found
+
+    def state(self, key: str, series: str) -> Optional[Tuple[float, float, int]]:
+        """Returns the moving average of a series of a device.
+
+        Args:
+            key (str): The device key
+            series (str): The series name (see `pySMART.history.samples`)
+
+        Returns:
+            Tuple[float, float, int]: The mean, standard deviation and number of samples
+                (of increases per hour, for counters). None if never seen.
+        """
+        with self._lock:
+            state = self._states.get(key)
+            slot = self._slots.get(series)
+            if state is None or slot is None or slot * _WIDTH >= len(state) or \
+                    not state[slot * _WIDTH + _COUNT]:
+                return None
+            offset = slot * _WIDTH
+            return (state[offset + _MEAN], math.sqrt(state[offset + _VARIANCE]),
+                    int(state[offset + _COUNT]))
+
+    def forget(self, key: str) -> None:
+        """Drops the state of a device (ie: replaced or removed).
+
+        Args:
+            key (str): The device key
+        """
+        with self._lock:
+            self._states.pop(key, None)
+            self._times.pop(key, None)
+
+
+__all__ = ['AnomalyDetector', 'Anomaly', 'LEVELS', 'COUNTERS']
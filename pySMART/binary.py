@@ -0,0 +1,348 @@
+# SPDX-FileCopyrightText: 2026 pySMART contributors
+# SPDX-License-Identifier: LGPL-2.1-or-later
+
+"""
+This module contains a compact, versioned binary format for `Device` and
+`DeviceList` objects, to ship fleet snapshots between processes and hosts.
+
+The payload is the output of `Device.__getstate__` (the same data sent as
+json), plus the few fields it leaves out that are needed to rebuild the
+device, and loading goes back through `Device.__setstate__`. The encoding is
+msgpack-like, with a few additions that matter for SMART data:
+    * Strings are written once per payload and referenced afterwards, so the
+      values repeated on every attribute or device (ie: 'Pre-fail', 'Always')
+      take one or two bytes.
+    * Dicts with the same keys (ie: every attribute, every device) write their
+      keys once, and then only their values.
+    * Mostly empty lists (ie: the 256-slot ATA attribute list) only store
+      their non-None items.
+
+    #!bash
+    >>> from pySMART import binary
+    >>> payload = binary.dumps(devlist)
+    >>> binary.loads(payload)
+    <DeviceList contents:
+    ...
+
+Layout: `MAGIC`, the format version (1 byte), the kind of object (b'D' for a
+`Device`, b'L' for a `DeviceList`) and the encoded value.
+"""
+
+import struct
+from typing import Any, Dict, List, Tuple, Union
+
+from .device import Device
+from .device_list import DeviceList
+
+MAGIC = b'pySM'
+"""Bytes every payload starts with."""
+
+VERSION = 1
+"""Current format version. Payloads of newer versions are rejected."""
+
+_DEVICE = ord('D')
+_DEVICE_LIST = ord('L')
+
+# Tags. Values 0x00-0x7f are small non-negative integers, 0xa0-0xff are
+# references to the first 96 strings of the string table.
+_NONE = 0x80
+_FALSE = 0x81
+_TRUE = 0x82
+_INT = 0x83          # zigzag varint
+_FLOAT = 0x84        # little endian double
+_STR = 0x85          # varint length + utf-8, added to the string table
+_STR_REF = 0x86      # varint index in the string table
+_LIST = 0x87         # varint length + items
+_SPARSE_LIST = 0x88  # varint length + varint count + (varint index, item) pairs
+_MAP = 0x89          # varint length + (key, value) pairs
+_RECORD = 0x8a       # varint length + keys + values, keys added to the shape table
+_RECORD_REF = 0x8b   # varint index in the shape table + values
+_SHORT_REF = 0xa0
+_SHORT_REFS = 0x100 - _SHORT_REF
+
+_DOUBLE = struct.Struct('<d')
+
+
+def _write_varint(out: bytearray, value: int) -> None:
+    while value > 0x7f:
+        out.append((value & 0x7f) | 0x80)
+        value >>= 7
+    out.append(value)
+
+
+def _encode_into(out: bytearray, value: Any) -> None:
+    """Appends the encoding of a value (and all its children) to out."""
+    strings: Dict[str, int] = {}
+    shapes: Dict[Tuple, int] = {}
+
+    def write(value: Any) -> None:
+        kind = type(value)
+        if kind is str:
+            index = strings.get(value)
+            if index is None:
+                strings[value] = len(strings)
+                data = value.encode('utf-8')
+                out.append(_STR)
+                _write_varint(out, len(data))
+                out.extend(data)
+            elif index < _SHORT_REFS:
+                out.append(_SHORT_REF + index)
+            else:
+                out.append(_STR_REF)
+                _write_varint(out, index)
+        elif value is None:
+            out.append(_NONE)
+        elif kind is int:
+            if 0 <= value < 0x80:
+                out.append(value)
+            else:
+                out.append(_INT)
+                _write_varint(out, value << 1 if value >= 0 else (-value << 1) - 1)
+        elif kind is dict:
+            write_dict(value)
+        elif kind is bool:
+            out.append(_TRUE if value else _FALSE)
+        elif kind is list or kind is tuple:
+            write_list(value)
+        elif kind is float:
+            out.append(_FLOAT)
+            out.extend(_DOUBLE.pack(value))
+        # Subclasses (ie: enums) are encoded as their base type
+        elif isinstance(value, bool):
+            write(bool(value))
+        elif isinstance(value, int):
+            write(int(value))
+        elif isinstance(value, str):
+            write(str(value))
+        elif isinstance(value, float):
+            write(float(value))
+        else:
+            raise TypeError('{0} values can not be encoded'.format(kind.__name__))
+
+    def write_dict(value: Dict) -> None:
+        shape = tuple(value)
+        if not all(type(key) is str for key in shape):
+            out.append(_MAP)
+            _write_varint(out, len(value))
+            for key, item in value.items():
+                write(key)
+                write(item)
+            return
+
+        index = shapes.get(shape)
+        if index is None:
+            shapes[shape] = len(shapes)
+            out.append(_RECORD)
+            _write_varint(out, len(shape))
+            for key in shape:
+                write(key)
+        else:
+            out.append(_RECORD_REF)
+            _write_varint(out, index)
+        for item in value.values():
+            write(item)
+
+    def write_list(value: Union[List, Tuple]) -> None:
+        present = [(index, item) for index, item in enumerate(value) if item is not None]
+        if len(value) >= 8 and len(present) * 2 < len(value):
+            out.append(_SPARSE_LIST)
+            _write_varint(out, len(value))
+            _write_varint(out, len(present))
+            for index, item in present:
+                _write_varint(out, index)
+                write(item)
+        else:
+            out.append(_LIST)
+            _write_varint(out, len(value))
+            for item in value:
+                write(item)
+
+    write(value)
+
+
+def _decode_from(data: bytes, pos: int) -> Any:
+    """Decodes the value encoded at data[pos:]."""
+    strings: List[str] = []
+    shapes: List[Tuple[str, ...]] = []
+
+    def read_varint() -> int:
+        nonlocal pos
+        value = shift = 0
+        while True:
+            byte = data[pos]
+            pos += 1
+            value |= (byte & 0x7f) << shift
+            if byte < 0x80:
+                return value
+            shift += 7
+
+    def read_values(count: int) -> List[Any]:
+        """Reads count values, without a call for the simplest ones."""
+        nonlocal pos
+        values = []
+        append = values.append
+        for _ in range(count):
+            tag = data[pos]
+            if tag >= _SHORT_REF:
+                append(strings[tag - _SHORT_REF])
+                pos += 1
+            elif tag < 0x80:
+                append(tag)
+                pos += 1
+            elif tag == _NONE:
+                append(None)
+                pos += 1
+            else:
+                append(read())
+        return values
+
+    def read() -> Any:
+        nonlocal pos
+        tag = data[pos]
+        pos += 1
+        # Most frequent first
+        if tag >= _SHORT_REF:
+            return strings[tag - _SHORT_REF]
+        if tag < 0x80:
+            return tag
+        if tag == _NONE:
+            return None
+        if tag == _RECORD_REF:
+            keys = shapes[read_varint()]
+            return dict(zip(keys, read_values(len(keys))))
+        if tag == _STR:
+            length = read_varint()
+            value = data[pos:pos + length].decode('utf-8')
+            pos += length
+            strings.append(value)
+            return value
+        if tag == _STR_REF:
+            return strings[read_varint()]
+        if tag == _INT:
+            value = read_varint()
+            return value >> 1 if not value & 1 else -((value + 1) >> 1)
+        if tag == _TRUE:
+            return True
+        if tag == _FALSE:
+            return False
+        if tag == _LIST:
+            return read_values(read_varint())
+        if tag == _SPARSE_LIST:
+            ret: List[Any] = [None] * read_varint()
+            for _ in range(read_varint()):
+                index = read_varint()
+                ret[index] = read()
+            return ret
+        if tag == _RECORD:
+            keys = tuple(read_values(read_varint()))
+            shapes.append(keys)
+            return dict(zip(keys, read_values(len(keys))))
+        if tag == _MAP:
+            items = {}
+            for _ in range(read_varint()):
+                key = read()
+                items[key] = read()
+            return items
+        if tag == _FLOAT:
+            value = _DOUBLE.unpack_from(data, pos)[0]
+            pos += _DOUBLE.size
+            return value
+        raise ValueError('Corrupted payload: unknown tag 0x{0:02x} at {1}'.format(tag, pos - 1))
+
+    try:
+        return read()
+    except IndexError:
+        raise ValueError('Corrupted payload: truncated data')
+
+
+def encode(value: Any) -> bytes:
+    """Encodes a json-like value (None, bool, int, float, str, list, tuple and
+    dict, with any of them as keys) without the header.
+
+    Args:
+        value (Any): The value to encode
+
+    Returns:
+        bytes: The encoded value
+    """
+    out = bytearray()
+    _encode_into(out, value)
+    return bytes(out)
+
+
+def decode(data: bytes) -> Any:
+    """Decodes a value written by `encode`. Tuples are returned as lists.
+
+    Args:
+        data (bytes): The encoded value
+
+    Returns:
+        Any: The decoded value
+    """
+    return _decode_from(data, 0)
+
+
+def _device_from_state(state: Dict[str, Any]) -> Device:
+    device = Device.__new__(Device)
+    device.__setstate__(state)
+    return device
+
+
+def dumps(obj: Union[Device, DeviceList]) -> bytes:
+    """Serializes a `Device` or a `DeviceList` (its devices) into the binary format.
+
+    Args:
+        obj (Union[Device, DeviceList]): The object to serialize
+
+    Returns:
+        bytes: The payload
+    """
+    if isinstance(obj, Device):
+        kind, value = _DEVICE, obj._full_state()
+    elif isinstance(obj, DeviceList):
+        kind, value = _DEVICE_LIST, [device._full_state() for device in obj.devices]
+    else:
+        raise TypeError('{0} objects can not be serialized'.format(type(obj).__name__))
+
+    out = bytearray(MAGIC)
+    out.append(VERSION)
+    out.append(kind)
+    _encode_into(out, value)
+    return bytes(out)
+
+
+def loads(data: bytes) -> Union[Device, DeviceList]:
+    """Loads a payload written by `dumps` back into full objects. No smartctl
+    call is done: devices hold the serialized data until their `update()`.
+
+    Args:
+        data (bytes): The payload
+
+    Raises:
+        ValueError: If the payload is not in this format, is corrupted or
+            was written by a newer version.
+
+    Returns:
+        Union[Device, DeviceList]: The `Device`, or a `DeviceList` holding the
+            devices (not initialized, no scan is done).
+    """
+    header = len(MAGIC) + 2
+    if bytes(data[:len(MAGIC)]) != MAGIC or len(data) < header:
+        raise ValueError('Not a pySMART binary payload')
+    version = data[len(MAGIC)]
+    if version > VERSION:
+        raise ValueError('Unsupported pySMART binary format version: {0}'.format(version))
+    kind = data[len(MAGIC) + 1]
+
+    value = _decode_from(data, header)
+
+    if kind == _DEVICE:
+        return _device_from_state(value)
+    elif kind == _DEVICE_LIST:
+        devlist = DeviceList(init=False)
+        devlist.devices = [_device_from_state(state) for state in value]
+        return devlist
+    raise ValueError('Unknown pySMART binary payload kind: {0!r}'.format(chr(kind)))
+
+
+__all__ = ['MAGIC', 'VERSION', 'dumps', 'loads', 'encode', 'decode']
@@ -0,0 +1,364 @@
+# SPDX-FileCopyrightText: 2026 pySMART contributors
+# SPDX-License-Identifier: LGPL-2.1-or-later
+
+"""
+This module contains streaming encoders and decoders used to compress series
+of samples (see `pySMART.history`), based on how SMART values behave:
+    * Timestamps of periodic polls: delta-of-delta, in milliseconds. A steady
+      poll interval encodes every timestamp in a byte or two.
+    * Integer counters (ie: power on hours, NVMe `dataUnitsWritten`, ATA raw
+      values): delta from the previous value. Counters that do not move, or
+      move at a steady rate, repeat the same delta, so runs are collapsed.
+    * Floats (ie: SCSI `Reads_GB`): XOR with the previous value, keeping only
+      the bytes that changed.
+
+Encoders take one value at a time and decoders yield one value at a time,
+so series never need to be held uncompressed.
+
+    #!bash
+    >>> from pySMART.codec import IntEncoder, decode_ints
+    >>> encoder = IntEncoder()
+    >>> for value in [1000, 1001, 1002, 1003, None, 1004]:
+    ...     encoder.append(value)
+    >>> data = encoder.finish()
+    >>> len(data), list(decode_ints(data))
+    (6, [1000, 1001, 1002, 1003, None, 1004])
+"""
+
+import struct
+from typing import Iterable, Iterator, List, Optional, Union
+
+_DOUBLE = struct.Struct('<d')
+_BITS = struct.Struct('<Q')
+
+# Float headers: 0 repeats the previous value, _FLOAT_RUN is followed by the
+# (varint) repetitions, _FLOAT_MISSING is a missing value. Others are
+# 1 + (leading zero bytes << 3 | (changed bytes - 1)).
+_FLOAT_RUN = 0xfe
+_FLOAT_MISSING = 0xff
+
+
+def _write_varint(out: bytearray, value: int) -> None:
+    while value > 0x7f:
+        out.append((value & 0x7f) | 0x80)
+        value >>= 7
+    out.append(value)
+
+
+def _zigzag(value: int) -> int:
+    return value << 1 if value >= 0 else (-value << 1) - 1
+
+
+def _unzigzag(value: int) -> int:
+    return value >> 1 if not value & 1 else -((value + 1) >> 1)
+
+
+def _read_tokens(data: bytes) -> Iterator[int]:
+    """Yields the tokens written by `_TokenWriter`, expanding the runs."""
+    pos = 0
+    end = len(data)
+    while pos < end:
+        value = shift = 0
+        while True:
+            byte = data[pos]
+            pos += 1
+            value |= (byte & 0x7f) << shift
+            if byte < 0x80:
+                break
+            shift += 7
+        if value & 1:
+            count = shift = 0
+            while True:
+                byte = data[pos]
+                pos += 1
+                count |= (byte & 0x7f) << shift
+                if byte < 0x80:
+                    break
+                shift += 7
+            token = value >> 1
+            for _ in range(count):
+                yield token
+        else:
+            yield value >> 1
+
+
+class _TokenWriter(object):
+    """Writes non-negative integer tokens as varints, collapsing runs of the
+    same token into (token, count) pairs."""
+    __slots__ = ('out', 'token', 'count')
+
+    def __init__(self):
+        self.out = bytearray()
+        self.token = -1
+        self.count = 0
+
+    def add(self, token: int) -> None:
+        if token == self.token:
+            self.count += 1
+        else:
+            self.flush()
+            self.token = token
+            self.count = 1
+
+    def flush(self) -> None:
+        if self.count == 1:
+            _write_varint(self.out, self.token << 1)
+        elif self.count > 1:
+            _write_varint(self.out, self.token << 1 | 1)
+            _write_varint(self.out, self.count)
+        self.count = 0
+        self.token = -1
+
+
+class TimestampEncoder(object):
+    """
+    Encodes `time.time()` timestamps (at millisecond resolution) as
+    delta-of-delta values.
+    """
+    __slots__ = ('_writer', '_previous', '_delta', 'count')
+
+    def __init__(self):
+        self._writer = _TokenWriter()
+        self._previous = 0
+        self._delta = 0
+        self.count: int = 0
+        """**(int):** Number of timestamps appended."""
+
+    def append(self, timestamp: float) -> None:
+        """Appends a timestamp.
+
+        Args:
+            timestamp (float): The timestamp, in seconds
+        """
+        millis = int(round(timestamp * 1000))
+        delta = millis - self._previous
+        self._writer.add(_zigzag(delta - self._delta))
+        self._previous = millis
+        self._delta = delta
+        self.count += 1
+
+    def finish(self) -> bytes:
+        """Returns the encoded timestamps. Further appends continue the stream.
+
+        Returns:
+            bytes: The encoded data
+        """
+        self._writer.flush()
+        return bytes(self._writer.out)
+
+
+def decode_timestamps(data: bytes) -> Iterator[float]:
+    """Decodes the output of `TimestampEncoder`.
+
+    Args:
+        data (bytes): The encoded timestamps
+
+    Yields:
+        float: The timestamps, in seconds
+    """
+    previous = delta = 0
+    for token in _read_tokens(data):
+        delta += _unzigzag(token)
+        previous += delta
+        yield previous / 1000
+
+
+class IntEncoder(object):
+    """
+    Encodes integers (or None) as deltas from the previous value.
+    """
+    __slots__ = ('_writer', '_previous', 'count')
+
+    def __init__(self):
+        self._writer = _TokenWriter()
+        self._previous = 0
+        self.count: int = 0
+        """**(int):** Number of values appended."""
+
+    def append(self, value: Optional[int]) -> None:
+        """Appends a value.
+
+        Args:
+            value (int, optional): The value, None if missing
+        """
+        if value is None:
+            self._writer.add(0)
+        else:
+            self._writer.add(_zigzag(value - self._previous) + 1)
+            self._previous = value
+        self.count += 1
+
+    def finish(self) -> bytes:
+        """Returns the encoded values. Further appends continue the stream.
+
+        Returns:
+            bytes: The encoded data
+        """
+        self._writer.flush()
+        return bytes(self._writer.out)
+
+
+def decode_ints(data: bytes) -> Iterator[Optional[int]]:
+    """Decodes the output of `IntEncoder`.
+
+    Args:
+        data (bytes): The encoded values
+
+    Yields:
+        Optional[int]: The values, None where missing
+    """
+    previous = 0
+    for token in _read_tokens(data):
+        if token:
+            previous += _unzigzag(token - 1)
+            yield previous
+        else:
+            yield None
+
+
+class FloatEncoder(object):
+    """
+    Encodes floats (or None) as the changed bytes of their XOR with the
+    previous value.
+    """
+    __slots__ = ('_out', '_previous', '_repeats', 'count')
+
+    def __init__(self):
+        self._out = bytearray()
+        self._previous = 0
+        self._repeats = 0
+        self.count: int = 0
+        """**(int):** Number of values appended."""
+
+    def append(self, value: Optional[float]) -> None:
+        """Appends a value.
+
+        Args:
+            value (float, optional): The value, None if missing
+        """
+        self.count += 1
+        if value is None:
+            self._flush()
+            self._out.append(_FLOAT_MISSING)
+            return
+
+        bits = _BITS.unpack(_DOUBLE.pack(value))[0]
+        xor = bits ^ self._previous
+        if not xor:
+            self._repeats += 1
+            return
+
+        self._flush()
+        self._previous = bits
+        length = (xor.bit_length() + 7) // 8
+        trailing = ((xor & -xor).bit_length() - 1) // 8
+        changed = length - trailing
+        self._out.append(1 + ((8 - length) << 3 | (changed - 1)))
+        self._out.extend((xor >> (8 * trailing)).to_bytes(changed, 'little'))
+
+    def _flush(self) -> None:
+        if self._repeats == 1:
+            self._out.append(0)
+        elif self._repeats > 1:
+            self._out.append(_FLOAT_RUN)
+            _write_varint(self._out, self._repeats)
+        self._repeats = 0
+
+    def finish(self) -> bytes:
+        """Returns the encoded values. Further appends continue the stream.
+
+        Returns:
+            bytes: The encoded data
+        """
+        self._flush()
+        return bytes(self._out)
+
+
+def decode_floats(data: bytes) -> Iterator[Optional[float]]:
+    """Decodes the output of `FloatEncoder`.
+
+    Args:
+        data (bytes): The encoded values
+
+    Yields:
+        Optional[float]: The values, None where missing
+    """
+    previous = 0
+    value = 0.0
+    pos = 0
+    end = len(data)
+    while pos < end:
+        header = data[pos]
+        pos += 1
+        if header == 0:
+            yield value
+        elif header == _FLOAT_MISSING:
+            yield None
+        elif header == _FLOAT_RUN:
+            count = shift = 0
+            while True:
+                byte = data[pos]
+                pos += 1
+                count |= (byte & 0x7f) << shift
+                if byte < 0x80:
+                    break
+                shift += 7
+            for _ in range(count):
+                yield value
+        else:
+            header -= 1
+            length = 8 - (header >> 3)
+            changed = (header & 7) + 1
+            xor = int.from_bytes(data[pos:pos + changed], 'little') << (8 * (length - changed))
+            pos += changed
+            previous ^= xor
+            value = _DOUBLE.unpack(_BITS.pack(previous))[0]
+            yield value
+
+
+def encode_values(values: Iterable[Union[None, int, float]], floats: bool = False) -> bytes:
+    """Encodes a sequence of values with `IntEncoder` or `FloatEncoder`.
+
+    Args:
+        values (Iterable[Union[None, int, float]]): The values, None where missing
+        floats (bool, optional): If True, values are encoded as floats. Defaults to False.
+
+    Returns:
+        bytes: The encoded values
+    """
+    encoder: Union[IntEncoder, FloatEncoder] = FloatEncoder() if floats else IntEncoder()
+    for value in values:
+        encoder.append(value)
+    return encoder.finish()
+
+
+def decode_values(data: bytes, floats: bool = False) -> List[Union[None, int, float]]:
+    """Decodes the output of `encode_values`.
+
+    Args:
+        data (bytes): The encoded values
+        floats (bool, optional): If True, values were encoded as floats. Defaults to False.
+
+    Returns:
+        List[Union[None, int, float]]: The values, None where missing
+    """
+    return list(decode_floats(data) if floats else decode_ints(data))
+
+
+def encode_timestamps(timestamps: Iterable[float]) -> bytes:
+    """Encodes a sequence of timestamps with `TimestampEncoder`.
+
+    Args:
+        timestamps (Iterable[float]): The timestamps, in seconds
+
+    Returns:
+        bytes: The encoded timestamps
+    """
+    encoder = TimestampEncoder()
+    for timestamp in timestamps:
+        encoder.append(timestamp)
+    return encoder.finish()
+
+
+__all__ = ['TimestampEncoder', 'IntEncoder', 'FloatEncoder', 'decode_timestamps',
+           'decode_ints', 'decode_floats', 'encode_timestamps', 'encode_values', 'decode_values']
@@ -0,0 +1,622 @@
+# SPDX-FileCopyrightText: 2026 pySMART contributors
+# SPDX-License-Identifier: LGPL-2.1-or-later
+
+"""
+This module contains a collector daemon and its client, so the processes of
+a host share one collection loop instead of each querying every drive.
+
+A `Daemon` collects the devices on a schedule (it is an
+`pySMART.exporter.Exporter`, so it can serve metrics too) and answers
+queries on a local Unix socket: device data, the changes of the last
+collection and, when it keeps one, the `pySMART.history.HistoryStore`.
+
+    #!bash
+    $ python -m pySMART.daemon --socket /run/pysmart.sock --history /var/lib/pysmart
+
+A `Client` exposes it through read-only `Device` and `DeviceList` objects:
+
+    #!bash
+    >>> from pySMART.daemon import Client
+    >>> client = Client('/run/pysmart.sock')
+    >>> devlist = client.devices()        # a RemoteDeviceList
+    >>> devlist.devices[0].temperature
+    38
+    >>> devlist.update()                  # fetches the last collection, no smartctl call
+    >>> client.history(devlist.devices[0].serial, ['temperature'])['temperature']
+    <Series 288 points>
+
+Messages are frames of a 4-byte big endian length and a `pySMART.binary.encode`
+payload. Requests are dicts with an 'op' and its arguments; responses hold
+'ok' and either 'result' or 'error' and 'message'. Device data is the
+`pySMART.device.Device.__getstate__` output (plus the fields it leaves out,
+as `pySMART.binary` does), encoded once per collection.
+
+Unix sockets are required: on platforms without them (ie: Windows),
+`Daemon.listen` and the `Client` calls raise `DaemonError`.
+"""
+
+import argparse
+import logging
+import os
+import socket
+import socketserver
+import stat
+import struct
+import threading
+from array import array
+from typing import Any, BinaryIO, Dict, List, Optional, Tuple
+
+from . import binary
+from .device import Device
+from .device_list import DeviceList
+from .diff import SnapshotDiff, diff_snapshots
+from .exporter import Exporter
+from .history import Aggregates, HistoryStore, Series, _device_key
+from .smartctl import Smartctl, SMARTCTL
+from .snapshot import DeviceSnapshot
+
+logger = logging.getLogger('pySMART')
+
+DEFAULT_SOCKET = '/run/pysmart.sock'
+"""Default path of the daemon socket."""
+
+_HEADER = struct.Struct('>I')
+_MAX_FRAME = 256 * 1024 * 1024
+# Remote errors raised again as such by the client
+_ERRORS = {'KeyError': KeyError, 'ValueError': ValueError}
+
+
+class DaemonError(Exception):
+    """
+    An error of the daemon, or of the connection to it.
+    """
+
+
+def _check_platform() -> None:
+    """Raises a `DaemonError` where Unix sockets are not available (ie: on
+    Windows)."""
+    if not hasattr(socket, 'AF_UNIX') or not hasattr(socketserver, 'ThreadingUnixStreamServer'):
+        raise DaemonError('Unix sockets are not supported on this platform')
+
+
+def _frame(value: Any) -> bytes:
+    payload = binary.encode(value)
+    return _HEADER.pack(len(payload)) + payload
+
+
+def _read_frame(stream: BinaryIO) -> Optional[Any]:
+    """The next message of a stream, None at its end."""
+    header = stream.read(_HEADER.size)
+    if not header:
+        return None
+    if len(header) < _HEADER.size:
+        raise DaemonError('Truncated frame')
+    length, = _HEADER.unpack(header)
+    if length > _MAX_FRAME:
+        raise DaemonError('Frame too large: {0} bytes'.format(length))
+    payload = stream.read(length)
+    if len(payload) < length:
+        raise DaemonError('Truncated frame')
+    return binary.decode(payload)
+
+
+class _Handler(socketserver.StreamRequestHandler):
+    """Answers the requests of one connection, until the client closes it."""
+
+    def handle(self):
+        daemon: 'Daemon' = self.server.owner  # type: ignore[attr-defined]
+        while True:
+            try:
+                request = _read_frame(self.rfile)
+            except (DaemonError, ValueError, OSError) as e:
+                logger.debug(f"Daemon: dropping connection: {e}")
+                return
+            if request is None:
+                return
+            try:
+                self.wfile.write(daemon._answer(request))
+            except OSError as e:
+                # ie: BrokenPipeError, ConnectionResetError when the client went away
+                logger.debug(f"Daemon: dropping connection: {e}")
+                return
+
+
+class Daemon(Exporter):
+    """
+    Owns the collection loop of a host and serves its data on a Unix socket
+    (see `pySMART.daemon`).
+    """
+
+    def __init__(self, path: str = DEFAULT_SOCKET, devices: Optional[DeviceList] = None, interval: float = 300.0,
+                 rescan: Optional[float] = 3600.0, max_workers: int = 1, deadline: Optional[float] = None,
+                 history: Optional[HistoryStore] = None, mode: int = 0o660, smartctl: Smartctl = SMARTCTL):
+        """Instantiates a daemon. Nothing is collected nor served until `start`.
+
+        Args:
+            path (str, optional): Path of the Unix socket. Defaults to `DEFAULT_SOCKET`.
+            devices (DeviceList, optional): The devices. Defaults to a new (empty) list,
+                scanned by the first collection.
+            interval (float, optional): Seconds between collections. Defaults to 300.
+            rescan (float, optional): Seconds between scans for new devices. Defaults to 3600.
+            max_workers (int, optional): Number of devices queried in parallel. Defaults to 1.
+            deadline (float, optional): Maximum duration of a collection, in seconds.
+                Defaults to `interval`.
+            history (HistoryStore, optional): If set, every collection is recorded in
+                this store, and clients can query it. Defaults to None.
+            mode (int, optional): Permissions of the socket file. Defaults to 0o660
+                (the owner and group of the daemon).
+            smartctl (Smartctl, optional): The smartctl wrapper of the new list. Defaults to
+                the global `SMARTCTL` object.
+        """
+        self.path: str = path
+        """**(str):** Path of the Unix socket."""
+        self.mode: int = mode
+        """**(int):** Permissions of the socket file."""
+        self.history: Optional[HistoryStore] = history
+        """**(HistoryStore):** The store the collections are recorded in, if any."""
+
+        self._published: Dict[str, DeviceSnapshot] = {}
+        # The last collection: its number, device states by name, changes by
+        # device key and the pre-encoded 'devices' response
+        self._view: Tuple[int, Dict[str, Dict[str, Any]], Dict[str, Dict[str, Any]], bytes] = (0, {}, {}, b'')
+        self._server: Optional[socketserver.BaseServer] = None
+
+        if devices is None:
+            devices = DeviceList(init=False, smartctl=smartctl, history=history)
+        elif history is not None:
+            devices.history = history
+            for device in devices.devices:
+                device.history = history
+        super().__init__(devices, interval=interval, rescan=rescan, max_workers=max_workers, deadline=deadline,
+                         smartctl=smartctl)
+
+    def __repr__(self):
+        """Define a basic representation of the class object."""
+        generation, states, _, _ = self._view
+        return "<Daemon {0} devices:{1} generation:{2}>".format(self.path, len(states), generation)
+
+    def _render(self) -> None:
+        super()._render()
+        if self.history is not None:
+            # New devices found by a rescan record their values too
+            for device in self.devices.devices:
+                device.history = self.history
+
+        published: Dict[str, DeviceSnapshot] = {}
+        states: Dict[str, Dict[str, Any]] = {}
+        changes: Dict[str, Dict[str, Any]] = {}
+        for device in self.devices.devices:
+            key = _device_key(device)
+            snapshot = device.snapshot
+            old = self._published.get(key)
+            if old is not None and old is not snapshot:
+                diff = diff_snapshots(old, snapshot)
+                if diff:
+                    changes[key] = diff.as_dict()
+            published[key] = snapshot
+            states[device.name] = device._full_state()
+
+        generation = self._view[0] + 1
+        frame = _frame({'ok': True, 'result': {'generation': generation, 'devices': list(states.values())}})
+        self._published = published
+        # Swapped at once: requests never see a half-updated collection
+        self._view = (generation, states, changes, frame)
+
+    @staticmethod
+    def _state(states: Dict[str, Dict[str, Any]], name: str) -> Dict[str, Any]:
+        if name in states:
+            return states[name]
+        for state in states.values():
+            if name in (state.get('serial'), state.get('path')):
+                return state
+        raise KeyError(name)
+
+    def _require_history(self) -> HistoryStore:
+        if self.history is None:
+            raise ValueError('The daemon keeps no history')
+        return self.history
+
+    def _answer(self, request: Any) -> bytes:
+        """The response frame of a request."""
+        generation, states, changes, devices_frame = self._view
+        try:
+            op = request['op']
+            if op == 'devices':
+                if request.get('since') == generation:
+                    return _frame({'ok': True, 'result': {'generation': generation, 'devices': None}})
+                return devices_frame
+            if op == 'device':
+                result: Any = self._state(states, request['name'])
+            elif op == 'changes':
+                result = {'generation': generation, 'changes': changes}
+            elif op == 'status':
+                result = {'generation': generation, 'devices': len(states),
+                          'collections': self._collections, 'errors': self._errors,
+                          'last_collection': self._last, 'history': self.history is not None}
+            elif op == 'series':
+                result = self._require_history().series(request['key'])
+            elif op == 'history':
+                found = self._require_history().query_many(request['key'], request['names'],
+                                                           request.get('start'), request.get('end'))
+                result = {name: [series.values.typecode, list(series.timestamps), list(series.values)]
+                          for name, series in found.items()}
+            elif op == 'aggregate':
+                aggregates = self._require_history().aggregate(request['key'], request['name'],
+                                                               request.get('start'), request.get('end'),
+                                                               request.get('step'))
+                result = {name: list(getattr(aggregates, name)) for name in Aggregates.__slots__ if name != 'step'}
+                result['step'] = aggregates.step
+            else:
+                raise ValueError('Unknown operation: {0}'.format(op))
+        except Exception as e:
+            return _frame({'ok': False, 'error': type(e).__name__, 'message': str(e)})
+        return _frame({'ok': True, 'result': result})
+
+    def listen(self) -> None:
+        """Binds the socket and answers clients on a background thread. A
+        stale socket file left by a previous daemon is replaced, but not the
+        socket of a daemon still running.
+
+        Raises:
+            DaemonError: If another daemon is listening on `path`, or the platform
+                has no Unix sockets
+        """
+        if self._server is not None:
+            return
+        _check_platform()
+        if os.path.exists(self.path) and stat.S_ISSOCK(os.stat(self.path).st_mode):
+            probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            try:
+                probe.connect(self.path)
+            except ConnectionRefusedError:
+                # Nobody listening: left by a daemon that did not stop cleanly
+                os.unlink(self.path)
+            else:
+                raise DaemonError('A daemon is already running on {0}'.format(self.path))
+            finally:
+                probe.close()
+        server = socketserver.ThreadingUnixStreamServer(self.path, _Handler)
+        server.daemon_threads = True
+        server.owner = self  # type: ignore[attr-defined]
+        os.chmod(self.path, self.mode)
+        threading.Thread(target=server.serve_forever, name='pySMART-daemon', daemon=True).start()
+        self._server = server
+
+    def start(self) -> threading.Thread:
+        """Starts answering clients (see `listen`) and collecting, every
+        `interval` seconds.
+
+        Returns:
+            threading.Thread: The collector thread
+        """
+        self.listen()
+        return super().start()
+
+    def stop(self) -> None:
+        """Stops the collector thread, the socket and the HTTP servers."""
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+            try:
+                os.unlink(self.path)
+            except FileNotFoundError:
+                pass
+        super().stop()
+
+
+class RemoteDevice(Device):
+    """
+    A read-only `pySMART.device.Device` served by a `Daemon`. `update()`
+    fetches the data of the last collection of the daemon; methods that
+    would run smartctl (self-tests, SMART toggling) raise `NotImplementedError`.
+    """
+
+    def __init__(self, client: 'Client', state: Dict[str, Any]):
+        """Instantiates a device from its daemon data (see `Client.device`)."""
+        self._client = client
+        self.__setstate__(state)
+
+    def _load(self, state: Dict[str, Any]) -> None:
+        """Swaps in new daemon data, keeping the local history, detector and rules."""
+        kept = (self.history, self.detector, self.rules)
+        collected_at = self.snapshot.collected_at
+        self.__setstate__(state)
+        self.history, self.detector, self.rules = kept
+        if self.snapshot.collected_at != collected_at:
+            self._record()
+
+    def update(self, return_changes: bool = False) -> Optional[SnapshotDiff]:
+        """Fetches the data of the last collection of the daemon.
+
+        Args:
+            return_changes (bool, optional): If True, the changes from the previous
+                snapshot are computed and returned. Defaults to False.
+
+        Returns:
+            SnapshotDiff: The changes if return_changes is set, None otherwise.
+        """
+        previous = self.snapshot
+        self._load(self._client.call('device', name=self.name))
+        if return_changes:
+            return diff_snapshots(previous, self.snapshot)
+        return None
+
+    def _read_only(self, *args, **kwargs):
+        raise NotImplementedError('RemoteDevice objects are read-only: run it on the daemon host')
+
+    smart_toggle = _read_only
+    abort_selftest = _read_only
+    run_selftest = _read_only
+    run_selftest_and_wait = _read_only
+    get_selftest_result = _read_only
+
+
+class RemoteDeviceList(DeviceList):
+    """
+    A read-only `pySMART.device_list.DeviceList` served by a `Daemon`:
+    `initialize()` and `update()` fetch the devices of its last collection.
+    """
+
+    def __init__(self, client: 'Client', init: bool = True):
+        """Instantiates the list.
+
+        Args:
+            client (Client): The daemon client
+            init (bool, optional): If True, the devices are fetched at once. Defaults to True.
+        """
+        super().__init__(init=False)
+        self.client: 'Client' = client
+        """**(Client):** The daemon client."""
+        self.generation: Optional[int] = None
+        """**(int):** The daemon collection the devices come from."""
+        if init:
+            self.initialize()
+
+    def initialize(self, *args, **kwargs) -> None:
+        """Fetches every device of the last collection of the daemon, as new
+        `RemoteDevice` objects. Arguments are accepted for compatibility, and ignored."""
+        result = self.client.call('devices')
+        self.devices = [RemoteDevice(self.client, state) for state in result['devices']]
+        self.devices.sort(key=lambda device: device.name)
+        self.generation = result['generation']
+
+    def update(self, *args, **kwargs) -> None:
+        """Fetches the devices of the last collection of the daemon, if it
+        finished a new one. Known devices are updated in place, new ones are
+        added and the ones the daemon dropped are removed. Arguments are
+        accepted for compatibility, and ignored."""
+        result = self.client.call('devices', since=self.generation)
+        if result['devices'] is None:
+            return
+        known = {device.name: device for device in self.devices}
+        devices: List[Device] = []
+        for state in result['devices']:
+            device = known.get(state['name'])
+            if isinstance(device, RemoteDevice):
+                device._load(state)
+            else:
+                device = RemoteDevice(self.client, state)
+            devices.append(device)
+        devices.sort(key=lambda device: device.name)
+        self.devices = devices
+        self.generation = result['generation']
+
+
+class Client(object):
+    """
+    Connection to a `Daemon`. Calls are serialized on one connection, opened
+    on first use and again after a failure, so a client can be shared by
+    several threads.
+    """
+
+    def __init__(self, path: str = DEFAULT_SOCKET, timeout: Optional[float] = 30.0):
+        """Instantiates a client. Nothing is connected until the first call.
+
+        Args:
+            path (str, optional): Path of the daemon socket. Defaults to `DEFAULT_SOCKET`.
+            timeout (float, optional): Seconds to wait for an answer. Defaults to 30.
+        """
+        self.path: str = path
+        """**(str):** Path of the daemon socket."""
+        self.timeout: Optional[float] = timeout
+        """**(float):** Seconds to wait for an answer."""
+        self._lock = threading.Lock()
+        self._socket: Optional[socket.socket] = None
+        self._stream: Optional[BinaryIO] = None
+
+    def __repr__(self):
+        """Define a basic representation of the class object."""
+        return "<Client {0} {1}>".format(self.path, 'connected' if self._socket is not None else 'idle')
+
+    def __enter__(self) -> 'Client':
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Closes the connection, if open."""
+        with self._lock:
+            self._disconnect()
+
+    def _disconnect(self) -> None:
+        if self._stream is not None:
+            self._stream.close()
+        if self._socket is not None:
+            self._socket.close()
+        self._socket = self._stream = None
+
+    def _exchange(self, frame: bytes) -> Any:
+        if self._socket is None:
+            sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            sock.settimeout(self.timeout)
+            try:
+                sock.connect(self.path)
+            except OSError:
+                sock.close()
+                raise
+            self._socket, self._stream = sock, sock.makefile('rb')
+        self._socket.sendall(frame)
+        response = _read_frame(self._stream)  # type: ignore[arg-type]
+        if response is None:
+            raise DaemonError('Connection closed by the daemon')
+        return response
+
+    def call(self, op: str, **args) -> Any:
+        """Sends a request to the daemon and returns its result. A broken
+        connection is retried once, on a new one.
+
+        Args:
+            op (str): The operation (ie: 'devices', 'device', 'changes', 'status',
+                'series', 'history', 'aggregate')
+            **args: Its arguments
+
+        Raises:
+            DaemonError: If the daemon can not be reached (or the platform has no
+                Unix sockets), or failed
+            KeyError: If the device is unknown
+            ValueError: If the request is invalid (ie: no history kept)
+
+        Returns:
+            Any: The result
+        """
+        _check_platform()
+        args['op'] = op
+        frame = _frame(args)
+        with self._lock:
+            try:
+                try:
+                    response = self._exchange(frame)
+                except (OSError, DaemonError):
+                    # ie: the daemon restarted since the last call
+                    self._disconnect()
+                    response = self._exchange(frame)
+            except (OSError, DaemonError) as e:
+                self._disconnect()
+                raise DaemonError('Can not query the daemon at {0}: {1}'.format(self.path, e)) from e
+        if not response['ok']:
+            raise _ERRORS.get(response['error'], DaemonError)(response['message'])
+        return response['result']
+
+    def devices(self) -> RemoteDeviceList:
+        """Returns the devices of the last collection of the daemon.
+
+        Returns:
+            RemoteDeviceList: The devices, refreshed by its `update()`
+        """
+        return RemoteDeviceList(self)
+
+    def device(self, name: str) -> RemoteDevice:
+        """Returns one device of the last collection of the daemon.
+
+        Args:
+            name (str): The device name (ie: 'sda'), path or serial number
+
+        Returns:
+            RemoteDevice: The device, refreshed by its `update()`
+        """
+        return RemoteDevice(self, self.call('device', name=name))
+
+    def changes(self) -> Tuple[int, Dict[str, Dict[str, Any]]]:
+        """Returns the changes found by the last collection of the daemon.
+
+        Returns:
+            Tuple[int, Dict[str, Dict]]: The collection number, and the changes of
+                each device that changed (see `pySMART.diff.SnapshotDiff.as_dict`),
+                by device key
+        """
+        result = self.call('changes')
+        return result['generation'], result['changes']
+
+    def status(self) -> Dict[str, Any]:
+        """Returns the state of the daemon: its collection number, devices,
+        collections, errors, last collection time and whether it keeps a history."""
+        return self.call('status')
+
+    def series(self, key: str) -> List[str]:
+        """Returns the names of the series recorded for a device (see
+        `pySMART.history.HistoryStore.series`)."""
+        return self.call('series', key=key)
+
+    def history(self, key: str, names: List[str], start: Optional[float] = None,
+                end: Optional[float] = None) -> Dict[str, Series]:
+        """Returns the values of some series of a device within a time range
+        (see `pySMART.history.HistoryStore.query_many`).
+
+        Args:
+            key (str): The device key
+            names (List[str]): The series names
+            start (float, optional): First `time.time()` included. Defaults to None (no bound).
+            end (float, optional): Last `time.time()` included. Defaults to None (no bound).
+
+        Returns:
+            Dict[str, Series]: The values by series name, oldest first
+        """
+        found = self.call('history', key=key, names=list(names), start=start, end=end)
+        return {name: Series(array('d', timestamps), array(typecode, values))
+                for name, (typecode, timestamps, values) in found.items()}
+
+    def aggregate(self, key: str, name: str, start: Optional[float] = None, end: Optional[float] = None,
+                  step: Optional[float] = None) -> Aggregates:
+        """Returns the aggregated values of a series of a device (see
+        `pySMART.history.HistoryStore.aggregate`).
+
+        Args:
+            key (str): The device key
+            name (str): The series name
+            start (float, optional): First `time.time()` included. Defaults to None (no bound).
+            end (float, optional): Last `time.time()` included. Defaults to None (no bound).
+            step (float, optional): Bucket size, in seconds. Defaults to None (every sample).
+
+        Returns:
+            Aggregates: The aggregates, oldest first
+        """
+        result = self.call('aggregate', key=key, name=name, start=start, end=end, step=step)
+        aggregates = Aggregates(result.pop('step'))
+        aggregates.timestamps = array('d', result.pop('timestamps'))
+        for field, values in result.items():
+            setattr(aggregates, field, values)
+        return aggregates
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """Runs a daemon until interrupted (`python -m pySMART.daemon --help`)."""
+    parser = argparse.ArgumentParser(prog='python -m pySMART.daemon',
+                                     description='pySMART collector daemon.')
+    parser.add_argument('--socket', default=DEFAULT_SOCKET, help='path of the socket (default: %(default)s)')
+    parser.add_argument('--interval', type=float, default=300.0,
+                        help='seconds between collections (default: %(default)s)')
+    parser.add_argument('--rescan', type=float, default=3600.0,
+                        help='seconds between scans for new devices (default: %(default)s)')
+    parser.add_argument('--workers', type=int, default=1,
+                        help='devices queried in parallel (default: %(default)s)')
+    parser.add_argument('--history', help='directory of the history store (default: no history)')
+    parser.add_argument('--metrics-port', type=int,
+                        help='also serve Prometheus metrics on this local port (default: disabled)')
+    args = parser.parse_args(argv)
+
+    logging.basicConfig()
+    history = HistoryStore(args.history) if args.history else None
+    daemon = Daemon(args.socket, interval=args.interval, rescan=args.rescan, max_workers=args.workers,
+                    history=history)
+    try:
+        daemon.start()
+    except DaemonError as e:
+        parser.exit(1, '{0}: error: {1}\n'.format(parser.prog, e))
+    if args.metrics_port is not None:
+        daemon.serve(port=args.metrics_port)
+    logger.warning('Serving {0}'.format(args.socket))
+    try:
+        daemon._stop.wait()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        daemon.stop()
+
+
+__all__ = ['Daemon', 'Client', 'RemoteDevice', 'RemoteDeviceList', 'DaemonError', 'DEFAULT_SOCKET']
+
+
+if __name__ == '__main__':
+    main()
@@ -13,20 +13,30 @@ Methods are provided for initiating self tests and querying their results.
 # Python built-ins
 from __future__ import print_function
 
+import copyreg
+import hashlib
 import logging
 import os
 import re
 import warnings
-from time import time, strptime, mktime, sleep
-from typing import Iterator, Tuple, Union, List, Dict, Optional
+from time import monotonic, time, strptime, mktime, sleep
+from typing import TYPE_CHECKING, Any, Iterator, Tuple, Union, List, Dict, Optional
 
 # pySMART module imports
 from .interface.ata.attribute import Attribute
 from .interface.scsi.diagnostics import Diagnostics
 from .interface import *
 from .smartctl import Smartctl, SMARTCTL
+from .diff import SnapshotDiff, diff_snapshots
+from .rules import _SMART_WARNINGS, check
+from .snapshot import DeviceSnapshot
 from .testentry import TestEntry
-from .utils import smartctl_type, smartctl_isvalid_type, any_in, all_in
+from .utils import smartctl_type, smartctl_isvalid_type, any_in, all_in, normalize_wwn
+
+if TYPE_CHECKING:
+    from .anomaly import AnomalyDetector
+    from .history import HistoryStore
+    from .rules import RuleEngine
 
 logger = logging.getLogger('pySMART')
 
@@ -63,6 +73,55 @@ def smart_health_assement(disk_name: str, interface: Optional[str] = None, smart
     return assessment
 
 
+# Lines changing on every smartctl call, ignored by the output fingerprints
+_VOLATILE_LINES = ('Local Time is:',)
+
+
+def _fingerprint(raw: List[str]) -> bytes:
+    """Digest of a smartctl output, ignoring the lines that change on every
+    call (ie: the local time), to tell when a poll returned the same data."""
+    text = '\n'.join(line for line in raw if not line.startswith(_VOLATILE_LINES))
+    return hashlib.blake2b(text.encode('utf-8', 'surrogatepass'), digest_size=16).digest()
+
+
+def _if_attributes_from_state(state) -> Union[None, AtaAttributes, NvmeAttributes, SCSIAttributes]:
+    """Rebuilds the interface attributes from their `__getstate__` output,
+    telling their class by their fields."""
+    if state is None or isinstance(state, CommonIface):
+        return state
+    if 'legacyAttributes' in state:
+        cls: type = AtaAttributes
+    elif 'legacyDiagnostics' in state:
+        cls = SCSIAttributes
+    else:
+        cls = NvmeAttributes
+    if_attributes = cls.__new__(cls)
+    if_attributes.__setstate__(state)
+    return if_attributes
+
+
+def _snapshot_field(name: str, doc: str) -> property:
+    """Creates a `Device` property delegating to a field of its current
+    `pySMART.snapshot.DeviceSnapshot`.
+
+    Reads always come from the published snapshot. Writes go to the draft
+    when called from `Device.update()`, otherwise they publish a modified copy
+    of the snapshot.
+    """
+
+    def getter(self):
+        return getattr(self._snapshot, name)
+
+    def setter(self, value):
+        draft = self._draft
+        if draft is not None:
+            setattr(draft, name, value)
+        else:
+            self._snapshot = self._snapshot.replace(**{name: value})
+
+    return property(getter, setter, doc=doc)
+
+
 class Device(object):
     """
     Represents any device attached to an internal storage interface, such as a
@@ -70,165 +129,188 @@ class Device(object):
     (considered SATA) but excludes other external devices (USB, Firewire).
     """
 
-    def __init__(self, name: str, interface: Optional[str] = None, abridged: bool = False, smart_options: Union[str, List[str], None] = None, smartctl: Smartctl = SMARTCTL):
-        """Instantiates and initializes the `pySMART.device.Device`."""
-        if not (
-                interface is None or
-                smartctl_isvalid_type(interface.lower())
-        ):
-            raise ValueError(
-                'Unknown interface: {0} specified for {1}'.format(interface, name))
-        self.abridged = abridged or interface == 'UNKNOWN INTERFACE'
-        if smart_options is not None:
-            if isinstance(smart_options,  str):
-                smart_options = smart_options.split(' ')
-            smartctl.add_options(smart_options)
-        self.smartctl = smartctl
-        """
-        """
-        self.name: str = name.replace('/dev/', '').replace('nvd', 'nvme')
-        """
-        **(str):** Device's hardware ID, without the '/dev/' prefix.
-        (ie: sda (Linux), pd0 (Windows))
-        """
-        self.family: Optional[str] = None
-        """**(str):** Device's family (if any)."""
-        self.model: Optional[str] = None
-        """**(str):** Device's model number (if any)."""
-        self.serial: Optional[str] = None
-        """**(str):** Device's serial number (if any)."""
-        self._vendor: Optional[str] = None
-        """**(str):** Device's vendor (if any)."""
-        self._interface: Optional[str] = None if interface == 'UNKNOWN INTERFACE' else interface
-        """
-        **(str):** Device's interface type. Must be one of:
-            * **ATA** - Advanced Technology Attachment
-            * **SATA** - Serial ATA
-            * **SCSI** - Small Computer Systems Interface
-            * **SAS** - Serial Attached SCSI
-            * **SAT** - SCSI-to-ATA Translation (SATA device plugged into a
-            SAS port)
-            * **CSMI** - Common Storage Management Interface (Intel ICH /
-            Matrix RAID)
-        Generally this should not be specified to allow auto-detection to
-        occur. Otherwise, this value overrides the auto-detected type and could
-        produce unexpected or no data.
-        """
-        self._capacity: Optional[int] = None
-        """**(str):** Device's user capacity as reported directly by smartctl (RAW)."""
-        self._capacity_human: Optional[str] = None
-        """**(str):** Device's user capacity (human readable) as reported directly by smartctl (RAW)."""
-        self.firmware: Optional[str] = None
-        """**(str):** Device's firmware version."""
-        self.smart_capable: bool = False
-        """
+    # Data obtained on each update(). They delegate to the current
+    # `pySMART.snapshot.DeviceSnapshot`, see `Device.snapshot`.
+    family = _snapshot_field('family', """**(str):** Device's family (if any).""")
+    model = _snapshot_field('model', """**(str):** Device's model number (if any).""")
+    serial = _snapshot_field('serial', """**(str):** Device's serial number (if any).""")
+    wwn = _snapshot_field('wwn', """
+        **(str):** Device's World Wide Name (LU WWN / Logical Unit id), in
+        lowercase hexadecimal without separators (if any).
+        """)
+    _vendor = _snapshot_field('_vendor', """**(str):** Device's vendor (if any).""")
+    _capacity = _snapshot_field(
+        '_capacity', """**(str):** Device's user capacity as reported directly by smartctl (RAW).""")
+    _capacity_human = _snapshot_field(
+        '_capacity_human', """**(str):** Device's user capacity (human readable) as reported directly by smartctl (RAW).""")
+    firmware = _snapshot_field('firmware', """**(str):** Device's firmware version.""")
+    smart_capable = _snapshot_field('smart_capable', """
         **(bool):** True if the device has SMART Support Available.
         False otherwise. This is useful for VMs amongst other things.
-        """
-        self.smart_enabled: bool = False
-        """
+        """)
+    smart_enabled = _snapshot_field('smart_enabled', """
         **(bool):** True if the device supports SMART (or SCSI equivalent) and
         has the feature set enabled. False otherwise.
-        """
-        self.assessment: Optional[str] = None
-        """
+        """)
+    assessment = _snapshot_field('assessment', """
         **(str):** SMART health self-assessment as reported by the device.
-        """
-        self.messages: List[str] = []
-        """
+        """)
+    messages = _snapshot_field('messages', """
         **(list of str):** Contains any SMART warnings or other error messages
         reported by the device (ie: ascq codes).
-        """
-        self.is_ssd: bool = False
-        """
+        """)
+    is_ssd = _snapshot_field('is_ssd', """
         **(bool):** True if this device is a Solid State Drive.
         False otherwise.
-        """
-        self.rotation_rate: Optional[int] = None
-        """
+        """)
+    rotation_rate = _snapshot_field('rotation_rate', """
         **(int):** The Roatation Rate of the Drive if it is not a SSD.
         The Metric is RPM.
-        """
-        self.test_capabilities = {
-            'offline': False,  # SMART execute Offline immediate (ATA only)
-            'short': 'nvme' not in self.name,  # SMART short Self-test
-            'long': 'nvme' not in self.name,  # SMART long Self-test
-            'conveyance': False,  # SMART Conveyance Self-Test (ATA only)
-            'selective': False,  # SMART Selective Self-Test (ATA only)
-        }
-        # Note have not included 'offline' test for scsi as it runs in the foregorund
-        # mode. While this may be beneficial to us in someways it is against the
-        # general layout and pattern that the other tests issued using pySMART are
-        # followed hence not doing it currently
-        """
+        """)
+    test_capabilities = _snapshot_field('test_capabilities', """
         **(dict): ** This dictionary contains key == 'Test Name' and
         value == 'True/False' of self-tests that this device is capable of.
-        """
-        # Note: The above are just default values and can/will be changed
-        # upon update() when the attributes and type of the disk is actually
-        # determined.
-        self.test_polling_time = {
-            'short': 10,
-            'long': 1000,
-            'conveyance': 20,
-        }
-        """
+        """)
+    test_polling_time = _snapshot_field('test_polling_time', """
         **(dict): ** This dictionary contains key == 'Test Name' and
         value == int of approximate times to run each test type that this
         device is capable of.
-        """
-        # Note: The above are just default values and can/will be changed
-        # upon update() when the attributes and type of the disk is actually
-        # determined.
-        self.tests: List[TestEntry] = []
-        """
+        """)
+    tests = _snapshot_field('tests', """
         **(list of `TestEntry`):** Contains the complete SMART self-test log
         for this device, as provided by smartctl.
-        """
-        self._test_running = False
-        """
+        """)
+    _test_running = _snapshot_field('_test_running', """
         **(bool):** True if a self-test is currently being run.
         False otherwise.
-        """
-        self._test_ECD = None
-        """
+        """)
+    _test_ECD = _snapshot_field('_test_ECD', """
         **(str):** Estimated completion time of the running SMART selftest.
         Not provided by SAS/SCSI devices.
-        """
-        self._test_progress = None
-        """
+        """)
+    _test_progress = _snapshot_field('_test_progress', """
         **(int):** Estimate progress percantage of the running SMART selftest.
-        """
-        self._temperature: Optional[int] = None
-        """
+        """)
+    _temperature = _snapshot_field('_temperature', """
         **(int or None): Since SCSI disks do not report attributes like ATA ones
         we need to grep/regex the shit outta the normal "smartctl -a" output.
         In case the device have more than one temperature sensor the first value
         will be stored here too.
         Note: Temperatures are always in Celsius (if possible).
-        """
-        self.temperatures: Dict[int, int] = {}
-        """
+        """)
+    temperatures = _snapshot_field('temperatures', """
         **(dict of int): NVMe disks usually report multiple temperatures, which
         will be stored here if available. Keys are sensor numbers as reported in
         output data.
         Note: Temperatures are always in Celsius (if possible).
+        """)
+    logical_sector_size = _snapshot_field('logical_sector_size', """
+        **(int):** The logical sector size of the device (or LBA).
+        """)
+    physical_sector_size = _snapshot_field('physical_sector_size', """
+        **(int):** The physical sector size of the device.
+        """)
+    if_attributes = _snapshot_field('if_attributes', """
+        **(NvmeAttributes):** This object may vary for each device interface attributes.
+        It will store all data obtained from smartctl
+        """)
+
+    def __init__(self, name: str, interface: Optional[str] = None, abridged: bool = False, smart_options: Union[str, List[str], None] = None, smartctl: Smartctl = SMARTCTL,
+                 history: Optional['HistoryStore'] = None, detector: Optional['AnomalyDetector'] = None,
+                 rules: Optional['RuleEngine'] = None):
+        """Instantiates and initializes the `pySMART.device.Device`."""
+        if not (
+                interface is None or
+                smartctl_isvalid_type(interface.lower())
+        ):
+            raise ValueError(
+                'Unknown interface: {0} specified for {1}'.format(interface, name))
+        self.abridged = abridged or interface == 'UNKNOWN INTERFACE'
+        if smart_options is None:
+            smart_options = []
+        elif isinstance(smart_options,  str):
+            smart_options = smart_options.split()
+        self.smart_options: Tuple[str, ...] = tuple(smart_options)
         """
-        self.logical_sector_size: Optional[int] = None
+        **(tuple of str):** Extra smartctl options used when querying this
+        device, on top of the `smartctl` object ones. They are passed on each
+        call, so the shared `smartctl` object is never modified.
         """
-        **(int):** The logical sector size of the device (or LBA).
+        self.smartctl = smartctl
         """
-        self.physical_sector_size: Optional[int] = None
         """
-        **(int):** The physical sector size of the device.
+        self.name: str = name.replace('/dev/', '').replace('nvd', 'nvme')
         """
-        self.if_attributes: Union[None,
-                                  AtaAttributes,
-                                  NvmeAttributes,
-                                  SCSIAttributes] = None
+        **(str):** Device's hardware ID, without the '/dev/' prefix.
+        (ie: sda (Linux), pd0 (Windows))
         """
-        **(NvmeAttributes):** This object may vary for each device interface attributes.
-        It will store all data obtained from smartctl
+        self.alternate_paths: List[str] = []
+        """
+        **(list of str):** Other device references that lead to this same
+        physical disk (ie: the second port of a dual-ported SAS drive). Only
+        filled by `pySMART.device_list.DeviceList` when multipath
+        deduplication is enabled.
+        """
+        self.history: Optional['HistoryStore'] = history
+        """
+        **(HistoryStore):** If set, the values of every successful `update()`
+        are recorded in this `pySMART.history.HistoryStore`.
+        """
+        self.detector: Optional['AnomalyDetector'] = detector
+        """
+        **(AnomalyDetector):** If set, the values of every successful `update()`
+        are checked by this `pySMART.anomaly.AnomalyDetector`.
+        """
+        self.rules: Optional['RuleEngine'] = rules
+        """
+        **(RuleEngine):** If set, the values of every successful `update()`
+        are evaluated by this `pySMART.rules.RuleEngine`.
+        """
+        self._interface: Optional[str] = None if interface == 'UNKNOWN INTERFACE' else interface
+        """
+        **(str):** Device's interface type. Must be one of:
+            * **ATA** - Advanced Technology Attachment
+            * **SATA** - Serial ATA
+            * **SCSI** - Small Computer Systems Interface
+            * **SAS** - Serial Attached SCSI
+            * **SAT** - SCSI-to-ATA Translation (SATA device plugged into a
+            SAS port)
+            * **CSMI** - Common Storage Management Interface (Intel ICH /
+            Matrix RAID)
+        Generally this should not be specified to allow auto-detection to
+        occur. Otherwise, this value overrides the auto-detected type and could
+        produce unexpected or no data.
+        """
+        self._draft = None
+        """The snapshot being filled by `update()`, if any."""
+        self._parsed: Optional[Tuple[Tuple, DeviceSnapshot]] = None
+        """The fingerprint of the last parsed smartctl output and the snapshot it gave."""
+        self._snapshot: DeviceSnapshot = DeviceSnapshot(
+            test_capabilities={
+                'offline': False,  # SMART execute Offline immediate (ATA only)
+                'short': 'nvme' not in self.name,  # SMART short Self-test
+                'long': 'nvme' not in self.name,  # SMART long Self-test
+                'conveyance': False,  # SMART Conveyance Self-Test (ATA only)
+                'selective': False,  # SMART Selective Self-Test (ATA only)
+            },
+            # Note have not included 'offline' test for scsi as it runs in the foregorund
+            # mode. While this may be beneficial to us in someways it is against the
+            # general layout and pattern that the other tests issued using pySMART are
+            # followed hence not doing it currently
+            test_polling_time={
+                'short': 10,
+                'long': 1000,
+                'conveyance': 20,
+            },
+            # Note: The above are just default values and can/will be changed
+            # upon update() when the attributes and type of the disk is actually
+            # determined.
+        )
+        self.stale: bool = False
+        """
+        **(bool):** True if the last refresh of this device did not finish in
+        time (see `pySMART.device_list.DeviceList.update`) and the data held is
+        the last known one. Cleared on every successful `update()`.
         """
 
         if self.name is None:
@@ -292,10 +374,19 @@ class Device(object):
         Returns:
             list of `Attribute`: The SMART attributes of the device.
         """
-        if self.if_attributes is None or not isinstance(self.if_attributes, AtaAttributes):
-            return [None] * 256
-        else:
-            return self.if_attributes.legacyAttributes
+        return self._snapshot.attributes
+
+    @property
+    def snapshot(self) -> DeviceSnapshot:
+        """Returns the data obtained on the last `update()`, as an immutable
+        `pySMART.snapshot.DeviceSnapshot`. The snapshot is replaced (never
+        modified) by later updates, so it can be read from any thread without
+        locking and all its values are consistent with each other.
+
+        Returns:
+            DeviceSnapshot: The current snapshot of the device
+        """
+        return self._snapshot
 
     @property
     def dev_interface(self) -> Optional[str]:
@@ -306,13 +397,20 @@ class Device(object):
             str: The interface type of the device. (example: ata, scsi, nvme)
                  None if the interface type could not be determined.
         """
-        # Try to get the fine-tuned interface type
-        fineType = self._classify()
+        # Try to get the fine-tuned interface type, classified on the last update
+        fineType = self._snapshot._fine_interface
+        if fineType is None:
+            fineType = self._classify()
+
+        return self._resolve_interface(fineType, self.if_attributes)
 
+    @staticmethod
+    def _resolve_interface(fineType: str, if_attributes) -> str:
+        """Turns a `_classify()` result into the internal interface type."""
         # If return still contains a megaraid, just asume it's type
         if 'megaraid' in fineType:
             # If any attributes is not None and has at least non None value, then it is a sat+megaraid device
-            if isinstance(self.if_attributes, AtaAttributes):
+            if isinstance(if_attributes, AtaAttributes):
                 return 'ata'
             else:
                 return 'sas'
@@ -327,10 +425,7 @@ class Device(object):
             int: The temperature of the device in Celsius.
                  None if the temperature could not be determined.
         """
-        if self.if_attributes is None:
-            return self._temperature
-        else:
-            return self.if_attributes.temperature or self._temperature
+        return self._snapshot.temperature
 
     @property
     def smartctl_interface(self) -> Optional[str]:
@@ -377,23 +472,7 @@ class Device(object):
         Returns:
             str: The vendor of the device.
         """
-        if self._vendor:
-            return self._vendor
-
-        # If family is present, try to stract from family. Skip anything but letters.
-        elif self.family:
-            filter = re.search(r'^[a-zA-Z]+', self.family.strip())
-            if filter:
-                return filter.group(0)
-
-        # If model is present, try to stract from model. Skip anything but letters.
-        elif self.model:
-            filter = re.search(r'^[a-zA-Z]+', self.model.strip())
-            if filter:
-                return filter.group(0)
-
-        # If all else fails, return None
-        return None
+        return self._snapshot.vendor
 
     @property
     def capacity(self) -> Optional[str]:
@@ -403,28 +482,25 @@ class Device(object):
         Returns:
             str: The capacity in the raw smartctl format
         """
-        return self._capacity_human
+        return self._snapshot.capacity
 
     @property
     def diagnostics(self) -> Optional[Diagnostics]:
         """Gets the old/deprecated version of SCSI/SAS diagnostics atribute.
         """
-        if self.if_attributes is None or not isinstance(self.if_attributes, SCSIAttributes):
-            return None
-
-        else:
-            return self.if_attributes.diagnostics
+        return self._snapshot.diagnostics
 
     @property
     def diags(self) -> Dict[str, str]:
         """Gets the old/deprecated version of SCSI/SAS diags atribute.
         """
-        if self.if_attributes is None or not isinstance(self.if_attributes, SCSIAttributes):
+        diagnostics = self._snapshot.diagnostics
+        if diagnostics is None:
             # Return an empty dict if the device is not SCSI/SAS
             return {}
 
         else:
-            return self.if_attributes.diagnostics.get_classic_format()
+            return diagnostics.get_classic_format()
 
     @property
     def size_raw(self) -> Optional[str]:
@@ -433,7 +509,7 @@ class Device(object):
         Returns:
             str: The capacity in the raw smartctl format
         """
-        return self._capacity_human
+        return self._snapshot.capacity
 
     @property
     def size(self) -> int:
@@ -442,14 +518,7 @@ class Device(object):
         Returns:
             int: The capacity in bytes
         """
-        import humanfriendly
-
-        if self._capacity is not None:
-            return self._capacity
-        elif self._capacity_human is not None:
-            return humanfriendly.parse_size(self._capacity_human)
-        else:
-            return 0
+        return self._snapshot.size
 
     @property
     def sector_size(self) -> int:
@@ -458,12 +527,7 @@ class Device(object):
         Returns:
             int: The sector size of the device in Bytes. If undefined, we'll assume 512B
         """
-        if self.logical_sector_size is not None:
-            return self.logical_sector_size
-        elif self.physical_sector_size is not None:
-            return self.physical_sector_size
-        else:
-            return 512
+        return self._snapshot.sector_size
 
     def __repr__(self):
         """Define a basic representation of the class object."""
@@ -485,6 +549,7 @@ class Device(object):
         # - diagnostics
 
         state_dict = {
+            'alternate_paths': list(self.alternate_paths),
             'attributes': [attr.__getstate__() if attr else None for attr in self.attributes],
             'capacity': self._capacity_human,
             'diagnostics': self.diagnostics.__getstate__() if self.diagnostics else None,
@@ -504,14 +569,95 @@ class Device(object):
             'temperature': self.temperature,
             'test_capabilities': self.test_capabilities.copy(),
             'tests': [t.__getstate__() for t in self.tests] if self.tests else [],
+            'wwn': self.wwn,
         }
         return state_dict
 
+    def _full_state(self) -> Dict:
+        """
+        The `__getstate__` output plus the data it leaves out that is needed to
+        rebuild an equivalent device with `__setstate__`. Used by
+        `pySMART.binary` and `pySMART.daemon`; the json shape of `__getstate__`
+        is left as is.
+        """
+        state_dict = self.__getstate__()
+        state_dict.update({
+            'abridged': self.abridged,
+            'collect_duration': self.snapshot.collect_duration,
+            'collected_at': self.snapshot.collected_at,
+            'dev_interface': self.dev_interface,
+            'family': self.family,
+            'if_attributes': self.if_attributes._full_state() if self.if_attributes else None,
+            'logical_sector_size': self.logical_sector_size,
+            'physical_sector_size': self.physical_sector_size,
+            'size': self._capacity,
+            'stale': self.stale,
+            'temperatures': self.temperatures.copy(),
+            'test_polling_time': self.test_polling_time.copy(),
+            'tests': [t._full_state() for t in self.tests] if self.tests else [],
+            'vendor': self._vendor,
+        })
+        return state_dict
+
+    def __reduce__(self):
+        # __getstate__ is the public json payload, pickle the lossless one instead
+        return (copyreg.__newobj__, (self.__class__,), self._full_state())
+
     def __setstate__(self, state):
-        state['assessment'] = state['smart_status']
-        del state['smart_status']
+        # Rebuild the full objects, so the output of _full_state (even after a
+        # json round-trip) gives back an equivalent device. The fields missing
+        # from a plain __getstate__ payload keep their defaults. No smartctl call is done.
+        state = dict(state)
+        state['assessment'] = state.pop('smart_status')
+
+        # Snapshot fields can not be stored on __dict__, they are properties
+        fields: Dict[str, Any] = {}
+        for name in ['assessment', 'collect_duration', 'collected_at', 'family', 'firmware', 'is_ssd',
+                     'logical_sector_size', 'messages', 'model', 'physical_sector_size',
+                     'rotation_rate', 'serial', 'smart_capable', 'smart_enabled',
+                     'test_capabilities', 'test_polling_time', 'wwn']:
+            if name in state:
+                fields[name] = state.pop(name)
+        for name, field in [('capacity', '_capacity_human'), ('size', '_capacity'),
+                            ('vendor', '_vendor'), ('temperature', '_temperature'),
+                            ('dev_interface', '_fine_interface')]:
+            if name in state:
+                fields[field] = state.pop(name)
+        if 'temperatures' in state:
+            # json turns int keys into strings
+            fields['temperatures'] = {int(sensor): value
+                                      for sensor, value in state.pop('temperatures').items()}
+        if 'tests' in state:
+            fields['tests'] = [t if isinstance(t, TestEntry) else TestEntry.from_state(t)
+                               for t in state.pop('tests')]
+        fields['if_attributes'] = _if_attributes_from_state(state.pop('if_attributes', None))
+
+        # Computed from the fields above
+        state.pop('attributes', None)
+        state.pop('diagnostics', None)
+
+        interface = state.pop('interface', None)
+        self._interface = None if interface == 'UNKNOWN INTERFACE' else interface
+        self._reset_local()
+        self._snapshot = DeviceSnapshot(**fields)
         self.__dict__.update(state)
 
+    def _reset_local(self) -> None:
+        """Sets the attributes that are never serialized (the smartctl wrapper,
+        the history, detector and rules, the parse cache) to their defaults, on
+        a device rebuilt without `__init__` (see `__setstate__` and
+        `pySMART.serialize.from_dict`)."""
+        self.abridged = False
+        self.smart_options = ()
+        self.smartctl = SMARTCTL
+        self.alternate_paths = []
+        self.history = None
+        self.detector = None
+        self.rules = None
+        self.stale = False
+        self._draft = None
+        self._parsed = None
+
     def smart_toggle(self, action: str) -> Tuple[bool, List[str]]:
         """
         A basic function to enable/disable SMART on device.
@@ -631,7 +777,7 @@ class Device(object):
                 smartctl_type(test),
                 '-l',
                 'sataphy',
-                self.dev_reference])
+                self.dev_reference], pass_options=True, options=self.smart_options)
 
             if returncode == 0 and 'GP Log 0x11' in raw[3]:
                 fine_interface = test
@@ -643,13 +789,14 @@ class Device(object):
                 smartctl_type(fine_interface),
                 '-l',
                 'sasphy',
-                self.dev_reference])
+                self.dev_reference], pass_options=True, options=self.smart_options)
             if returncode == 0 and len(raw) > 4 and 'SAS SSP' in raw[4]:
                 fine_interface = 'sas'
             # Some older SAS devices do not support the SAS PHY log command.
             # For these, see if smartmontools reports a transport protocol.
             else:
-                raw = self.smartctl.all(self.dev_reference, fine_interface)
+                raw = self.smartctl.all(
+                    self.dev_reference, fine_interface, options=self.smart_options)
 
                 for line in raw:
                     if 'Transport protocol' in line and 'SAS' in line:
@@ -672,53 +819,44 @@ class Device(object):
         """
         if smartctl_type(self._interface) == 'scsi':
             return
-        for attr in self.attributes:
-            if attr is not None:
-                if attr.when_failed == 'In_the_past':
-                    warn_str = "{0} failed in the past with value {1}. [Threshold: {2}]".format(
-                        attr.name, attr.worst, attr.thresh)
-                    self.messages.append(warn_str)
-                    if not self.assessment == 'FAIL':
-                        self.assessment = 'WARN'
-                elif attr.when_failed == 'FAILING_NOW':
-                    warn_str = "{0} is failing now with value {1}. [Threshold: {2}]".format(
-                        attr.name, attr.value, attr.thresh)
-                    self.assessment = 'FAIL'
-                    self.messages.append(warn_str)
-                elif not attr.when_failed == '-':
-                    warn_str = "{0} says it failed '{1}'. [V={2},W={3},T={4}]".format(
-                        attr.name, attr.when_failed, attr.value, attr.worst, attr.thresh)
-                    self.messages.append(warn_str)
-                    if not self.assessment == 'FAIL':
-                        self.assessment = 'WARN'
+        # Work on the draft being filled by update(), if any
+        snap = self._draft if self._draft is not None else self
+        for alert in check(_SMART_WARNINGS, self._draft if self._draft is not None else self._snapshot):
+            snap.messages = snap.messages + [alert.message]
+            if alert.severity == 'critical':
+                snap.assessment = 'FAIL'
+            elif not snap.assessment == 'FAIL':
+                snap.assessment = 'WARN'
 
     def __get_smart_status(self, raw_iterator:Iterator[str]):
         """
         A quick function to get the SMART status of the device.
         This is required prior to scsi parsing.
         """
-        
+        # Work on the draft being filled by update(), if any
+        snap = self._draft if self._draft is not None else self
+
         for line in raw_iterator:
             if 'SMART support' in line:
-                # self.smart_capable = 'Available' in line
-                # self.smart_enabled = 'Enabled' in line
+                # snap.smart_capable = 'Available' in line
+                # snap.smart_enabled = 'Enabled' in line
                 # Since this line repeats twice the above method is flawed
                 # Lets try the following instead, it is a bit redundant but
                 # more robust.
                 if any_in(line, 'Unavailable', 'device lacks SMART capability'):
-                    self.smart_capable = False
-                    self.smart_enabled = False
+                    snap.smart_capable = False
+                    snap.smart_enabled = False
                 elif 'Enabled' in line:
-                    self.smart_enabled = True
+                    snap.smart_enabled = True
                 elif 'Disabled' in line:
-                    self.smart_enabled = False
+                    snap.smart_enabled = False
                 elif any_in(line, 'Available', 'device has SMART capability'):
-                    self.smart_capable = True
+                    snap.smart_capable = True
                 continue
 
             if 'does not support SMART' in line:
-                self.smart_capable = False
-                self.smart_enabled = False
+                snap.smart_capable = False
+                snap.smart_enabled = False
                 continue
 
         
@@ -979,41 +1117,134 @@ class Device(object):
             return selftest_return_value, str(self.tests[0]) if output == 'str' else self.tests[0]
         return selftest_results[:2]
 
-    def update(self):
+    def update(self, return_changes: bool = False) -> Optional[SnapshotDiff]:
         """
         Queries for device information using smartctl and updates all
         class members, including the SMART attribute table and self-test log.
         Can be called at any time to refresh the `pySMART.device.Device`
         object's data content.
+
+        Outputs are fingerprinted: if smartctl returns the same data as on the
+        last parsed poll (the local time line apart), parsing is skipped and
+        the objects of that poll (attributes, tests...) are reused.
+
+        Args:
+            return_changes (bool, optional): If True, the changes from the previous
+                snapshot are computed and returned. Defaults to False.
+
+        Returns:
+            SnapshotDiff: The changes (see `pySMART.diff.diff_snapshots`) if
+                return_changes is set, None otherwise.
         """
-        # set temperature back to None so that if update() is called more than once
-        # any logic that relies on self.temperature to be None to rescan it works.it
-        self._temperature = None
-        # same for temperatures
-        self.temperatures = {}
+        start = monotonic()
+        # Query smartctl before touching any field, so a failed or timed out
+        # call keeps the last known values
         if self.abridged:
             interface = None
-            raw = self.smartctl.info(self.dev_reference)
+            raw = self.smartctl.info(
+                self.dev_reference, options=self.smart_options)
 
         else:
             interface = smartctl_type(self._interface)
             raw = self.smartctl.all(
-                self.dev_reference, interface)
+                self.dev_reference, interface, options=self.smart_options)
+
+        fingerprint = (self._interface, self.abridged, _fingerprint(raw))
+        parsed = self._parsed
+        previous = self._snapshot
+
+        if parsed is not None and parsed[0] == fingerprint:
+            # Same output as the last parsed one: reuse its objects
+            snap = parsed[1].draft()
+            snap.collected_at = time()
+            snap.collect_duration = monotonic() - start
+            self._snapshot = snap.freeze()
+            self.stale = False
+            self._record()
+            if return_changes:
+                return diff_snapshots(previous, self._snapshot)
+            return None
+
+        # Classify once per update: it may take a few more smartctl calls
+        fine_interface = self._classify()
+        canonical_interface = self._resolve_interface(
+            fine_interface, self.if_attributes)
+
+        # Fill a private copy of the current snapshot, and publish it at once
+        # when finished: readers never see a half-updated device
+        snap = self._snapshot.draft()
+        snap._fine_interface = fine_interface
+        self._draft = snap
+        try:
+            self._parse(snap, raw, interface, canonical_interface)
+        finally:
+            self._draft = None
+
+        snap.collected_at = time()
+        snap.collect_duration = monotonic() - start
+        self._snapshot = snap.freeze()
+        self.stale = False
+
+        # Parses that needed more smartctl queries can not be reused
+        if isinstance(snap.if_attributes, SCSIAttributes) and not self.abridged and \
+                snap.smart_enabled and SCSIAttributes._needs_background_log(raw):
+            self._parsed = None
+        else:
+            self._parsed = (fingerprint, self._snapshot)
+        self._record()
 
-        canonical_interface = self.dev_interface
+        if return_changes:
+            return diff_snapshots(previous, self._snapshot)
+        return None
+
+    def _record(self) -> None:
+        """Records the published snapshot in `history`, checks it with
+        `detector` and evaluates it with `rules`, if set. Storage errors and
+        errors raised by their callbacks are logged: they never fail the
+        update."""
+        if self.history is not None:
+            try:
+                self.history.append(self)
+            except (OSError, ValueError) as e:
+                logger.error(f"Failed to record {self.name} in the history store: {e}")
+        if self.detector is not None:
+            try:
+                self.detector.observe(self)
+            except Exception as e:
+                logger.error(f"Anomaly detection failed for {self.name}: {e}")
+        if self.rules is not None:
+            try:
+                self.rules.evaluate(self)
+            except Exception as e:
+                logger.error(f"Rule evaluation failed for {self.name}: {e}")
+
+    def _parse(self, snap, raw: List[str], interface: Optional[str], canonical_interface: Optional[str]):
+        """Parses the output of a smartctl query into a snapshot draft.
+
+        Args:
+            snap (_DeviceSnapshotDraft): The snapshot being filled
+            raw (List[str]): The smartctl output
+            interface (str, optional): The smartctl interface type used in the query
+            canonical_interface (str, optional): The internal interface type of the device
+        """
+        # set temperature back to None so that if update() is called more than once
+        # any logic that relies on self.temperature to be None to rescan it works.it
+        snap._temperature = None
+        # same for temperatures
+        snap.temperatures = {}
         if canonical_interface == 'nvme':
-            self.smart_capable = True
-            self.smart_enabled = True
-            self.is_ssd = True
+            snap.smart_capable = True
+            snap.smart_enabled = True
+            snap.is_ssd = True
 
         parse_self_tests = False
         parse_running_test = False
         parse_ascq = False
         polling_minute_type = None
         message = ''
-        self.tests = []
-        self._test_running = False
-        self._test_progress = None
+        snap.tests = []
+        snap._test_running = False
+        snap._test_progress = None
         # Lets skip the first couple of non-useful lines
         _stdout = raw[4:]
 
@@ -1030,37 +1261,38 @@ class Device(object):
         #   Dedicated interface attributes    #
         #######################################
         if AtaAttributes.has_compatible_data(iter(_stdout)):
-            self.if_attributes = AtaAttributes(iter(_stdout))
+            snap.if_attributes = AtaAttributes(iter(_stdout))
 
-        elif self.dev_interface == 'nvme':
-            self.if_attributes = NvmeAttributes(iter(_stdout))
+        elif canonical_interface == 'nvme':
+            snap.if_attributes = NvmeAttributes(iter(_stdout))
 
             # Get Tests
-            for test in self.if_attributes.tests:
-                self.tests.append(TestEntry('nvme', test.num, test.description, test.status, test.powerOnHours,
+            for test in snap.if_attributes.tests:
+                snap.tests.append(TestEntry('nvme', test.num, test.description, test.status, test.powerOnHours,
                                   test.failingLBA, nsid=test.nsid, segment=test.seg, sct=test.sct, code=test.code, remain=100-test.progress))
 
             # Set running test
-            if any(test.status == 'Running' for test in self.if_attributes.tests):
-                self._test_running = True
-                self._test_progress = self.if_attributes.tests[0].progress
+            if any(test.status == 'Running' for test in snap.if_attributes.tests):
+                snap._test_running = True
+                snap._test_progress = snap.if_attributes.tests[0].progress
             else:
-                self._test_running = False
-                self._test_progress = None
+                snap._test_running = False
+                snap._test_progress = None
 
         elif SCSIAttributes.has_compatible_data(iter(_stdout)):
             self.__get_smart_status(iter(_stdout))
-            self.if_attributes = SCSIAttributes(iter(_stdout),
+            snap.if_attributes = SCSIAttributes(iter(_stdout),
                                                 abridged=self.abridged,
-                                                smartEnabled=self.smart_enabled,
+                                                smartEnabled=snap.smart_enabled,
                                                 sm=self.smartctl,
-                                                dev_reference=self.dev_reference)
+                                                dev_reference=self.dev_reference,
+                                                options=self.smart_options)
 
             # Import (for now) the tests from if_attributes
-            self.tests = self.if_attributes.tests
+            snap.tests = snap.if_attributes.tests
 
         else:
-            self.if_attributes = None
+            snap.if_attributes = None
 
         #######################################
         #    Global / generic  attributes     #
@@ -1072,7 +1304,7 @@ class Device(object):
                     parse_self_tests = False
                 if parse_ascq:
                     parse_ascq = False
-                    self.messages.append(message)
+                    snap.messages.append(message)
             if parse_ascq:
                 message += ' ' + line.lstrip().rstrip()
             if parse_self_tests:
@@ -1115,7 +1347,7 @@ class Device(object):
                     except:
                         num = None
 
-                    self.tests.append(
+                    snap.tests.append(
                         TestEntry(format, num, test_type, status,
                                   hours, lba, remain=remain)
                     )
@@ -1124,33 +1356,38 @@ class Device(object):
 
             # Basic device information parsing
             if any_in(line, 'Device Model', 'Product', 'Model Number'):
-                self.model = line.split(':')[1].lstrip().rstrip()
+                snap.model = line.split(':')[1].lstrip().rstrip()
                 self._guess_smart_type(line.lower())
                 continue
 
             if 'Model Family' in line:
-                self.family = line.split(':')[1].strip()
+                snap.family = line.split(':')[1].strip()
                 self._guess_smart_type(line.lower())
                 continue
 
             if 'LU WWN' in line:
+                snap.wwn = normalize_wwn(line.split(':')[1])
                 self._guess_smart_type(line.lower())
                 continue
 
+            if 'Logical Unit id' in line:  # SCSI devices
+                snap.wwn = normalize_wwn(line.split(':')[1])
+                continue
+
             if any_in(line, 'Serial Number', 'Serial number'):
                 try:
-                    self.serial = line.split(':')[1].split()[0].rstrip()
+                    snap.serial = line.split(':')[1].split()[0].rstrip()
                 except IndexError:
                     # Serial reported empty
-                    self.serial = ""
+                    snap.serial = ""
                 continue
 
             vendor = re.compile(r'^Vendor:\s+(\w+)').match(line)
             if vendor is not None:
-                self._vendor = vendor.groups()[0]
+                snap._vendor = vendor.groups()[0]
 
             if any_in(line, 'Firmware Version', 'Revision'):
-                self.firmware = line.split(':')[1].strip()
+                snap.firmware = line.split(':')[1].strip()
 
             if any_in(line, 'User Capacity', 'Total NVM Capacity', 'Namespace 1 Size/Capacity'):
                 # TODO: support for multiple NVMe namespaces
@@ -1163,59 +1400,59 @@ class Device(object):
                         # This capacity is set to 0, skip it
                         continue
 
-                    self._capacity = int(
+                    snap._capacity = int(
                         tmp[0].strip().replace(',', '').replace('.', '').replace(' ', '').replace('\u2019', '').replace('\u00a0', ''))
 
                     if len(tmp) == 2 and tmp[1] is not None:
-                        self._capacity_human = tmp[1].strip().replace(',', '.')
+                        snap._capacity_human = tmp[1].strip().replace(',', '.')
 
             if 'SMART support' in line:
-                # self.smart_capable = 'Available' in line
-                # self.smart_enabled = 'Enabled' in line
+                # snap.smart_capable = 'Available' in line
+                # snap.smart_enabled = 'Enabled' in line
                 # Since this line repeats twice the above method is flawed
                 # Lets try the following instead, it is a bit redundant but
                 # more robust.
                 if any_in(line, 'Unavailable', 'device lacks SMART capability'):
-                    self.smart_capable = False
-                    self.smart_enabled = False
+                    snap.smart_capable = False
+                    snap.smart_enabled = False
                 elif 'Enabled' in line:
-                    self.smart_enabled = True
+                    snap.smart_enabled = True
                 elif 'Disabled' in line:
-                    self.smart_enabled = False
+                    snap.smart_enabled = False
                 elif any_in(line, 'Available', 'device has SMART capability'):
-                    self.smart_capable = True
+                    snap.smart_capable = True
                 continue
 
             if 'does not support SMART' in line:
-                self.smart_capable = False
-                self.smart_enabled = False
+                snap.smart_capable = False
+                snap.smart_enabled = False
                 continue
 
             if 'Rotation Rate' in line:
                 if 'Solid State Device' in line:
-                    self.is_ssd = True
+                    snap.is_ssd = True
                 elif 'rpm' in line:
-                    self.is_ssd = False
+                    snap.is_ssd = False
                     try:
-                        self.rotation_rate = int(
+                        snap.rotation_rate = int(
                             line.split(':')[1].lstrip().rstrip()[:-4])
                     except ValueError:
                         # Cannot parse the RPM? Assigning None instead
-                        self.rotation_rate = None
+                        snap.rotation_rate = None
                 continue
 
             if 'SMART overall-health self-assessment' in line:  # ATA devices
                 if line.split(':')[1].strip() == 'PASSED':
-                    self.assessment = 'PASS'
+                    snap.assessment = 'PASS'
                 else:
-                    self.assessment = 'FAIL'
+                    snap.assessment = 'FAIL'
                 continue
 
             if 'SMART Health Status' in line:  # SCSI devices
                 if line.split(':')[1].strip() == 'OK':
-                    self.assessment = 'PASS'
+                    snap.assessment = 'PASS'
                 else:
-                    self.assessment = 'FAIL'
+                    snap.assessment = 'FAIL'
                     parse_ascq = True  # Set flag to capture status message
                     message = line.split(':')[1].lstrip().rstrip()
                 continue
@@ -1223,27 +1460,27 @@ class Device(object):
             # Parse SMART test capabilities (ATA only)
             # Note: SCSI does not list this but and allows for only 'offline', 'short' and 'long'
             if 'SMART execute Offline immediate' in line:
-                self.test_capabilities['offline'] = 'No' not in line
+                snap.test_capabilities['offline'] = 'No' not in line
                 continue
 
             if 'Conveyance Self-test supported' in line:
-                self.test_capabilities['conveyance'] = 'No' not in line
+                snap.test_capabilities['conveyance'] = 'No' not in line
                 continue
 
             if 'Selective Self-test supported' in line:
-                self.test_capabilities['selective'] = 'No' not in line
+                snap.test_capabilities['selective'] = 'No' not in line
                 continue
 
             if 'Self-test supported' in line:
-                self.test_capabilities['short'] = 'No' not in line
-                self.test_capabilities['long'] = 'No' not in line
+                snap.test_capabilities['short'] = 'No' not in line
+                snap.test_capabilities['long'] = 'No' not in line
                 continue
 
             # Parse SMART test capabilities (NVMe only)
             if 'Optional Admin Commands' in line:
                 if 'Self_Test' in line:
-                    self.test_capabilities['short'] = True
-                    self.test_capabilities['long'] = True
+                    snap.test_capabilities['short'] = True
+                    snap.test_capabilities['long'] = True
 
             if 'Short self-test routine' in line:
                 polling_minute_type = 'short'
@@ -1255,7 +1492,7 @@ class Device(object):
                 polling_minute_type = 'conveyance'
                 continue
             if 'recommended polling time:' in line:
-                self.test_polling_time[polling_minute_type] = float(
+                snap.test_polling_time[polling_minute_type] = float(
                     re.sub("[^0-9]", "", line)
                 )
                 continue
@@ -1265,23 +1502,23 @@ class Device(object):
             # For 'scsi' I still do it since it is the only place I get % remaining in scsi
             if 'Self-test execution status' in line:
                 if 'progress' in line:
-                    self._test_running = True
+                    snap._test_running = True
                     # for ATA the "%" remaining is on the next line
                     # thus set the parse_running_test flag and move on
                     parse_running_test = True
                 elif '%' in line:
                     # for scsi the progress is on the same line
                     # so we can just parse it and move on
-                    self._test_running = True
+                    snap._test_running = True
                     try:
-                        self._test_progress = 100 - \
+                        snap._test_progress = 100 - \
                             int(line.split('%')[0][-3:].strip())
                     except ValueError:
                         pass
                 continue
             if parse_running_test is True:
                 try:
-                    self._test_progress = 100 - \
+                    snap._test_progress = 100 - \
                         int(line.split('%')[0][-3:].strip())
                 except ValueError:
                     pass
@@ -1301,12 +1538,12 @@ class Device(object):
             if 'Current Drive Temperature' in line or ('Temperature:' in
                                                        line and interface == 'nvme'):
                 try:
-                    self._temperature = int(
+                    snap._temperature = int(
                         line.split(':')[-1].strip().split()[0])
 
                     if 'fahrenheit' in line.lower():
-                        self._temperature = int(
-                            (self.temperature - 32) * 5 / 9)
+                        snap._temperature = int(
+                            (snap.temperature - 32) * 5 / 9)
 
                 except ValueError:
                     pass
@@ -1326,9 +1563,9 @@ class Device(object):
                             tempsensor_value = int(
                                 (tempsensor_value - 32) * 5 / 9)
 
-                        self.temperatures[tempsensor_number] = tempsensor_value
-                        if self.temperature is None or tempsensor_number == 0:
-                            self._temperature = tempsensor_value
+                        snap.temperatures[tempsensor_number] = tempsensor_value
+                        if snap.temperature is None or tempsensor_number == 0:
+                            snap._temperature = tempsensor_value
                 except ValueError:
                     pass
 
@@ -1343,20 +1580,20 @@ class Device(object):
                 m = re.match(
                     r'.* (\d+) bytes logical,\s*(\d+) bytes physical', line)
                 if m:
-                    self.logical_sector_size = int(m.group(1))
-                    self.physical_sector_size = int(m.group(2))
+                    snap.logical_sector_size = int(m.group(1))
+                    snap.physical_sector_size = int(m.group(2))
                 continue
             if 'Logical block size:' in line:  # SCSI 1/2
-                self.logical_sector_size = int(
+                snap.logical_sector_size = int(
                     line.split(':')[1].strip().split(' ')[0])
                 continue
             if 'Physical block size:' in line:  # SCSI 2/2
-                self.physical_sector_size = int(
+                snap.physical_sector_size = int(
                     line.split(':')[1].strip().split(' ')[0])
                 continue
             if 'Namespace 1 Formatted LBA Size' in line:  # NVMe
                 # Note: we will assume that there is only one namespace
-                self.logical_sector_size = int(
+                snap.logical_sector_size = int(
                     line.split(':')[1].strip().split(' ')[0])
                 continue
 
@@ -1367,10 +1604,10 @@ class Device(object):
                 self._make_smart_warnings()
 
         # Now that we have finished the update routine, if we did not find a runnning selftest
-        # nuke the self._test_ECD and self._test_progress
-        if self._test_running is False:
-            self._test_ECD = None
-            self._test_progress = None
+        # nuke the snap._test_ECD and snap._test_progress
+        if snap._test_running is False:
+            snap._test_ECD = None
+            snap._test_progress = None
 
 
 __all__ = ['Device', 'smart_health_assement']
@@ -7,16 +7,81 @@ represent all physical storage devices connected to the system.
 Once initialized, the sole member `devices` will contain a list of `Device`
 objects.
 
-This class has no public methods.  All interaction should be through the
+Devices can also be collected one by one, as soon as each of them is ready,
+through `DeviceList.iter_devices` and its asyncio counterpart
+`DeviceList.aiter_devices`. Any other interaction should be through the
 `Device` class API.
 """
 # Python built-ins
+import asyncio
+import logging
+import os
 import re
+import threading
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from subprocess import TimeoutExpired
+from time import monotonic
 
 # pySMART module imports
+from .anomaly import AnomalyDetector
 from .device import Device
+from .fleet import FleetMatrix
+from .health import HealthScores, score
+from .history import HistoryStore
+from .quarantine import Quarantine, QuarantinedError
+from .rules import RuleEngine
 from .smartctl import Smartctl, SMARTCTL
-from typing import List
+from .utils import smartctl_type, normalize_wwn, any_in
+from typing import Any, AsyncIterator, Callable, Dict, Iterator, List, Optional, Tuple, TypeVar, Union
+
+logger = logging.getLogger('pySMART')
+
+_Job = TypeVar('_Job')
+_Result = TypeVar('_Result')
+
+
+def _device_name(path: str) -> str:
+    """Converts a scanned device path into the `pySMART.device.Device.name` it gets."""
+    return path.replace('/dev/', '').replace('nvd', 'nvme')
+
+
+def _dev_reference(path: str) -> str:
+    """Converts a scanned device path into the `pySMART.device.Device.dev_reference` it gets."""
+    name = _device_name(path)
+    if 'IOService' in name:
+        return name
+    return os.path.join('/dev/', name)
+
+
+class DeviceError(Exception):
+    """
+    Represents a scanned device that could not be collected. Instances are
+    yielded by `DeviceList.iter_devices` in place of the `Device` object when
+    errors are caught.
+    """
+
+    def __init__(self, name: str, interface: Optional[str], error: BaseException):
+        super().__init__(f"Error parsing device {name}: {error}")
+        self.name: str = name
+        """**(str):** The device path as reported by smartctl scan."""
+        self.interface: Optional[str] = interface
+        """**(str):** The device interface as reported by smartctl scan."""
+        self.error: BaseException = error
+        """**(Exception):** The exception raised while collecting the device."""
+
+    @property
+    def timed_out(self) -> bool:
+        """True if the device was not collected because a deadline expired."""
+        return isinstance(self.error, (TimeoutError, TimeoutExpired))
+
+    @property
+    def quarantined(self) -> bool:
+        """True if the device was not queried because it is quarantined."""
+        return isinstance(self.error, QuarantinedError)
+
+    def __repr__(self):
+        """Define a basic representation of the class object."""
+        return "<DeviceError on {0}: {1!r}>".format(self.name, self.error)
 
 
 class DeviceList(object):
@@ -24,7 +89,9 @@ class DeviceList(object):
     Represents a list of all the storage devices connected to this computer.
     """
 
-    def __init__(self, init: bool = True, smartctl=SMARTCTL, catch_errors: bool = False):
+    def __init__(self, init: bool = True, smartctl=SMARTCTL, catch_errors: bool = False, deduplicate: bool = False,
+                 quarantine: Optional[Quarantine] = None, history: Optional[HistoryStore] = None,
+                 detector: Optional[AnomalyDetector] = None, rules: Optional[RuleEngine] = None):
         """Instantiates and optionally initializes the `DeviceList`.
 
         Args:
@@ -36,6 +103,18 @@ class DeviceList(object):
                 Defaults the global `SMARTCTL` object and should be only
                 overwritten on tests.
             catch_errors (bool, optional): If True, individual device-parsing errors will be caught
+            deduplicate (bool, optional): If True, paths that lead to the same physical disk
+                (ie: both ports of a dual-ported SAS drive) are detected before querying
+                SMART data, and only one `Device` is created for each disk. Defaults to False.
+            quarantine (Quarantine, optional): If set, devices that are persistently slow or
+                failing are quarantined and not queried until their back-off expires. Their
+                last known data is served instead. Defaults to None (disabled).
+            history (HistoryStore, optional): If set, every device records its values in
+                this store on each successful update. Defaults to None (disabled).
+            detector (AnomalyDetector, optional): If set, the values of every device are
+                checked by this detector on each successful update. Defaults to None (disabled).
+            rules (RuleEngine, optional): If set, the values of every device are evaluated
+                by this rule engine on each successful update. Defaults to None (disabled).
         """
 
         self.devices: List[Device] = []
@@ -46,6 +125,50 @@ class DeviceList(object):
         self.smartctl: Smartctl = smartctl
         """The smartctl wrapper
         """
+        self.deduplicate: bool = deduplicate
+        """
+        **(bool):** If True, multipath devices are collected only once. Alternate
+        paths are stored in `pySMART.device.Device.alternate_paths`.
+        """
+        self.quarantine: Optional[Quarantine] = quarantine
+        """
+        **(Quarantine):** The circuit breaker that tracks slow or failing devices,
+        if enabled. See `pySMART.quarantine.Quarantine.states`.
+        """
+        self.history: Optional[HistoryStore] = history
+        """
+        **(HistoryStore):** The store the devices record their values in, if
+        enabled. See `pySMART.device.Device.history`.
+        """
+        self.detector: Optional[AnomalyDetector] = detector
+        """
+        **(AnomalyDetector):** The detector the values of the devices are checked
+        by, if enabled. See `pySMART.device.Device.detector`.
+        """
+        self.rules: Optional[RuleEngine] = rules
+        """
+        **(RuleEngine):** The rule engine the values of the devices are evaluated
+        by, if enabled. See `pySMART.device.Device.rules`.
+        """
+        self.timed_out: List[str] = []
+        """
+        **(list of str):** Devices that were not collected before the deadline of
+        the last `initialize` or `update` call, and have no last known values to
+        be served (see `pySMART.device.Device.stale`), by
+        `pySMART.device.Device.dev_reference`.
+        """
+        self.quarantined: List[str] = []
+        """
+        **(list of str):** Devices that were skipped by the last `initialize` call
+        because they are quarantined, and have no last known values to be served,
+        by `pySMART.device.Device.dev_reference`.
+        """
+        self.revalidation: Optional[threading.Thread] = None
+        """
+        **(Thread):** The background refresh started by the last `revalidate`
+        call (see `from_snapshot`), if any. Join it to wait until every device
+        has been refreshed.
+        """
         if init:
             self.initialize(catch_errors)
 
@@ -86,7 +209,330 @@ class DeviceList(object):
         self.devices[:] = [v for i, v in enumerate(self.devices)
                            if i not in to_delete]
 
-    def initialize(self, catch_errors: bool = False):
+    def _scan(self) -> List[Tuple[str, str]]:
+        """Queries smartctl for the list of available devices
+
+        Returns:
+            List[Tuple[str, str]]: A list of (name, interface) tuples, in scan order
+        """
+        entries = []
+        for line in self.smartctl.scan():
+            if not ('failed:' in line or line == ''):
+                groups = re.compile(
+                    r'^(\S+)\s+-d\s+(\S+)').match(line).groups()
+                entries.append((groups[0], groups[1]))
+
+        return entries
+
+    def _path_identity(self, name: str, interface: str) -> Optional[str]:
+        """Gets an identifier of the physical disk behind a device path, as
+           cheaply as possible. The sysfs wwid is used when available, otherwise
+           an identity-only smartctl query (--info) is performed.
+
+        Args:
+            name (str): The device path as reported by smartctl scan
+            interface (str): The device interface as reported by smartctl scan
+
+        Returns:
+            str: The LU WWN of the disk, or its model+serial if no WWN is reported.
+                 None if the disk could not be identified.
+        """
+        # Fast path: Linux exposes the SCSI VPD page 0x83 identifier on sysfs
+        if os.name == 'posix' and name.startswith('/dev/sd') and 'megaraid' not in interface:
+            wwid_path = os.path.join(
+                '/sys/block', os.path.basename(name), 'device', 'wwid')
+            try:
+                with open(wwid_path) as f:
+                    wwid = normalize_wwn(f.read())
+                if wwid:
+                    return wwid
+            except OSError:
+                pass
+
+        try:
+            raw = self.smartctl.info(name, smartctl_type(interface))
+        except Exception as e:
+            logger.debug(f"Unable to identify device {name}: {e}")
+            return None
+
+        model = None
+        serial = None
+        for line in raw:
+            if 'LU WWN' in line or 'Logical Unit id' in line:
+                wwn = normalize_wwn(line.split(':')[1])
+                if wwn:
+                    return wwn
+            elif any_in(line, 'Device Model', 'Product', 'Model Number'):
+                model = line.split(':')[1].strip()
+            elif any_in(line, 'Serial Number', 'Serial number'):
+                serial = line.split(':')[1].strip()
+
+        if serial:
+            return f'{model}:{serial}'
+
+        return None
+
+    def _deduplicate(self, entries: List[Tuple[str, str]], max_workers: int = 1,
+                     until: Optional[float] = None) -> List[Tuple[str, str, List[str]]]:
+        """Groups the scanned device paths that lead to the same physical disk.
+
+        Args:
+            entries (List[Tuple[str, str]]): The (name, interface) list returned by `_scan`
+            max_workers (int, optional): Number of paths identified in parallel. Defaults to 1.
+            until (float, optional): Deadline of the identity queries, as returned by
+                `time.monotonic()`. Paths not identified in time are kept on their own.
+                Defaults to None (no limit).
+
+        Returns:
+            List[Tuple[str, str, List[str]]]: A (name, interface, alternate_paths) tuple
+                for each physical disk. The first scanned path is the one kept.
+        """
+        identities: Dict[str, Optional[str]] = {}
+        for (name, interface), identity, finished in self._run(
+                entries, lambda entry: self._path_identity(*entry), max_workers, until):
+            identities[name] = identity if finished else None
+
+        groups: Dict[str, Tuple[str, str, List[str]]] = {}
+        result: List[Tuple[str, str, List[str]]] = []
+
+        for name, interface in entries:
+            identity = identities[name]
+
+            if identity is not None and identity in groups:
+                logger.debug(
+                    f"Device {name} is an alternate path of {groups[identity][0]}")
+                groups[identity][2].append(name)
+                continue
+
+            entry: Tuple[str, str, List[str]] = (name, interface, [])
+            if identity is not None:
+                groups[identity] = entry
+            result.append(entry)
+
+        return result
+
+    def _targets(self, entries: List[Tuple[str, str]], max_workers: int = 1,
+                 until: Optional[float] = None) -> List[Tuple[str, str, List[str]]]:
+        """Groups the scanned multipath devices, if enabled.
+
+        Args:
+            entries (List[Tuple[str, str]]): The (name, interface) list returned by `_scan`
+            max_workers (int, optional): Number of paths identified in parallel. Defaults to 1.
+            until (float, optional): Deadline of the identity queries. Defaults to None (no limit).
+
+        Returns:
+            List[Tuple[str, str, List[str]]]: A (name, interface, alternate_paths)
+                tuple for each device that must be collected
+        """
+        # Group multipath devices before running the full queries
+        if self.deduplicate:
+            return self._deduplicate(entries, max_workers, until)
+        else:
+            return [(name, interface, []) for name, interface in entries]
+
+    def _collect(self, target: Tuple[str, str, List[str]], catch_errors: bool) -> Union[Device, DeviceError]:
+        """Runs the full query of a single scanned device.
+
+        Args:
+            target (Tuple[str, str, List[str]]): A (name, interface, alternate_paths) tuple
+            catch_errors (bool): If True, errors are returned as `DeviceError` objects
+
+        Returns:
+            Union[Device, DeviceError]: The collected device, or the error if caught
+        """
+        name, interface, alternate_paths = target
+        try:
+            device = Device(name, interface=interface, smartctl=self.smartctl, history=self.history,
+                            detector=self.detector, rules=self.rules)
+            device.alternate_paths = alternate_paths
+            return device
+
+        except Exception as e:
+            if catch_errors:
+                return DeviceError(name, interface, e)
+
+            # Reraise the exception
+            raise e
+
+    @staticmethod
+    def _is_wanted(device: Union[Device, DeviceError]) -> bool:
+        """Filters out devices with no capacity value, as this indicates
+        removable storage, ie: CD/DVD-ROM, ZIP, etc. Errors are always wanted.
+        """
+        if isinstance(device, DeviceError):
+            return True
+
+        return device.interface in ['nvme'] or device.capacity is not None
+
+    def _run(self, jobs: List[_Job], fn: Callable[[_Job], _Result], max_workers: int = 1,
+             until: Optional[float] = None) -> Iterator[Tuple[_Job, Optional[_Result], bool]]:
+        """Runs fn over every job, yielding results in completion order.
+
+        Args:
+            jobs (List): The jobs to run
+            fn (Callable): The function to run on each job
+            max_workers (int, optional): Number of jobs run in parallel. Defaults to 1.
+            until (float, optional): Deadline, as returned by `time.monotonic()`.
+                Defaults to None (no limit).
+
+        Yields:
+            Tuple[job, result, bool]: The job, its result, and whether it finished.
+                Jobs not finished before the deadline are yielded last, with a None result.
+        """
+        if max_workers <= 1 and until is None:
+            for job in jobs:
+                yield job, fn(job), True
+            return
+
+        if until is not None and monotonic() >= until:
+            # ie: spent by the identity queries, nothing is started
+            for job in jobs:
+                yield job, None, False
+            return
+
+        def bounded(job: _Job) -> _Result:
+            # Any smartctl call still running at the deadline is killed
+            with self.smartctl.deadline(until):
+                return fn(job)
+
+        executor = ThreadPoolExecutor(max_workers=max(1, max_workers))
+        pending: Dict = {}
+        jobs_iter = iter(jobs)
+        try:
+            while True:
+                # Keep at most max_workers jobs in flight
+                for job in jobs_iter:
+                    pending[executor.submit(bounded, job)] = job
+                    if len(pending) >= max_workers:
+                        break
+
+                if not pending:
+                    break
+
+                timeout = None if until is None else max(0, until - monotonic())
+                done, _ = wait(pending, timeout=timeout,
+                               return_when=FIRST_COMPLETED)
+
+                if not done:
+                    # Deadline reached, whatever is left is reported unfinished
+                    for job in list(pending.values()) + list(jobs_iter):
+                        yield job, None, False
+                    break
+
+                for future in done:
+                    job = pending.pop(future)
+                    yield job, future.result(), True
+        finally:
+            for future in pending:
+                future.cancel()
+            executor.shutdown(wait=False)
+
+    def iter_devices(self, catch_errors: bool = True, max_workers: int = 1,
+                     deadline: Optional[float] = None) -> Iterator[Union[Device, DeviceError]]:
+        """Scans system busses for attached devices and yields each `Device`
+        as soon as it has been collected, in completion order.
+
+        Devices are not stored in `pySMART.device_list.DeviceList.devices`, so
+        memory usage does not grow with the number of devices.
+        Unlike `initialize`, CSMI duplicates are not removed, as that requires
+        every device to be known beforehand.
+
+        Args:
+            catch_errors (bool, optional): If True, a `DeviceError` is yielded for each
+                device that could not be collected. Otherwise the exception is raised.
+                Defaults to True.
+            max_workers (int, optional): Number of devices queried in parallel. Defaults to 1.
+            deadline (float, optional): Maximum total time, in seconds. Devices not collected
+                in time are reported as timed out `DeviceError` objects (or a `TimeoutError`
+                is raised if errors are not caught). Defaults to None (no limit).
+
+        The deadline starts before the scan. The identity queries of `deduplicate`
+        run on the same `max_workers` and within the same deadline as the full
+        queries.
+
+        Quarantined devices are not queried: they are reported as `DeviceError`
+        objects too (or a `pySMART.quarantine.QuarantinedError` is raised).
+
+        Yields:
+            Union[Device, DeviceError]: Each collected device (or its error)
+        """
+        quarantine = self.quarantine
+        # Shared by the scan, the identity queries of deduplicate and the full queries
+        until = None if deadline is None else monotonic() + deadline
+        with self.smartctl.deadline(until):
+            entries = self._scan()
+
+        # Before the identity queries of deduplicate: quarantined paths are not queried at all
+        if quarantine is not None:
+            allowed = []
+            for name, interface in entries:
+                if quarantine.allow(_device_name(name)):
+                    allowed.append((name, interface))
+                else:
+                    error = QuarantinedError(f"{name} is quarantined")
+                    if not catch_errors:
+                        raise error
+                    yield DeviceError(name, interface, error)
+            entries = allowed
+
+        targets = self._targets(entries, max_workers, until)
+
+        def collect(target: Tuple[str, str, List[str]]) -> Tuple[Union[Device, DeviceError], float]:
+            start = monotonic()
+            device = self._collect(target, True)
+            return device, monotonic() - start
+
+        for target, result, finished in self._run(targets, collect, max_workers, until):
+            if finished:
+                device, duration = result
+            else:
+                device = DeviceError(target[0], target[1], TimeoutError(
+                    f"Deadline exceeded before {target[0]} was collected"))
+                duration = deadline or 0
+
+            if quarantine is not None:
+                quarantine.record(_device_name(target[0]), duration,
+                                  device.error if isinstance(device, DeviceError) else None)
+
+            if isinstance(device, DeviceError) and not catch_errors:
+                raise device.error
+
+            if self._is_wanted(device):
+                yield device
+
+    async def aiter_devices(self, catch_errors: bool = True, max_workers: int = 1,
+                            deadline: Optional[float] = None) -> AsyncIterator[Union[Device, DeviceError]]:
+        """Asyncio version of `iter_devices`. smartctl is run on worker threads,
+        so the event loop is never blocked.
+
+        Args:
+            catch_errors (bool, optional): If True, a `DeviceError` is yielded for each
+                device that could not be collected. Otherwise the exception is raised.
+                Defaults to True.
+            max_workers (int, optional): Number of devices queried in parallel. Defaults to 1.
+            deadline (float, optional): Maximum total time, in seconds. Defaults to None (no limit).
+
+        Yields:
+            Union[Device, DeviceError]: Each collected device (or its error)
+        """
+        loop = asyncio.get_running_loop()
+        # A single thread drives the synchronous generator, which runs its own pool
+        executor = ThreadPoolExecutor(max_workers=1)
+        devices = self.iter_devices(catch_errors, max_workers, deadline)
+        exhausted = object()
+        try:
+            while True:
+                device = await loop.run_in_executor(executor, next, devices, exhausted)
+                if device is exhausted:
+                    break
+                yield device
+        finally:
+            # Closed from the driving thread, once any pending next() returns
+            executor.submit(devices.close)
+            executor.shutdown(wait=False)
+
+    def initialize(self, catch_errors: bool = False, max_workers: int = 1,
+                   deadline: Optional[float] = None, reuse_stale: bool = True):
         """
         Scans system busses for attached devices and add them to the
         `DeviceList` as `Device` objects.
@@ -94,41 +540,251 @@ class DeviceList(object):
 
         Args:
             catch_errors (bool, optional): If True, individual device-parsing errors will be caught
+            max_workers (int, optional): Number of devices queried in parallel. Defaults to 1.
+            deadline (float, optional): Maximum total time, in seconds. When it expires,
+                every device finished so far is kept, and the outstanding smartctl calls
+                are cancelled. Defaults to None (no limit).
+            reuse_stale (bool, optional): If True, devices not collected before the deadline
+                keep their previous `Device` object (if any), marked as
+                `pySMART.device.Device.stale`. Otherwise they are listed in
+                `pySMART.device_list.DeviceList.timed_out`. Defaults to True.
+
+        Quarantined devices keep their previous `Device` object (if any), marked as
+        `pySMART.device.Device.stale`. The others are listed in
+        `pySMART.device_list.DeviceList.quarantined`.
         """
 
         # Clear the list if it's already populated
-        if len(self.devices):
-            self.devices = []
+        previous = {device.name: device for device in self.devices}
+        self.devices = []
+        self.timed_out = []
+        self.quarantined = []
 
-        # Scan for devices
-        for line in self.smartctl.scan():
-            if not ('failed:' in line or line == ''):
-                groups = re.compile(
-                    r'^(\S+)\s+-d\s+(\S+)').match(line).groups()
-                name = groups[0]
-                interface = groups[1]
+        for device in self.iter_devices(catch_errors=True, max_workers=max_workers, deadline=deadline):
+            if isinstance(device, DeviceError):
+                if device.quarantined:
+                    # Serve the last known data, if any
+                    name = _device_name(device.name)
+                    if name in previous:
+                        previous[name].stale = True
+                        self.devices.append(previous[name])
+                    else:
+                        self.quarantined.append(_dev_reference(device.name))
 
-                try:
-                    # Add the device to the list
-                    self.devices.append(
-                        Device(name, interface=interface, smartctl=self.smartctl))
+                elif device.timed_out:
+                    name = _device_name(device.name)
+                    if reuse_stale and name in previous:
+                        previous[name].stale = True
+                        self.devices.append(previous[name])
+                    else:
+                        self.timed_out.append(_dev_reference(device.name))
 
-                except Exception as e:
-                    if catch_errors:
-                        # Print the exception
-                        import logging
+                elif catch_errors:
+                    # Print the exception
+                    logging.error(f"Error parsing device {device.name}",
+                                  exc_info=device.error)
 
-                        logging.exception(f"Error parsing device {name}")
+                else:
+                    # Reraise the exception
+                    raise device.error
 
-                    else:
-                        # Reraise the exception
-                        raise e
+            else:
+                # Add the device to the list
+                self.devices.append(device)
 
         # Remove duplicates and unwanted devices (optical, etc.) from the list
         self._cleanup()
         # Sort the list alphabetically by device name
         self.devices.sort(key=lambda device: device.name)
 
+    @classmethod
+    def from_snapshot(cls, snapshot: Union[bytes, List[Dict[str, Any]]], smartctl: Smartctl = SMARTCTL,
+                      revalidate: bool = True, max_workers: int = 1,
+                      quarantine: Optional[Quarantine] = None,
+                      history: Optional[HistoryStore] = None,
+                      detector: Optional[AnomalyDetector] = None,
+                      rules: Optional[RuleEngine] = None) -> 'DeviceList':
+        """Builds a `DeviceList` from persisted device data, without scanning nor
+        querying any device, so it can be served right after a restart.
+
+        Devices are marked as `pySMART.device.Device.stale` until they are
+        refreshed. Unless disabled, they are refreshed on a background thread
+        (see `revalidate`): each device swaps in its fresh data as soon as its
+        own update finishes.
+
+            #!bash
+            >>> payload = [device.__getstate__() for device in devlist.devices]
+            >>> # ... json.dump / restart / json.load ...
+            >>> devlist = DeviceList.from_snapshot(payload)
+
+        Args:
+            snapshot (Union[bytes, List[Dict]]): The `pySMART.device.Device.__getstate__`
+                output of each device (ie: loaded back from json), or a
+                `pySMART.binary.dumps` payload of a `DeviceList`. Only the latter
+                keeps the fields `__getstate__` leaves out (ie: the collection times).
+            smartctl (Smartctl, optional): The smartctl wrapper used to refresh the devices.
+                Defaults to the global `SMARTCTL` object.
+            revalidate (bool, optional): If True, devices are refreshed in the background.
+                Defaults to True.
+            max_workers (int, optional): Number of devices refreshed in parallel. Defaults to 1.
+            quarantine (Quarantine, optional): The circuit breaker of the new list. Defaults to None.
+            history (HistoryStore, optional): The history store of the new list. Defaults to None.
+            detector (AnomalyDetector, optional): The anomaly detector of the new list. Defaults to None.
+            rules (RuleEngine, optional): The rule engine of the new list. Defaults to None.
+
+        Returns:
+            DeviceList: The new list, holding the persisted devices
+        """
+        if isinstance(snapshot, (bytes, bytearray, memoryview)):
+            from . import binary
+            loaded = binary.loads(bytes(snapshot))
+            if not isinstance(loaded, DeviceList):
+                raise ValueError('The payload does not hold a DeviceList')
+            devices = loaded.devices
+        else:
+            devices = []
+            for state in snapshot:
+                device = Device.__new__(Device)
+                device.__setstate__(state)
+                devices.append(device)
+
+        devlist = cls(init=False, smartctl=smartctl, quarantine=quarantine, history=history,
+                      detector=detector, rules=rules)
+        for device in devices:
+            device.smartctl = smartctl
+            device.history = history
+            device.detector = detector
+            device.rules = rules
+            device.stale = True
+        devlist.devices = devices
+
+        if revalidate:
+            devlist.revalidate(max_workers=max_workers)
+        return devlist
+
+    def revalidate(self, max_workers: int = 1, deadline: Optional[float] = None) -> threading.Thread:
+        """Refreshes every device on a background thread, fastest devices first
+        (by the duration of their last update), so most of the list gets fresh
+        data as soon as possible. Errors are logged, and failing devices keep
+        their last known data marked as `pySMART.device.Device.stale`.
+
+        Args:
+            max_workers (int, optional): Number of devices refreshed in parallel. Defaults to 1.
+            deadline (float, optional): Maximum total time, in seconds. Defaults to None (no limit).
+
+        Returns:
+            threading.Thread: The background thread, also stored in
+                `pySMART.device_list.DeviceList.revalidation`
+        """
+        thread = threading.Thread(
+            target=self.update,
+            kwargs={'catch_errors': True, 'max_workers': max_workers, 'deadline': deadline,
+                    'fastest_first': True},
+            name='pySMART-revalidation', daemon=True)
+        self.revalidation = thread
+        thread.start()
+        return thread
+
+    def update(self, catch_errors: bool = False, max_workers: int = 1,
+               deadline: Optional[float] = None, reuse_stale: bool = True,
+               fastest_first: bool = False):
+        """
+        Refreshes the data of every `Device` in the list, without scanning for
+        new devices.
+
+        Args:
+            catch_errors (bool, optional): If True, individual device-parsing errors will be caught
+            max_workers (int, optional): Number of devices queried in parallel. Defaults to 1.
+            deadline (float, optional): Maximum total time, in seconds. When it expires,
+                the outstanding smartctl calls are cancelled. Defaults to None (no limit).
+            reuse_stale (bool, optional): If True, devices not refreshed before the deadline
+                keep their last known values and are marked as `pySMART.device.Device.stale`.
+                Otherwise they are removed from the list and listed in
+                `pySMART.device_list.DeviceList.timed_out`. Defaults to True.
+            fastest_first (bool, optional): If True, devices are refreshed in order of the
+                duration of their last update (unknown ones last) instead of the list order.
+                Defaults to False.
+        """
+        quarantine = self.quarantine
+
+        def refresh(device: Device) -> Tuple[Optional[BaseException], float]:
+            start = monotonic()
+            try:
+                device.update()
+            except Exception as e:
+                return e, monotonic() - start
+            return None, monotonic() - start
+
+        self.timed_out = []
+        expired: List[Device] = []
+        devices = []
+
+        for device in list(self.devices):
+            if quarantine is None or quarantine.allow(device.name):
+                devices.append(device)
+            else:
+                # Serve the last known data instead of blocking on it
+                device.stale = True
+
+        if fastest_first:
+            def last_duration(device: Device) -> Tuple[bool, float]:
+                duration = device.snapshot.collect_duration
+                return duration is None, duration or 0.0
+            devices.sort(key=last_duration)
+
+        until = None if deadline is None else monotonic() + deadline
+        for device, result, finished in self._run(devices, refresh, max_workers, until):
+            if finished:
+                error, duration = result
+            else:
+                error = TimeoutError(
+                    f"Deadline exceeded before {device.name} was refreshed")
+                duration = deadline or 0
+
+            if quarantine is not None:
+                quarantine.record(device.name, duration, error)
+
+            if isinstance(error, (TimeoutError, TimeoutExpired)):
+                expired.append(device)
+
+            elif error is not None:
+                if catch_errors:
+                    # Print the exception
+                    logging.error(f"Error parsing device {device.name}",
+                                  exc_info=error)
+                else:
+                    # Reraise the exception
+                    raise error
+
+        for device in expired:
+            if reuse_stale:
+                device.stale = True
+            else:
+                self.devices.remove(device)
+                self.timed_out.append(device.dev_reference)
+
+    def matrix(self) -> FleetMatrix:
+        """Returns the current values of every device as NumPy matrices, for
+        vectorized fleet queries (see `pySMART.fleet`). Requires numpy.
+
+        Returns:
+            FleetMatrix: The matrices, one row per device in `devices` order
+        """
+        return FleetMatrix(self.devices)
+
+    def health(self, weights: Optional[Dict[str, float]] = None) -> HealthScores:
+        """Rates the health of every device on the same scale, whatever its
+        interface (see `pySMART.health`). Requires numpy.
+
+        Args:
+            weights (Dict[str, float], optional): Weights of some health factors,
+                replacing the default ones (see `pySMART.health.WEIGHTS`).
+
+        Returns:
+            HealthScores: The scores, one per device in `devices` order
+        """
+        return score(self.matrix(), weights)
+
     def __getitem__(self, index: int) -> Device:
         """Returns an element from self.devices
 
@@ -141,4 +797,4 @@ class DeviceList(object):
         return self.devices[index]
 
 
-__all__ = ['DeviceList']
+__all__ = ['DeviceList', 'DeviceError']
@@ -0,0 +1,209 @@
+# SPDX-FileCopyrightText: 2026 pySMART contributors
+# SPDX-License-Identifier: LGPL-2.1-or-later
+
+"""
+This module contains `diff_snapshots` and the `SnapshotDiff` class, used to
+know what changed on a device between two polls: health verdict flips,
+attribute value or raw changes, new self-test log entries, new NVMe error log
+entries, etc.
+
+Fields are compared by their typed values (ATA attribute tables column by
+column, see `pySMART.interface.ata.table.AtaAttributeTable.changed`), and logs
+are only walked until the previously newest entry is found.
+
+    #!bash
+    >>> changes = sda.update(return_changes=True)
+    >>> changes
+    <SnapshotDiff fields:['temperature'] attributes:[194, 241] new_tests:0 new_errors:0>
+    >>> changes.attributes[194]
+    (<SMART Attribute 'Temperature_Celsius' 064/000 raw:36>, <SMART Attribute 'Temperature_Celsius' 063/000 raw:37>)
+"""
+
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from .interface import AtaAttributes, NvmeAttributes, SCSIAttributes
+from .interface.ata.attribute import Attribute
+from .interface.nvme import NvmeError
+from .snapshot import DeviceSnapshot
+from .testentry import TestEntry
+
+# Device fields compared (computed values included)
+_FIELDS = ['model', 'family', 'serial', 'wwn', 'firmware', 'capacity', 'size',
+           'smart_capable', 'smart_enabled', 'assessment', 'messages', 'is_ssd',
+           'rotation_rate', 'temperature', 'temperatures', 'logical_sector_size',
+           'physical_sector_size', 'test_capabilities', 'test_polling_time',
+           'test_running', 'test_progress']
+
+# Interface counters compared
+_NVME_COUNTERS = [
+    'criticalWarning', 'availableSpare', 'availableSpareThreshold', 'percentageUsed',
+    'dataUnitsRead', 'bytesRead', 'dataUnitsWritten', 'bytesWritten', 'hostReadCommands',
+    'hostWriteCommands', 'controllerBusyTime', 'powerCycles', 'powerOnHours',
+    'unsafeShutdowns', 'integrityErrors', 'errorEntries', 'warningTemperatureTime',
+    'criticalTemperatureTime']
+_SCSI_COUNTERS = [
+    'Reallocated_Sector_Ct', 'Start_Stop_Spec', 'Start_Stop_Cycles', 'Start_Stop_Pct_Left',
+    'Load_Cycle_Spec', 'Load_Cycle_Count', 'Load_Cycle_Pct_Left', 'Power_On_Hours',
+    'Life_Left', 'Corrected_Reads', 'Corrected_Writes', 'Corrected_Verifies',
+    'Uncorrected_Reads', 'Uncorrected_Writes', 'Uncorrected_Verifies', 'Reads_GB',
+    'Writes_GB', 'Verifies_GB', 'Non_Medium_Errors']
+
+
+class SnapshotDiff(object):
+    """
+    The changes between two `pySMART.snapshot.DeviceSnapshot` objects of the
+    same device. Empty (false) if nothing changed.
+    """
+    __slots__ = ('fields', 'attributes', 'counters', 'new_tests', 'new_errors')
+
+    def __init__(self):
+        self.fields: Dict[str, Tuple[Any, Any]] = {}
+        """**(dict):** Changed device fields (ie: 'assessment'), as (old, new) tuples."""
+        self.attributes: Dict[int, Tuple[Optional[Attribute], Optional[Attribute]]] = {}
+        """
+        **(dict):** Changed ATA attributes by ID, as (old, new) `Attribute`
+        tuples. Added or removed attributes have a None side.
+        """
+        self.counters: Dict[str, Tuple[Any, Any]] = {}
+        """
+        **(dict):** Changed NVMe health counters (ie: 'percentageUsed') or SCSI
+        diagnostics (ie: 'Reallocated_Sector_Ct'), as (old, new) tuples. Counters
+        seen for the first time have a None old side.
+        """
+        self.new_tests: List[TestEntry] = []
+        """**(list of `TestEntry`):** Self-test log entries not present before, newest first."""
+        self.new_errors: List[NvmeError] = []
+        """**(list of `NvmeError`):** NVMe error log entries not present before, newest first."""
+
+    @property
+    def health_changed(self) -> bool:
+        """True if the SMART health verdict (`assessment`) changed."""
+        return 'assessment' in self.fields
+
+    def __bool__(self) -> bool:
+        return bool(self.fields or self.attributes or self.counters or
+                    self.new_tests or self.new_errors)
+
+    def __repr__(self):
+        """Define a basic representation of the class object."""
+        return "<SnapshotDiff fields:{0} attributes:{1} new_tests:{2} new_errors:{3}>".format(
+            list(self.fields), list(self.attributes), len(self.new_tests), len(self.new_errors))
+
+    def as_dict(self) -> Dict[str, Any]:
+        """Returns the changes as plain dicts and lists, ready for json.
+        Objects are converted by `pySMART.serialize.to_dict`.
+
+        Returns:
+            Dict[str, Any]: The changes. Unchanged sections are omitted.
+        """
+        from .serialize import to_dict
+
+        ret: Dict[str, Any] = {}
+        if self.fields:
+            ret['fields'] = {name: list(change) for name, change in self.fields.items()}
+        if self.attributes:
+            ret['attributes'] = {num: [to_dict(old), to_dict(new)]
+                                 for num, (old, new) in self.attributes.items()}
+        if self.counters:
+            ret['counters'] = {name: list(change) for name, change in self.counters.items()}
+        if self.new_tests:
+            ret['new_tests'] = [to_dict(test) for test in self.new_tests]
+        if self.new_errors:
+            ret['new_errors'] = [to_dict(error) for error in self.new_errors]
+        return ret
+
+
+def _compare(old: Any, new: Any, names: Iterable[str], into: Dict[str, Tuple[Any, Any]]) -> None:
+    """Adds the (old, new) values of the named attributes that differ. A None
+    old object has every attribute set to None."""
+    for name in names:
+        before = None if old is None else getattr(old, name)
+        after = getattr(new, name)
+        if before != after:
+            into[name] = (before, after)
+
+
+def _test_key(test: TestEntry) -> Tuple:
+    # num is the position in the log, it shifts on every new entry
+    return (test.type, test.status, test.hours, test.LBA, test.segment, test.sense,
+            test.ASC, test.ASCQ, test.nsid, test.sct, test.code)
+
+
+def _new_tests(old: Sequence[TestEntry], new: Sequence[TestEntry]) -> List[TestEntry]:
+    """New log entries, newest first. Logs are listed newest first, so only
+    the entries before the previously newest one are walked."""
+    if not old:
+        return list(new)
+    head = _test_key(old[0])
+    for index, test in enumerate(new):
+        if _test_key(test) == head:
+            return list(new[:index])
+    # Previous head not found (finished test, log cleared...): compare every entry
+    known = set(_test_key(test) for test in old)
+    return [test for test in new if _test_key(test) not in known]
+
+
+def _new_errors(old: Sequence[NvmeError], new: Sequence[NvmeError]) -> List[NvmeError]:
+    """New NVMe error log entries, by their (ever increasing) error count."""
+    last = max((error.errCount for error in old), default=None)
+    if last is None:
+        return list(new)
+    # Listed newest first: stop at the first known entry
+    ret = []
+    for error in new:
+        if error.errCount <= last:
+            break
+        ret.append(error)
+    return ret
+
+
+def _diff_if_attributes(old: Any, new: Any, changes: SnapshotDiff) -> None:
+    if isinstance(old, AtaAttributes) and isinstance(new, AtaAttributes):
+        old_table = old.legacyAttributes
+        new_table = new.legacyAttributes
+        for num in new_table.changed(old_table):
+            changes.attributes[num] = (old_table[num], new_table[num])
+
+    elif isinstance(old, NvmeAttributes) and isinstance(new, NvmeAttributes):
+        _compare(old, new, _NVME_COUNTERS, changes.counters)
+        changes.new_errors = _new_errors(old.errors, new.errors)
+
+    elif isinstance(old, SCSIAttributes) and isinstance(new, SCSIAttributes):
+        _compare(old.diagnostics, new.diagnostics, _SCSI_COUNTERS, changes.counters)
+
+    # Interface attributes seen for the first time
+    elif isinstance(new, AtaAttributes):
+        for attr in new.legacyAttributes.present():
+            changes.attributes[attr.num] = (None, attr)
+
+    elif isinstance(new, NvmeAttributes):
+        _compare(None, new, _NVME_COUNTERS, changes.counters)
+        changes.new_errors = list(new.errors)
+
+    elif isinstance(new, SCSIAttributes):
+        _compare(None, new.diagnostics, _SCSI_COUNTERS, changes.counters)
+
+
+def diff_snapshots(old: DeviceSnapshot, new: DeviceSnapshot) -> SnapshotDiff:
+    """Compares two snapshots of the same device.
+
+    Args:
+        old (DeviceSnapshot): The previous snapshot
+        new (DeviceSnapshot): The current snapshot
+
+    Returns:
+        SnapshotDiff: The changes from old to new (false if none)
+    """
+    changes = SnapshotDiff()
+    if old is new:
+        return changes
+
+    _compare(old, new, _FIELDS, changes.fields)
+    if old.if_attributes is not new.if_attributes:
+        _diff_if_attributes(old.if_attributes, new.if_attributes, changes)
+    if old.tests is not new.tests:
+        changes.new_tests = _new_tests(old.tests, new.tests)
+    return changes
+
+
+__all__ = ['SnapshotDiff', 'diff_snapshots']
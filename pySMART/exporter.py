@@ -0,0 +1,431 @@
+# SPDX-FileCopyrightText: 2026 pySMART contributors
+# SPDX-License-Identifier: LGPL-2.1-or-later
+
+"""
+This module contains a Prometheus / OpenMetrics exporter. An `Exporter`
+collects the devices on a background thread, on a schedule, and renders
+their metrics once per collection: scrapes are served from the cached
+exposition bytes, so they never wait for smartctl.
+
+    #!bash
+    $ python -m pySMART.exporter --port 9633 --interval 300
+    $ curl -s localhost:9633/metrics | grep temperature
+    pysmart_temperature_celsius{device="sda",serial="ZA20VNPT"} 38
+
+Or from Python:
+
+    #!bash
+    >>> from pySMART.exporter import Exporter
+    >>> exporter = Exporter(interval=300)
+    >>> exporter.start()
+    >>> server = exporter.serve(port=9633)
+
+Metrics are gauges, labeled by `device` (name) and `serial`:
+    * `pysmart_device_info` (model, firmware, interface...), `pysmart_health`
+      (1 per assessment state), `pysmart_temperature_celsius` and
+      `pysmart_temperature_sensor_celsius`, `pysmart_capacity_bytes`.
+    * `pysmart_ata_attribute_{value,worst,threshold,raw}` (labeled by `id`
+      and `name`).
+    * `pysmart_nvme_<counter>` (ie: `pysmart_nvme_percentage_used`) and
+      `pysmart_scsi_<diagnostic>` (ie: `pysmart_scsi_reallocated_sector_ct`).
+    * `pysmart_selftest_running`, `pysmart_selftest_progress_percent`,
+      `pysmart_selftest_failed` (failed tests in the log) and
+      `pysmart_selftest_last_failed`.
+    * `pysmart_stale`, `pysmart_collected_timestamp_seconds` and
+      `pysmart_collect_duration_seconds`, and the `pysmart_exporter_*`
+      metrics of the collections.
+
+Clients asking for OpenMetrics (`Accept: application/openmetrics-text`) get
+it, others the Prometheus text format (0.0.4). Both are gzipped on request.
+"""
+
+import argparse
+import gzip
+import logging
+import math
+import re
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from time import monotonic, time
+from typing import TYPE_CHECKING, Dict, Iterable, List, Optional, Tuple, Union
+
+from .device_list import DeviceList
+from .diff import _NVME_COUNTERS, _SCSI_COUNTERS
+from .history import _device_key
+from .interface import AtaAttributes, NvmeAttributes, SCSIAttributes
+from .interface.ata.table import _NO_INT64, _NO_THRESH
+from .rules import field_value
+from .smartctl import Smartctl, SMARTCTL
+from .snapshot import DeviceSnapshot
+
+if TYPE_CHECKING:
+    from .device import Device
+
+logger = logging.getLogger('pySMART')
+
+OPENMETRICS_TYPE = 'application/openmetrics-text; version=1.0.0; charset=utf-8'
+"""Content type of the OpenMetrics exposition."""
+TEXT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+"""Content type of the Prometheus text exposition."""
+
+_PREFIX = 'pysmart_'
+_ASSESSMENTS = ('PASS', 'WARN', 'FAIL')
+_CAMEL = re.compile('(?<=[a-z0-9])([A-Z])')
+
+
+def _snake(name: str) -> str:
+    return _CAMEL.sub(r'_\1', name).lower()
+
+
+# Help of each metric family, in exposition order
+_FAMILIES: Dict[str, str] = {
+    'device_info': 'Device identity.',
+    'health': 'SMART health assessment (1 for the current state).',
+    'temperature_celsius': 'Device temperature.',
+    'temperature_sensor_celsius': 'Temperature of each sensor of the device.',
+    'capacity_bytes': 'Device capacity.',
+    'stale': '1 if the last update of the device failed and its last known values are served.',
+    'collected_timestamp_seconds': 'Time of the last update of the device.',
+    'collect_duration_seconds': 'Duration of the last update of the device (smartctl calls included).',
+    'ata_attribute_value': 'ATA attribute normalized value.',
+    'ata_attribute_worst': 'ATA attribute worst normalized value.',
+    'ata_attribute_threshold': 'ATA attribute failure threshold.',
+    'ata_attribute_raw': 'ATA attribute decoded raw value.',
+}
+_FAMILIES.update(('nvme_' + _snake(name), 'NVMe health log {0}.'.format(name)) for name in _NVME_COUNTERS)
+_FAMILIES.update(('scsi_' + name.lower(), 'SCSI diagnostic {0}.'.format(name)) for name in _SCSI_COUNTERS)
+_FAMILIES.update({
+    'selftest_running': '1 if a self-test is running.',
+    'selftest_progress_percent': 'Progress of the running self-test.',
+    'selftest_failed': 'Failed self-tests in the log.',
+    'selftest_last_failed': '1 if the latest self-test in the log failed.',
+    'exporter_devices': 'Devices exported.',
+    'exporter_collections': 'Collections finished since the exporter started.',
+    'exporter_collection_errors': 'Collections that raised an error since the exporter started.',
+    'exporter_last_collection_timestamp_seconds': 'Time the last collection finished.',
+    'exporter_collection_duration_seconds': 'Duration of the last collection.',
+})
+_NVME_FAMILIES = [(name, 'nvme_' + _snake(name)) for name in _NVME_COUNTERS]
+_SCSI_FAMILIES = [(name, 'scsi_' + name.lower()) for name in _SCSI_COUNTERS]
+
+
+def _escape(value: object) -> str:
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _labels(pairs: Iterable[Tuple[str, object]]) -> str:
+    return '{' + ','.join('{0}="{1}"'.format(name, _escape(value)) for name, value in pairs
+                          if value is not None) + '}'
+
+
+def _number(value: object) -> Optional[str]:
+    """The sample value, None if missing (or not a number)."""
+    if value is None or isinstance(value, str):
+        return None
+    if isinstance(value, bool):
+        return '1' if value else '0'
+    if isinstance(value, int):
+        return str(value)
+    if isinstance(value, float):
+        return None if math.isnan(value) else repr(value)
+    return None
+
+
+class _Samples(object):
+    """Sample lines by metric family."""
+    __slots__ = ('families',)
+
+    def __init__(self):
+        self.families: Dict[str, List[str]] = {}
+
+    def add(self, family: str, labels: str, value: object) -> None:
+        text = _number(value)
+        if text is not None:
+            self.families.setdefault(family, []).append(_PREFIX + family + labels + ' ' + text + '\n')
+
+    def render(self) -> str:
+        parts = []
+        for family, help_text in _FAMILIES.items():
+            lines = self.families.get(family)
+            if lines:
+                name = _PREFIX + family
+                parts.append('# HELP {0} {1}\n# TYPE {0} gauge\n'.format(name, help_text))
+                parts.extend(lines)
+        return ''.join(parts)
+
+
+def _device_samples(samples: _Samples, device: Union['Device', DeviceSnapshot]) -> None:
+    snapshot = getattr(device, 'snapshot', device)
+    serial = _device_key(device)
+    name = getattr(device, 'name', serial)
+    base = 'device="{0}",serial="{1}"'.format(_escape(name), _escape(serial))
+    labels = '{' + base + '}'
+    add = samples.add
+
+    add('device_info', _labels([('device', name), ('serial', serial), ('model', snapshot.model),
+                                ('family', snapshot.family), ('firmware', snapshot.firmware),
+                                ('interface', getattr(device, 'interface', None)), ('wwn', snapshot.wwn)]), 1)
+    if snapshot.assessment is not None:
+        for state in _ASSESSMENTS:
+            add('health', '{' + base + ',state="' + state + '"}', snapshot.assessment == state)
+    add('temperature_celsius', labels, snapshot.temperature)
+    for sensor, value in sorted(snapshot.temperatures.items()):
+        add('temperature_sensor_celsius', '{' + base + ',sensor="' + str(sensor) + '"}', value)
+    add('capacity_bytes', labels, snapshot.size or None)
+    add('stale', labels, getattr(device, 'stale', False))
+    add('collected_timestamp_seconds', labels, snapshot.collected_at)
+    add('collect_duration_seconds', labels, snapshot.collect_duration)
+
+    if_attributes = snapshot.if_attributes
+    if isinstance(if_attributes, AtaAttributes):
+        table = if_attributes.legacyAttributes
+        for num, attr_name, value, worst, thresh, raw in sorted(zip(
+                table.ids, table.names, table.values, table.worsts, table.threshs, table.primaries)):
+            attr_labels = '{' + base + ',id="' + str(num) + '",name="' + _escape(attr_name) + '"}'
+            add('ata_attribute_value', attr_labels, value)
+            add('ata_attribute_worst', attr_labels, worst)
+            add('ata_attribute_threshold', attr_labels, None if thresh == _NO_THRESH else thresh)
+            add('ata_attribute_raw', attr_labels, None if raw == _NO_INT64 else raw)
+    elif isinstance(if_attributes, NvmeAttributes):
+        for counter, family in _NVME_FAMILIES:
+            add(family, labels, getattr(if_attributes, counter))
+    elif isinstance(if_attributes, SCSIAttributes):
+        diagnostics = if_attributes.diagnostics
+        for counter, family in _SCSI_FAMILIES:
+            add(family, labels, getattr(diagnostics, counter))
+
+    add('selftest_running', labels, bool(snapshot.test_running))
+    add('selftest_progress_percent', labels, snapshot.test_progress if snapshot.test_running else None)
+    if snapshot.tests:
+        add('selftest_failed', labels, field_value(snapshot, 'tests.failed'))
+        add('selftest_last_failed', labels, 'fail' in (snapshot.tests[0].status or '').lower())
+
+
+def render(devices: Iterable[Union['Device', DeviceSnapshot]]) -> str:
+    """Renders the metrics of some devices, in the Prometheus text format
+    (an OpenMetrics exposition, once terminated by '# EOF').
+
+    Args:
+        devices (Iterable[Union[Device, DeviceSnapshot]]): The devices (their current
+            snapshots are rendered) or snapshots, ie: a `pySMART.device_list.DeviceList`.
+
+    Returns:
+        str: The metrics, grouped by family
+    """
+    samples = _Samples()
+    for device in devices:
+        _device_samples(samples, device)
+    return samples.render()
+
+
+class Exporter(object):
+    """
+    Collects devices in the background and serves their metrics (see
+    `pySMART.exporter`). Rendering happens once per collection, never on
+    scrapes.
+    """
+
+    def __init__(self, devices: Optional[DeviceList] = None, interval: float = 300.0,
+                 rescan: Optional[float] = 3600.0, max_workers: int = 1, deadline: Optional[float] = None,
+                 smartctl: Smartctl = SMARTCTL):
+        """Instantiates an exporter. Nothing is collected until `collect` or `start`.
+
+        Args:
+            devices (DeviceList, optional): The devices. Defaults to a new (empty) list,
+                scanned by the first collection.
+            interval (float, optional): Seconds between collections. Defaults to 300.
+            rescan (float, optional): Seconds between scans for new devices; other
+                collections only update the known ones. None never rescans.
+                Defaults to 3600.
+            max_workers (int, optional): Number of devices queried in parallel. Defaults to 1.
+            deadline (float, optional): Maximum duration of a collection, in seconds.
+                Devices not collected in time keep their last known values. Defaults
+                to `interval`.
+            smartctl (Smartctl, optional): The smartctl wrapper of the new list. Defaults to
+                the global `SMARTCTL` object.
+        """
+        self.devices: DeviceList = devices if devices is not None else DeviceList(init=False, smartctl=smartctl)
+        """**(DeviceList):** The devices exported."""
+        self.interval: float = interval
+        """**(float):** Seconds between collections."""
+        self.rescan: Optional[float] = rescan
+        """**(float):** Seconds between scans for new devices, None to never rescan."""
+        self.max_workers: int = max_workers
+        """**(int):** Number of devices queried in parallel."""
+        self.deadline: Optional[float] = deadline if deadline is not None else interval
+        """**(float):** Maximum duration of a collection, in seconds."""
+
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._servers: List[ThreadingHTTPServer] = []
+        self._scanned: Optional[float] = None if devices is None else monotonic()
+        self._collections = 0
+        self._errors = 0
+        self._last: Optional[float] = None
+        self._duration: Optional[float] = None
+        # Rendered expositions by (openmetrics, gzip)
+        self._cache: Dict[Tuple[bool, bool], bytes] = {}
+        self._render()
+
+    def __repr__(self):
+        """Define a basic representation of the class object."""
+        return "<Exporter devices:{0} collections:{1} interval:{2}>".format(
+            len(self.devices.devices), self._collections, self.interval)
+
+    def _render(self) -> None:
+        samples = _Samples()
+        for device in self.devices.devices:
+            _device_samples(samples, device)
+        add = samples.add
+        add('exporter_devices', '', len(self.devices.devices))
+        add('exporter_collections', '', self._collections)
+        add('exporter_collection_errors', '', self._errors)
+        add('exporter_last_collection_timestamp_seconds', '', self._last)
+        add('exporter_collection_duration_seconds', '', self._duration)
+        text = samples.render().encode('utf-8')
+        openmetrics = text + b'# EOF\n'
+        # Swapped at once: scrapes never see a half-rendered cache
+        self._cache = {
+            (False, False): text,
+            (True, False): openmetrics,
+            (False, True): gzip.compress(text, 6),
+            (True, True): gzip.compress(openmetrics, 6),
+        }
+
+    def collect(self) -> None:
+        """Runs one collection: scans for devices (the first time, then every
+        `rescan` seconds) or updates the known ones, then renders their
+        metrics. Errors are logged and counted, the last metrics are kept.
+        """
+        with self._lock:
+            start = monotonic()
+            try:
+                if self._scanned is None or (self.rescan is not None and start - self._scanned >= self.rescan):
+                    self.devices.initialize(catch_errors=True, max_workers=self.max_workers,
+                                            deadline=self.deadline)
+                    self._scanned = start
+                else:
+                    self.devices.update(catch_errors=True, max_workers=self.max_workers,
+                                        deadline=self.deadline)
+            except Exception as e:
+                self._errors += 1
+                logger.error(f"Exporter collection failed: {e}")
+            self._collections += 1
+            self._last = time()
+            self._duration = monotonic() - start
+            self._render()
+
+    def exposition(self, openmetrics: bool = True, compressed: bool = False) -> bytes:
+        """Returns the metrics of the last collection.
+
+        Args:
+            openmetrics (bool, optional): OpenMetrics if True, otherwise the Prometheus
+                text format. Defaults to True.
+            compressed (bool, optional): If True, gzipped. Defaults to False.
+
+        Returns:
+            bytes: The exposition, as served
+        """
+        return self._cache[(openmetrics, compressed)]
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            self.collect()
+            self._stop.wait(self.interval)
+
+    def start(self) -> threading.Thread:
+        """Starts collecting on a background thread, every `interval` seconds
+        (the first collection starts at once).
+
+        Returns:
+            threading.Thread: The collector thread
+        """
+        if self._thread is not None and self._thread.is_alive():
+            return self._thread
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name='pySMART-exporter', daemon=True)
+        self._thread.start()
+        return self._thread
+
+    def serve(self, host: str = '127.0.0.1', port: int = 9633) -> ThreadingHTTPServer:
+        """Serves the metrics over HTTP (at any path, ie: /metrics) on a
+        background thread.
+
+        Args:
+            host (str, optional): The address listened on. Defaults to '127.0.0.1' (local only).
+            port (int, optional): The port, 0 for any free one. Defaults to 9633.
+
+        Returns:
+            ThreadingHTTPServer: The server (`server_address` holds the port bound)
+        """
+        exporter = self
+
+        class Handler(BaseHTTPRequestHandler):
+
+            def do_GET(self):
+                openmetrics = 'application/openmetrics-text' in self.headers.get('Accept', '')
+                compressed = 'gzip' in self.headers.get('Accept-Encoding', '')
+                body = exporter.exposition(openmetrics, compressed)
+                self.send_response(200)
+                self.send_header('Content-Type', OPENMETRICS_TYPE if openmetrics else TEXT_TYPE)
+                if compressed:
+                    self.send_header('Content-Encoding', 'gzip')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                logger.debug('Exporter: ' + format, *args)
+
+        server = ThreadingHTTPServer((host, port), Handler)
+        server.daemon_threads = True
+        threading.Thread(target=server.serve_forever, name='pySMART-exporter-http', daemon=True).start()
+        self._servers.append(server)
+        return server
+
+    def stop(self) -> None:
+        """Stops the collector thread (after its current collection) and the
+        HTTP servers."""
+        self._stop.set()
+        for server in self._servers:
+            server.shutdown()
+            server.server_close()
+        self._servers = []
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """Runs an exporter until interrupted (`python -m pySMART.exporter --help`)."""
+    parser = argparse.ArgumentParser(prog='python -m pySMART.exporter',
+                                     description='Prometheus / OpenMetrics exporter of SMART data.')
+    parser.add_argument('--host', default='127.0.0.1', help='address listened on (default: %(default)s)')
+    parser.add_argument('--port', type=int, default=9633, help='port listened on (default: %(default)s)')
+    parser.add_argument('--interval', type=float, default=300.0,
+                        help='seconds between collections (default: %(default)s)')
+    parser.add_argument('--rescan', type=float, default=3600.0,
+                        help='seconds between scans for new devices (default: %(default)s)')
+    parser.add_argument('--workers', type=int, default=1,
+                        help='devices queried in parallel (default: %(default)s)')
+    args = parser.parse_args(argv)
+
+    logging.basicConfig()
+    exporter = Exporter(interval=args.interval, rescan=args.rescan, max_workers=args.workers)
+    exporter.start()
+    server = exporter.serve(args.host, args.port)
+    logger.warning('Serving metrics on http://{0}:{1}/metrics'.format(*server.server_address[:2]))
+    try:
+        exporter._stop.wait()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        exporter.stop()
+
+
+__all__ = ['Exporter', 'render', 'OPENMETRICS_TYPE', 'TEXT_TYPE']
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,403 @@
+# SPDX-FileCopyrightText: 2026 pySMART contributors
+# SPDX-License-Identifier: LGPL-2.1-or-later
+
+"""
+This module contains the `FleetMatrix` class: the values of many devices as
+dense NumPy matrices (one row per device), so fleet queries are vectorized
+expressions instead of Python loops over `pySMART.device.Device.attributes`.
+
+NumPy is an optional dependency (`pip install pySMART[numpy]`), only imported
+when a matrix is built.
+
+    #!bash
+    >>> import numpy as np
+    >>> from pySMART import DeviceList
+    >>> fleet = DeviceList().matrix()
+    >>> fleet.serials[fleet.attribute(5) > 0]            # reallocated sectors
+    array(['ZA20VNPT'], dtype=object)
+    >>> fleet.serials[np.argsort(-fleet.counter('percentageUsed'))][:3]   # most worn NVMe
+    array(['S59CNM0RB05028D', 'S59CNM0RB05113H', '03850709185D88300410'], dtype=object)
+
+Matrices hold float64 values with NaN where a device has no such value
+(other interface, attribute not reported...), so comparisons with missing
+values are simply false. Every matrix has the same rows, in `serials` order.
+
+`FleetMatrix.outliers` compares every device with its population (the
+devices of the same model and firmware) using robust z-scores, so a drive
+running hotter than its identical siblings, or the only one logging CRC
+errors, stands out even while far from any static threshold:
+
+    #!bash
+    >>> fleet.outliers()
+    [<Outlier ZA22W366 ata.199.raw 312 (median 0) score:98.1>]
+"""
+
+import warnings
+from typing import TYPE_CHECKING, Dict, Iterable, List, Optional, Sequence, Tuple, Union
+
+from .diff import _NVME_COUNTERS, _SCSI_COUNTERS
+from .history import _device_key
+from .interface import AtaAttributes, NvmeAttributes, SCSIAttributes
+from .interface.ata.table import _NO_INT64, _NO_THRESH
+from .snapshot import DeviceSnapshot
+
+if TYPE_CHECKING:
+    import numpy
+    from .device import Device
+
+# ATA matrices, by `FleetMatrix.attribute` column name
+_ATA_COLUMNS = ('value', 'worst', 'thresh', 'raw')
+
+
+# Series compared by `FleetMatrix.outliers`: temperature and error counters
+OUTLIER_SERIES = (
+    ['temperature'] +
+    ['ata.{0}.raw'.format(num) for num in (1, 5, 10, 184, 187, 188, 196, 197, 198, 199)] +
+    ['nvme.' + name for name in ('criticalWarning', 'integrityErrors', 'errorEntries',
+                                 'warningTemperatureTime', 'criticalTemperatureTime')] +
+    ['scsi.' + name for name in ('Reallocated_Sector_Ct', 'Uncorrected_Reads', 'Uncorrected_Writes',
+                                 'Uncorrected_Verifies', 'Non_Medium_Errors')])
+
+# Standard deviations of a normal distribution per median absolute deviation,
+# and per mean absolute deviation
+_MAD_SCALE = 1.4826
+_MEANAD_SCALE = 1.2533
+
+
+def _numpy():
+    try:
+        import numpy
+    except ImportError as e:
+        raise ImportError('pySMART.fleet requires numpy (pip install numpy)') from e
+    return numpy
+
+
+class Outlier(object):
+    """
+    A device value that differs sharply from its population (see
+    `FleetMatrix.outliers`).
+    """
+    __slots__ = ('serial', 'series', 'value', 'median', 'score')
+
+    def __init__(self, serial: str, series: str, value: float, median: float, score: float):
+        self.serial: str = serial
+        """**(str):** The device key."""
+        self.series: str = series
+        """**(str):** The series name (see `FleetMatrix.column`)."""
+        self.value: float = value
+        """**(float):** The device value."""
+        self.median: float = median
+        """**(float):** Median value of the population of the device."""
+        self.score: float = score
+        """**(float):** Robust z-score of the value (negative if below the median)."""
+
+    def __repr__(self):
+        """Define a basic representation of the class object."""
+        return "<Outlier {0} {1} {2:g} (median {3:g}) score:{4:.1f}>".format(
+            self.serial, self.series, self.value, self.median, self.score)
+
+
+class FleetMatrix(object):
+    """
+    Values of a set of devices as NumPy matrices: ATA attributes (devices x
+    attribute IDs), NVMe health counters and SCSI diagnostics (devices x
+    counters).
+    """
+
+    def __init__(self, devices: Iterable[Union['Device', DeviceSnapshot]]):
+        """Builds the matrices of a set of devices.
+
+        Args:
+            devices (Iterable[Union[Device, DeviceSnapshot]]): The devices (their
+                current snapshots are used) or snapshots, ie: a `pySMART.device_list.DeviceList`.
+
+        Raises:
+            ImportError: If numpy is not installed
+        """
+        np = _numpy()
+        snapshots = [getattr(device, 'snapshot', device) for device in devices]
+
+        self.serials: 'numpy.ndarray' = np.array([_device_key(snapshot) for snapshot in snapshots],
+                                                 dtype=object)
+        """
+        **(ndarray of str):** Key of each row: the device serial number (or
+        WWN, or name). Boolean masks index it directly: `serials[mask]`.
+        """
+        self.rows: Dict[str, int] = {serial: row for row, serial in enumerate(self.serials)}
+        """**(dict):** Row of each device, by serial number."""
+        self.models: 'numpy.ndarray' = np.array([snapshot.model for snapshot in snapshots], dtype=object)
+        """**(ndarray of str):** Model of each device."""
+        self.firmwares: 'numpy.ndarray' = np.array([snapshot.firmware for snapshot in snapshots], dtype=object)
+        """**(ndarray of str):** Firmware version of each device."""
+        self.assessments: 'numpy.ndarray' = np.array([snapshot.assessment for snapshot in snapshots], dtype=object)
+        """**(ndarray of str):** SMART health assessment of each device ('PASS', 'WARN', 'FAIL' or None)."""
+        self.ssd: 'numpy.ndarray' = np.array([bool(snapshot.is_ssd) for snapshot in snapshots], dtype=bool)
+        """**(ndarray of bool):** True for each solid state device."""
+        self.temperature: 'numpy.ndarray' = np.array([snapshot.temperature for snapshot in snapshots],
+                                                     dtype=np.float64)
+        """**(ndarray):** Temperature of each device, in Celsius."""
+
+        tables = []
+        nvme: List[List] = []
+        scsi: List[List] = []
+        nvme_rows: List[int] = []
+        scsi_rows: List[int] = []
+        for row, snapshot in enumerate(snapshots):
+            if_attributes = snapshot.if_attributes
+            if isinstance(if_attributes, AtaAttributes):
+                tables.append((row, if_attributes.legacyAttributes))
+            elif isinstance(if_attributes, NvmeAttributes):
+                nvme_rows.append(row)
+                nvme.append([getattr(if_attributes, name) for name in _NVME_COUNTERS])
+            elif isinstance(if_attributes, SCSIAttributes):
+                diagnostics = if_attributes.diagnostics
+                scsi_rows.append(row)
+                scsi.append([value if isinstance(value, (int, float)) else None
+                             for value in (getattr(diagnostics, name) for name in _SCSI_COUNTERS)])
+
+        # ATA tables: every row of every table in one fancy-indexed assignment
+        def column(name: str, dtype: str) -> 'numpy.ndarray':
+            arrays = [getattr(table, name) for _, table in tables]
+            return np.concatenate([np.frombuffer(data, dtype=dtype) for data in arrays if data]
+                                  or [np.empty(0, dtype=dtype)])
+
+        ids = column('ids', 'B')
+        device_rows = np.repeat(np.array([row for row, _ in tables], dtype=np.intp),
+                                [len(table.ids) for _, table in tables])
+        self.ata_ids: 'numpy.ndarray' = np.unique(ids)
+        """**(ndarray of uint8):** Attribute ID of each column of the ATA matrices, sorted."""
+        self._ata_columns = np.full(256, -1, dtype=np.intp)
+        self._ata_columns[self.ata_ids] = np.arange(len(self.ata_ids))
+        columns = self._ata_columns[ids]
+
+        def ata(data: 'numpy.ndarray', missing: Optional[int] = None) -> 'numpy.ndarray':
+            matrix = np.full((len(snapshots), len(self.ata_ids)), np.nan)
+            values = data.astype(np.float64)
+            if missing is not None:
+                values[data == missing] = np.nan
+            matrix[device_rows, columns] = values
+            return matrix
+
+        self.value: 'numpy.ndarray' = ata(column('values', 'H'))
+        """**(ndarray):** Normalized values, devices x `ata_ids`."""
+        self.worst: 'numpy.ndarray' = ata(column('worsts', 'H'))
+        """**(ndarray):** Worst normalized values, devices x `ata_ids`."""
+        self.thresh: 'numpy.ndarray' = ata(column('threshs', 'h'), _NO_THRESH)
+        """**(ndarray):** Thresholds, devices x `ata_ids` (NaN if none)."""
+        self.raw: 'numpy.ndarray' = ata(column('primaries', 'q'), _NO_INT64)
+        """
+        **(ndarray):** Decoded raw values (the main number, see
+        `pySMART.interface.ata.rawvalue`), devices x `ata_ids`.
+        """
+
+        def counters(rows: List[int], values: List[List], names: List[str]) -> 'numpy.ndarray':
+            matrix = np.full((len(snapshots), len(names)), np.nan)
+            if rows:
+                matrix[rows] = np.array(values, dtype=np.float64)
+            return matrix
+
+        self.nvme_fields: List[str] = list(_NVME_COUNTERS)
+        """**(list of str):** NVMe health counter of each column of `nvme`."""
+        self.nvme: 'numpy.ndarray' = counters(nvme_rows, nvme, self.nvme_fields)
+        """**(ndarray):** NVMe health counters, devices x `nvme_fields`."""
+        self.scsi_fields: List[str] = list(_SCSI_COUNTERS)
+        """**(list of str):** SCSI diagnostic of each column of `scsi`."""
+        self.scsi: 'numpy.ndarray' = counters(scsi_rows, scsi, self.scsi_fields)
+        """**(ndarray):** SCSI diagnostics, devices x `scsi_fields`."""
+
+    def __len__(self) -> int:
+        return len(self.serials)
+
+    def __repr__(self):
+        """Define a basic representation of the class object."""
+        return "<FleetMatrix devices:{0} ata_ids:{1}>".format(len(self.serials), len(self.ata_ids))
+
+    def attribute(self, num: int, column: str = 'raw') -> 'numpy.ndarray':
+        """Returns one ATA attribute of every device.
+
+        Args:
+            num (int): Attribute's ID (0-255)
+            column (str, optional): 'value', 'worst', 'thresh' or 'raw'. Defaults to 'raw'.
+
+        Returns:
+            ndarray: The values, one per device (NaN where missing)
+        """
+        if column not in _ATA_COLUMNS:
+            raise ValueError('Unknown attribute column: {0}'.format(column))
+        matrix = getattr(self, column)
+        index = self._ata_columns[num]
+        if index < 0:
+            return _numpy().full(len(self.serials), _numpy().nan)
+        return matrix[:, index]
+
+    def counter(self, name: str) -> 'numpy.ndarray':
+        """Returns one NVMe health counter (ie: 'percentageUsed') or SCSI
+        diagnostic (ie: 'Reallocated_Sector_Ct') of every device.
+
+        Args:
+            name (str): The counter name
+
+        Returns:
+            ndarray: The values, one per device (NaN where missing)
+        """
+        if name in self.nvme_fields:
+            return self.nvme[:, self.nvme_fields.index(name)]
+        if name in self.scsi_fields:
+            return self.scsi[:, self.scsi_fields.index(name)]
+        raise KeyError(name)
+
+    def column(self, name: str) -> 'numpy.ndarray':
+        """Returns one value of every device, by its `pySMART.history.samples`
+        series name: 'temperature', 'ata.<id>.<value|worst|thresh|raw>',
+        'nvme.<counter>' or 'scsi.<diagnostic>'.
+
+        Args:
+            name (str): The series name
+
+        Returns:
+            ndarray: The values, one per device (NaN where missing)
+        """
+        if name == 'temperature':
+            return self.temperature
+        kind, _, rest = name.partition('.')
+        if kind == 'ata':
+            num, _, column = rest.partition('.')
+            if num.isdigit() and int(num) < 256 and column in _ATA_COLUMNS:
+                return self.attribute(int(num), column)
+        elif kind in ('nvme', 'scsi') and rest in getattr(self, kind + '_fields'):
+            return self.counter(rest)
+        raise KeyError(name)
+
+    def _groups(self, by: Sequence[str]) -> Tuple[int, 'numpy.ndarray']:
+        """The number of populations (ie: distinct model and firmware), and the
+        population of each row."""
+        for field in by:
+            if field not in ('model', 'firmware'):
+                raise ValueError('Unknown population field: {0}'.format(field))
+        codes: Dict[Tuple, int] = {}
+        keys = zip(*[getattr(self, field + 's') for field in by]) if by else [()] * len(self.serials)
+        group = [codes.setdefault(key, len(codes)) for key in keys]
+        return len(codes), _numpy().array(group, dtype=_numpy().intp)
+
+    def _population(self, names: List[str], by: Sequence[str],
+                    min_group: int) -> Tuple['numpy.ndarray', 'numpy.ndarray', 'numpy.ndarray']:
+        """Values, population medians and robust z-scores of some series, devices x series."""
+        np = _numpy()
+        data = np.column_stack([self.column(name) for name in names]) if names else \
+            np.empty((len(self.serials), 0))
+        medians = np.full(data.shape, np.nan)
+        scores = np.full(data.shape, np.nan)
+
+        count, group = self._groups(by)
+        order = np.argsort(group, kind='stable')
+        bounds = np.searchsorted(group[order], np.arange(count + 1))
+        with warnings.catch_warnings(), np.errstate(divide='ignore', invalid='ignore'):
+            # All-NaN columns (ie: NVMe counters of ATA populations) are expected
+            warnings.simplefilter('ignore', RuntimeWarning)
+            for first, last in zip(bounds[:-1], bounds[1:]):
+                if last - first < min_group:
+                    continue
+                rows = order[first:last]
+                block = data[rows]
+                median = np.nanmedian(block, axis=0)
+                deviation = block - median
+                distance = np.abs(deviation)
+                spread = np.nanmedian(distance, axis=0) * _MAD_SCALE
+                spread = np.where(spread > 0, spread, np.nanmean(distance, axis=0) * _MEANAD_SCALE)
+                block_scores = np.where(distance == 0, 0.0, deviation / spread)
+                block_scores[:, np.sum(~np.isnan(block), axis=0) < min_group] = np.nan
+                medians[rows] = median
+                scores[rows] = block_scores
+        return data, medians, scores
+
+    def zscores(self, series: Optional[Sequence[str]] = None, by: Sequence[str] = ('model', 'firmware'),
+                min_group: int = 3) -> 'numpy.ndarray':
+        """Returns robust z-scores of some series of every device against its
+        population (the devices with the same model and firmware): the distance
+        to the population median, in median absolute deviations (scaled to
+        match a standard deviation). When most of the population has the same
+        value (ie: 0 reallocated sectors), the mean absolute deviation is used.
+
+        Args:
+            series (Sequence[str], optional): The series names (see `column`). Defaults
+                to the temperature and the error counters (see `OUTLIER_SERIES`).
+            by (Sequence[str], optional): Device fields defining a population:
+                'model' and/or 'firmware'. Defaults to both.
+            min_group (int, optional): Minimum population with a value to score it.
+                Defaults to 3.
+
+        Returns:
+            ndarray: The scores, devices x series (NaN where missing or not scored)
+        """
+        names = list(OUTLIER_SERIES if series is None else series)
+        return self._population(names, by, min_group)[2]
+
+    def outliers(self, threshold: float = 3.5, series: Optional[Sequence[str]] = None,
+                 by: Sequence[str] = ('model', 'firmware'), min_group: int = 3) -> List['Outlier']:
+        """Returns the values that differ sharply from the rest of their
+        population (see `zscores`), ie: a drive running hotter than its
+        identical siblings, or the only one with pending sectors.
+
+            #!bash
+            >>> devlist.matrix().outliers()
+            [<Outlier ZA22W366 ata.197.raw 24 (median 0) score:31.3>,
+             <Outlier ZA20VNPT temperature 52 (median 38) score:4.7>]
+
+        Args:
+            threshold (float, optional): Minimum absolute score of an outlier. Defaults to 3.5.
+            series (Sequence[str], optional): The series names (see `zscores`).
+            by (Sequence[str], optional): Device fields defining a population (see `zscores`).
+            min_group (int, optional): Minimum population with a value to score it. Defaults to 3.
+
+        Returns:
+            List[Outlier]: The outliers, most deviant first
+        """
+        np = _numpy()
+        names = list(OUTLIER_SERIES if series is None else series)
+        data, medians, scores = self._population(names, by, min_group)
+        with np.errstate(invalid='ignore'):
+            rows, columns = np.nonzero(np.abs(scores) >= threshold)
+        ranked = np.argsort(-np.abs(scores[rows, columns]), kind='stable')
+        return [Outlier(self.serials[row], names[column], float(data[row, column]),
+                        float(medians[row, column]), float(scores[row, column]))
+                for row, column in zip(rows[ranked], columns[ranked])]
+
+    def reindex(self, serials: Iterable[str]) -> 'FleetMatrix':
+        """Returns the matrices with their rows in the given order, so two
+        matrices of the same fleet (ie: from yesterday and today) can be
+        compared element-wise. Unknown devices get rows of NaN.
+
+            #!bash
+            >>> grown = today.attribute(5) > yesterday.reindex(today.serials).attribute(5)
+
+        Args:
+            serials (Iterable[str]): The device keys, in the wanted order
+
+        Returns:
+            FleetMatrix: A new matrix (the ATA columns are unchanged)
+        """
+        np = _numpy()
+        serials = list(serials)
+        index = np.array([self.rows.get(serial, -1) for serial in serials], dtype=np.intp)
+        missing = index < 0
+
+        ret = FleetMatrix.__new__(FleetMatrix)
+        ret.serials = np.array(serials, dtype=object)
+        ret.rows = {serial: row for row, serial in enumerate(serials)}
+        ret.ata_ids = self.ata_ids
+        ret._ata_columns = self._ata_columns
+        ret.nvme_fields = self.nvme_fields
+        ret.scsi_fields = self.scsi_fields
+        for name in _ATA_COLUMNS + ('nvme', 'scsi', 'temperature', 'models', 'firmwares', 'assessments', 'ssd'):
+            matrix = getattr(self, name)
+            fill = {'O': None, 'b': False}.get(matrix.dtype.kind, np.nan)
+            if len(matrix):
+                matrix = matrix[index]
+            else:
+                matrix = np.full((len(serials),) + matrix.shape[1:], fill, dtype=matrix.dtype)
+            matrix[missing] = fill
+            setattr(ret, name, matrix)
+        return ret
+
+
+__all__ = ['FleetMatrix', 'Outlier', 'OUTLIER_SERIES']
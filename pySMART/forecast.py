@@ -0,0 +1,322 @@
+# SPDX-FileCopyrightText: 2026 pySMART contributors
+# SPDX-License-Identifier: LGPL-2.1-or-later
+
+"""
+This module contains `forecast`, which projects when each device of a fleet
+reaches the end of its rated life, from the trend of its wear indicator in a
+`pySMART.history.HistoryStore`:
+    * NVMe: `percentageUsed` going up to 100. When the drive has written
+      data already, the wear rate is the (smooth) write rate times the wear
+      per data unit so far, instead of the slope of the (integer)
+      percentage, which moves too rarely to fit.
+    * ATA SSDs: the normalized value of their wear attribute (ie: 231
+      `SSD_Life_Left`, 233 `Media_Wearout_Indicator`, 177
+      `Wear_Leveling_Count`) going down to its threshold.
+    * ATA HDDs (and SSDs without wear attribute): the raw count of
+      `Reallocated_Sector_Ct` going up to `reallocated_limit`. Its normalized
+      value is no use: most firmwares keep it at 100 until the spare area is
+      almost exhausted.
+    * SCSI SSDs: `Life_Left` going down to 0.
+
+Trends of the whole fleet are fitted at once by `fit_trends` (vectorized
+least squares over the concatenated series, no per device loop). NumPy is
+required.
+
+    #!bash
+    >>> from pySMART.forecast import forecast
+    >>> for key, result in forecast(history, devlist).items():
+    ...     print(key, result)
+    S59CNM0RB05028D <Forecast nvme.dataUnitsWritten 3 -> 100 in 2807 days (2390-3412) confidence:0.99>
+    ZA20VNPT <Forecast ata.5.raw 8 -> 100 in 1460 days (1120-2095) confidence:0.93>
+"""
+
+import math
+from time import time
+from typing import TYPE_CHECKING, Dict, Iterable, List, Optional, Sequence, Tuple, Union
+
+from .fleet import _numpy
+from .history import HistoryStore, _device_key
+from .interface import AtaAttributes, NvmeAttributes, SCSIAttributes
+from .snapshot import DeviceSnapshot
+
+if TYPE_CHECKING:
+    import numpy
+    from .device import Device
+
+DAY = 86400.0
+
+REALLOCATED_LIMIT = 100
+"""Default count of reallocated sectors at which an ATA HDD is considered
+worn out (see `forecast`)."""
+
+# ATA wear attributes (normalized value going down), by preference
+_ATA_WEAR = (231, 233, 177, 202, 169, 173)
+_ATA_REALLOCATED = 5
+
+# Standard errors of the slope used for the ETA range (about 95%)
+_SPREAD = 2.0
+
+
+class Trends(object):
+    """
+    Linear fits of many series (see `fit_trends`), as arrays with one entry
+    per series. Entries of series with less than two distinct times are NaN.
+    """
+    __slots__ = ('slope', 'level', 'r2', 'stderr', 'samples')
+
+    def __init__(self, slope: 'numpy.ndarray', level: 'numpy.ndarray', r2: 'numpy.ndarray',
+                 stderr: 'numpy.ndarray', samples: 'numpy.ndarray'):
+        self.slope: 'numpy.ndarray' = slope
+        """**(ndarray):** Slope of each series, in units per day."""
+        self.level: 'numpy.ndarray' = level
+        """**(ndarray):** Fitted value of each series at the origin."""
+        self.r2: 'numpy.ndarray' = r2
+        """**(ndarray):** Coefficient of determination of each fit (1 for flat series)."""
+        self.stderr: 'numpy.ndarray' = stderr
+        """**(ndarray):** Standard error of each slope (NaN with less than 3 samples)."""
+        self.samples: 'numpy.ndarray' = samples
+        """**(ndarray of int):** Number of samples of each series."""
+
+    def __len__(self) -> int:
+        return len(self.slope)
+
+
+def fit_trends(series: Sequence[Tuple[Sequence[float], Sequence[float]]], origin: float = 0) -> Trends:
+    """Fits a least squares line to each series, all at once: the series are
+    concatenated and every sum is reduced per series with `numpy.add.reduceat`.
+
+    Args:
+        series (Sequence[Tuple[Sequence[float], Sequence[float]]]): The (timestamps,
+            values) of each series, ie: `pySMART.history.Series` objects
+        origin (float, optional): `time.time()` at which `Trends.level` is given. Defaults to 0.
+
+    Returns:
+        Trends: The fits, in the order of series
+    """
+    np = _numpy()
+    count = len(series)
+    lengths = np.array([len(timestamps) for timestamps, _ in series], dtype=np.intp)
+    x = np.concatenate([np.asarray(timestamps, dtype=np.float64) for timestamps, _ in series] or
+                       [np.empty(0)])
+    x -= origin
+    x /= DAY
+    y = np.concatenate([np.asarray(values, dtype=np.float64) for _, values in series] or [np.empty(0)])
+
+    # Series are contiguous in x and y: sums are reduced between their offsets
+    present = lengths > 0
+    offsets = (np.cumsum(lengths) - lengths)[present]
+
+    def sums(values: 'numpy.ndarray') -> 'numpy.ndarray':
+        ret = np.zeros(count)
+        if len(offsets):
+            ret[present] = np.add.reduceat(values, offsets)
+        return ret
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        n = lengths.astype(np.float64)
+        mean_x = sums(x) / n
+        mean_y = sums(y) / n
+        # Centered sums (in place, the series may be large), so timestamps far
+        # from the origin and large counters keep their precision
+        x -= np.repeat(mean_x, lengths)
+        y -= np.repeat(mean_y, lengths)
+        sxy = sums(x * y)
+        x *= x
+        y *= y
+        sxx = sums(x)
+        syy = sums(y)
+
+        fitted = sxx > 0
+        slope = np.where(fitted, sxy / sxx, np.nan)
+        level = mean_y - slope * mean_x
+        sse = np.maximum(syy - slope * sxy, 0)
+        r2 = np.where(syy > 0, 1 - sse / syy, 1.0)
+        r2[~fitted] = np.nan
+        stderr = np.where(fitted & (n > 2), np.sqrt(sse / (n - 2) / sxx), np.nan)
+    return Trends(slope, level, r2, stderr, n.astype(np.int64))
+
+
+class Forecast(object):
+    """
+    Projected end of rated life of one device (see `forecast`).
+    """
+    __slots__ = ('key', 'series', 'current', 'threshold', 'rate', 'eta', 'eta_earliest',
+                 'eta_latest', 'confidence', 'samples')
+
+    def __init__(self, key: str, series: str, current: float, threshold: float, rate: float,
+                 eta: Optional[float], eta_earliest: Optional[float], eta_latest: Optional[float],
+                 confidence: float, samples: int):
+        self.key: str = key
+        """**(str):** The device key (see `pySMART.history.HistoryStore`)."""
+        self.series: str = series
+        """**(str):** The history series fitted (see `pySMART.history.samples`)."""
+        self.current: float = current
+        """**(float):** Current value of the wear indicator."""
+        self.threshold: float = threshold
+        """**(float):** Value of the wear indicator at the end of rated life."""
+        self.rate: float = rate
+        """**(float):** Change of the wear indicator per day (NaN if unknown)."""
+        self.eta: Optional[float] = eta
+        """**(float):** Projected `time.time()` at which threshold is reached, None if never."""
+        self.eta_earliest: Optional[float] = eta_earliest
+        """**(float):** Earliest projected `time.time()` at which threshold is reached (slope + 2 standard errors)."""
+        self.eta_latest: Optional[float] = eta_latest
+        """**(float):** Latest projected `time.time()` at which threshold is reached (slope - 2 standard errors), None if never."""
+        self.confidence: float = confidence
+        """**(float):** Quality of the fit, from 0 to 1 (its R², 0 with less than 3 samples)."""
+        self.samples: int = samples
+        """**(int):** Number of history points fitted."""
+
+    def days_left(self, now: Optional[float] = None) -> Optional[float]:
+        """Returns the projected days until the end of rated life.
+
+        Args:
+            now (float, optional): Current `time.time()`. Defaults to the current time.
+
+        Returns:
+            float: The days left (0 if reached), None if never
+        """
+        if self.eta is None:
+            return None
+        return max(self.eta - (time() if now is None else now), 0) / DAY
+
+    def __repr__(self):
+        """Define a basic representation of the class object."""
+        days = self.days_left()
+        if days is None:
+            projection = 'never'
+        else:
+            projection = 'in {0:.0f} days'.format(days)
+            if self.eta_earliest is not None:
+                projection += ' ({0:.0f}-{1})'.format(
+                    max(self.eta_earliest - time(), 0) / DAY,
+                    'never' if self.eta_latest is None else '{0:.0f}'.format(max(self.eta_latest - time(), 0) / DAY))
+        return "<Forecast {0} {1} -> {2:g} {3} confidence:{4:.2f}>".format(
+            self.series, self.current, self.threshold, projection, self.confidence)
+
+
+class _Target(object):
+    """Wear indicator of one device: what to fit, and where it ends."""
+    __slots__ = ('key', 'series', 'current', 'threshold', 'direction', 'scale')
+
+    def __init__(self, key: str, series: str, current: float, threshold: float, direction: int,
+                 scale: float = 1.0):
+        self.key = key
+        self.series = series
+        self.current = current
+        self.threshold = threshold
+        # +1 if the indicator goes up to its threshold, -1 if it goes down
+        self.direction = direction
+        # Wear indicator units per unit of the fitted series
+        self.scale = scale
+
+
+def _target(snapshot: DeviceSnapshot, reallocated_limit: int) -> Optional[_Target]:
+    key = _device_key(snapshot)
+    if_attributes = snapshot.if_attributes
+    if isinstance(if_attributes, NvmeAttributes):
+        used = if_attributes.percentageUsed
+        if used is None:
+            return None
+        written = if_attributes.dataUnitsWritten
+        if used > 0 and written:
+            return _Target(key, 'nvme.dataUnitsWritten', used, 100, 1, used / written)
+        return _Target(key, 'nvme.percentageUsed', used, 100, 1)
+
+    if isinstance(if_attributes, AtaAttributes):
+        table = if_attributes.legacyAttributes
+        nums = [num for num in _ATA_WEAR if table.has(num)] if snapshot.is_ssd else []
+        if nums:
+            attr = table[nums[0]]
+            return _Target(key, 'ata.{0}.value'.format(attr.num), attr.value_int, max(attr.thresh or 0, 0), -1)
+        reallocated = table.raw_int(_ATA_REALLOCATED)
+        if reallocated is None:
+            return None
+        return _Target(key, 'ata.{0}.raw'.format(_ATA_REALLOCATED), reallocated, reallocated_limit, 1)
+
+    if isinstance(if_attributes, SCSIAttributes):
+        left = if_attributes.diagnostics.Life_Left
+        if isinstance(left, (int, float)):
+            return _Target(key, 'scsi.Life_Left', left, 0, -1)
+    return None
+
+
+def forecast(store: HistoryStore, devices: Iterable[Union['Device', DeviceSnapshot]],
+             now: Optional[float] = None, window: float = 90 * DAY,
+             step: Optional[float] = 3600.0, reallocated_limit: int = REALLOCATED_LIMIT) -> Dict[str, Forecast]:
+    """Projects the end of rated life of every device, from the trend of its
+    wear indicator over the last `window` seconds of history.
+
+    Args:
+        store (HistoryStore): The history of the devices
+        devices (Iterable[Union[Device, DeviceSnapshot]]): The devices (their current
+            snapshots give the current values and thresholds), ie: a `pySMART.device_list.DeviceList`
+        now (float, optional): Current `time.time()`. Defaults to the current time.
+        window (float, optional): Seconds of history fitted. Defaults to 90 days.
+        step (float, optional): Resolution of the history fitted, read from the
+            rollups (see `pySMART.history.HistoryStore.aggregate`). None fits every
+            sample. Defaults to one hour.
+        reallocated_limit (int, optional): Reallocated sectors at which an ATA HDD
+            is worn out. Defaults to `REALLOCATED_LIMIT`.
+
+    Returns:
+        Dict[str, Forecast]: The forecasts by device key. Devices without a wear
+            indicator are left out.
+    """
+    np = _numpy()
+    if now is None:
+        now = time()
+
+    targets: List[_Target] = []
+    for device in devices:
+        target = _target(getattr(device, 'snapshot', device), reallocated_limit)
+        if target is not None:
+            targets.append(target)
+
+    # One read per wear indicator, for all the devices that have it
+    keys: Dict[str, List[str]] = {}
+    for target in targets:
+        keys.setdefault(target.series, []).append(target.key)
+    found: Dict[Tuple[str, str], Tuple[Sequence[float], Sequence[float]]] = {}
+    for name, group in keys.items():
+        if step is None:
+            for key in group:
+                points = store.query(key, name, now - window, now)
+                found[key, name] = (points.timestamps, points.values)
+        else:
+            for key, aggregates in store.aggregate_many(group, name, now - window, now, step).items():
+                found[key, name] = (aggregates.timestamps, aggregates.average)
+    trends = fit_trends([found[target.key, target.series] for target in targets], now)
+
+    scale = np.array([target.scale for target in targets], dtype=np.float64)
+    direction = np.array([target.direction for target in targets], dtype=np.float64)
+    current = np.array([target.current for target in targets], dtype=np.float64)
+    threshold = np.array([target.threshold for target in targets], dtype=np.float64)
+    rate = trends.slope * scale
+    spread = np.nan_to_num(trends.stderr * scale * _SPREAD)
+    reached = direction * (current - threshold) >= 0
+
+    def eta(slope: 'numpy.ndarray') -> 'numpy.ndarray':
+        # Seconds from now, NaN if the indicator does not move towards its threshold
+        with np.errstate(divide='ignore', invalid='ignore'):
+            seconds = np.where(direction * slope > 0, (threshold - current) / slope * DAY, np.nan)
+        return np.where(reached, 0.0, seconds)
+
+    expected = eta(rate)
+    earliest = eta(rate + direction * spread)
+    latest = eta(rate - direction * spread)
+    confidence = np.where(trends.samples > 2, np.nan_to_num(trends.r2), 0.0)
+
+    def when(seconds: float) -> Optional[float]:
+        return None if math.isnan(seconds) else now + seconds
+
+    ret = {}
+    for index, target in enumerate(targets):
+        ret[target.key] = Forecast(
+            target.key, target.series, target.current, target.threshold, float(rate[index]),
+            when(expected[index]), when(earliest[index]), when(latest[index]),
+            float(confidence[index]), int(trends.samples[index]))
+    return ret
+
+
+__all__ = ['forecast', 'fit_trends', 'Forecast', 'Trends', 'REALLOCATED_LIMIT']
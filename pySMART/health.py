@@ -0,0 +1,217 @@
+# SPDX-FileCopyrightText: 2026 pySMART contributors
+# SPDX-License-Identifier: LGPL-2.1-or-later
+
+"""
+This module contains `score`, which rates the health of every device of a
+fleet on the same scale, whatever its interface, so drives can be ranked for
+replacement without one code path per interface:
+
+    #!bash
+    >>> from pySMART import DeviceList
+    >>> scores = DeviceList().health()
+    >>> scores.ranked()[:2]
+    [<Health ZA20VNPT score:41.2 risk:0.59 media:0.41 temperature:0.10>,
+     <Health S59CNM0RB05028D score:78.0 risk:0.22 wear:0.22>]
+
+Each factor is a penalty from 0 (no sign of trouble) to 1, computed from the
+signals of each interface:
+    * `assessment`: the SMART health assessment is 'FAIL' (1) or 'WARN' (0.5).
+    * `failing`: an ATA attribute is at or below its threshold, or an NVMe
+      critical warning bit is set.
+    * `wear`: rated life used: NVMe `percentageUsed`, ATA SSD wear leveling
+      attributes (231, 233, 177, 202, 169, 173) or SCSI `Life_Left`.
+    * `spare`: NVMe spare capacity used, reaching 1 at its threshold.
+    * `media`: media defects: ATA reallocated, pending and uncorrectable
+      sectors (5, 197, 198), NVMe media errors, or SCSI grown defects and
+      uncorrected errors. n defects are a penalty of n / (n + 10).
+    * `temperature`: from 0 at 50 Celsius to 1 at 70.
+
+Factors are weighted (see `WEIGHTS`) and combined as independent risks:
+`risk = 1 - prod(1 - weight * penalty)`, and `score = 100 * (1 - risk)`.
+Every step is a NumPy expression over a `pySMART.fleet.FleetMatrix`, so
+scoring thousands of devices takes milliseconds.
+"""
+
+from typing import TYPE_CHECKING, Dict, Iterable, List, Optional, Union
+
+from .fleet import FleetMatrix, _numpy
+from .forecast import _ATA_WEAR
+from .snapshot import DeviceSnapshot
+
+if TYPE_CHECKING:
+    import numpy
+    from .device import Device
+
+FACTORS = ('assessment', 'failing', 'wear', 'spare', 'media', 'temperature')
+"""Names of the health factors, in `HealthScores.penalties` column order."""
+
+WEIGHTS = {
+    'assessment': 1.0,
+    'failing': 1.0,
+    'wear': 0.8,
+    'spare': 0.8,
+    'media': 0.6,
+    'temperature': 0.3,
+}
+"""Default weight of each factor: the risk of a factor at its worst (penalty 1)."""
+
+# Media defects giving a penalty of 0.5
+_MEDIA_HALF = 10.0
+# Temperatures (Celsius) giving a penalty of 0 and 1
+_TEMPERATURE_RANGE = (50.0, 70.0)
+
+_ATA_MEDIA = (5, 197, 198)
+_SCSI_MEDIA = ('Reallocated_Sector_Ct', 'Uncorrected_Reads', 'Uncorrected_Writes', 'Uncorrected_Verifies')
+
+
+class Health(object):
+    """
+    The health score of one device (see `HealthScores`).
+    """
+    __slots__ = ('serial', 'score', 'risk', 'factors')
+
+    def __init__(self, serial: str, score: float, risk: float, factors: Dict[str, float]):
+        self.serial: str = serial
+        """**(str):** The device key."""
+        self.score: float = score
+        """**(float):** Health score, from 0 (failed) to 100 (no sign of trouble)."""
+        self.risk: float = risk
+        """**(float):** Risk, from 0 to 1: `1 - score / 100`."""
+        self.factors: Dict[str, float] = factors
+        """**(dict):** Weighted penalty of the factors found, by name, the highest first."""
+
+    def __repr__(self):
+        """Define a basic representation of the class object."""
+        return "<Health {0} score:{1:.1f} risk:{2:.2f}{3}>".format(
+            self.serial, self.score, self.risk,
+            ''.join(' {0}:{1:.2f}'.format(name, value) for name, value in self.factors.items()))
+
+
+class HealthScores(object):
+    """
+    Health scores of a set of devices, as arrays in `serials` order.
+    """
+
+    def __init__(self, serials: 'numpy.ndarray', penalties: 'numpy.ndarray', weights: 'numpy.ndarray'):
+        np = _numpy()
+        self.serials: 'numpy.ndarray' = serials
+        """**(ndarray of str):** Key of each device."""
+        self.penalties: 'numpy.ndarray' = penalties
+        """**(ndarray):** Penalty of each factor, devices x `FACTORS`, from 0 to 1."""
+        self.weights: 'numpy.ndarray' = weights
+        """**(ndarray):** Weight of each factor, in `FACTORS` order."""
+        self.risk: 'numpy.ndarray' = 1 - np.prod(1 - penalties * weights, axis=1)
+        """**(ndarray):** Risk of each device, from 0 to 1."""
+        self.score: 'numpy.ndarray' = 100 * (1 - self.risk)
+        """**(ndarray):** Health score of each device, from 0 (failed) to 100."""
+
+    def __len__(self) -> int:
+        return len(self.serials)
+
+    def __repr__(self):
+        """Define a basic representation of the class object."""
+        return "<HealthScores devices:{0}>".format(len(self.serials))
+
+    def _health(self, row: int) -> Health:
+        contributions = self.penalties[row] * self.weights
+        factors = {FACTORS[column]: float(contributions[column])
+                   for column in _numpy().argsort(-contributions, kind='stable') if contributions[column] > 0}
+        return Health(self.serials[row], float(self.score[row]), float(self.risk[row]), factors)
+
+    def __getitem__(self, serial: str) -> Health:
+        """Returns the health of one device.
+
+        Args:
+            serial (str): The device key
+
+        Returns:
+            Health: Its score and contributing factors
+        """
+        rows = _numpy().flatnonzero(self.serials == serial)
+        if not len(rows):
+            raise KeyError(serial)
+        return self._health(int(rows[0]))
+
+    def ranked(self) -> List[Health]:
+        """Returns the health of every device, the riskiest first.
+
+        Returns:
+            List[Health]: The devices, by decreasing risk
+        """
+        return [self._health(int(row)) for row in _numpy().argsort(-self.risk, kind='stable')]
+
+
+def _first(columns: List['numpy.ndarray']) -> 'numpy.ndarray':
+    """The first non-NaN value of each row, across columns."""
+    np = _numpy()
+    ret = columns[-1].copy()
+    for column in reversed(columns[:-1]):
+        ret = np.where(np.isnan(column), ret, column)
+    return ret
+
+
+def _penalties(fleet: FleetMatrix) -> 'numpy.ndarray':
+    """Penalty of each factor, devices x `FACTORS`."""
+    np = _numpy()
+    penalties = np.zeros((len(fleet), len(FACTORS)))
+
+    penalties[:, 0] = np.where(fleet.assessments == 'FAIL', 1.0, np.where(fleet.assessments == 'WARN', 0.5, 0.0))
+
+    # NaN comparisons are false: missing values never count
+    thresh = fleet.thresh
+    ata_failing = ((thresh > 0) & (fleet.value <= thresh)).any(axis=1)
+    penalties[:, 1] = ata_failing | (fleet.counter('criticalWarning') > 0)
+
+    ata_wear = (100 - _first([fleet.attribute(num, 'value') for num in _ATA_WEAR])) / 100
+    wear = _first([fleet.counter('percentageUsed') / 100,
+                   np.where(fleet.ssd, ata_wear, np.nan),
+                   (100 - fleet.counter('Life_Left')) / 100])
+    penalties[:, 2] = np.nan_to_num(wear)
+
+    spare = fleet.counter('availableSpare')
+    threshold = np.nan_to_num(fleet.counter('availableSpareThreshold'))
+    with np.errstate(divide='ignore', invalid='ignore'):
+        used = np.where(spare <= threshold, 1.0, (100 - spare) / (100 - threshold))
+    penalties[:, 3] = np.nan_to_num(used)
+
+    defects = (np.nansum(np.column_stack([fleet.attribute(num) for num in _ATA_MEDIA]), axis=1) +
+               np.nan_to_num(fleet.counter('integrityErrors')) +
+               np.nansum(np.column_stack([fleet.counter(name) for name in _SCSI_MEDIA]), axis=1))
+    defects = np.maximum(defects, 0)
+    penalties[:, 4] = defects / (defects + _MEDIA_HALF)
+
+    low, high = _TEMPERATURE_RANGE
+    penalties[:, 5] = np.nan_to_num((fleet.temperature - low) / (high - low))
+
+    return np.clip(penalties, 0, 1, out=penalties)
+
+
+def score(devices: Union[FleetMatrix, Iterable[Union['Device', DeviceSnapshot]]],
+          weights: Optional[Dict[str, float]] = None) -> HealthScores:
+    """Rates the health of every device of a fleet (see `pySMART.health`).
+
+    Args:
+        devices (Union[FleetMatrix, Iterable[Union[Device, DeviceSnapshot]]]): The
+            devices, ie: a `pySMART.device_list.DeviceList`, or their matrices.
+        weights (Dict[str, float], optional): Weights of some factors, replacing
+            the default ones (see `WEIGHTS`). A weight of 0 ignores a factor.
+
+    Raises:
+        ImportError: If numpy is not installed
+
+    Returns:
+        HealthScores: The scores, one per device in `devices` order
+    """
+    np = _numpy()
+    fleet = devices if isinstance(devices, FleetMatrix) else FleetMatrix(devices)
+    merged = dict(WEIGHTS)
+    for name, weight in (weights or {}).items():
+        if name not in merged:
+            raise ValueError('Unknown health factor: {0}'.format(name))
+        if not 0 <= weight <= 1:
+            raise ValueError('Health factor weights must be in [0, 1]')
+        merged[name] = weight
+    return HealthScores(fleet.serials, _penalties(fleet), np.array([merged[name] for name in FACTORS]))
+
+
+__all__ = ['score', 'HealthScores', 'Health', 'FACTORS', 'WEIGHTS']
@@ -0,0 +1,1051 @@
+# SPDX-FileCopyrightText: 2026 pySMART contributors
+# SPDX-License-Identifier: LGPL-2.1-or-later
+
+"""
+This module contains the `HistoryStore` class, an embedded, append-only
+time-series store for the values pySMART collects: ATA attributes (value,
+worst and raw), NVMe health counters, SCSI diagnostics and temperatures.
+
+    #!bash
+    >>> from pySMART import DeviceList
+    >>> from pySMART.history import HistoryStore
+    >>> history = HistoryStore('/var/lib/pysmart', retention=365 * 86400)
+    >>> devlist = DeviceList(history=history)   # every update() is recorded
+    >>> history.devices()
+    ['S3Z9NB0K123456', 'WD-WCC4N1234567']
+    >>> history.query('WD-WCC4N1234567', 'ata.194.raw', start=time.time() - 86400)
+    <Series 1440 points>
+
+Each device has its own directory (named after its serial number) holding:
+    * `active.jsonl`: the latest samples, one json line per update. It is
+      only appended to.
+    * `<first>-<last>.seg`: sealed segments of `segment_rows` samples, written
+      once when the active log is full. Segments are columnar (one array per
+      series, plus the timestamps) and are read through `mmap`, so a range
+      query only touches the rows and the series it asks for.
+    * `sealing.jsonl`: a full active log, renamed while its segment is
+      written. Left behind by a crash, it is sealed the next time the
+      directory is used.
+
+    * `rollup-<resolution>/`: the same log and segments, holding the minimum,
+      maximum, sum, count and last value of every series per rollup bucket
+      (hourly and daily by default). Buckets are filled in memory on every
+      append and written when the first sample of the next one comes.
+
+`HistoryStore.aggregate` answers range queries from the coarsest rollup that
+fits the requested step, so a year of daily values reads 365 rows:
+
+    #!bash
+    >>> history.aggregate('WD-WCC4N1234567', 'temperature', start=time.time() - 365 * 86400, step=86400)
+    <Aggregates 365 buckets step:86400>
+
+Segments older than `retention` (or `rollup_retention` for rollups) are
+removed, as are the oldest segments when the store grows beyond `max_bytes`.
+
+Segments are compressed by default (see `pySMART.codec`): delta-of-delta
+timestamps, delta integers and XOR floats. A year of samples of a counter
+that rarely moves takes a few bytes. With `compress=False` columns are
+stored raw, and range queries slice them in place.
+
+Segment layout (little endian): `MAGIC`, the format version (1 byte), 3
+padding bytes, the timestamps, the series columns (compressed, or raw int64
+or float64 with missing values stored as `MISSING_INT` or NaN), a json
+footer describing them, its length (uint32) and `MAGIC` again.
+"""
+
+import heapq
+import json
+import logging
+import math
+import mmap
+import os
+import re
+import struct
+import sys
+import threading
+from array import array
+from bisect import bisect_left, bisect_right
+from time import time
+from typing import TYPE_CHECKING, Any, Dict, Iterator, List, Optional, Sequence, Set, Tuple, Union
+
+from . import codec
+from .diff import _NVME_COUNTERS, _SCSI_COUNTERS
+from .interface import AtaAttributes, NvmeAttributes, SCSIAttributes
+from .snapshot import DeviceSnapshot
+
+if TYPE_CHECKING:
+    from .device import Device
+
+logger = logging.getLogger('pySMART')
+
+MAGIC = b'pSHS'
+"""Bytes every segment starts and ends with."""
+
+VERSION = 2
+"""Current segment format version. Segments of newer versions are rejected."""
+
+MISSING_INT = -2 ** 63
+"""Value stored in integer columns for the rows where a series has no value."""
+
+# Column encodings, see `pySMART.codec`
+_RAW = 'raw'
+_DELTA_OF_DELTA = 'dod'
+_DELTA = 'delta'
+_XOR = 'xor'
+
+_ACTIVE = 'active.jsonl'
+_SEALING = 'sealing.jsonl'
+_ROLLUP_PREFIX = 'rollup-'
+_ROLLUP_SEGMENT_ROWS = 64
+# Rollup log columns of each series: <name>:min, <name>:max...
+_AGGREGATES = (':min', ':max', ':sum', ':count', ':last')
+_SEGMENT_SUFFIX = '.seg'
+_HEADER = 8
+_TRAILER = struct.Struct('<I4s')
+_UNSAFE = re.compile(r'[^A-Za-z0-9._-]')
+_CONSTANTS = {'true': True, 'false': False, 'null': None}
+_VALUE_END = re.compile('[,}]')
+
+
+class Series(object):
+    """
+    Values of one series over a time range, as parallel arrays. Rows where the
+    series had no value are left out.
+    """
+    __slots__ = ('timestamps', 'values')
+
+    def __init__(self, timestamps: array, values: array):
+        self.timestamps: array = timestamps
+        """**(array of float):** `time.time()` of each sample, ascending."""
+        self.values: array = values
+        """**(array of int or float):** The value of each sample."""
+
+    def __len__(self) -> int:
+        return len(self.timestamps)
+
+    def __iter__(self) -> Iterator[Tuple[float, Union[int, float]]]:
+        return zip(self.timestamps, self.values)
+
+    def __repr__(self):
+        """Define a basic representation of the class object."""
+        return "<Series {0} points>".format(len(self.timestamps))
+
+
+def samples(snapshot: DeviceSnapshot) -> Dict[str, Union[int, float]]:
+    """Extracts the recorded series of a snapshot. Series names are:
+        * `temperature` and `temperatures.<sensor>`
+        * `ata.<id>.value`, `ata.<id>.worst` and `ata.<id>.raw` (`raw_int`)
+        * `nvme.<counter>` (ie: `nvme.percentageUsed`)
+        * `scsi.<diagnostic>` (ie: `scsi.Reallocated_Sector_Ct`)
+
+    Args:
+        snapshot (DeviceSnapshot): The snapshot
+
+    Returns:
+        Dict[str, Union[int, float]]: The values by series name. Missing values are left out.
+    """
+    ret: Dict[str, Union[int, float]] = {}
+    if snapshot.temperature is not None:
+        ret['temperature'] = snapshot.temperature
+    for sensor, value in snapshot.temperatures.items():
+        if value is not None:
+            ret['temperatures.{0}'.format(sensor)] = value
+
+    if_attributes = snapshot.if_attributes
+    if isinstance(if_attributes, AtaAttributes):
+        table = if_attributes.legacyAttributes
+        for attr in table.present():
+            prefix = 'ata.{0}.'.format(attr.num)
+            ret[prefix + 'value'] = attr.value_int
+            ret[prefix + 'worst'] = attr.worst
+            raw = attr.raw_int
+            if raw is not None:
+                ret[prefix + 'raw'] = raw
+    elif isinstance(if_attributes, NvmeAttributes):
+        for name in _NVME_COUNTERS:
+            value = getattr(if_attributes, name)
+            if value is not None:
+                ret['nvme.' + name] = value
+    elif isinstance(if_attributes, SCSIAttributes):
+        for name in _SCSI_COUNTERS:
+            value = getattr(if_attributes.diagnostics, name)
+            if isinstance(value, (int, float)):
+                ret['scsi.' + name] = value
+    return ret
+
+
+def _find_value(text: str, key: str, begin: int, end: int) -> Tuple[bool, Any]:
+    """Reads the value of a series in an active log line (`text[begin:end]`)
+    without decoding the line. `key` is the json encoded name followed by ':'.
+    Values are numbers (or constants): they end at the next ',' or '}'.
+
+    Returns:
+        Tuple[bool, Any]: Whether the series is in the line, and its value
+    """
+    index = text.find(key, begin, end)
+    # Names are quoted, so only a key preceded by an escaped quote may match
+    # inside another name
+    while index > begin and text[index - 1] not in '{,':
+        index = text.find(key, index + 1, end)
+    if index < 0:
+        return False, None
+    index += len(key)
+    stop = _VALUE_END.search(text, index, end)
+    token = text[index:stop.start() if stop is not None else end]
+    if token in _CONSTANTS:
+        return True, _CONSTANTS[token]
+    try:
+        return True, int(token)
+    except ValueError:
+        return True, float(token)  # Also reads NaN and Infinity, as json does
+
+
+def _read_log(path: str, start: Optional[float] = None, end: Optional[float] = None,
+              names: Optional[List[str]] = None) -> List[Tuple[float, Dict[str, Any]]]:
+    """Rows of a json lines log within a time range, sorted, skipping a
+    truncated last line. With `names`, only those values are read: lines are
+    not decoded as a whole, which is most of the cost of a query."""
+    try:
+        with open(path, encoding='utf-8') as f:
+            text = f.read()
+    except FileNotFoundError:
+        return []
+
+    keys = None if names is None else [(name, json.dumps(name) + ':') for name in names]
+    rows = []
+    # Lines are '[<timestamp>,{...}]': they are scanned in place, and the
+    # timestamp is read first, to skip the rows out of range
+    stop = -1
+    while stop < len(text):
+        begin = stop + 1
+        stop = text.find('\n', begin)
+        if stop < 0:
+            stop = len(text)
+        if stop - 2 < begin or not text.startswith('}]', stop - 2):
+            continue  # Truncated
+        try:
+            timestamp = float(text[begin + 1:text.index(',', begin, stop)])
+        except ValueError:
+            continue
+        if (start is not None and timestamp < start) or (end is not None and timestamp > end):
+            continue
+        if keys is None:
+            try:
+                values = json.loads(text[begin:stop])[1]
+            except ValueError:
+                continue
+        else:
+            values = {}
+            for name, key in keys:
+                found, value = _find_value(text, key, begin, stop)
+                if found:
+                    values[name] = value
+        rows.append((timestamp, values))
+    rows.sort(key=lambda row: row[0])
+    return rows
+
+
+def _device_key(device: Union['Device', DeviceSnapshot]) -> str:
+    """Stable key of a device: its serial number (or WWN, or name)."""
+    snapshot = getattr(device, 'snapshot', device)
+    key = snapshot.serial or snapshot.wwn or getattr(device, 'name', None)
+    if not key:
+        raise ValueError('The device has no serial number nor WWN, a key must be given')
+    return str(key)
+
+
+def _typecode(values: List[Any]) -> str:
+    """int64 column, unless there are floats or integers out of its range."""
+    for value in values:
+        if isinstance(value, float) or (value is not None and not MISSING_INT < value < 2 ** 63):
+            return 'd'
+    return 'q'
+
+
+def _to_little_endian(column: array) -> array:
+    if sys.byteorder != 'little':
+        column = array(column.typecode, column)
+        column.byteswap()
+    return column
+
+
+def _from_bytes(typecode: str, data: bytes) -> array:
+    column = array(typecode)
+    column.frombytes(data)
+    if sys.byteorder != 'little':
+        column.byteswap()
+    return column
+
+
+class _Segment(object):
+    """Footer of a sealed segment: where (and how) each column is stored."""
+    __slots__ = ('path', 'rows', 'first', 'last', 'timestamps', 'columns', 'size')
+
+    def __init__(self, path: str):
+        self.path = path
+        with open(path, 'rb') as f:
+            self.size = os.fstat(f.fileno()).st_size
+            if self.size < _HEADER + _TRAILER.size:
+                raise ValueError('Corrupted history segment: {0}'.format(path))
+            f.seek(self.size - _TRAILER.size)
+            length, magic = _TRAILER.unpack(f.read(_TRAILER.size))
+            f.seek(0)
+            header = f.read(_HEADER)
+            if magic != MAGIC or header[:len(MAGIC)] != MAGIC:
+                raise ValueError('Not a pySMART history segment: {0}'.format(path))
+            if header[len(MAGIC)] > VERSION:
+                raise ValueError('Unsupported history segment version: {0}'.format(path))
+            f.seek(self.size - _TRAILER.size - length)
+            footer = json.loads(f.read(length).decode('utf-8'))
+        self.rows: int = footer['rows']
+        self.first: float = footer['first']
+        self.last: float = footer['last']
+        # (encoding, offset, length). Version 1 segments only hold raw columns
+        self.timestamps: Tuple[str, int, int] = tuple(
+            footer.get('timestamps', (_RAW, _HEADER, self.rows * 8)))
+        self.columns: Dict[str, Tuple[str, str, int, int]] = {}
+        for name, column in footer['columns'].items():
+            if len(column) == 2:
+                column = [column[0], _RAW, column[1], self.rows * 8]
+            self.columns[name] = tuple(column)
+
+    @staticmethod
+    def write(path: str, rows: List[Tuple[float, Dict[str, Any]]], compress: bool = True) -> None:
+        """Writes the rows (sorted by timestamp) as a columnar segment."""
+        times = [timestamp for timestamp, _ in rows]
+        names = sorted(set(name for _, values in rows for name in values))
+
+        out = bytearray(MAGIC)
+        out.extend(bytes([VERSION, 0, 0, 0]))
+
+        def add(encoding: str, data: bytes) -> List[Any]:
+            entry = [encoding, len(out), len(data)]
+            out.extend(data)
+            # Keep raw columns 8-byte aligned
+            out.extend(bytes(-len(out) % 8))
+            return entry
+
+        if compress:
+            timestamps = add(_DELTA_OF_DELTA, codec.encode_timestamps(times))
+        else:
+            timestamps = add(_RAW, _to_little_endian(array('d', times)).tobytes())
+
+        columns: Dict[str, List[Any]] = {}
+        for name in names:
+            values = [values.get(name) for _, values in rows]
+            typecode = _typecode(values)
+            if compress:
+                floats = typecode == 'd'
+                encoding = _XOR if floats else _DELTA
+                entry = add(encoding, codec.encode_values(
+                    [float(value) if floats and value is not None else value for value in values], floats))
+            else:
+                missing = MISSING_INT if typecode == 'q' else math.nan
+                column = array(typecode, [missing if value is None else value for value in values])
+                entry = add(_RAW, _to_little_endian(column).tobytes())
+            columns[name] = [typecode] + entry
+
+        footer = json.dumps({'rows': len(rows), 'first': times[0], 'last': times[-1],
+                             'timestamps': timestamps, 'columns': columns}).encode('utf-8')
+        out.extend(footer)
+        out.extend(_TRAILER.pack(len(footer), MAGIC))
+
+        tmp = path + '.tmp'
+        with open(tmp, 'wb') as f:
+            f.write(out)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, path)
+
+    def read(self, names: List[str], start: Optional[float], end: Optional[float]
+             ) -> Tuple[array, Dict[str, Optional[array]]]:
+        """Reads the timestamps and columns of the rows within [start, end].
+        Raw columns are sliced in place, compressed ones are decoded."""
+        with open(self.path, 'rb') as f, \
+                mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            encoding, offset, length = self.timestamps
+            if encoding == _RAW:
+                timestamps = _from_bytes('d', mm[offset:offset + length])
+            else:
+                timestamps = array('d', codec.decode_timestamps(mm[offset:offset + length]))
+            low = 0 if start is None else bisect_left(timestamps, start)
+            high = self.rows if end is None else bisect_right(timestamps, end)
+
+            columns: Dict[str, Optional[array]] = {}
+            for name in names:
+                column = self.columns.get(name)
+                if column is None:
+                    columns[name] = None
+                    continue
+                typecode, encoding, offset, length = column
+                if encoding == _RAW:
+                    columns[name] = _from_bytes(typecode, mm[offset + low * 8:offset + high * 8])
+                    continue
+                missing = MISSING_INT if typecode == 'q' else math.nan
+                values = codec.decode_values(mm[offset:offset + length], floats=typecode == 'd')
+                columns[name] = array(typecode, [missing if value is None else value
+                                                 for value in values[low:high]])
+        return timestamps[low:high], columns
+
+
+class Aggregates(object):
+    """
+    Aggregated values of one series, one entry per time bucket (see
+    `HistoryStore.aggregate`). Buckets without values are left out.
+    """
+    __slots__ = ('step', 'timestamps', 'minimum', 'maximum', 'average', 'last', 'count')
+
+    def __init__(self, step: Optional[float]):
+        self.step: Optional[float] = step
+        """**(float):** Bucket size in seconds, None for one bucket per sample."""
+        self.timestamps: array = array('d')
+        """**(array of float):** Start of each bucket (or sample time), ascending."""
+        self.minimum: List[Union[int, float]] = []
+        """**(list):** Minimum value of each bucket."""
+        self.maximum: List[Union[int, float]] = []
+        """**(list):** Maximum value of each bucket."""
+        self.average: List[float] = []
+        """**(list of float):** Average value of each bucket."""
+        self.last: List[Union[int, float]] = []
+        """**(list):** Latest value of each bucket."""
+        self.count: List[int] = []
+        """**(list of int):** Number of samples aggregated in each bucket."""
+
+    def __len__(self) -> int:
+        return len(self.timestamps)
+
+    def __repr__(self):
+        """Define a basic representation of the class object."""
+        return "<Aggregates {0} buckets step:{1}>".format(len(self.timestamps), self.step)
+
+
+class _Bucket(object):
+    """Aggregates of every series over one rollup period, being filled."""
+    __slots__ = ('start', 'values')
+
+    def __init__(self, start: float):
+        self.start = start
+        # name: [minimum, maximum, sum, count, last]
+        self.values: Dict[str, List[Union[int, float]]] = {}
+
+    def add(self, values: Dict[str, Union[int, float]]) -> None:
+        for name, value in values.items():
+            aggregate = self.values.get(name)
+            if aggregate is None:
+                self.values[name] = [value, value, value, 1, value]
+            else:
+                if value < aggregate[0]:
+                    aggregate[0] = value
+                if value > aggregate[1]:
+                    aggregate[1] = value
+                aggregate[2] += value
+                aggregate[3] += 1
+                aggregate[4] = value
+
+    def row(self) -> Dict[str, Union[int, float]]:
+        """The aggregates as rollup log columns."""
+        ret = {}
+        for name, aggregate in self.values.items():
+            for suffix, value in zip(_AGGREGATES, aggregate):
+                ret[name + suffix] = value
+        return ret
+
+
+class HistoryStore(object):
+    """
+    Embedded time-series store of device values, kept in a local directory.
+    Feed it with `append` or by setting `pySMART.device.Device.history` (or
+    `pySMART.device_list.DeviceList(history=...)`): every successful
+    `pySMART.device.Device.update()` is then recorded.
+
+    The store is safe to use from the threads of a single process.
+    """
+
+    def __init__(self, path: str, retention: Optional[float] = None, max_bytes: Optional[int] = None,
+                 segment_rows: int = 1024, compress: bool = True,
+                 rollups: Sequence[float] = (3600, 86400), rollup_retention: Optional[float] = None):
+        """Opens (or creates) a history store.
+
+        Args:
+            path (str): Directory of the store. Created if needed.
+            retention (float, optional): Seconds of samples kept. Older segments are
+                removed. Defaults to None (kept forever).
+            max_bytes (int, optional): Size bound of the store on disk. The oldest
+                segments are removed beyond it. Active logs are never removed, so
+                the store may exceed it by up to `segment_rows` samples per device.
+                Defaults to None (unbounded).
+            segment_rows (int, optional): Samples per sealed segment. Defaults to 1024.
+            compress (bool, optional): If True, sealed segments are compressed (see
+                `pySMART.codec`). Timestamps are then stored at millisecond
+                resolution. Defaults to True.
+            rollups (Sequence[float], optional): Resolutions, in seconds, of the
+                min/max/avg/last aggregates kept for every series. Defaults to
+                hourly and daily.
+            rollup_retention (float, optional): Seconds of aggregates kept. Defaults
+                to None (kept forever).
+        """
+        if segment_rows < 1:
+            raise ValueError('segment_rows must be positive')
+        if any(resolution <= 0 for resolution in rollups):
+            raise ValueError('rollup resolutions must be positive')
+        self.path: str = os.fspath(path)
+        """**(str):** Directory of the store."""
+        self.retention: Optional[float] = retention
+        """**(float):** Seconds of samples kept, None to keep everything."""
+        self.max_bytes: Optional[int] = max_bytes
+        """**(int):** Size bound of the store on disk, None for no bound."""
+        self.segment_rows: int = segment_rows
+        """**(int):** Samples per sealed segment."""
+        self.compress: bool = compress
+        """**(bool):** If True, sealed segments are compressed."""
+        self.rollups: Tuple[float, ...] = tuple(sorted(set(rollups)))
+        """**(tuple of float):** Resolutions of the aggregates kept, in seconds, finest first."""
+        self.rollup_retention: Optional[float] = rollup_retention
+        """**(float):** Seconds of aggregates kept, None to keep everything."""
+
+        self._lock = threading.RLock()
+        self._active_rows: Dict[str, int] = {}
+        # Log directories with no seal left to finish
+        self._recovered: Set[str] = set()
+        self._segments: Dict[str, _Segment] = {}
+        # Size of the store on disk and its segments by last timestamp (a heap),
+        # from a single walk of the store, then kept up to date on every write
+        self._bytes: Optional[int] = None
+        self._oldest: List[Tuple[float, str]] = []
+        # Open (not yet written) rollup bucket of each device, by resolution
+        self._buckets: Dict[str, Dict[float, _Bucket]] = {}
+        os.makedirs(self.path, exist_ok=True)
+
+    def __repr__(self):
+        """Define a basic representation of the class object."""
+        return "<HistoryStore {0} devices:{1}>".format(self.path, len(self.devices()))
+
+    # Paths
+
+    def _device_dir(self, key: str) -> str:
+        return os.path.join(self.path, _UNSAFE.sub('_', key))
+
+    def _rollup_dir(self, key: str, resolution: float) -> str:
+        return os.path.join(self._device_dir(key), '{0}{1:g}'.format(_ROLLUP_PREFIX, resolution))
+
+    def _directories(self) -> Iterator[Tuple[str, bool]]:
+        """Every log directory, and whether it holds rollups."""
+        for key in self.devices():
+            directory = self._device_dir(key)
+            yield directory, False
+            for name in sorted(os.listdir(directory)):
+                if name.startswith(_ROLLUP_PREFIX):
+                    yield os.path.join(directory, name), True
+
+    def _segment_paths(self, directory: str) -> List[str]:
+        """Sealed segments of a log directory, oldest first, once any interrupted
+        seal is finished."""
+        self._recover(directory)
+        try:
+            names = os.listdir(directory)
+        except FileNotFoundError:
+            return []
+        return [os.path.join(directory, name) for name in sorted(names)
+                if name.endswith(_SEGMENT_SUFFIX)]
+
+    def _segment(self, path: str) -> _Segment:
+        segment = self._segments.get(path)
+        if segment is None:
+            segment = self._segments[path] = _Segment(path)
+        return segment
+
+    @staticmethod
+    def _segment_range(path: str) -> Tuple[float, float]:
+        """First and last timestamps of a segment, from its file name."""
+        first, last = os.path.basename(path)[:-len(_SEGMENT_SUFFIX)].split('-')
+        return int(first) / 1000, int(last) / 1000
+
+    # Writing
+
+    def append(self, device: Union['Device', DeviceSnapshot], key: Optional[str] = None) -> None:
+        """Records the current values of a device, and updates its rollups.
+
+        Args:
+            device (Union[Device, DeviceSnapshot]): The device (its current snapshot
+                is recorded) or a snapshot.
+            key (str, optional): The device key. Defaults to its serial number
+                (or WWN, or name).
+        """
+        snapshot = getattr(device, 'snapshot', device)
+        if key is None:
+            key = _device_key(device)
+        timestamp = snapshot.collected_at if snapshot.collected_at is not None else time()
+        values = samples(snapshot)
+
+        with self._lock:
+            buckets = self._open_buckets(key)
+            self._append_row(self._device_dir(key), timestamp, values, self.segment_rows)
+            for resolution in self.rollups:
+                self._roll(key, resolution, buckets, timestamp, values)
+
+    def _append_row(self, directory: str, timestamp: float, values: Dict[str, Any], segment_rows: int) -> None:
+        os.makedirs(directory, exist_ok=True)
+        rows = self._count_active(directory)
+        line = json.dumps([timestamp, values], separators=(',', ':')) + '\n'
+        with open(os.path.join(directory, _ACTIVE), 'a', encoding='utf-8') as f:
+            f.write(line)
+        if self._bytes is not None:
+            self._bytes += len(line)  # json.dumps output is ASCII
+        self._active_rows[directory] = rows + 1
+        if rows + 1 >= segment_rows:
+            self._seal(directory)
+
+    def _roll(self, key: str, resolution: float, buckets: Dict[float, _Bucket],
+              timestamp: float, values: Dict[str, Any]) -> None:
+        """Adds a sample to the open bucket of a resolution, writing the
+        previous bucket once the sample starts a new one."""
+        start = math.floor(timestamp / resolution) * resolution
+        bucket = buckets.get(resolution)
+        if bucket is not None and start < bucket.start:
+            return  # Late sample: its bucket is already written
+        if bucket is None or start > bucket.start:
+            if bucket is not None and bucket.values:
+                self._append_row(self._rollup_dir(key, resolution), bucket.start, bucket.row(),
+                                 _ROLLUP_SEGMENT_ROWS)
+            bucket = buckets[resolution] = _Bucket(start)
+        bucket.add(values)
+
+    def _open_buckets(self, key: str) -> Dict[float, _Bucket]:
+        """Open rollup buckets of a device. The first time, they are rebuilt
+        from the samples not yet aggregated (ie: after a restart, or when a
+        resolution is added to an existing store)."""
+        buckets = self._buckets.get(key)
+        if buckets is not None:
+            return buckets
+
+        buckets = self._buckets[key] = {}
+        pending = {}
+        for resolution in self.rollups:
+            last = self._last_timestamp(self._rollup_dir(key, resolution))
+            pending[resolution] = None if last is None else last + resolution
+        if pending:
+            known = [since for since in pending.values() if since is not None]
+            since = None if len(known) < len(pending) else min(known)
+            for timestamp, values in self._read_rows(self._device_dir(key), since):
+                for resolution in self.rollups:
+                    if pending[resolution] is None or timestamp >= pending[resolution]:
+                        self._roll(key, resolution, buckets, timestamp, values)
+        return buckets
+
+    def _count_active(self, directory: str) -> int:
+        rows = self._active_rows.get(directory)
+        if rows is None:
+            rows = len(self._read_active(directory, names=[]))
+            self._active_rows[directory] = rows
+            # End a line truncated by a crash, so the next one is not lost with it
+            path = os.path.join(directory, _ACTIVE)
+            if os.path.exists(path):
+                with open(path, 'rb+') as f:
+                    size = f.seek(0, os.SEEK_END)
+                    if size:
+                        f.seek(size - 1)
+                        if f.read(1) != b'\n':
+                            f.write(b'\n')
+                            if self._bytes is not None:
+                                self._bytes += 1
+        return rows
+
+    def _read_active(self, directory: str, start: Optional[float] = None, end: Optional[float] = None,
+                     names: Optional[List[str]] = None) -> List[Tuple[float, Dict[str, Any]]]:
+        """Rows of the active log within a time range, sorted (see `_read_log`)."""
+        self._recover(directory)
+        return _read_log(os.path.join(directory, _ACTIVE), start, end, names)
+
+    def _read_rows(self, directory: str, start: Optional[float]) -> List[Tuple[float, Dict[str, Any]]]:
+        """Every row of a log directory from start on, sealed or not."""
+        rows: List[Tuple[float, Dict[str, Any]]] = []
+        for path in self._segment_paths(directory):
+            if start is not None and self._segment_range(path)[1] < start:
+                continue
+            segment = self._segment(path)
+            times, columns = segment.read(list(segment.columns), start, None)
+            rows.extend((timestamp, {}) for timestamp in times)
+            first = len(rows) - len(times)
+            for name, column in columns.items():
+                if column is None:
+                    continue
+                for index, value in enumerate(column):
+                    if value != MISSING_INT and value == value:  # not NaN
+                        rows[first + index][1][name] = value
+        rows.extend(self._read_active(directory, start))
+        return rows
+
+    def _last_timestamp(self, directory: str) -> Optional[float]:
+        """Timestamp of the last row of a rollup log directory. Rollup rows are
+        written in time order, so the last complete line of the active log
+        is read first."""
+        self._recover(directory)
+        try:
+            with open(os.path.join(directory, _ACTIVE), encoding='utf-8') as f:
+                tail = f.read().rsplit('\n', 2)
+        except FileNotFoundError:
+            tail = []
+        for line in reversed(tail):
+            if line.endswith('}]'):
+                try:
+                    return float(line[1:line.index(',')])
+                except ValueError:
+                    break
+        active = self._read_active(directory, names=[]) if tail else []
+        if active:
+            return active[-1][0]
+        paths = self._segment_paths(directory)
+        return self._segment(paths[-1]).last if paths else None
+
+    def _seal(self, directory: str) -> None:
+        """Writes the active log of a directory as a segment, and starts a new one.
+        Then prunes the directory, and the store if it grew beyond `max_bytes`."""
+        self._recover(directory)
+        try:
+            os.replace(os.path.join(directory, _ACTIVE), os.path.join(directory, _SEALING))
+        except FileNotFoundError:
+            pass
+        self._recovered.discard(directory)
+        self._recover(directory)
+        self._active_rows[directory] = 0
+        self._expire(directory, os.path.basename(directory).startswith(_ROLLUP_PREFIX), time())
+        self._shrink()
+
+    def _recover(self, directory: str) -> None:
+        """Writes the segment of a log being sealed (left behind by a crash, the
+        first time a directory is used), and removes the log."""
+        if directory in self._recovered:
+            return
+        sealing = os.path.join(directory, _SEALING)
+        rows = _read_log(sealing)
+        if rows:
+            name = '{0:015d}-{1:015d}{2}'.format(
+                int(rows[0][0] * 1000), int(math.ceil(rows[-1][0] * 1000)), _SEGMENT_SUFFIX)
+            path = os.path.join(directory, name)
+            if not os.path.exists(path):  # Else the crash came after it was written
+                _Segment.write(path, rows, self.compress)
+                if self._bytes is not None:
+                    self._bytes += os.path.getsize(path)
+                    heapq.heappush(self._oldest, (self._segment_range(path)[1], path))
+        self._remove(sealing)
+        self._recovered.add(directory)
+
+    def flush(self) -> None:
+        """Seals every active log (samples and rollups), so all the written data
+        is in segments. Open rollup buckets are kept in memory."""
+        with self._lock:
+            for directory, _ in list(self._directories()):
+                if self._count_active(directory):
+                    self._seal(directory)
+
+    def prune(self, now: Optional[float] = None) -> int:
+        """Applies `retention`, `rollup_retention` and `max_bytes` to the whole
+        store, removing whole segments. Every seal already prunes the directory
+        it wrote to, so this is only needed after changing them.
+
+        Args:
+            now (float, optional): Current `time.time()`. Defaults to the current time.
+
+        Returns:
+            int: The number of segments removed
+        """
+        with self._lock:
+            if now is None:
+                now = time()
+            removed = 0
+            for directory, rollup in list(self._directories()):
+                removed += self._expire(directory, rollup, now)
+            return removed + self._shrink()
+
+    def _expire(self, directory: str, rollup: bool, now: float) -> int:
+        """Removes the segments of a log directory older than its retention."""
+        retention = self.rollup_retention if rollup else self.retention
+        if retention is None:
+            return 0
+        return sum(self._remove(path) for path in self._segment_paths(directory)
+                   if self._segment_range(path)[1] < now - retention)
+
+    def _shrink(self) -> int:
+        """Removes the oldest segments of the store while it is larger than `max_bytes`."""
+        if self.max_bytes is None:
+            return 0
+        removed = 0
+        while self.size() > self.max_bytes and self._oldest:
+            # Entries of the segments removed by retention are skipped here
+            removed += self._remove(heapq.heappop(self._oldest)[1])
+        return removed
+
+    def _remove(self, path: str) -> bool:
+        """Removes a file of the store, keeping its size up to date. Returns
+        False if it was already gone."""
+        try:
+            size = os.path.getsize(path)
+            os.remove(path)
+        except FileNotFoundError:
+            return False
+        self._segments.pop(path, None)
+        if self._bytes is not None:
+            self._bytes -= size
+        return True
+
+    # Reading
+
+    def devices(self) -> List[str]:
+        """Returns the keys of the recorded devices.
+
+        Returns:
+            List[str]: The device keys, sorted
+        """
+        with self._lock:
+            return sorted(name for name in os.listdir(self.path)
+                          if os.path.isdir(os.path.join(self.path, name)))
+
+    def size(self) -> int:
+        """Returns the size of the store on disk, in bytes. The store is walked
+        once; the files written and removed by this instance are then counted
+        as they go."""
+        with self._lock:
+            if self._bytes is None:
+                total = 0
+                oldest = []
+                for root, _, names in os.walk(self.path):
+                    for name in names:
+                        path = os.path.join(root, name)
+                        total += os.path.getsize(path)
+                        if name.endswith(_SEGMENT_SUFFIX):
+                            oldest.append((self._segment_range(path)[1], path))
+                heapq.heapify(oldest)
+                self._bytes, self._oldest = total, oldest
+            return self._bytes
+
+    def series(self, key: str) -> List[str]:
+        """Returns the names of the series recorded for a device.
+
+        Args:
+            key (str): The device key
+
+        Returns:
+            List[str]: The series names, sorted
+        """
+        with self._lock:
+            directory = self._device_dir(key)
+            names = set()
+            for path in self._segment_paths(directory):
+                names.update(self._segment(path).columns)
+            for _, values in self._read_active(directory):
+                names.update(values)
+            return sorted(names)
+
+    def query(self, key: str, name: str, start: Optional[float] = None,
+              end: Optional[float] = None) -> Series:
+        """Returns the values of a series within a time range.
+
+        Args:
+            key (str): The device key
+            name (str): The series name (see `samples`)
+            start (float, optional): First `time.time()` included. Defaults to None (no bound).
+            end (float, optional): Last `time.time()` included. Defaults to None (no bound).
+
+        Returns:
+            Series: The values, oldest first
+        """
+        return self.query_many(key, [name], start, end)[name]
+
+    def query_many(self, key: str, names: List[str], start: Optional[float] = None,
+                   end: Optional[float] = None) -> Dict[str, Series]:
+        """Returns the values of several series of a device within a time range,
+        reading each segment once.
+
+        Args:
+            key (str): The device key
+            names (List[str]): The series names (see `samples`)
+            start (float, optional): First `time.time()` included. Defaults to None (no bound).
+            end (float, optional): Last `time.time()` included. Defaults to None (no bound).
+
+        Returns:
+            Dict[str, Series]: The values by series name, oldest first
+        """
+        return self._query(self._device_dir(key), names, start, end)
+
+    def aggregate(self, key: str, name: str, start: Optional[float] = None, end: Optional[float] = None,
+                  step: Optional[float] = None) -> Aggregates:
+        """Returns the minimum, maximum, average and last values of a series per
+        time bucket. The coarsest rollup that fits the step (one that divides
+        it) is read, and its buckets are merged into steps. Samples are only
+        read when no rollup fits.
+
+        Rollup buckets overlapping the range are included whole, and the
+        bucket being filled is included too.
+
+            #!bash
+            >>> year = history.aggregate(serial, 'temperature', start=time.time() - 365 * 86400, step=86400)
+            >>> max(year.maximum)
+            47
+
+        Args:
+            key (str): The device key
+            name (str): The series name (see `samples`)
+            start (float, optional): First `time.time()` included. Defaults to None (no bound).
+            end (float, optional): Last `time.time()` included. Defaults to None (no bound).
+            step (float, optional): Bucket size of the result, in seconds. Defaults to
+                None (one bucket per sample).
+
+        Returns:
+            Aggregates: The aggregates, oldest first
+        """
+        return self.aggregate_many([key], name, start, end, step)[key]
+
+    def aggregate_many(self, keys: List[str], name: str, start: Optional[float] = None,
+                       end: Optional[float] = None, step: Optional[float] = None) -> Dict[str, Aggregates]:
+        """Returns the aggregates of a series for several devices at once (see
+        `aggregate`), ie: the wear indicators of a fleet. The open buckets of
+        devices not yet loaded are computed for this series only.
+
+        Args:
+            keys (List[str]): The device keys
+            name (str): The series name (see `samples`)
+            start (float, optional): First `time.time()` included. Defaults to None (no bound).
+            end (float, optional): Last `time.time()` included. Defaults to None (no bound).
+            step (float, optional): Bucket size of the result, in seconds. Defaults to
+                None (one bucket per sample).
+
+        Returns:
+            Dict[str, Aggregates]: The aggregates by device key, oldest first
+        """
+        resolution = None
+        if step is not None:
+            for candidate in self.rollups:
+                ratio = step / candidate
+                if candidate <= step and abs(ratio - round(ratio)) < 1e-9:
+                    resolution = candidate
+        lower = None
+        if resolution is not None and start is not None:
+            lower = math.floor(start / resolution) * resolution
+        suffixed = [name + suffix for suffix in _AGGREGATES]
+
+        ret = {}
+        with self._lock:
+            for key in keys:
+                # (start, minimum, maximum, sum, count, last) of each source bucket
+                points: List[Tuple[float, Any, Any, Any, int, Any]]
+                if resolution is None:
+                    series = self._query(self._device_dir(key), [name], start, end)[name]
+                    points = [(timestamp, value, value, value, 1, value) for timestamp, value in series]
+                else:
+                    # First, as rebuilding the open buckets may write the completed ones
+                    bucket = self._open_bucket(key, resolution, name)
+                    columns = self._query(self._rollup_dir(key, resolution), suffixed, lower, end)
+                    points = list(zip(columns[suffixed[0]].timestamps,
+                                      *(columns[column].values for column in suffixed)))
+                    if bucket is not None and (lower is None or bucket[0] >= lower) and \
+                            (end is None or bucket[0] <= end):
+                        points.append(bucket)
+                ret[key] = self._merge(points, step)
+        return ret
+
+    def _open_bucket(self, key: str, resolution: float,
+                     name: str) -> Optional[Tuple[float, Any, Any, Any, int, Any]]:
+        """The open rollup bucket of one series, as (start, minimum, maximum, sum,
+        count, last). For a device not loaded yet (see `_open_buckets`), it is
+        computed from the samples of this series only, when they all fall in
+        a single bucket (the usual case: nothing to write)."""
+        if key not in self._buckets:
+            last = self._last_timestamp(self._rollup_dir(key, resolution))
+            since = None if last is None else last + resolution
+            series = self._query(self._device_dir(key), [name], since, None)[name]
+            starts = {math.floor(timestamp / resolution) * resolution for timestamp in series.timestamps}
+            if not starts:
+                return None
+            if len(starts) == 1:
+                values = series.values
+                return (starts.pop(), min(values), max(values), sum(values), len(values), values[-1])
+        bucket = self._open_buckets(key).get(resolution)
+        if bucket is None or name not in bucket.values:
+            return None
+        return (bucket.start, *bucket.values[name])
+
+    @staticmethod
+    def _merge(points: List[Tuple[float, Any, Any, Any, int, Any]], step: Optional[float]) -> Aggregates:
+        """Merges source buckets into the buckets of a step."""
+        ret = Aggregates(step)
+        for timestamp, minimum, maximum, total, count, last in points:
+            if step is not None:
+                timestamp = math.floor(timestamp / step) * step
+            if ret.timestamps and ret.timestamps[-1] == timestamp:
+                ret.minimum[-1] = min(ret.minimum[-1], minimum)
+                ret.maximum[-1] = max(ret.maximum[-1], maximum)
+                ret.average[-1] += total  # sum until the end
+                ret.count[-1] += count
+                ret.last[-1] = last
+            else:
+                ret.timestamps.append(timestamp)
+                ret.minimum.append(minimum)
+                ret.maximum.append(maximum)
+                ret.average.append(total)
+                ret.count.append(count)
+                ret.last.append(last)
+        ret.average = [total / count for total, count in zip(ret.average, ret.count)]
+        return ret
+
+    def _query(self, directory: str, names: List[str], start: Optional[float],
+               end: Optional[float]) -> Dict[str, Series]:
+        timestamps: Dict[str, array] = {name: array('d') for name in names}
+        values: Dict[str, Optional[array]] = {name: None for name in names}
+        # Series with rows older than the ones before them (the clock went back)
+        unsorted = set()
+
+        def extend(name: str, times: array, column: array) -> None:
+            if column.typecode == 'q':
+                keep = [i for i, value in enumerate(column) if value != MISSING_INT]
+            else:
+                keep = [i for i, value in enumerate(column) if value == value]  # not NaN
+            if keep and timestamps[name] and times[keep[0]] < timestamps[name][-1]:
+                unsorted.add(name)
+            current = values[name]
+            if current is None:
+                current = array(column.typecode)
+            elif current.typecode != column.typecode:
+                # A series that got float values: both as float
+                current = array('d', current)
+                column = array('d', column)
+            if len(keep) == len(column):
+                timestamps[name].extend(times)
+                current.extend(column)
+            else:
+                timestamps[name].extend(times[i] for i in keep)
+                current.extend(column[i] for i in keep)
+            values[name] = current
+
+        with self._lock:
+            for path in self._segment_paths(directory):
+                first, last = self._segment_range(path)
+                if (start is not None and last < start) or (end is not None and first > end):
+                    continue
+                times, columns = self._segment(path).read(names, start, end)
+                for name, column in columns.items():
+                    if column is not None:
+                        extend(name, times, column)
+
+            active = self._read_active(directory, start, end, names)
+
+        for name in names:
+            times = array('d')
+            column = []
+            for timestamp, row in active:
+                value = row.get(name)
+                if value is not None:
+                    times.append(timestamp)
+                    column.append(value)
+            if column:
+                extend(name, times, array(_typecode(column), column))
+
+        for name in unsorted:
+            times, column = timestamps[name], values[name]
+            order = sorted(range(len(times)), key=times.__getitem__)
+            timestamps[name] = array('d', (times[i] for i in order))
+            values[name] = array(column.typecode, (column[i] for i in order))
+
+        return {name: Series(timestamps[name], values[name] or array('q')) for name in names}
+
+
+__all__ = ['HistoryStore', 'Series', 'Aggregates', 'samples', 'MAGIC', 'VERSION', 'MISSING_INT']
@@ -11,6 +11,7 @@ from typing import Optional, Iterator, Union, List
 
 from ..common import CommonIface
 from .attribute import Attribute
+from .table import AtaAttributeTable
 
 
 class AtaAttributes(CommonIface):
@@ -43,10 +44,11 @@ class AtaAttributes(CommonIface):
 
         """
 
-        self.legacyAttributes: List[Optional[Attribute]] = [None] * 256
+        self.legacyAttributes: AtaAttributeTable = AtaAttributeTable()
         """
-        **(List[Optional[Attribute]]):** List of the ATA attributes. The index is the attribute ID.
+        **(AtaAttributeTable):** List of the ATA attributes. The index is the attribute ID.
         This is the legacy attribute list for ATA devices. It is strongly recommended to other properties when possible.
+        It is stored as a compact columnar table, `Attribute` objects are built on access.
         """
 
         self._logical_sector_size: Optional[int] = None
@@ -82,7 +84,7 @@ class AtaAttributes(CommonIface):
                     m = attribute_re.match(line)
                     if m is not None:
                         tmp = m.groupdict()
-                        self.legacyAttributes[int(tmp['id'])] = Attribute(
+                        self.legacyAttributes.set(
                             int(tmp['id']), tmp['name'], int(tmp['flag'], base=16), tmp['value'], tmp['worst'], tmp['thresh'], tmp['type'], tmp['updated'], tmp['whenfailed'], tmp['raw'])
 
             # Sector sizes
@@ -117,14 +119,21 @@ class AtaAttributes(CommonIface):
         return ret
 
     def __setstate__(self, state):
+        state = dict(state)
+        table = AtaAttributeTable()
+        for attr in state.pop('legacyAttributes', []):
+            if attr is not None:
+                table.set(attr['num'], attr['name'], attr['flags'], attr['_value'],
+                          attr['_worst'], attr['_thresh'], attr['type'], attr['updated'],
+                          attr['when_failed'], attr['raw'])
         self.__dict__.update(state)
+        self.legacyAttributes = table
 
     @property
     def temperature(self) -> Optional[int]:
-        if self.legacyAttributes[190] is not None or self.legacyAttributes[194] is not None:
-            temp_attr = self.legacyAttributes[190] or self.legacyAttributes[194]
-            if temp_attr is not None and temp_attr.raw_int is not None:
-                return temp_attr.raw_int
+        for num in (190, 194):
+            if self.legacyAttributes.has(num):
+                return self.legacyAttributes.raw_int(num)
 
         return None
 
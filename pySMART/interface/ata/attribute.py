@@ -7,9 +7,13 @@ This module contains the definition of the `Attribute` class, used to represent
 individual SMART attributes associated with a `Device`.
 """
 
+import copyreg
 import re
 from typing import Optional
 
+from ...utils import instance_vars
+from .rawvalue import RawValue, decode_raw
+
 
 class Attribute(object):
     """
@@ -17,6 +21,9 @@ class Attribute(object):
     in a `Device`'s SMART table. This data is intended to exactly mirror that
     obtained through smartctl.
     """
+    # Long-running collectors keep lots of these, avoid a __dict__ per object
+    __slots__ = ('num', 'name', 'flags', '_value', '_worst', '_thresh',
+                 'type', 'updated', 'when_failed', 'raw')
 
     def __init__(self, num: int, name, flags: int, value, worst, thresh, attr_type, updated, when_failed, raw):
         self.num: int = num
@@ -108,6 +115,18 @@ class Attribute(object):
         except:
             return None
 
+    @property
+    def raw_value(self) -> RawValue:
+        """Gets the raw value decoded into typed fields (min/max, hours...),
+        according to its format. See `pySMART.interface.ata.rawvalue.decode_raw`.
+        Attributes stored in an `AtaAttributeTable` are already decoded, use
+        `AtaAttributeTable.decoded` to avoid parsing them again.
+
+        Returns:
+            RawValue: The decoded raw value
+        """
+        return decode_raw(self.num, self.raw)
+
     def __repr__(self):
         """Define a basic representation of the class object."""
         return "<SMART Attribute %r %s/%s raw:%s>" % (
@@ -151,5 +170,9 @@ class Attribute(object):
 
         }
 
+    def __reduce__(self):
+        # __getstate__ is meant for json-like payloads, pickle every slot instead
+        return (copyreg.__newobj__, (self.__class__,), (None, instance_vars(self)))
+
 
 __all__ = ['Attribute']
@@ -0,0 +1,165 @@
+# SPDX-FileCopyrightText: 2026 pySMART contributors
+# SPDX-License-Identifier: LGPL-2.1-or-later
+
+"""
+This module contains the definition of the `RawValue` class and the
+`decode_raw` function, used to decode the vendor-specific formats smartctl
+uses to print ATA attribute raw values.
+
+Supported formats (see smartctl's `-v` option):
+    * `1234` (raw48) and `0x00000000001a` (hex48)
+    * `35 (Min/Max 20/45)` and `35 (Min/Max 20/45 #3)` (tempminmax)
+    * `31 (0 22 0 0 0)` (tempminmax, without valid min/max)
+    * `1369 (143 119 0)` (raw24(raw8)) and `2379 (861 65535)` (raw16(raw16))
+    * `347 (Average 348)` (raw16(avg16))
+    * `12345h+06m+07.123s`, `12345h+06m+07s` and `12345h+06m` (hours)
+    * `12/34` (raw24/raw24)
+"""
+
+import re
+from typing import Optional
+
+# Attributes holding a temperature (tempminmax format)
+TEMPERATURE_IDS = (190, 194)
+
+_PLAIN = re.compile(r'^-?\d+$')
+_HEX = re.compile(r'^0x([0-9a-fA-F]+)$')
+_MINMAX = re.compile(r'^(-?\d+) \(Min/Max (-?\d+)/(-?\d+)(?: #\d+)?\)$')
+_AVERAGE = re.compile(r'^(\d+) \(Average (\d+)\)$')
+_FIELDS = re.compile(r'^(-?\d+) \((\d+(?: \d+)*)\)$')
+_DURATION = re.compile(r'^(\d+)h(?:\+(\d+)m(?:\+(\d+(?:\.\d+)?)s)?)?')
+_RATIO = re.compile(r'^(\d+)/(\d+)$')
+_NUMBER = re.compile(r'-?\d+')
+
+
+class RawValue(object):
+    """
+    Typed fields decoded from an ATA attribute raw value. Fields not present
+    in the raw value format are None.
+    """
+    __slots__ = ('primary', 'minimum', 'maximum', 'hours', 'minutes', 'seconds', 'raw48')
+
+    def __init__(self, primary: Optional[int] = None, minimum: Optional[int] = None,
+                 maximum: Optional[int] = None, hours: Optional[int] = None,
+                 minutes: Optional[int] = None, seconds: Optional[float] = None,
+                 raw48: Optional[int] = None):
+        self.primary: Optional[int] = primary
+        """
+        **(int):** The main value: the current temperature, the hours of a
+        duration, the value of hex or plain raw values...
+        """
+        self.minimum: Optional[int] = minimum
+        """**(int):** Minimum value (ie: lifetime min temperature), if reported."""
+        self.maximum: Optional[int] = maximum
+        """**(int):** Maximum value (ie: lifetime max temperature), if reported."""
+        self.hours: Optional[int] = hours
+        """**(int):** Hours of a duration (ie: `12345h+06m+07.123s`)."""
+        self.minutes: Optional[int] = minutes
+        """**(int):** Minutes of a duration, if reported."""
+        self.seconds: Optional[float] = seconds
+        """**(float):** Seconds of a duration, if reported."""
+        self.raw48: Optional[int] = raw48
+        """
+        **(int):** The packed 48-bit raw value, when it can be rebuilt from
+        the printed format.
+        """
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, RawValue):
+            return NotImplemented
+        return all(getattr(self, name) == getattr(other, name) for name in self.__slots__)
+
+    __hash__ = None  # type: ignore
+
+    def __repr__(self):
+        """Define a basic representation of the class object."""
+        return "<RawValue {0}>".format(' '.join(
+            '{0}={1}'.format(name, getattr(self, name))
+            for name in self.__slots__ if getattr(self, name) is not None))
+
+    def __getstate__(self):
+        return {name: getattr(self, name) for name in self.__slots__}
+
+    def __setstate__(self, state):
+        for name in self.__slots__:
+            setattr(self, name, state.get(name))
+
+
+def _pack(values, widths) -> Optional[int]:
+    """Packs values (least significant first) of the given bit widths into
+    a 48-bit value. None if any of them does not fit."""
+    raw48 = 0
+    shift = 0
+    for value, width in zip(values, widths):
+        if not 0 <= value < (1 << width):
+            return None
+        raw48 |= value << shift
+        shift += width
+    return raw48
+
+
+def decode_raw(num: int, raw: str) -> RawValue:
+    """Decodes an ATA attribute raw value, as printed by smartctl.
+
+    Args:
+        num (int): The attribute ID, used to tell apart ambiguous formats
+        raw (str): The raw value string
+
+    Returns:
+        RawValue: The decoded fields. Unknown formats only get `primary` (the
+            first number found, if any).
+    """
+    raw = raw.strip()
+
+    if _PLAIN.match(raw):
+        value = int(raw)
+        return RawValue(primary=value, raw48=_pack([value], [48]))
+
+    m = _HEX.match(raw)
+    if m:
+        value = int(m.group(1), 16)
+        return RawValue(primary=value, raw48=_pack([value], [48]))
+
+    m = _MINMAX.match(raw)
+    if m:
+        return RawValue(primary=int(m.group(1)), minimum=int(m.group(2)),
+                        maximum=int(m.group(3)))
+
+    m = _AVERAGE.match(raw)
+    if m:
+        value, average = int(m.group(1)), int(m.group(2))
+        return RawValue(primary=value, raw48=_pack([value, average], [16, 16]))
+
+    m = _FIELDS.match(raw)
+    if m:
+        value = int(m.group(1))
+        # Fields in parentheses are printed from the most significant
+        fields = [int(f) for f in reversed(m.group(2).split())]
+        if len(fields) == 5 and num in TEMPERATURE_IDS:
+            # tempminmax: byte 0 is the (signed) temperature
+            raw48 = _pack([value & 0xff] + fields, [8] * 6)
+        elif len(fields) == 3:
+            raw48 = _pack([value] + fields, [24, 8, 8, 8])
+        elif len(fields) == 2:
+            raw48 = _pack([value] + fields, [16, 16, 16])
+        else:
+            raw48 = None
+        return RawValue(primary=value, raw48=raw48)
+
+    m = _DURATION.match(raw)
+    if m:
+        hours, minutes, seconds = m.groups()
+        return RawValue(primary=int(hours), hours=int(hours),
+                        minutes=int(minutes) if minutes is not None else None,
+                        seconds=float(seconds) if seconds is not None else None)
+
+    m = _RATIO.match(raw)
+    if m:
+        high, low = int(m.group(1)), int(m.group(2))
+        return RawValue(primary=high, raw48=_pack([low, high], [24, 24]))
+
+    m = _NUMBER.search(raw)
+    return RawValue(primary=int(m.group()) if m else None)
+
+
+__all__ = ['RawValue', 'decode_raw']
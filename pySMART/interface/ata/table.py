@@ -0,0 +1,449 @@
+# SPDX-FileCopyrightText: 2026 pySMART contributors
+# SPDX-License-Identifier: LGPL-2.1-or-later
+
+"""
+This module contains the definition of the `AtaAttributeTable` class, a compact
+columnar storage for the SMART attribute table of an ATA device.
+
+Instead of a 256-slot list of `Attribute` objects, each present attribute is a
+row in a few parallel typed arrays (id, flags, value, worst, thresh and the
+raw value decoded once at ingestion, see `pySMART.interface.ata.rawvalue`).
+Names and the other repeated strings are stored as codes of a process-wide
+vocabulary, so they are shared by every device. `Attribute` objects are only
+built on access, as views of a row.
+"""
+
+import re
+import threading
+from array import array
+from collections.abc import Sequence
+from typing import Dict, Iterator, List, Optional, Tuple, overload
+
+from .attribute import Attribute
+from .rawvalue import RawValue, decode_raw
+
+# Sentinels for values that do not fit (or are missing in) the typed columns
+_NO_THRESH = -1
+_NO_INT64 = -2 ** 63
+_MAX_INT64 = 2 ** 63 - 1
+_NO_INT16 = -2 ** 15
+_MAX_INT16 = 2 ** 15 - 1
+_NO_INT32 = -1
+
+_Row = Tuple[int, str, int, str, str, str, str, str, str, str]
+
+
+class _Vocabulary(object):
+    """Process-wide table of interned strings, referenced by integer codes."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._strings: List[str] = []
+        self._codes: Dict[str, int] = {}
+
+    def code(self, string: str) -> int:
+        code = self._codes.get(string)
+        if code is None:
+            with self._lock:
+                code = self._codes.get(string)
+                if code is None:
+                    code = len(self._strings)
+                    self._strings.append(string)
+                    self._codes[string] = code
+        return code
+
+    def string(self, code: int) -> str:
+        return self._strings[code]
+
+
+_vocabulary = _Vocabulary()
+
+
+def _encode(value: Optional[int], missing: int, low: int, high: int) -> int:
+    """Returns value, or the missing sentinel if it is None or out of range."""
+    return value if value is not None and low <= value <= high else missing
+
+
+def _decode(value: int, missing: int) -> Optional[int]:
+    return None if value == missing else value
+
+
+class AtaAttributeTable(Sequence):
+    """
+    Compact SMART attribute table. It behaves like the legacy 256-slot list
+    indexed by attribute ID (`table[194]` returns an `Attribute` or None), and
+    provides O(1) lookup by ID and by name.
+
+    `Attribute` objects returned are views built on access: modifying them
+    does not change the table, assign them back (`table[id] = attr`) instead.
+    """
+    __slots__ = ('_index', '_ids', '_flags', '_values', '_worsts', '_threshs',
+                 '_primary', '_raw48', '_minimum', '_maximum', '_hours', '_minutes',
+                 '_millis', '_names', '_types', '_updated', '_when_failed',
+                 '_verbatim', '_by_name')
+
+    def __init__(self, rows: Optional[List[_Row]] = None):
+        """Instantiates an empty table (or one holding the given rows).
+
+        Args:
+            rows (List[Tuple], optional): Rows as `(num, name, flags, value, worst, thresh,
+                type, updated, when_failed, raw)` tuples, as returned by `rows()`.
+        """
+        self._index = array('h', [-1]) * 256
+        """Row of each attribute ID, -1 if not present."""
+        self._ids = array('B')
+        self._flags = array('H')
+        self._values = array('H')
+        self._worsts = array('H')
+        self._threshs = array('h')
+        # Decoded raw value
+        self._primary = array('q')
+        self._raw48 = array('q')
+        self._minimum = array('h')
+        self._maximum = array('h')
+        self._hours = array('i')
+        self._minutes = array('i')
+        self._millis = array('i')
+        self._names = array('I')
+        self._types = array('I')
+        self._updated = array('I')
+        self._when_failed = array('I')
+        self._verbatim: Dict[Tuple[int, int], str] = {}
+        """Original strings that can not be rebuilt from the columns, by (row, column)."""
+        self._by_name: Optional[Dict[str, int]] = None
+        """Lazily built name to row map."""
+
+        for row in rows or []:
+            self.set(*row)
+
+    # Sequence interface (legacy list indexed by attribute ID)
+
+    def __len__(self) -> int:
+        return 256
+
+    @overload
+    def __getitem__(self, key: int) -> Optional[Attribute]: ...
+
+    @overload
+    def __getitem__(self, key: slice) -> List[Optional[Attribute]]: ...
+
+    def __getitem__(self, key):
+        if isinstance(key, slice):
+            return [self[i] for i in range(*key.indices(256))]
+        row = self._index[key]
+        return self._view(row) if row >= 0 else None
+
+    def __setitem__(self, key: int, attribute: Optional[Attribute]) -> None:
+        num = range(256)[key]
+        if attribute is None:
+            self.remove(num)
+        else:
+            self.set(num, attribute.name, attribute.flags, attribute._value, attribute._worst,
+                     attribute._thresh, attribute.type, attribute.updated, attribute.when_failed,
+                     attribute.raw)
+
+    def __iter__(self) -> Iterator[Optional[Attribute]]:
+        index = self._index
+        for num in range(256):
+            row = index[num]
+            yield self._view(row) if row >= 0 else None
+
+    def __eq__(self, other) -> bool:
+        if isinstance(other, AtaAttributeTable):
+            return self.rows() == other.rows()
+        return NotImplemented
+
+    __hash__ = None  # type: ignore
+
+    def __repr__(self):
+        """Define a basic representation of the class object."""
+        return "<AtaAttributeTable {0} attributes>".format(len(self._ids))
+
+    def __reduce__(self):
+        # Vocabulary codes are only valid in this process, pickle the strings
+        return (self.__class__, (self.rows(),))
+
+    # Column access
+
+    def set(self, num: int, name: str, flags: int, value: str, worst: str, thresh: str,
+            attr_type: str, updated: str, when_failed: str, raw: str) -> None:
+        """Adds or replaces an attribute, with the fields as parsed from smartctl.
+
+        Args:
+            num (int): Attribute's ID (0-255)
+            name (str): Attribute's name
+            flags (int): Attribute flags as a bit value
+            value (str): Current normalized value
+            worst (str): Worst normalized value
+            thresh (str): Failure threshold ('---' if none)
+            attr_type (str): Attribute's type ('Pre-fail', 'Old_age')
+            updated (str): When is this attribute updated ('Always', 'Offline')
+            when_failed (str): When did this attribute fail ('-' if never)
+            raw (str): Raw (non-normalized) value
+        """
+        if not 0 <= num <= 255:
+            raise IndexError('Attribute ID out of range: {0}'.format(num))
+
+        row = self._index[num]
+        if row < 0:
+            row = len(self._ids)
+            self._index[num] = row
+            self._ids.append(num)
+            for column in self._columns():
+                column.append(0)
+        else:
+            for key in [key for key in self._verbatim if key[0] == row]:
+                del self._verbatim[key]
+
+        self._flags[row] = flags & 0xffff
+        if flags & 0xffff != flags:
+            self._verbatim[(row, 0)] = str(flags)
+        self._values[row] = self._encode_number(row, 1, value, 0xffff)
+        self._worsts[row] = self._encode_number(row, 2, worst, 0xffff)
+        self._threshs[row] = _NO_THRESH if thresh == '---' else \
+            self._encode_number(row, 3, thresh, 0x7fff)
+        self._set_raw(row, num, raw)
+        self._names[row] = _vocabulary.code(name)
+        self._types[row] = _vocabulary.code(attr_type)
+        self._updated[row] = _vocabulary.code(updated)
+        self._when_failed[row] = _vocabulary.code(when_failed)
+        self._by_name = None
+
+    def _set_raw(self, row: int, num: int, raw: str) -> None:
+        """Decodes a raw value into the raw columns."""
+        decoded = decode_raw(num, raw)
+        self._primary[row] = primary = _encode(decoded.primary, _NO_INT64, -_MAX_INT64, _MAX_INT64)
+        self._raw48[row] = _encode(decoded.raw48, _NO_INT32, 0, _MAX_INT64)
+        self._minimum[row] = _encode(decoded.minimum, _NO_INT16, -_MAX_INT16, _MAX_INT16)
+        self._maximum[row] = _encode(decoded.maximum, _NO_INT16, -_MAX_INT16, _MAX_INT16)
+        self._hours[row] = _encode(decoded.hours, _NO_INT32, 0, 2 ** 31 - 1)
+        self._minutes[row] = _encode(decoded.minutes, _NO_INT32, 0, 2 ** 31 - 1)
+        self._millis[row] = _NO_INT32 if decoded.seconds is None else \
+            _encode(round(decoded.seconds * 1000), _NO_INT32, 0, 2 ** 31 - 1)
+
+        # Keep the original string unless it is just the primary value
+        if primary == _NO_INT64 or primary < 0 or str(primary) != raw:
+            self._verbatim[(row, 4)] = raw
+
+    def remove(self, num: int) -> None:
+        """Removes an attribute from the table, if present.
+
+        Args:
+            num (int): Attribute's ID (0-255)
+        """
+        if self._index[num] < 0:
+            return
+        # Rare operation: rebuild the columns without the removed row
+        fresh = AtaAttributeTable([row for row in self.rows() if row[0] != num])
+        for name in self.__slots__:
+            setattr(self, name, getattr(fresh, name))
+
+    def _columns(self) -> Tuple[array, ...]:
+        """The per-row columns (everything but the IDs and the verbatim strings)."""
+        return (self._flags, self._values, self._worsts, self._threshs, self._primary,
+                self._raw48, self._minimum, self._maximum, self._hours, self._minutes,
+                self._millis, self._names, self._types, self._updated, self._when_failed)
+
+    def changed(self, other: 'AtaAttributeTable') -> List[int]:
+        """Returns the IDs of the attributes that differ between two tables
+        (added, removed or with any field changed). Tables with the same
+        attributes are compared column by column, so an unchanged table costs a
+        few array comparisons.
+
+        Args:
+            other (AtaAttributeTable): The table to compare with (ie: the previous one)
+
+        Returns:
+            List[int]: The attribute IDs, sorted
+        """
+        if self._ids != other._ids:
+            # Different rows: compare attribute by attribute
+            nums = set(self._ids) | set(other._ids)
+            return sorted(num for num in nums if self._row_of(num) != other._row_of(num))
+
+        rows = set()
+        for mine, theirs in zip(self._columns(), other._columns()):
+            if mine != theirs:
+                rows.update(row for row, (a, b) in enumerate(zip(mine, theirs)) if a != b)
+        if self._verbatim != other._verbatim:
+            rows.update(row for (row, _), _ in
+                        set(self._verbatim.items()) ^ set(other._verbatim.items()))
+        return sorted(self._ids[row] for row in rows)
+
+    def _row_of(self, num: int) -> Optional[_Row]:
+        row = self._index[num]
+        return self._row(row) if row >= 0 else None
+
+    def _encode_number(self, row: int, column: int, text: str, limit: int) -> int:
+        """Stores a normalized value in its column, keeping the original
+        string aside if it is not in the usual 3-digit format."""
+        if text.isdigit() and int(text) <= limit:
+            number = int(text)
+            if text != '%03d' % number:
+                self._verbatim[(row, column)] = text
+            return number
+        self._verbatim[(row, column)] = text
+        return 0
+
+    def _decode_number(self, row: int, column: int, number: int) -> str:
+        text = self._verbatim.get((row, column))
+        return text if text is not None else '%03d' % number
+
+    def _row(self, row: int) -> _Row:
+        verbatim = self._verbatim
+        flags = verbatim.get((row, 0))
+        thresh = self._threshs[row]
+        raw = verbatim.get((row, 4))
+        return (
+            self._ids[row],
+            _vocabulary.string(self._names[row]),
+            int(flags) if flags is not None else self._flags[row],
+            self._decode_number(row, 1, self._values[row]),
+            self._decode_number(row, 2, self._worsts[row]),
+            '---' if thresh == _NO_THRESH else self._decode_number(row, 3, thresh),
+            _vocabulary.string(self._types[row]),
+            _vocabulary.string(self._updated[row]),
+            _vocabulary.string(self._when_failed[row]),
+            raw if raw is not None else str(self._primary[row]),
+        )
+
+    def _view(self, row: int) -> Attribute:
+        return Attribute(*self._row(row))
+
+    def rows(self) -> List[_Row]:
+        """Returns the attributes as plain tuples, in insertion order.
+
+        Returns:
+            List[Tuple]: `(num, name, flags, value, worst, thresh, type, updated, when_failed, raw)` tuples
+        """
+        return [self._row(row) for row in range(len(self._ids))]
+
+    def present(self) -> Iterator[Attribute]:
+        """Iterates over the attributes present in the table, by ID."""
+        index = self._index
+        for num in range(256):
+            row = index[num]
+            if row >= 0:
+                yield self._view(row)
+
+    def has(self, num: int) -> bool:
+        """Checks if the attribute with the given ID is present."""
+        return 0 <= num <= 255 and self._index[num] >= 0
+
+    def by_id(self, num: int) -> Optional[Attribute]:
+        """Returns the attribute with the given ID, if present."""
+        if not 0 <= num <= 255:
+            return None
+        return self[num]
+
+    def by_name(self, name: str) -> Optional[Attribute]:
+        """Returns the attribute with the given name (ie: 'Power_On_Hours'), if present."""
+        by_name = self._by_name
+        if by_name is None:
+            by_name = {_vocabulary.string(code): row for row, code in enumerate(self._names)}
+            self._by_name = by_name
+        row = by_name.get(name)
+        return self._view(row) if row is not None else None
+
+    def raw_int(self, num: int) -> Optional[int]:
+        """Returns the first number of an attribute raw value, as `Attribute.raw_int`
+        does, without building the `Attribute` view. None if missing or not parseable."""
+        row = self._index[num]
+        if row < 0:
+            return None
+        raw = self._verbatim.get((row, 4))
+        if raw is None:
+            # The raw value is a plain non-negative number
+            return self._primary[row]
+        m = re.search(r'\d+', raw)
+        return int(m.group()) if m is not None else None
+
+    def decoded(self, num: int) -> Optional[RawValue]:
+        """Returns the decoded raw value of an attribute, from the columns filled
+        at ingestion (no parsing involved). None if the attribute is not present.
+
+        Args:
+            num (int): Attribute's ID (0-255)
+
+        Returns:
+            RawValue: The decoded raw value
+        """
+        if not self.has(num):
+            return None
+        row = self._index[num]
+        if self._primary[row] == _NO_INT64 and (row, 4) in self._verbatim:
+            # Values too big for the columns: decode again
+            return decode_raw(num, self._verbatim[(row, 4)])
+        millis = self._millis[row]
+        return RawValue(
+            primary=_decode(self._primary[row], _NO_INT64),
+            minimum=_decode(self._minimum[row], _NO_INT16),
+            maximum=_decode(self._maximum[row], _NO_INT16),
+            hours=_decode(self._hours[row], _NO_INT32),
+            minutes=_decode(self._minutes[row], _NO_INT32),
+            seconds=None if millis == _NO_INT32 else millis / 1000,
+            raw48=_decode(self._raw48[row], _NO_INT32),
+        )
+
+    @property
+    def ids(self) -> array:
+        """**(array of uint8):** Attribute IDs, one per row. Must not be modified."""
+        return self._ids
+
+    @property
+    def flags(self) -> array:
+        """**(array of uint16):** Attribute flags, one per row. Must not be modified."""
+        return self._flags
+
+    @property
+    def values(self) -> array:
+        """**(array of uint16):** Normalized values, one per row. Must not be modified."""
+        return self._values
+
+    @property
+    def worsts(self) -> array:
+        """**(array of uint16):** Worst normalized values, one per row. Must not be modified."""
+        return self._worsts
+
+    @property
+    def threshs(self) -> array:
+        """**(array of int16):** Thresholds, one per row (-1 if none). Must not be modified."""
+        return self._threshs
+
+    @property
+    def primaries(self) -> array:
+        """**(array of int64):** Main decoded raw value of each row (-2**63 if none).
+        Must not be modified."""
+        return self._primary
+
+    @property
+    def raw48s(self) -> array:
+        """**(array of int64):** Packed 48-bit raw value of each row (-1 if unknown).
+        Must not be modified."""
+        return self._raw48
+
+    @property
+    def minimums(self) -> array:
+        """**(array of int16):** Decoded minimum of each row (-32768 if none).
+        Must not be modified."""
+        return self._minimum
+
+    @property
+    def maximums(self) -> array:
+        """**(array of int16):** Decoded maximum of each row (-32768 if none).
+        Must not be modified."""
+        return self._maximum
+
+    @property
+    def hours(self) -> array:
+        """**(array of int32):** Decoded duration hours of each row (-1 if none).
+        Must not be modified."""
+        return self._hours
+
+    @property
+    def names(self) -> List[str]:
+        """**(list of str):** Attribute names, one per row."""
+        return [_vocabulary.string(code) for code in self._names]
+
+
+__all__ = ['AtaAttributeTable']
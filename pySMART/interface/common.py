@@ -1,7 +1,7 @@
 # SPDX-FileCopyrightText: 2023-2024 Rafael Leira, Naudit HPCN S.L.
 # SPDX-License-Identifier: LGPL-2.1-or-later
 
-from typing import Optional
+from typing import Dict, Optional
 from abc import ABC, abstractmethod
 
 
@@ -40,3 +40,9 @@ class CommonIface (ABC):
             int: The logical sector size of the disk in bytes
         """
         return self.physical_sector_size
+
+    def _full_state(self) -> Dict:
+        """The `__getstate__` output plus any data it leaves out that `__setstate__`
+        needs to rebuild an equivalent object (see `pySMART.device.Device._full_state`).
+        """
+        return self.__getstate__()
@@ -10,6 +10,7 @@ import re
 import humanfriendly
 from typing import Optional, Iterator, Union, List
 from ..common import CommonIface
+from ...utils import instance_vars
 
 
 class NvmeStatus(Enum):
@@ -175,6 +176,9 @@ class NvmeError(object):
         vs                      : The vendor specific
         cs                      : The command specific
     """
+    # Long-running collectors keep lots of these, avoid a __dict__ per object
+    __slots__ = ('num', 'errCount', 'sqId', 'cmdId', 'status', 'peLoc',
+                 'lba', 'nsid', 'vs', 'cs')
 
     def __init__(self, num: int, errCount: int, sqId: int, cmdId: int, status: int, peLoc: int, lba: Optional[int] = None, nsid: Optional[int] = None, vs: Optional[int] = None):
         self.num: int = num
@@ -424,10 +428,20 @@ class NvmeError(object):
         Allows us to send a pySMART diagnostics object over a serializable
         medium which uses json (or the likes of json) payloads
         """
-        return vars(self)
+        return instance_vars(self)
 
     def __setstate__(self, state):
-        self.__dict__.update(state)
+        for name, value in state.items():
+            setattr(self, name, value)
+
+    @classmethod
+    def _from_state(cls, state):
+        """Rebuilds an object from its `__getstate__` output (kept as is if already built)."""
+        if isinstance(state, cls):
+            return state
+        obj = cls.__new__(cls)
+        obj.__setstate__(state)
+        return obj
 
 
 class NvmeSelfTest(object):
@@ -446,6 +460,9 @@ class NvmeSelfTest(object):
         progress (int): The progress of the test. Defaults to 100%
 
     """
+    # Long-running collectors keep lots of these, avoid a __dict__ per object
+    __slots__ = ('num', 'description', 'status', 'powerOnHours', 'failingLBA',
+                 'nsid', 'seg', 'sct', 'code', 'progress')
 
     def __init__(self, num: int, description: str, status: str, powerOnHours: int, failingLBA: Optional[int] = None, nsid: Optional[int] = None, seg: Optional[int] = None, sct: Optional[str] = None, code: Optional[str] = None, progress: int = 100):
 
@@ -499,10 +516,20 @@ class NvmeSelfTest(object):
         Allows us to send a pySMART diagnostics object over a serializable
         medium which uses json (or the likes of json) payloads
         """
-        return vars(self)
+        return instance_vars(self)
 
     def __setstate__(self, state):
-        self.__dict__.update(state)
+        for name, value in state.items():
+            setattr(self, name, value)
+
+    @classmethod
+    def _from_state(cls, state):
+        """Rebuilds an object from its `__getstate__` output (kept as is if already built)."""
+        if isinstance(state, cls):
+            return state
+        obj = cls.__new__(cls)
+        obj.__setstate__(state)
+        return obj
 
 
 class NvmeAttributes(CommonIface):
@@ -835,7 +862,12 @@ class NvmeAttributes(CommonIface):
         return ret
 
     def __setstate__(self, state):
+        state = dict(state)
+        errors = state.pop('errors', None) or []
+        tests = state.pop('tests', None) or []
         self.__dict__.update(state)
+        self.errors = [NvmeError._from_state(e) for e in errors]
+        self.tests = [NvmeSelfTest._from_state(t) for t in tests]
 
     @property
     def temperature(self) -> Optional[int]:
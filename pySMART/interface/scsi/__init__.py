@@ -12,7 +12,7 @@ import os
 import re
 import warnings
 from time import time, strptime, mktime, sleep
-from typing import Tuple, Union, List, Dict, Optional, Iterator
+from typing import Tuple, Union, List, Dict, Optional, Iterable, Iterator, Sequence
 from enum import Enum
 from typing import Optional, Iterator, Union, List
 
@@ -23,12 +23,16 @@ from ...testentry import TestEntry
 from .diagnostics import Diagnostics
 
 
+_POWER_ON_TIME = 'Accumulated power on time'
+
+
 class SCSIAttributes(CommonIface):
 
     """Class to store the SCSI/SAS attributes
     """
 
-    def __init__(self, data: Optional[Iterator[str]] = None, abridged: bool = False, smartEnabled: bool = True, sm: Optional[Smartctl] = None, dev_reference: Optional[str] = None):
+    def __init__(self, data: Optional[Iterator[str]] = None, abridged: bool = False, smartEnabled: bool = True, sm: Optional[Smartctl] = None, dev_reference: Optional[str] = None,
+                 options: Optional[Sequence[str]] = None):
         """Initializes the attributes
 
         Args:
@@ -37,6 +41,8 @@ class SCSIAttributes(CommonIface):
             smartEnabled (bool, optional): If True, the SMART attributes will be parsed. Defaults to True.
             sm (Optional[Smartctl], optional): Smartctl reader object. Defaults to None.
             dev_reference (Optional[str], optional): The device reference. Defaults to None.
+            options (Sequence[str], optional): Extra smartctl options of the device, passed on its
+                queries (see `pySMART.device.Device.smart_options`). Defaults to None.
         """
 
         self._temperature: Optional[int] = None
@@ -69,7 +75,8 @@ class SCSIAttributes(CommonIface):
                        abridged=abridged,
                        smartEnabled=smartEnabled,
                        sm=sm,
-                       dev_reference=dev_reference)
+                       dev_reference=dev_reference,
+                       options=options)
 
     @staticmethod
     def has_compatible_data(data: Iterator[str]) -> bool:
@@ -86,6 +93,12 @@ class SCSIAttributes(CommonIface):
 
         return True
 
+    @staticmethod
+    def _needs_background_log(data: Iterable[str]) -> bool:
+        """True if the power on hours are missing from the data, so a
+        non-abridged `parse` queries them from the background scan results log."""
+        return not any(_POWER_ON_TIME in line for line in data)
+
     def __getstate__(self, all_info=True) -> Dict:
         """
         Allows us to send a pySMART Device object over a serializable
@@ -97,7 +110,28 @@ class SCSIAttributes(CommonIface):
         }
         return state_dict
 
-    def parse(self, data: Iterator[str], abridged: bool = False, smartEnabled: bool = True, sm: Optional[Smartctl] = None, dev_reference: Optional[str] = None) -> None:
+    def _full_state(self) -> Dict:
+        state_dict = self.__getstate__()
+        state_dict.update({
+            '_temperature': self._temperature,
+            '_logical_sector_size': self._logical_sector_size,
+            '_physical_sector_size': self._physical_sector_size,
+            'tests': [t._full_state() for t in self.tests],
+        })
+        return state_dict
+
+    def __setstate__(self, state):
+        self.__init__()
+        diagnostics = Diagnostics()
+        diagnostics.__setstate__(state.get('legacyDiagnostics', {}))
+        self.diagnostics = diagnostics
+        self._temperature = state.get('_temperature')
+        self._logical_sector_size = state.get('_logical_sector_size')
+        self._physical_sector_size = state.get('_physical_sector_size')
+        self.tests = [TestEntry.from_state(t) for t in state.get('tests', [])]
+
+    def parse(self, data: Iterator[str], abridged: bool = False, smartEnabled: bool = True, sm: Optional[Smartctl] = None, dev_reference: Optional[str] = None,
+              options: Optional[Sequence[str]] = None) -> None:
         """Parses the attributes from the raw data
 
         Args:
@@ -106,6 +140,8 @@ class SCSIAttributes(CommonIface):
             smartEnabled (bool, optional): If True, the SMART attributes will be parsed. Defaults to True.
             sm (Optional[Smartctl], optional): Smartctl reader object. Defaults to None.
             dev_reference (Optional[str], optional): The device reference. Defaults to None.
+            options (Sequence[str], optional): Extra smartctl options of the device, passed on its
+                queries (see `pySMART.device.Device.smart_options`). Defaults to None.
         """
 
         # Control variables for performance
@@ -255,7 +291,7 @@ class SCSIAttributes(CommonIface):
                     line.split(':')[1].strip())
                 continue
 
-            if 'Accumulated power on time' in line:
+            if _POWER_ON_TIME in line:
                 self.diagnostics.Power_On_Hours = int(
                     line.split(':')[1].split(' ')[1])
                 continue
@@ -298,7 +334,7 @@ class SCSIAttributes(CommonIface):
                             '-l',
                             'background',
                             dev_reference
-                        ])
+                        ], pass_options=True, options=options)
 
                     for line in raw:
                         if 'power on time' in line:
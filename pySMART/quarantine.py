@@ -0,0 +1,206 @@
+# SPDX-FileCopyrightText: 2026 pySMART contributors
+# SPDX-License-Identifier: LGPL-2.1-or-later
+
+"""
+This module contains the definition of the `Quarantine` class, a circuit
+breaker used by `pySMART.device_list.DeviceList` to stop querying devices that
+are persistently slow or failing.
+
+After `max_failures` consecutive slow or failed calls a device is quarantined:
+it is not queried again until its back-off time expires, and its last known
+data is served instead. Once the back-off expires a single caller probes the
+device: on success it is released, otherwise it is quarantined again with
+twice the previous back-off (up to `max_backoff`). Other callers keep skipping
+the device while the probe runs.
+"""
+
+import threading
+from time import monotonic
+from typing import Callable, Dict, Optional
+
+
+class QuarantinedError(Exception):
+    """Raised (or reported) when a device is skipped because it is quarantined."""
+    pass
+
+
+class QuarantineState(object):
+    """
+    Contains the health tracking information of a single device.
+    """
+
+    def __init__(self, name: str):
+        self.name: str = name
+        """**(str):** The device name."""
+        self.failures: int = 0
+        """**(int):** Consecutive slow or failed calls."""
+        self.quarantines: int = 0
+        """
+        **(int):** Consecutive times the device has been quarantined. Used to
+        compute the exponential back-off. Reset on the first successful call.
+        """
+        self.quarantined_until: Optional[float] = None
+        """
+        **(float):** `time.monotonic()` time at which the device may be probed
+        again. None if the device is not quarantined.
+        """
+        self.last_duration: Optional[float] = None
+        """**(float):** Duration in seconds of the last call."""
+        self.last_error: Optional[str] = None
+        """**(str):** Description of the last failure, if any."""
+
+    @property
+    def quarantined(self) -> bool:
+        """True if the device is (or was, and must be probed again) quarantined."""
+        return self.quarantined_until is not None
+
+    def __repr__(self):
+        """Define a basic representation of the class object."""
+        return "<QuarantineState {0} failures:{1} quarantined:{2}>".format(
+            self.name, self.failures, self.quarantined)
+
+    def __getstate__(self):
+        return {
+            'name': self.name,
+            'failures': self.failures,
+            'quarantines': self.quarantines,
+            'quarantined': self.quarantined,
+            'last_duration': self.last_duration,
+            'last_error': self.last_error,
+        }
+
+
+class Quarantine(object):
+    """
+    Tracks the health of every device queried by a `DeviceList`, and decides
+    which ones should be skipped.
+    """
+
+    def __init__(self, max_failures: int = 3, slow_threshold: float = 30.0,
+                 base_backoff: float = 60.0, max_backoff: float = 3600.0,
+                 clock: Callable[[], float] = monotonic):
+        """Instantiates the quarantine tracker.
+
+        Args:
+            max_failures (int, optional): Consecutive slow or failed calls before a device
+                is quarantined. Defaults to 3.
+            slow_threshold (float, optional): Calls lasting more than this many seconds
+                count as failures. Defaults to 30.0.
+            base_backoff (float, optional): Seconds a device stays quarantined the first time.
+                Defaults to 60.0.
+            max_backoff (float, optional): Upper limit for the back-off, in seconds.
+                Defaults to 3600.0.
+            clock (Callable[[], float], optional): Time source. Defaults to `time.monotonic`.
+        """
+        self.max_failures: int = max_failures
+        self.slow_threshold: float = slow_threshold
+        self.base_backoff: float = base_backoff
+        self.max_backoff: float = max_backoff
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._states: Dict[str, QuarantineState] = {}
+
+    def __repr__(self):
+        """Define a basic representation of the class object."""
+        return "<Quarantine {0} quarantined of {1} tracked>".format(
+            len(self.quarantined), len(self._states))
+
+    @property
+    def states(self) -> Dict[str, QuarantineState]:
+        """Returns the health tracking information of every known device.
+
+        Returns:
+            Dict[str, QuarantineState]: The state of each device, by device name
+        """
+        with self._lock:
+            return dict(self._states)
+
+    @property
+    def quarantined(self) -> Dict[str, QuarantineState]:
+        """Returns the health tracking information of the quarantined devices.
+
+        Returns:
+            Dict[str, QuarantineState]: The state of each quarantined device, by device name
+        """
+        with self._lock:
+            return {name: state for name, state in self._states.items() if state.quarantined}
+
+    def state(self, name: str) -> Optional[QuarantineState]:
+        """Returns the health tracking information of a device, if known."""
+        with self._lock:
+            return self._states.get(name)
+
+    def allow(self, name: str) -> bool:
+        """Checks if a device may be queried now.
+
+        Args:
+            name (str): The device name
+
+        Returns:
+            bool: False if the device is quarantined and its back-off has not expired
+                yet, or if another caller is already probing it
+        """
+        with self._lock:
+            state = self._states.get(name)
+            if state is None or state.quarantined_until is None:
+                return True
+            now = self._clock()
+            if now < state.quarantined_until:
+                return False
+            # This caller is the probe: the others wait for its result. A probe
+            # that never reports is replaced after the same back-off.
+            state.quarantined_until = now + min(self.max_backoff,
+                                                self.base_backoff * (2 ** max(0, state.quarantines - 1)))
+            return True
+
+    def retry_in(self, name: str) -> float:
+        """Returns the seconds left until a quarantined device is probed again.
+        0 if the device may be queried now.
+        """
+        with self._lock:
+            state = self._states.get(name)
+            if state is None or state.quarantined_until is None:
+                return 0.0
+            return max(0.0, state.quarantined_until - self._clock())
+
+    def record(self, name: str, duration: float, error: Optional[BaseException] = None) -> None:
+        """Records the outcome of a query.
+
+        Args:
+            name (str): The device name
+            duration (float): Duration of the query, in seconds
+            error (BaseException, optional): The error raised by the query, if any
+        """
+        with self._lock:
+            state = self._states.get(name)
+            if state is None:
+                state = self._states[name] = QuarantineState(name)
+
+            state.last_duration = duration
+
+            if error is None and duration <= self.slow_threshold:
+                # Healthy call: release the device
+                state.failures = 0
+                state.quarantines = 0
+                state.quarantined_until = None
+                state.last_error = None
+                return
+
+            state.failures += 1
+            state.last_error = repr(error) if error is not None else \
+                'Slow call: {0:.1f}s'.format(duration)
+
+            # A failed probe re-quarantines the device directly
+            if state.quarantined_until is not None or state.failures >= self.max_failures:
+                backoff = min(self.max_backoff,
+                              self.base_backoff * (2 ** state.quarantines))
+                state.quarantines += 1
+                state.quarantined_until = self._clock() + backoff
+
+    def release(self, name: str) -> None:
+        """Forgets the health tracking information of a device, releasing it."""
+        with self._lock:
+            self._states.pop(name, None)
+
+
+__all__ = ['Quarantine', 'QuarantineState', 'QuarantinedError']
@@ -0,0 +1,575 @@
+# SPDX-FileCopyrightText: 2026 pySMART contributors
+# SPDX-License-Identifier: LGPL-2.1-or-later
+
+"""
+This module contains a declarative rule engine for health alerts: `Rule`
+objects test one field of a device (or every field matching a pattern), and
+a `RuleEngine` evaluates them on each update and emits `Alert` events.
+
+    #!bash
+    >>> from pySMART import DeviceList
+    >>> from pySMART.rules import DEFAULT_RULES, Rule, RuleEngine
+    >>> engine = RuleEngine(DEFAULT_RULES + [Rule('hot', 'temperature', '>', 55, hold=600)],
+    ...                     callback=print)
+    >>> devlist = DeviceList(rules=engine)   # every update() is evaluated
+    >>> devlist.update()
+    <Alert firing warning reallocated_sectors ZA20VNPT ata.5.raw: 8 (was 0)>
+
+Fields are named as the `pySMART.history.samples` series, plus:
+    * Device fields: `assessment`, `smart_enabled`, `temperature`, `firmware`...
+    * `ata.<id>.<column>`: `value`, `worst`, `thresh`, `raw` (`raw_int`),
+      `when_failed`, `type` and `updated` of ATA attributes.
+    * `tests.failed`: the number of failed self-tests in the log, and
+      `tests.latest`: the status of the latest one.
+
+The engine keeps the last snapshot of each device, and only evaluates the
+rules of the fields that changed since (see `pySMART.diff.diff_snapshots`),
+plus the ones waiting for their `hold` delay. Rules are matched against
+field names once: the result is cached by field name.
+
+Rules testing a state (`==`, `>`, `in`...) fire when it becomes true (after
+`hold` seconds) and resolve when it becomes false. Rules testing a change
+(`increased`, `decreased`, `changed`) fire on every change, at most once
+per `cooldown` seconds.
+"""
+
+import operator
+import re
+import threading
+from collections import deque
+from fnmatch import fnmatchcase
+from time import time
+from typing import TYPE_CHECKING, Any, Callable, Deque, Dict, Iterable, Iterator, List, Optional, Tuple, Union
+
+from .diff import _FIELDS, _NVME_COUNTERS, _SCSI_COUNTERS, SnapshotDiff, diff_snapshots
+from .history import _device_key
+from .interface import AtaAttributes, NvmeAttributes, SCSIAttributes
+from .interface.ata.attribute import Attribute
+from .snapshot import DeviceSnapshot
+
+if TYPE_CHECKING:
+    from .device import Device
+
+_OPERATORS: Dict[str, Callable[[Any, Any], bool]] = {
+    '==': operator.eq,
+    '!=': operator.ne,
+    '>': operator.gt,
+    '>=': operator.ge,
+    '<': operator.lt,
+    '<=': operator.le,
+    'in': lambda value, threshold: value in threshold,
+    'not in': lambda value, threshold: value not in threshold,
+}
+_TRANSITIONS: Dict[str, Callable[[Any, Any], bool]] = {
+    'increased': operator.gt,
+    'decreased': operator.lt,
+    'changed': operator.ne,
+}
+
+# Device fields (temperatures are expanded by sensor)
+_DEVICE_FIELDS = [name for name in _FIELDS if name != 'temperatures']
+_ATA_COLUMNS = ('value', 'worst', 'thresh', 'raw', 'when_failed', 'type', 'updated')
+_TEST_FAILED = re.compile('fail', re.IGNORECASE)
+
+
+class Rule(object):
+    """
+    An alert rule: a test of one field (or of every field matching a
+    `fnmatch` pattern) of a device.
+    """
+    __slots__ = ('name', 'field', 'op', 'threshold', 'severity', 'message', 'hold', 'cooldown', '_test')
+
+    def __init__(self, name: str, field: str, op: str, threshold: Any = None, severity: str = 'warning',
+                 message: Optional[str] = None, hold: float = 0.0, cooldown: float = 0.0):
+        """Instantiates a rule.
+
+        Args:
+            name (str): Rule name, unique in an engine
+            field (str): Field name or pattern (ie: 'ata.5.raw', 'ata.*.when_failed')
+            op (str): '==', '!=', '>', '>=', '<', '<=', 'in', 'not in' (tests of the
+                value against threshold) or 'increased', 'decreased', 'changed' (tests
+                of the value against the previous one)
+            threshold (Any, optional): Value compared with. Defaults to None.
+            severity (str, optional): Alert severity, ie: 'warning' or 'critical'.
+                Defaults to 'warning'.
+            message (str, optional): Alert message, a `str.format` template of the
+                `Alert` fields plus `threshold` and `attr` (the ATA `Attribute` of
+                `ata.` fields). Defaults to a description of the test.
+            hold (float, optional): Seconds a state must hold before the alert fires.
+                Defaults to 0.
+            cooldown (float, optional): Seconds before the same rule can fire again
+                on the same device field. Defaults to 0.
+        """
+        if op in _OPERATORS:
+            self._test = _OPERATORS[op]
+        elif op in _TRANSITIONS:
+            self._test = _TRANSITIONS[op]
+        else:
+            raise ValueError('Unknown rule operator: {0}'.format(op))
+        self.name: str = name
+        """**(str):** Rule name."""
+        self.field: str = field
+        """**(str):** Field name or `fnmatch` pattern."""
+        self.op: str = op
+        """**(str):** The test operator."""
+        self.threshold: Any = threshold
+        """**(Any):** Value compared with, for state tests."""
+        self.severity: str = severity
+        """**(str):** Alert severity."""
+        if message is None:
+            if op in _TRANSITIONS:
+                message = '{field} ' + op + ' from {previous} to {value}'
+            else:
+                message = '{field} ' + op + ' {threshold}: {value}'
+        self.message: str = message
+        """**(str):** Alert message template."""
+        self.hold: float = hold
+        """**(float):** Seconds a state must hold before the alert fires."""
+        self.cooldown: float = cooldown
+        """**(float):** Seconds before the rule can fire again on the same device field."""
+
+    def __repr__(self):
+        """Define a basic representation of the class object."""
+        return "<Rule {0}: {1} {2} {3!r}>".format(self.name, self.field, self.op, self.threshold)
+
+    @property
+    def transition(self) -> bool:
+        """True if the rule tests a change, not a state."""
+        return self.op in _TRANSITIONS
+
+    def test(self, previous: Any, value: Any) -> bool:
+        """Tests a field value (and its previous value, for change tests).
+        Missing or incomparable values never pass.
+
+        Args:
+            previous (Any): The previous value (None if unknown)
+            value (Any): The current value (None if missing)
+
+        Returns:
+            bool: True if the rule fires
+        """
+        if value is None:
+            return False
+        try:
+            if self.op in _TRANSITIONS:
+                return previous is not None and self._test(value, previous)
+            return bool(self._test(value, self.threshold))
+        except TypeError:
+            return False
+
+
+class Alert(object):
+    """
+    An alert event emitted by a `RuleEngine`.
+    """
+    __slots__ = ('rule', 'severity', 'state', 'key', 'name', 'field', 'value', 'previous', 'timestamp',
+                 'message')
+
+    def __init__(self, rule: str, severity: str, state: str, key: str, name: str, field: str, value: Any,
+                 previous: Any, timestamp: float, message: str):
+        self.rule: str = rule
+        """**(str):** Name of the rule."""
+        self.severity: str = severity
+        """**(str):** Severity of the rule."""
+        self.state: str = state
+        """**(str):** 'firing' or 'resolved'."""
+        self.key: str = key
+        """**(str):** The device key (see `pySMART.history.HistoryStore`)."""
+        self.name: str = name
+        """**(str):** The device name (its key for snapshots)."""
+        self.field: str = field
+        """**(str):** The field tested."""
+        self.value: Any = value
+        """**(Any):** The field value."""
+        self.previous: Any = previous
+        """**(Any):** The previous field value (None if unknown)."""
+        self.timestamp: float = timestamp
+        """**(float):** `time.time()` of the event."""
+        self.message: str = message
+        """**(str):** The rule message."""
+
+    def __repr__(self):
+        """Define a basic representation of the class object."""
+        return "<Alert {0} {1} {2} {3} {4}: {5} (was {6})>".format(
+            self.state, self.severity, self.rule, self.key, self.field, self.value, self.previous)
+
+
+def _field_names(snapshot: DeviceSnapshot) -> Iterator[str]:
+    """Every field name of a snapshot."""
+    yield from _DEVICE_FIELDS
+    for sensor in snapshot.temperatures:
+        yield 'temperatures.{0}'.format(sensor)
+    if_attributes = snapshot.if_attributes
+    if isinstance(if_attributes, AtaAttributes):
+        for num in sorted(if_attributes.legacyAttributes.ids):
+            for column in _ATA_COLUMNS:
+                yield 'ata.{0}.{1}'.format(num, column)
+    elif isinstance(if_attributes, NvmeAttributes):
+        for name in _NVME_COUNTERS:
+            yield 'nvme.' + name
+    elif isinstance(if_attributes, SCSIAttributes):
+        for name in _SCSI_COUNTERS:
+            yield 'scsi.' + name
+    yield 'tests.failed'
+    yield 'tests.latest'
+
+
+def _changed_names(changes: SnapshotDiff, old: DeviceSnapshot, new: DeviceSnapshot) -> Iterator[str]:
+    """The field names whose value may differ between two snapshots."""
+    for name in changes.fields:
+        if name == 'temperatures':
+            for sensor in set(old.temperatures) | set(new.temperatures):
+                yield 'temperatures.{0}'.format(sensor)
+        else:
+            yield name
+    for num in changes.attributes:
+        for column in _ATA_COLUMNS:
+            yield 'ata.{0}.{1}'.format(num, column)
+    prefix = 'nvme.' if isinstance(new.if_attributes, NvmeAttributes) else 'scsi.'
+    for name in changes.counters:
+        yield prefix + name
+    if changes.new_tests or len(old.tests) != len(new.tests):
+        yield 'tests.failed'
+        yield 'tests.latest'
+
+
+def _attribute(snapshot: Optional[DeviceSnapshot], field: str) -> Optional[Attribute]:
+    if snapshot is None or not field.startswith('ata.') or \
+            not isinstance(snapshot.if_attributes, AtaAttributes):
+        return None
+    num = field.split('.')[1]
+    return snapshot.if_attributes.legacyAttributes[int(num)] if num.isdigit() and int(num) < 256 else None
+
+
+def field_value(snapshot: Optional[DeviceSnapshot], field: str) -> Any:
+    """Returns the value of a field of a snapshot (see `pySMART.rules`).
+
+    Args:
+        snapshot (DeviceSnapshot): The snapshot (None returns None)
+        field (str): The field name (ie: 'ata.5.raw', 'nvme.criticalWarning')
+
+    Returns:
+        Any: The value, None if missing
+    """
+    if snapshot is None:
+        return None
+    kind, _, rest = field.partition('.')
+    if not rest:
+        return getattr(snapshot, field, None) if field in _DEVICE_FIELDS else None
+    if kind == 'temperatures':
+        return snapshot.temperatures.get(int(rest)) if rest.isdigit() else None
+    if kind == 'ata':
+        attr = _attribute(snapshot, field)
+        column = rest.partition('.')[2]
+        if attr is None or column not in _ATA_COLUMNS:
+            return None
+        if column == 'value':
+            return attr.value_int
+        if column == 'raw':
+            return attr.raw_int
+        if column == 'type':
+            return attr.type
+        return getattr(attr, column)
+    if kind == 'nvme':
+        if_attributes = snapshot.if_attributes
+        return getattr(if_attributes, rest, None) if isinstance(if_attributes, NvmeAttributes) and \
+            rest in _NVME_COUNTERS else None
+    if kind == 'scsi':
+        if_attributes = snapshot.if_attributes
+        return getattr(if_attributes.diagnostics, rest, None) if isinstance(if_attributes, SCSIAttributes) and \
+            rest in _SCSI_COUNTERS else None
+    if kind == 'tests':
+        if rest == 'failed':
+            return sum(1 for test in snapshot.tests if _TEST_FAILED.search(test.status or ''))
+        if rest == 'latest':
+            return snapshot.tests[0].status if snapshot.tests else None
+    return None
+
+
+def _message(rule: Rule, alert: Alert, snapshot: Optional[DeviceSnapshot]) -> str:
+    return rule.message.format(rule=alert.rule, severity=alert.severity, state=alert.state, key=alert.key,
+                               name=alert.name, field=alert.field, value=alert.value, previous=alert.previous,
+                               timestamp=alert.timestamp, threshold=rule.threshold,
+                               attr=_attribute(snapshot, alert.field))
+
+
+class _Index(object):
+    """Rules matching each field name, resolved once per name."""
+    __slots__ = ('rules', '_cache')
+
+    def __init__(self, rules: Iterable[Rule]):
+        self.rules: List[Rule] = list(rules)
+        self._cache: Dict[str, Tuple[Rule, ...]] = {}
+
+    def __call__(self, field: str) -> Tuple[Rule, ...]:
+        matched = self._cache.get(field)
+        if matched is None:
+            matched = self._cache[field] = tuple(rule for rule in self.rules if fnmatchcase(field, rule.field))
+        return matched
+
+
+def check(rules: Union[Iterable[Rule], _Index], snapshot: DeviceSnapshot, key: Optional[str] = None,
+          now: Optional[float] = None) -> List[Alert]:
+    """Evaluates the state rules (change rules need a previous snapshot) on
+    every field of a snapshot, without any engine state: no hold delays, no
+    cooldowns and no resolved events.
+
+    Args:
+        rules (Iterable[Rule]): The rules
+        snapshot (DeviceSnapshot): The snapshot (or snapshot draft)
+        key (str, optional): The device key. Defaults to its serial number (or WWN).
+        now (float, optional): Timestamp of the alerts. Defaults to the current time.
+
+    Returns:
+        List[Alert]: The firing alerts, by field order
+    """
+    index = rules if isinstance(rules, _Index) else _Index(rules)
+    if key is None:
+        key = str(snapshot.serial or snapshot.wwn or '')
+    if now is None:
+        now = time()
+    ret = []
+    for field in _field_names(snapshot):
+        matched = index(field)
+        if not matched:
+            continue
+        value = field_value(snapshot, field)
+        for rule in matched:
+            if not rule.transition and rule.test(None, value):
+                alert = Alert(rule.name, rule.severity, 'firing', key, key, field, value, None, now, '')
+                alert.message = _message(rule, alert, snapshot)
+                ret.append(alert)
+    return ret
+
+
+class _State(object):
+    """A state rule holding on a device field."""
+    __slots__ = ('since', 'firing', 'previous')
+
+    def __init__(self, since: float, previous: Any):
+        self.since = since
+        self.firing = False
+        self.previous = previous
+
+
+class RuleEngine(object):
+    """
+    Evaluates rules on device updates, incrementally. Feed it with `evaluate`
+    or by setting `pySMART.device.Device.rules` (or
+    `pySMART.device_list.DeviceList(rules=...)`).
+
+    The engine is safe to use from several threads.
+    """
+
+    def __init__(self, rules: Iterable[Rule] = (), callback: Optional[Callable[[Alert], None]] = None,
+                 keep: int = 100):
+        """Instantiates an engine.
+
+        Args:
+            rules (Iterable[Rule], optional): The rules. Defaults to none.
+            callback (Callable[[Alert], None], optional): Called with every alert event.
+            keep (int, optional): Number of alert events kept in `recent`. Defaults to 100.
+        """
+        self._index = _Index(())
+        self.callback: Optional[Callable[[Alert], None]] = callback
+        """**(callable):** Called with every alert event, if set."""
+        self.recent: Deque[Alert] = deque(maxlen=keep)
+        """**(deque of `Alert`):** The latest alert events, oldest first."""
+
+        self._lock = threading.Lock()
+        self._last: Dict[str, DeviceSnapshot] = {}
+        # Holding state rules, by device key and (rule, field)
+        self._states: Dict[str, Dict[Tuple[str, str], _State]] = {}
+        # Last firing time, by device key and (rule, field), for cooldowns
+        self._fired: Dict[str, Dict[Tuple[str, str], float]] = {}
+        for rule in rules:
+            self.add(rule)
+
+    def __repr__(self):
+        """Define a basic representation of the class object."""
+        return "<RuleEngine rules:{0} devices:{1} firing:{2}>".format(
+            len(self.rules), len(self._last), len(self.active()))
+
+    @property
+    def rules(self) -> List[Rule]:
+        """**(list of `Rule`):** The rules. Use `add` and `remove` to change them."""
+        return list(self._index.rules)
+
+    def add(self, rule: Rule) -> None:
+        """Adds a rule. It is evaluated on every field of a device at its next
+        update.
+
+        Args:
+            rule (Rule): The rule, named uniquely
+        """
+        with self._lock:
+            if any(known.name == rule.name for known in self._index.rules):
+                raise ValueError('Duplicated rule name: {0}'.format(rule.name))
+            self._index = _Index(self._index.rules + [rule])
+            self._last.clear()
+
+    def remove(self, name: str) -> None:
+        """Removes a rule and its alerts, without resolved events.
+
+        Args:
+            name (str): The rule name
+        """
+        with self._lock:
+            self._index = _Index(rule for rule in self._index.rules if rule.name != name)
+            for states in list(self._states.values()) + list(self._fired.values()):
+                for state_key in [state_key for state_key in states if state_key[0] == name]:
+                    del states[state_key]
+
+    def evaluate(self, device: Union['Device', DeviceSnapshot], key: Optional[str] = None,
+                 changes: Optional[SnapshotDiff] = None) -> List[Alert]:
+        """Evaluates the rules of the fields of a device that changed since its
+        previous evaluation (every field the first time), and the state rules
+        waiting for their hold delay.
+
+        Args:
+            device (Union[Device, DeviceSnapshot]): The device (its current snapshot
+                is evaluated) or a snapshot.
+            key (str, optional): The device key. Defaults to its serial number
+                (or WWN, or name).
+            changes (SnapshotDiff, optional): The changes since the previous evaluation,
+                if already known (ie: from `pySMART.device.Device.update`).
+
+        Returns:
+            List[Alert]: The alert events (firing or resolved)
+        """
+        snapshot = getattr(device, 'snapshot', device)
+        if key is None:
+            key = _device_key(device)
+        name = getattr(device, 'name', key)
+        now = snapshot.collected_at if snapshot.collected_at is not None else time()
+
+        events: List[Alert] = []
+        with self._lock:
+            index = self._index
+            old = self._last.get(key)
+            self._last[key] = snapshot
+            states = self._states.setdefault(key, {})
+            fired = self._fired.setdefault(key, {})
+
+            if old is None or type(old.if_attributes) is not type(snapshot.if_attributes):
+                fields: Iterable[str] = set(_field_names(snapshot)) | \
+                    (set(_field_names(old)) if old is not None else set())
+                # Holding states of fields no longer tested are evaluated again
+                fields = set(fields) | set(field for _, field in states)
+            elif old is snapshot:
+                fields = ()
+            else:
+                if changes is None:
+                    changes = diff_snapshots(old, snapshot)
+                fields = set(_changed_names(changes, old, snapshot))
+
+            def emit(rule: Rule, state: str, field: str, value: Any, previous: Any) -> None:
+                alert = Alert(rule.name, rule.severity, state, key, name, field, value, previous, now, '')
+                alert.message = _message(rule, alert, snapshot)
+                events.append(alert)
+
+            def fire(rule: Rule, field: str, value: Any, previous: Any) -> bool:
+                last = fired.get((rule.name, field))
+                if last is not None and now - last < rule.cooldown:
+                    return False
+                fired[(rule.name, field)] = now
+                emit(rule, 'firing', field, value, previous)
+                return True
+
+            for field in fields:
+                matched = index(field)
+                if not matched:
+                    continue
+                value = field_value(snapshot, field)
+                previous = field_value(old, field)
+                for rule in matched:
+                    passed = rule.test(previous, value)
+                    if rule.transition:
+                        if passed:
+                            fire(rule, field, value, previous)
+                        continue
+                    state = states.get((rule.name, field))
+                    if passed and state is None:
+                        states[(rule.name, field)] = _State(now, previous)
+                    elif not passed and state is not None:
+                        del states[(rule.name, field)]
+                        if state.firing:
+                            emit(rule, 'resolved', field, value, previous)
+
+            # States (new or holding) that held long enough
+            rules = {rule.name: rule for rule in index.rules}
+            for (rule_name, field), state in states.items():
+                rule = rules[rule_name]
+                if not state.firing and now - state.since >= rule.hold:
+                    state.firing = fire(rule, field, field_value(snapshot, field), state.previous)
+
+            self.recent.extend(events)
+
+        if self.callback is not None:
+            for alert in events:
+                self.callback(alert)
+        return events
+
+    def active(self, key: Optional[str] = None) -> List[Tuple[str, str, str]]:
+        """Returns the firing state alerts.
+
+        Args:
+            key (str, optional): Only the ones of this device key. Defaults to every device.
+
+        Returns:
+            List[Tuple[str, str, str]]: (device key, rule name, field) tuples, sorted
+        """
+        with self._lock:
+            return sorted((device, rule, field) for device, states in self._states.items()
+                          if key is None or device == key
+                          for (rule, field), state in states.items() if state.firing)
+
+    def forget(self, key: str) -> None:
+        """Drops the state of a device (ie: replaced or removed), without
+        resolved events.
+
+        Args:
+            key (str): The device key
+        """
+        with self._lock:
+            self._last.pop(key, None)
+            self._states.pop(key, None)
+            self._fired.pop(key, None)
+
+
+SMART_WARNINGS = [
+    Rule('attribute_failed_in_the_past', 'ata.*.when_failed', '==', 'In_the_past',
+         message='{attr.name} failed in the past with value {attr.worst}. [Threshold: {attr.thresh}]'),
+    Rule('attribute_failing_now', 'ata.*.when_failed', '==', 'FAILING_NOW', severity='critical',
+         message='{attr.name} is failing now with value {attr.value}. [Threshold: {attr.thresh}]'),
+    Rule('attribute_failed', 'ata.*.when_failed', 'not in', ('-', 'In_the_past', 'FAILING_NOW'),
+         message="{attr.name} says it failed '{attr.when_failed}'. "
+                 "[V={attr.value},W={attr.worst},T={attr.thresh}]"),
+]
+"""
+Built-in rules of ATA attributes that failed (their `when_failed` column).
+`pySMART.device.Device` adds their messages to `messages` and lowers
+`assessment` (to 'WARN', or 'FAIL' for critical ones).
+"""
+
+# Index of SMART_WARNINGS, checked on every device update
+_SMART_WARNINGS = _Index(SMART_WARNINGS)
+
+DEFAULT_RULES = SMART_WARNINGS + [
+    Rule('health_failed', 'assessment', '==', 'FAIL', severity='critical',
+         message='SMART health assessment failed'),
+    Rule('reallocated_sectors', 'ata.5.raw', 'increased'),
+    Rule('pending_sectors', 'ata.197.raw', '>', 0),
+    Rule('uncorrectable_sectors', 'ata.198.raw', 'increased'),
+    Rule('nvme_critical_warning', 'nvme.criticalWarning', '!=', 0, severity='critical'),
+    Rule('nvme_media_errors', 'nvme.integrityErrors', 'increased'),
+    Rule('scsi_grown_defects', 'scsi.Reallocated_Sector_Ct', '>', 0,
+         message='Grown defect list: {value} defects'),
+    Rule('scsi_grown_defects_increased', 'scsi.Reallocated_Sector_Ct', 'increased'),
+    Rule('self_test_failed', 'tests.failed', '>', 0, severity='critical',
+         message='Self-test failed: {value} failed tests in the log'),
+]
+"""Built-in rules: `SMART_WARNINGS` and common signs of a failing device."""
+
+
+__all__ = ['Rule', 'RuleEngine', 'Alert', 'check', 'field_value', 'SMART_WARNINGS', 'DEFAULT_RULES']
@@ -0,0 +1,416 @@
+# SPDX-FileCopyrightText: 2026 pySMART contributors
+# SPDX-License-Identifier: LGPL-2.1-or-later
+
+"""
+This module contains `to_dict` and `from_dict`, a fast serializer for
+`pySMART.device.Device`, `pySMART.snapshot.DeviceSnapshot` and the interface
+classes.
+
+The dicts produced are the same `pySMART.utils.get_object_properties`
+produces for the interface classes, and for `Device` the shape stored in the
+test dataset `device.json` files (public data only, no `smartctl` object).
+Instead of deep-copying every object and inspecting all its members, each
+class has a fixed schema: the list of fields to read and how to convert the
+nested ones. Only the lists and dicts of the result are new objects, values
+are never copied more than once.
+
+    #!bash
+    >>> from pySMART.serialize import to_dict, from_dict
+    >>> payload = json.dumps(to_dict(sda))
+    >>> from_dict(Device, json.loads(payload))
+    <SAT device on /dev/sda mod:WDC WD5000AAKS-60Z1A0 sn:WD-WCAWFxxxxxxx>
+
+Objects rebuilt by `from_dict` hold the data only: no smartctl call is done
+until their `update()` is called.
+"""
+
+from operator import attrgetter
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple, Type
+
+from .device import Device
+from .interface import AtaAttributes, NvmeAttributes, SCSIAttributes
+from .interface.ata.attribute import Attribute
+from .interface.ata.table import AtaAttributeTable
+from .interface.nvme import NvmeError, NvmeSelfTest
+from .interface.scsi.diagnostics import Diagnostics
+from .snapshot import DeviceSnapshot
+from .testentry import TestEntry
+
+
+class _Schema(object):
+    """The fields of a class written by `to_dict`.
+
+    Args:
+        fields (Iterable[str]): Attributes and properties copied as they are
+        nested (Dict[str, Callable], optional): Fields converted by a function
+            (nested objects, containers that must be copied...)
+    """
+    __slots__ = ('keys', 'nested', '_get')
+
+    def __init__(self, fields: Iterable[str], nested: Optional[Dict[str, Callable[[Any], Any]]] = None):
+        self.keys: Tuple[str, ...] = tuple(fields)
+        self.nested: Tuple[Tuple[str, Callable[[Any], Any]], ...] = tuple((nested or {}).items())
+        self._get = attrgetter(*self.keys)
+
+    def dump(self, obj: Any) -> Dict[str, Any]:
+        ret = dict(zip(self.keys, self._get(obj)))
+        for key, convert in self.nested:
+            ret[key] = convert(getattr(obj, key))
+        return ret
+
+
+def _dump_list(schema: _Schema) -> Callable[[Any], List[Optional[Dict[str, Any]]]]:
+    dump = schema.dump
+    return lambda items: [None if item is None else dump(item) for item in items]
+
+
+def _dump_optional(schema: _Schema) -> Callable[[Any], Optional[Dict[str, Any]]]:
+    dump = schema.dump
+    return lambda obj: None if obj is None else dump(obj)
+
+
+def _dump_table(table: AtaAttributeTable) -> List[Optional[Dict[str, Any]]]:
+    """Dumps an attribute table straight from its rows, without building the
+    `Attribute` views. Same dicts as `_ATTRIBUTE.dump()`."""
+    ret: List[Optional[Dict[str, Any]]] = [None] * 256
+    raw_int = table.raw_int
+    for num, name, flags, value, worst, thresh, attr_type, updated, when_failed, raw in table.rows():
+        ret[num] = {
+            '_thresh': thresh,
+            '_value': value,
+            '_worst': worst,
+            'flags': flags,
+            'name': name,
+            'num': num,
+            'raw': raw,
+            'raw_int': raw_int(num),
+            'thresh': None if thresh == '---' else int(thresh),
+            'type': attr_type,
+            'updated': updated,
+            'value': value,
+            'value_int': int(value),
+            'value_str': value,
+            'when_failed': when_failed,
+            'worst': int(worst),
+        }
+    return ret
+
+
+_ATTRIBUTE = _Schema(
+    ['_thresh', '_value', '_worst', 'flags', 'name', 'num', 'raw', 'raw_int', 'thresh',
+     'type', 'updated', 'value', 'value_int', 'value_str', 'when_failed', 'worst'])
+
+_TEST_ENTRY = _Schema(
+    ['_format', 'num', 'type', 'status', 'hours', 'LBA', 'remain', 'segment', 'sense',
+     'ASC', 'ASCQ', 'nsid', 'sct', 'code'])
+
+_NVME_ERROR = _Schema(
+    ['num', 'errCount', 'sqId', 'cmdId', 'status', 'peLoc', 'lba', 'nsid', 'vs', 'cs',
+     'status_str'])
+
+_NVME_SELF_TEST = _Schema(
+    ['num', 'description', 'status', 'powerOnHours', 'failingLBA', 'nsid', 'seg', 'sct',
+     'code', 'progress'])
+
+# Stored fields, then the properties computed from them
+_DIAGNOSTICS_FIELDS = [
+    '_block_size', 'Reallocated_Sector_Ct', 'Start_Stop_Spec', 'Start_Stop_Cycles',
+    'Start_Stop_Pct_Left', 'Load_Cycle_Spec', 'Load_Cycle_Count', 'Load_Cycle_Pct_Left',
+    'Power_On_Hours', 'Life_Left', 'Corrected_Reads', 'Corrected_Writes',
+    'Corrected_Verifies', '_Uncorrected_Reads', '_Uncorrected_Writes',
+    '_Uncorrected_Verifies', '_Reads_GB', '_Writes_GB', '_Verifies_GB', '_Reads_count',
+    '_Writes_count', '_Verifies_count', 'Non_Medium_Errors']
+_DIAGNOSTICS = _Schema(
+    _DIAGNOSTICS_FIELDS +
+    ['Uncorrected_Reads', 'Uncorrected_Writes', 'Uncorrected_Verifies', 'Reads_GB',
+     'Writes_GB', 'Verifies_GB', 'Reads_count', 'Writes_count', 'Verifies_count',
+     'block_size'])
+
+_IFACE_FIELDS = ['_logical_sector_size', '_physical_sector_size', 'logical_sector_size',
+                 'physical_sector_size', 'temperature']
+
+_ATA_ATTRIBUTES = _Schema(
+    _IFACE_FIELDS,
+    {'legacyAttributes': _dump_table})
+
+_NVME_FIELDS = [
+    'criticalWarning', 'availableSpare', 'availableSpareThreshold', 'percentageUsed',
+    'dataUnitsRead', 'bytesRead', 'dataUnitsWritten', 'bytesWritten', 'hostReadCommands',
+    'hostWriteCommands', 'controllerBusyTime', 'powerCycles', 'powerOnHours',
+    'unsafeShutdowns', 'integrityErrors', 'errorEntries', 'warningTemperatureTime',
+    'criticalTemperatureTime']
+_NVME_ATTRIBUTES = _Schema(
+    _IFACE_FIELDS + ['_temperature'] + _NVME_FIELDS,
+    {'errors': _dump_list(_NVME_ERROR), 'tests': _dump_list(_NVME_SELF_TEST)})
+
+_SCSI_ATTRIBUTES = _Schema(
+    _IFACE_FIELDS + ['_temperature'],
+    {'diagnostics': _DIAGNOSTICS.dump, 'tests': _dump_list(_TEST_ENTRY)})
+
+
+def _dump_if_attributes(if_attributes) -> Optional[Dict[str, Any]]:
+    if if_attributes is None:
+        return None
+    return _schema_for(type(if_attributes)).dump(if_attributes)
+
+
+def _dump_diags(diagnostics: Optional[Diagnostics]) -> Dict[str, str]:
+    return {} if diagnostics is None else diagnostics.get_classic_format()
+
+
+def _copy_dict(value: Dict) -> Dict:
+    return value.copy()
+
+
+# Device data, all read from the same snapshot
+_SNAPSHOT = _Schema(
+    ['assessment', 'capacity', 'family', 'firmware', 'is_ssd', 'logical_sector_size',
+     'model', 'physical_sector_size', 'rotation_rate', 'sector_size', 'serial', 'size',
+     'smart_capable', 'smart_enabled', 'temperature', 'vendor', 'wwn'],
+    {
+        'diagnostics': _dump_optional(_DIAGNOSTICS),
+        'if_attributes': _dump_if_attributes,
+        'messages': list,
+        'temperatures': _copy_dict,
+        'test_capabilities': _copy_dict,
+        'test_polling_time': _copy_dict,
+        'tests': _dump_list(_TEST_ENTRY),
+    })
+
+# Device configuration
+_DEVICE = _Schema(
+    ['abridged', 'dev_interface', 'dev_reference', 'interface', 'name',
+     'smartctl_interface', 'stale'],
+    {'alternate_paths': list})
+
+_SCHEMAS: Dict[type, _Schema] = {
+    Attribute: _ATTRIBUTE,
+    TestEntry: _TEST_ENTRY,
+    NvmeError: _NVME_ERROR,
+    NvmeSelfTest: _NVME_SELF_TEST,
+    Diagnostics: _DIAGNOSTICS,
+    AtaAttributes: _ATA_ATTRIBUTES,
+    NvmeAttributes: _NVME_ATTRIBUTES,
+    SCSIAttributes: _SCSI_ATTRIBUTES,
+}
+
+
+def _schema_for(cls: type) -> _Schema:
+    """Returns the schema of a class, or of its closest serializable base."""
+    schema = _SCHEMAS.get(cls)
+    if schema is None:
+        for base in cls.__mro__[1:]:
+            schema = _SCHEMAS.get(base)
+            if schema is not None:
+                _SCHEMAS[cls] = schema
+                break
+        else:
+            raise TypeError('{0} objects can not be serialized'.format(cls.__name__))
+    return schema
+
+
+def _dump_snapshot(snapshot: DeviceSnapshot) -> Dict[str, Any]:
+    ret = _SNAPSHOT.dump(snapshot)
+    ret['size_raw'] = ret['capacity']
+    if_attributes = ret['if_attributes']
+    if if_attributes is not None and 'legacyAttributes' in if_attributes:
+        # Same values as if_attributes, but not the same dicts
+        ret['attributes'] = [None if attr is None else attr.copy()
+                             for attr in if_attributes['legacyAttributes']]
+    else:
+        ret['attributes'] = [None] * 256
+    ret['diags'] = _dump_diags(snapshot.diagnostics)
+    return ret
+
+
+def to_dict(obj: Any) -> Any:
+    """Converts a pySMART object into plain dicts and lists, ready for json.
+
+    Args:
+        obj (Any): A `Device`, `DeviceSnapshot`, `AtaAttributeTable`, interface
+            (`AtaAttributes`, `NvmeAttributes`, `SCSIAttributes`) or record
+            (`Attribute`, `TestEntry`, `Diagnostics`, `NvmeError`, `NvmeSelfTest`)
+            object, or None.
+
+    Returns:
+        Any: A new dict (a list for `AtaAttributeTable`, None for None). Nested
+            objects are converted too.
+    """
+    if obj is None:
+        return None
+    if isinstance(obj, Device):
+        # Read a single snapshot, so every value belongs to the same update
+        ret = _dump_snapshot(obj.snapshot)
+        ret.update(_DEVICE.dump(obj))
+        return ret
+    if isinstance(obj, DeviceSnapshot):
+        return _dump_snapshot(obj)
+    if isinstance(obj, AtaAttributeTable):
+        return _dump_table(obj)
+    return _schema_for(type(obj)).dump(obj)
+
+
+# Loaders
+
+def _load_attribute(data: Dict[str, Any]) -> Attribute:
+    return Attribute(data['num'], data['name'], data['flags'], data['_value'], data['_worst'],
+                     data['_thresh'], data['type'], data['updated'], data['when_failed'],
+                     data['raw'])
+
+
+def _load_table(data: List[Optional[Dict[str, Any]]]) -> AtaAttributeTable:
+    table = AtaAttributeTable()
+    for attr in data:
+        if attr is not None:
+            table.set(attr['num'], attr['name'], attr['flags'], attr['_value'], attr['_worst'],
+                      attr['_thresh'], attr['type'], attr['updated'], attr['when_failed'],
+                      attr['raw'])
+    return table
+
+
+def _load_test_entry(data: Dict[str, Any]) -> TestEntry:
+    return TestEntry(data['_format'], data['num'], data['type'], data['status'], data['hours'],
+                     data['LBA'], remain=data['remain'], segment=data['segment'],
+                     sense=data['sense'], asc=data['ASC'], ascq=data['ASCQ'],
+                     nsid=data['nsid'], sct=data['sct'], code=data['code'])
+
+
+def _load_nvme_error(data: Dict[str, Any]) -> NvmeError:
+    error = NvmeError(data['num'], data['errCount'], data['sqId'], data['cmdId'],
+                      data['status'], data['peLoc'], lba=data['lba'], nsid=data['nsid'],
+                      vs=data['vs'])
+    error.cs = data['cs']
+    return error
+
+
+def _load_nvme_self_test(data: Dict[str, Any]) -> NvmeSelfTest:
+    return NvmeSelfTest(data['num'], data['description'], data['status'],
+                        data['powerOnHours'], failingLBA=data['failingLBA'],
+                        nsid=data['nsid'], seg=data['seg'], sct=data['sct'],
+                        code=data['code'], progress=data['progress'])
+
+
+def _load_diagnostics(data: Dict[str, Any]) -> Diagnostics:
+    diagnostics = Diagnostics()
+    for name in _DIAGNOSTICS_FIELDS:
+        setattr(diagnostics, name, data[name])
+    return diagnostics
+
+
+def _load_ata_attributes(data: Dict[str, Any]) -> AtaAttributes:
+    ata = AtaAttributes()
+    ata._logical_sector_size = data['_logical_sector_size']
+    ata._physical_sector_size = data['_physical_sector_size']
+    ata.legacyAttributes = _load_table(data['legacyAttributes'])
+    return ata
+
+
+def _load_nvme_attributes(data: Dict[str, Any]) -> NvmeAttributes:
+    nvme = NvmeAttributes()
+    for name in ['_logical_sector_size', '_physical_sector_size', '_temperature'] + _NVME_FIELDS:
+        setattr(nvme, name, data[name])
+    nvme.errors = [_load_nvme_error(error) for error in data['errors']]
+    nvme.tests = [_load_nvme_self_test(test) for test in data['tests']]
+    return nvme
+
+
+def _load_scsi_attributes(data: Dict[str, Any]) -> SCSIAttributes:
+    scsi = SCSIAttributes()
+    scsi._logical_sector_size = data['_logical_sector_size']
+    scsi._physical_sector_size = data['_physical_sector_size']
+    scsi._temperature = data['_temperature']
+    scsi.diagnostics = _load_diagnostics(data['diagnostics'])
+    scsi.tests = [_load_test_entry(test) for test in data['tests']]
+    return scsi
+
+
+def _load_if_attributes(data: Optional[Dict[str, Any]]):
+    """Rebuilds the interface attributes, telling their class by their fields."""
+    if data is None:
+        return None
+    if 'legacyAttributes' in data:
+        return _load_ata_attributes(data)
+    if 'errors' in data:
+        return _load_nvme_attributes(data)
+    return _load_scsi_attributes(data)
+
+
+def _load_snapshot(data: Dict[str, Any], fine_interface: Optional[str] = None) -> DeviceSnapshot:
+    return DeviceSnapshot(
+        model=data['model'],
+        family=data['family'],
+        serial=data['serial'],
+        wwn=data.get('wwn'),
+        _vendor=data['vendor'],
+        firmware=data['firmware'],
+        _capacity=data['size'],
+        _capacity_human=data['capacity'],
+        smart_capable=data['smart_capable'],
+        smart_enabled=data['smart_enabled'],
+        assessment=data['assessment'],
+        messages=list(data['messages']),
+        is_ssd=data['is_ssd'],
+        rotation_rate=data['rotation_rate'],
+        test_capabilities=dict(data['test_capabilities']),
+        test_polling_time=dict(data['test_polling_time']),
+        tests=[_load_test_entry(test) for test in data['tests']],
+        # json turns int keys into strings
+        temperatures={int(sensor): value for sensor, value in data['temperatures'].items()},
+        _temperature=data['temperature'],
+        logical_sector_size=data['logical_sector_size'],
+        physical_sector_size=data['physical_sector_size'],
+        if_attributes=_load_if_attributes(data['if_attributes']),
+        _fine_interface=fine_interface,
+    )
+
+
+def _load_device(data: Dict[str, Any]) -> Device:
+    # Do not call __init__: it would query smartctl
+    device = Device.__new__(Device)
+    device._reset_local()
+    device.abridged = data['abridged']
+    device.name = data['name']
+    device.alternate_paths = list(data.get('alternate_paths', []))
+    device._interface = data['interface']
+    device._snapshot = _load_snapshot(data, fine_interface=data['dev_interface'])
+    device.stale = data.get('stale', False)
+    return device
+
+
+_LOADERS: Dict[type, Callable[[Any], Any]] = {
+    Device: _load_device,
+    DeviceSnapshot: _load_snapshot,
+    AtaAttributeTable: _load_table,
+    Attribute: _load_attribute,
+    TestEntry: _load_test_entry,
+    NvmeError: _load_nvme_error,
+    NvmeSelfTest: _load_nvme_self_test,
+    Diagnostics: _load_diagnostics,
+    AtaAttributes: _load_ata_attributes,
+    NvmeAttributes: _load_nvme_attributes,
+    SCSIAttributes: _load_scsi_attributes,
+}
+
+
+def from_dict(cls: Type, data: Any) -> Any:
+    """Rebuilds an object from the output of `to_dict` (or its json round-trip).
+    Values computed from others (ie: `Device.attributes`, `Device.diags`) are
+    ignored.
+
+    Args:
+        cls (Type): The class of the object to rebuild (one of the classes
+            supported by `to_dict`)
+        data (Any): The `to_dict` output
+
+    Returns:
+        Any: The new object (None if data is None)
+    """
+    loader = _LOADERS.get(cls)
+    if loader is None:
+        raise TypeError('{0} objects can not be deserialized'.format(cls.__name__))
+    if data is None:
+        return None
+    return loader(data)
+
+
+__all__ = ['to_dict', 'from_dict']
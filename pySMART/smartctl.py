@@ -1,33 +1,43 @@
 # SPDX-FileCopyrightText: 2021 Rafael Leira, Naudit HPCN S.L.
 # SPDX-License-Identifier: LGPL-2.1-or-later
 
-from subprocess import Popen, PIPE
+from contextlib import contextmanager
+from subprocess import Popen, PIPE, TimeoutExpired
+from time import monotonic
 from .utils import SMARTCTL_PATH, get_trace_logger
-from typing import List, Tuple, Union, Optional
+from typing import Iterator, List, Sequence, Tuple, Union, Optional
 
 import chardet
+import copy
 import os
+import threading
+import warnings
 
 logger = get_trace_logger()
 
 os.environ["LANG"] = "C"
 
+# Per-thread deadline (time.monotonic() based) for smartctl calls
+_call_deadline = threading.local()
+
 
 class Smartctl:
-    def __init__(self, smartctl_path=SMARTCTL_PATH, options: List[str] = [], sudo: Union[bool, List[str]] = False):
+    def __init__(self, smartctl_path=SMARTCTL_PATH, options: Sequence[str] = (), sudo: Union[bool, List[str]] = False):
         """
         Instantiates and initializes the Smartctl wrapper.
 
         Args:
             smartctl_path (str | PathLike): path to the smartctl executable
-            options (List[str]): extra options to use when invoking smartctl
+            options (Sequence[str]): extra options to use when invoking smartctl.
+                They are stored as an immutable tuple, use `with_options` to get
+                a wrapper with different ones.
             sudo (bool | List[str]):
                 if True use sudo -E when calling smartctl on POSIX systems.
                 If given as a list, then these arguments are passed to sudo.
                 (e.g. `sudo=['-u', 'foo']` will run `sudo -u foo ...`).
         """
         self.smartctl_path = smartctl_path
-        self.options: List[str] = options
+        self.options: Tuple[str, ...] = tuple(options)
         self._sudo: Union[None, List[str]] = None
         self.sudo = sudo
 
@@ -65,20 +75,68 @@ class Smartctl:
             logger.warn('Setting sudo is ignored on non-posix systems')
         self._sudo = value
 
-    def add_options(self, new_options: List[str]):
+    @contextmanager
+    def deadline(self, until: Optional[float]) -> Iterator[None]:
+        """Bounds every smartctl call made by the current thread inside the
+        `with` block. Once the deadline passes, running smartctl processes are
+        killed and new calls fail immediately, raising `subprocess.TimeoutExpired`.
+
+        Args:
+            until (float, optional): Absolute deadline, as returned by `time.monotonic()`.
+                None disables the deadline.
+        """
+        previous = getattr(_call_deadline, 'until', None)
+        _call_deadline.until = until
+        try:
+            yield
+        finally:
+            _call_deadline.until = previous
+
+    def with_options(self, options: Sequence[str]) -> 'Smartctl':
+        """Returns a copy of this wrapper using a different options list.
+        The current object is left untouched, so it can still be shared by other
+        threads or devices.
+
+        Args:
+            options (Sequence[str]): The options in raw smartctl format
+
+        Returns:
+            Smartctl: The new wrapper
+        """
+        new = copy.copy(self)
+        new.options = tuple(options)
+        return new
+
+    def add_options(self, new_options: Sequence[str]):
         """Adds options to be passed on some smartctl queries
 
+        Deprecated: this changes the options of every device sharing this object.
+        Use `with_options`, `pySMART.device.Device(smart_options=...)` or the
+        per-call `options` argument instead.
+
         Args:
-            new_options (List[str]): A list of options in raw smartctl format
+            new_options (Sequence[str]): A list of options in raw smartctl format
+        """
+        warnings.warn('Smartctl.add_options is deprecated, use Smartctl.with_options or per-call options instead',
+                      DeprecationWarning, stacklevel=2)
+        self.options = self.options + tuple(new_options)
+
+    def _final_options(self, options: Optional[Sequence[str]]) -> List[str]:
+        """Returns the options to pass on a query: the object ones followed by
+        the per-call ones, so the latter take precedence in smartctl.
         """
-        self.options = self.options + new_options
+        if options:
+            return list(self.options) + list(options)
+        return list(self.options)
 
-    def generic_call(self, params: List[str], pass_options=False) -> Tuple[List[str], int]:
+    def generic_call(self, params: List[str], pass_options=False, options: Optional[Sequence[str]] = None) -> Tuple[List[str], int]:
         """Generic smartctl query
 
         Args:
             params (List[str]): The list of arguments to be passed
             pass_options (bool, optional): If true options list would be passed. Defaults to False.
+            options (Sequence[str], optional): Extra options for this call only, appended after
+                the object options. Only used if pass_options is True. Defaults to None.
 
         Returns:
             Tuple[List[str], int]: A raw line-by-line output from smartctl and the process return code
@@ -94,7 +152,7 @@ class Smartctl:
         popen_list.append(self.smartctl_path)
 
         if pass_options:
-            popen_list.extend(self.options)
+            popen_list.extend(self._final_options(options))
 
         popen_list.extend(params)
 
@@ -106,20 +164,21 @@ class Smartctl:
 
         return self._exec(popen_list)
 
-    def try_generic_call(self, params: List[str], pass_options=False) -> Tuple[List[str], int]:
+    def try_generic_call(self, params: List[str], pass_options=False, options: Optional[Sequence[str]] = None) -> Tuple[List[str], int]:
         """Generic smartctl query
            However, if the command fails or crashes, it will return an empty list and a return code of 1 instead of raising an exception
 
         Args:
             params (List[str]): The list of arguments to be passed
             pass_options (bool, optional): If true options list would be passed. Defaults to False.
+            options (Sequence[str], optional): Extra options for this call only. Defaults to None.
 
         Returns:
             Tuple[List[str], int]: A raw line-by-line output from smartctl and the process return code
         """
 
         try:
-            return self.generic_call(params, pass_options)
+            return self.generic_call(params, pass_options, options)
         except Exception as e:
             logger.debug(f"Exception while executing smartctl: {e}")
             return [], 1
@@ -133,9 +192,22 @@ class Smartctl:
         Returns:
             Tuple[List[str], int]: A raw line-by-line output from smartctl and the process return code
         """
+        timeout = None
+        until = getattr(_call_deadline, 'until', None)
+        if until is not None:
+            timeout = until - monotonic()
+            if timeout <= 0:
+                raise TimeoutExpired(cmd, 0)
+
         proc = Popen(cmd, stdout=PIPE, stderr=PIPE)
 
-        _stdout, _stderr = [i for i in proc.communicate()]
+        try:
+            _stdout, _stderr = [i for i in proc.communicate(timeout=timeout)]
+        except TimeoutExpired:
+            # Do not leave orphan smartctl processes behind
+            proc.kill()
+            proc.communicate()
+            raise
 
         return self._decode_output(_stdout), proc.returncode
 
@@ -149,12 +221,15 @@ class Smartctl:
         Returns:
             List[str]: A raw line-by-line output from smartctl
         """
-        # Detect the encoding
+        # Detect the encoding (plain ascii, the usual case, needs no detection)
         encoding: Optional[str] = None
-        try:
-            encoding = chardet.detect(raw_output)['encoding']
-        except:
-            pass
+        if raw_output.isascii():
+            encoding = 'ascii'
+        else:
+            try:
+                encoding = chardet.detect(raw_output)['encoding']
+            except:
+                pass
 
         if not encoding:
             encoding = 'utf-8'
@@ -194,37 +269,39 @@ class Smartctl:
         else:
             return self.generic_call(['--health', disk])[0]
 
-    def info(self, disk: str, interface: Optional[str] = None) -> List[str]:
+    def info(self, disk: str, interface: Optional[str] = None, options: Optional[Sequence[str]] = None) -> List[str]:
         """Queries smartctl with option --info
 
         Args:
             disk (str): the disk os-full-path
             interface (str, optional): the disk interface (ata,scsi,nvme,...). Defaults to None.
+            options (Sequence[str], optional): Extra options for this call only. Defaults to None.
 
         Returns:
             List[str]: A raw line-by-line output from smartctl
         """
 
         if interface:
-            return self.generic_call(['-d', interface, '--info', disk], pass_options=True)[0]
+            return self.generic_call(['-d', interface, '--info', disk], pass_options=True, options=options)[0]
         else:
-            return self.generic_call(['--info', disk], pass_options=True)[0]
+            return self.generic_call(['--info', disk], pass_options=True, options=options)[0]
 
-    def all(self, disk: str, interface: Optional[str] = None) -> List[str]:
+    def all(self, disk: str, interface: Optional[str] = None, options: Optional[Sequence[str]] = None) -> List[str]:
         """Queries smartctl with option --all
 
         Args:
             disk (str): the disk os-full-path
             interface (str, optional): the disk interface (ata,scsi,nvme,...). Defaults to None.
+            options (Sequence[str], optional): Extra options for this call only. Defaults to None.
 
         Returns:
             List[str]: A raw line-by-line output from smartctl
         """
 
         if interface:
-            return self.generic_call(['-d', interface, '--all', disk], pass_options=True)[0]
+            return self.generic_call(['-d', interface, '--all', disk], pass_options=True, options=options)[0]
         else:
-            return self.generic_call(['--all', disk], pass_options=True)[0]
+            return self.generic_call(['--all', disk], pass_options=True, options=options)[0]
 
     def test_stop(self, disk_type: str, disk: str) -> int:
         """Queries smartctl with option -X
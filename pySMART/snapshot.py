@@ -0,0 +1,263 @@
+# SPDX-FileCopyrightText: 2026 pySMART contributors
+# SPDX-License-Identifier: LGPL-2.1-or-later
+
+"""
+This module contains the definition of the `DeviceSnapshot` class, an immutable
+view of everything a `pySMART.device.Device` learnt on its last `update()`.
+
+Each update fills a private draft and publishes it as a new snapshot with a
+single reference assignment, so readers holding a snapshot (or reading the
+`Device` properties, which delegate to the current one) never see a
+half-updated device and do not need any lock.
+
+Snapshots must be treated as read-only, including the lists and dicts they
+hold: a new update always builds new containers instead of modifying the
+published ones.
+"""
+
+import re
+from typing import Any, Dict, List, Optional, Union
+
+from .interface import AtaAttributes, NvmeAttributes, SCSIAttributes
+from .interface.ata.attribute import Attribute
+from .interface.scsi.diagnostics import Diagnostics
+from .testentry import TestEntry
+
+# Snapshot fields and their default values. Mutable defaults are copied.
+_FIELDS: Dict[str, Any] = {
+    'model': None,
+    'family': None,
+    'serial': None,
+    'wwn': None,
+    '_vendor': None,
+    'firmware': None,
+    '_capacity': None,
+    '_capacity_human': None,
+    'smart_capable': False,
+    'smart_enabled': False,
+    'assessment': None,
+    'messages': [],
+    'is_ssd': False,
+    'rotation_rate': None,
+    'test_capabilities': {},
+    'test_polling_time': {},
+    'tests': [],
+    '_test_running': False,
+    '_test_progress': None,
+    '_test_ECD': None,
+    '_temperature': None,
+    'temperatures': {},
+    'logical_sector_size': None,
+    'physical_sector_size': None,
+    'if_attributes': None,
+    '_fine_interface': None,  # Device._classify() result, see Device.dev_interface
+    'collected_at': None,
+    'collect_duration': None,
+}
+
+
+def _copy_value(value: Any) -> Any:
+    """Shallow copies the mutable containers held by a snapshot field."""
+    if isinstance(value, (list, dict)):
+        return value.copy()
+    return value
+
+
+class _SnapshotView(object):
+    """Values derived from the snapshot fields, shared by `DeviceSnapshot`
+    and its draft."""
+    __slots__ = ()
+
+    # Fields, declared here for type checkers only
+    model: Optional[str]
+    family: Optional[str]
+    serial: Optional[str]
+    wwn: Optional[str]
+    _vendor: Optional[str]
+    firmware: Optional[str]
+    _capacity: Optional[int]
+    _capacity_human: Optional[str]
+    smart_capable: bool
+    smart_enabled: bool
+    assessment: Optional[str]
+    messages: List[str]
+    is_ssd: bool
+    rotation_rate: Optional[int]
+    test_capabilities: Dict[str, bool]
+    test_polling_time: Dict[str, float]
+    tests: List[TestEntry]
+    _test_running: bool
+    _test_progress: Optional[int]
+    _test_ECD: Any
+    _temperature: Optional[int]
+    temperatures: Dict[int, int]
+    logical_sector_size: Optional[int]
+    physical_sector_size: Optional[int]
+    if_attributes: Union[None, AtaAttributes, NvmeAttributes, SCSIAttributes]
+    _fine_interface: Optional[str]
+    collected_at: Optional[float]
+    collect_duration: Optional[float]
+
+    @property
+    def attributes(self) -> List[Optional[Attribute]]:
+        """Returns the SMART attributes of the device.
+        Note: This is only filled with ATA/SATA attributes. SCSI/SAS/NVMe devices will have empty lists!!
+        """
+        if self.if_attributes is None or not isinstance(self.if_attributes, AtaAttributes):
+            return [None] * 256
+        else:
+            return self.if_attributes.legacyAttributes
+
+    @property
+    def temperature(self) -> Optional[int]:
+        """Returns the temperature of the device in Celsius, None if unknown."""
+        if self.if_attributes is None:
+            return self._temperature
+        else:
+            return self.if_attributes.temperature or self._temperature
+
+    @property
+    def vendor(self) -> Optional[str]:
+        """Returns the vendor of the device."""
+        if self._vendor:
+            return self._vendor
+
+        # If family is present, try to stract from family. Skip anything but letters.
+        elif self.family:
+            filter = re.search(r'^[a-zA-Z]+', self.family.strip())
+            if filter:
+                return filter.group(0)
+
+        # If model is present, try to stract from model. Skip anything but letters.
+        elif self.model:
+            filter = re.search(r'^[a-zA-Z]+', self.model.strip())
+            if filter:
+                return filter.group(0)
+
+        # If all else fails, return None
+        return None
+
+    @property
+    def capacity(self) -> Optional[str]:
+        """Returns the capacity in the raw smartctl format."""
+        return self._capacity_human
+
+    @property
+    def size(self) -> int:
+        """Returns the capacity in bytes."""
+        import humanfriendly
+
+        if self._capacity is not None:
+            return self._capacity
+        elif self._capacity_human is not None:
+            return humanfriendly.parse_size(self._capacity_human)
+        else:
+            return 0
+
+    @property
+    def sector_size(self) -> int:
+        """Returns the sector size of the device in Bytes. If undefined, we'll assume 512B"""
+        if self.logical_sector_size is not None:
+            return self.logical_sector_size
+        elif self.physical_sector_size is not None:
+            return self.physical_sector_size
+        else:
+            return 512
+
+    @property
+    def diagnostics(self) -> Optional[Diagnostics]:
+        """Gets the old/deprecated version of SCSI/SAS diagnostics atribute."""
+        if self.if_attributes is None or not isinstance(self.if_attributes, SCSIAttributes):
+            return None
+        else:
+            return self.if_attributes.diagnostics
+
+    @property
+    def test_running(self) -> bool:
+        """True if a self-test was being run when the snapshot was taken."""
+        return self._test_running
+
+    @property
+    def test_progress(self) -> Optional[int]:
+        """Estimate progress percentage of the running SMART selftest, if known."""
+        return self._test_progress
+
+    def as_dict(self) -> Dict[str, Any]:
+        """Returns the raw snapshot fields as a new dict (containers are not copied)."""
+        return {name: getattr(self, name) for name in _FIELDS}
+
+
+class DeviceSnapshot(_SnapshotView):
+    """
+    Immutable view of a device's data, as obtained by a single
+    `pySMART.device.Device.update()`. Fields share the names (and meaning) of
+    the matching `pySMART.device.Device` attributes, as do the derived values
+    (`temperature`, `vendor`, `size`, `attributes`...).
+
+    `collected_at` holds the `time.time()` when the snapshot was published, and
+    `collect_duration` the seconds the update took (smartctl calls included).
+    """
+    __slots__ = tuple(_FIELDS)
+
+    def __init__(self, **fields):
+        unknown = set(fields) - set(_FIELDS)
+        if unknown:
+            raise TypeError('Unknown DeviceSnapshot fields: {0}'.format(
+                ', '.join(sorted(unknown))))
+
+        for name, default in _FIELDS.items():
+            object.__setattr__(self, name, fields[name] if name in fields
+                               else _copy_value(default))
+
+    def __setattr__(self, name, value):
+        raise AttributeError('DeviceSnapshot is immutable')
+
+    def __delattr__(self, name):
+        raise AttributeError('DeviceSnapshot is immutable')
+
+    def __repr__(self):
+        """Define a basic representation of the class object."""
+        return "<DeviceSnapshot mod:{0} sn:{1} at:{2}>".format(
+            self.model, self.serial, self.collected_at)
+
+    def __reduce__(self):
+        return (self.__class__, (), self.as_dict())
+
+    def __setstate__(self, state):
+        for name, value in state.items():
+            object.__setattr__(self, name, value)
+
+    def replace(self, **changes) -> 'DeviceSnapshot':
+        """Returns a new snapshot with some fields changed.
+
+        Args:
+            **changes: The new field values
+
+        Returns:
+            DeviceSnapshot: The new snapshot. This one is left untouched.
+        """
+        fields = self.as_dict()
+        fields.update(changes)
+        return DeviceSnapshot(**fields)
+
+    def draft(self) -> '_DeviceSnapshotDraft':
+        """Returns a mutable copy of this snapshot (with its own lists and
+        dicts), to be filled and published with `_DeviceSnapshotDraft.freeze()`.
+        """
+        draft = _DeviceSnapshotDraft()
+        for name in _FIELDS:
+            setattr(draft, name, _copy_value(getattr(self, name)))
+        return draft
+
+
+class _DeviceSnapshotDraft(_SnapshotView):
+    """Mutable snapshot being filled by `pySMART.device.Device.update()`."""
+    __slots__ = tuple(_FIELDS)
+
+    def freeze(self) -> DeviceSnapshot:
+        """Publishes the draft as an immutable `DeviceSnapshot`.
+        The draft must not be used afterwards."""
+        return DeviceSnapshot(**self.as_dict())
+
+
+__all__ = ['DeviceSnapshot']
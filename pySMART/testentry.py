@@ -6,7 +6,10 @@ This module contains the definition of the `Test_Entry` class, used to
 represent individual entries in a `Device`'s SMART Self-test Log.
 """
 
-from typing import Optional
+import copyreg
+from typing import Any, Dict, Optional
+
+from .utils import instance_vars
 
 
 class TestEntry(object):
@@ -15,6 +18,9 @@ class TestEntry(object):
     log entry. This data is intended to exactly mirror that obtained through
     smartctl.
     """
+    # Long-running collectors keep lots of these, avoid a __dict__ per object
+    __slots__ = ('_format', 'num', 'type', 'status', 'hours', 'LBA', 'remain',
+                 'segment', 'sense', 'ASC', 'ASCQ', 'nsid', 'sct', 'code')
 
     def __init__(self, format, num: Optional[int], test_type, status, hours, lba,
                  remain=None,
@@ -118,6 +124,38 @@ class TestEntry(object):
             'code': self.code
         }
 
+    def _full_state(self) -> Dict[str, Any]:
+        """The `__getstate__` output plus the log format, as used by `from_state`."""
+        state = self.__getstate__()
+        state['format'] = self._format
+        return state
+
+    @classmethod
+    def from_state(cls, state: Dict[str, Any]) -> 'TestEntry':
+        """Rebuilds an entry from the output of `_full_state` (or of `__getstate__`,
+        without its log format).
+
+        Args:
+            state (Dict[str, Any]): The `_full_state` output (ie: after a json round-trip)
+
+        Returns:
+            TestEntry: The new entry
+        """
+        return cls(state.get('format'), state['num'], state['type'], state['status'],
+                   state['hours'], state['lba'],
+                   remain=state.get('remain'),
+                   segment=state.get('segment'),
+                   sense=state.get('sense'),
+                   asc=state.get('asc'),
+                   ascq=state.get('ascq'),
+                   nsid=state.get('nsid'),
+                   sct=state.get('sct'),
+                   code=state.get('code'))
+
+    def __reduce__(self):
+        # __getstate__ is meant for json-like payloads, pickle every slot instead
+        return (copyreg.__newobj__, (self.__class__,), (None, instance_vars(self)))
+
     def __repr__(self):
         """Define a basic representation of the class object."""
         return "<SMART Self-test [%s|%s] hrs:%s LBA:%s>" % (
@@ -158,19 +158,64 @@ def smartctl_type(interface_type: Optional[str]) -> Optional[str]:
         return None
 
 
+def normalize_wwn(wwn: Optional[str]) -> Optional[str]:
+    """Normalizes a World Wide Name so that the different ways smartctl and the
+       OS report it can be compared.
+       (ie: '5 000cca 24cea67fd', '0x5000cca24cea67fd' and 'naa.5000cca24cea67fd'
+       all become '5000cca24cea67fd')
+
+    Args:
+        wwn (str): A raw WWN as reported by smartctl or sysfs
+
+    Returns:
+        str: The normalized WWN. None if the given value is empty.
+    """
+    if wwn is None:
+        return None
+
+    wwn = wwn.strip().lower().replace(' ', '')
+    for prefix in ['naa.', 'eui.', '0x']:
+        if wwn.startswith(prefix):
+            wwn = wwn[len(prefix):]
+
+    return wwn if wwn else None
+
+
+def instance_vars(obj: Any) -> Dict[str, Any]:
+    """Like `vars()`, but also supports objects using `__slots__`.
+
+    Args:
+        obj (Any): The object to inspect
+
+    Returns:
+        Dict[str, Any]: A new dict with the instance attributes (set slots included)
+    """
+    ret = dict(getattr(obj, '__dict__', {}))
+    for cls in type(obj).__mro__:
+        slots = cls.__dict__.get('__slots__', ())
+        if isinstance(slots, str):
+            slots = (slots,)
+        for name in slots:
+            if name in ('__dict__', '__weakref__') or name in ret:
+                continue
+            if hasattr(obj, name):
+                ret[name] = getattr(obj, name)
+    return ret
+
+
 def get_object_properties(obj: Any, deep_copy: bool = True, remove_private: bool = False, recursive: bool = True) -> Optional[Dict[str, Any]]:
     if obj is None:
         return None
 
-    if not hasattr(obj, '__dict__'):
+    if not hasattr(obj, '__dict__') and not hasattr(obj, '__slots__'):
         return obj
 
     prop_names = dir(obj)
 
     if deep_copy:
-        ret = copy.deepcopy(vars(obj))
+        ret = copy.deepcopy(instance_vars(obj))
     else:
-        ret = copy.copy(vars(obj))
+        ret = instance_vars(obj)
 
     available_types = ['dict', 'str', 'int', 'float', 'list', 'NoneType']
     recursion_types = ['object',
@@ -201,7 +246,7 @@ def get_object_properties(obj: Any, deep_copy: bool = True, remove_private: bool
                 if prop_val_type_name in recursion_types:
                     ret[prop_name] = get_object_properties(
                         prop_val, deep_copy, remove_private, recursive)
-                elif prop_val_type_name == 'list':
+                elif prop_val_type_name in ['list', 'AtaAttributeTable']:
                     ret[prop_name] = []
                     for item in prop_val:
                         if type(item).__name__ in recursion_types:
@@ -227,4 +272,5 @@ def get_object_properties(obj: Any, deep_copy: bool = True, remove_private: bool
 
 
 __all__ = ['smartctl_type', 'SMARTCTL_PATH',
-           'all_in', 'any_in', 'get_object_properties']
+           'all_in', 'any_in', 'normalize_wwn', 'instance_vars',
+           'get_object_properties']
@@ -8,7 +8,7 @@ import os
 from typing import Dict, Any
 
 from pySMART import Device
-from pySMART.utils import get_object_properties
+from pySMART.serialize import to_dict
 
 from .smartctlfile import SmartctlFile
 
@@ -25,39 +25,7 @@ def update_device(folder, device_name, interface_name=None):
         dev = Device(device_name, interface=interface_name, smartctl=sf)
         json_dict['interface'] = interface_name
 
-    json_dict['values'] = get_object_properties(dev, deep_copy=True)
-
-    # Remove non serializable objects
-    to_delete = [
-        'smartctl',
-    ]
-
-    # add to list private objects
-    for entry in json_dict['values']:
-        if entry[0] == '_':
-            to_delete.append(entry)
-
-    for todel in to_delete:
-        if todel in json_dict['values']:
-            del json_dict['values'][todel]
-
-    # Transform tests
-    if 'tests' in json_dict['values']:
-        test_list = []
-        for tst in json_dict['values']['tests']:
-            if tst is None:
-                test_list.append(None)
-            else:
-                test_list.append(get_object_properties(tst))
-
-        json_dict['values']['tests'] = test_list
-
-    # Direct transform for other properties
-    to_transform = ['diagnostics']
-    for prop in json_dict['values']:
-        if prop in to_transform:
-            json_dict['values'][prop] = get_object_properties(
-                json_dict['values'][prop])
+    json_dict['values'] = to_dict(dev)
 
     with open(os.path.join(folder, 'device.json'), "w") as f:
         f.write(json.dumps(json_dict, indent=4, sort_keys=True))
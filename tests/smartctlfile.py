@@ -5,7 +5,7 @@ import re
 import os
 from pySMART.smartctl import Smartctl
 from .exceptions import SmartctlfileSampleNotFound
-from typing import Union, Tuple, List
+from typing import Optional, Sequence, Union, Tuple, List
 
 import logging
 logger = logging.getLogger('pySMART')
@@ -15,24 +15,25 @@ class SmartctlFile(Smartctl):
     """This class is just a mockup of the Smartctl class
     """
 
-    def __init__(self, smartctl_path, options: List[str] = []):
+    def __init__(self, smartctl_path, options: Sequence[str] = ()):
         """Instantiates and initializes the Smartctl wrapper."""
 
         self.smartctl_path = smartctl_path
-        self.options: List[str] = options
+        self.options: Tuple[str, ...] = tuple(options)
 
-    def generic_call(self, params: List[str], pass_options=False) -> Tuple[List[str], int]:
+    def generic_call(self, params: List[str], pass_options=False, options: Optional[Sequence[str]] = None) -> Tuple[List[str], int]:
         """Generic smartctl query
 
         Args:
             params (List[str]): The list of arguments to be passed
             pass_options (bool, optional): If true options list would be passed. Defaults to False.
+            options (Sequence[str], optional): Extra options for this call only. Defaults to None.
 
         Returns:
             Tuple[List[str], int]: A raw line-by-line output from smartctl and the process return code
         """
         if pass_options:
-            final_params = self.options + params
+            final_params = self._final_options(options) + params
         else:
             final_params = params
 
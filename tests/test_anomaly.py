@@ -0,0 +1,102 @@
+# SPDX-FileCopyrightText: 2026 pySMART contributors
+# SPDX-License-Identifier: LGPL-2.1-or-later
+
+import copy
+import json
+import os
+
+import pytest
+
+from pySMART import AnomalyDetector, Device, DeviceList
+
+from .smartctlfile import SmartctlFile
+
+single_device_tests_main_path = './tests/dataset/singletests/'
+
+HOUR = 3600.0
+
+
+def create_device(folder: str, detector=None) -> Device:
+    folder = single_device_tests_main_path + folder
+    with open(os.path.join(folder, 'device.json')) as json_file:
+        data = json.load(json_file)
+    return Device(data['name'], interface=data.get('interface'), smartctl=SmartctlFile(folder),
+                  detector=detector)
+
+
+def with_raw(dev: Device, raws, **changes):
+    """A snapshot of dev with raw values of ATA attributes changed."""
+    if_attributes = copy.deepcopy(dev.if_attributes)
+    table = if_attributes.legacyAttributes
+    for row in table.rows():
+        if row[0] in raws:
+            table.set(*row[:9], str(raws[row[0]]))
+    return dev.snapshot.replace(if_attributes=if_attributes, **changes)
+
+
+class TestAnomaly():
+
+    def test_levels(self):
+        found = []
+        detector = AnomalyDetector(callback=found.append)
+        dev = create_device('nvme_0')
+        for i in range(30):
+            assert detector.observe(dev.snapshot.replace(collected_at=i * HOUR, temperatures={1: 35 + i % 3})) == []
+        mean, std, count = detector.state(dev.serial, 'temperatures.1')
+        assert 35 < mean < 37 and 0 < std < 1 and count == 30
+
+        anomalies = detector.observe(dev.snapshot.replace(collected_at=30 * HOUR, temperatures={1: 60}))
+        assert [(a.key, a.series, a.value, a.rate) for a in anomalies] == [(dev.serial, 'temperatures.1', 60, False)]
+        # The standard deviation is floored: 60 degrees is over 20 of them away
+        assert anomalies[0].std == 1 and anomalies[0].score > 20
+        assert found == anomalies and list(detector.recent) == anomalies
+        assert repr(anomalies[0]).startswith('<Anomaly {0} temperatures.1 60 (expected 35.8 +- 1) score:'.format(dev.serial))
+
+    def test_counters(self):
+        detector = AnomalyDetector()
+        dev = create_device('sata_hdd_0_issue42')
+        # Power on hours grow steadily, CRC errors do not move
+        for i in range(30):
+            snapshot = with_raw(dev, {9: 1000 + i, 199: 0}, collected_at=i * HOUR)
+            assert detector.observe(snapshot) == []
+        assert detector.state(dev.serial, 'ata.9.raw')[0] == pytest.approx(1)
+
+        # A burst of CRC errors, while the hours keep their pace (on a longer poll interval)
+        snapshot = with_raw(dev, {9: 1031, 199: 50}, collected_at=31 * HOUR)
+        anomalies = detector.observe(snapshot)
+        assert [(a.series, a.value, a.rate) for a in anomalies] == [('ata.199.raw', 25, True)]
+        assert '/h' in repr(anomalies[0])
+
+        # Replayed or older samples are ignored, as are counter resets
+        assert detector.observe(snapshot) == []
+        assert detector.observe(with_raw(dev, {199: 0}, collected_at=32 * HOUR)) == []
+        assert detector.state(dev.serial, 'ata.199.raw')[2] == 30
+
+    def test_warmup_and_state_size(self):
+        detector = AnomalyDetector(warmup=5)
+        dev = create_device('nvme_0')
+        for i in range(4):
+            detector.observe(dev.snapshot.replace(collected_at=i * HOUR, temperatures={1: 30 + 20 * (i % 2)}))
+        state = detector._states[dev.serial]
+        size = len(state)
+        for i in range(4, 1000):
+            detector.observe(dev.snapshot.replace(collected_at=i * HOUR, temperatures={1: 35}))
+        assert len(detector._states[dev.serial]) == size
+        assert detector.state(dev.serial, 'nvme.powerOnHours') is None
+
+        detector.forget(dev.serial)
+        assert detector.state(dev.serial, 'temperatures.1') is None
+        with pytest.raises(ValueError):
+            AnomalyDetector(alpha=0)
+
+    def test_device_updates(self):
+        detector = AnomalyDetector()
+        dev = create_device('sata_hdd_0_issue42', detector=detector)
+        dev.update()
+        assert detector.state(dev.serial, 'temperature')[2] == 2
+        assert detector.state(dev.serial, 'ata.9.raw')[2] == 1
+
+        devlist = DeviceList(init=False, detector=detector)
+        assert devlist.detector is detector
+        clone = DeviceList.from_snapshot([dev.__getstate__()], revalidate=False, detector=detector)
+        assert clone.devices[0].detector is detector
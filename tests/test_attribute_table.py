@@ -0,0 +1,123 @@
+# SPDX-FileCopyrightText: 2026 pySMART contributors
+# SPDX-License-Identifier: LGPL-2.1-or-later
+
+import copy
+import pickle
+
+import pytest
+
+from pySMART import Attribute
+from pySMART.interface.ata.rawvalue import RawValue, decode_raw
+from pySMART.interface.ata.table import AtaAttributeTable
+
+rows = [
+    (1, 'Raw_Read_Error_Rate', 0x000f, '082', '066', '044',
+     'Pre-fail', 'Always', '-', '176373483'),
+    (9, 'Power_On_Hours', 0x0032, '054', '054', '000',
+     'Old_age', 'Always', '-', '40871 (186 120 0)'),
+    (194, 'Temperature_Celsius', 0x0022, '038', '051', '---',
+     'Old_age', 'Always', '-', '38 (Min/Max 20/45)'),
+    (240, 'Head_Flying_Hours', 0x0000, '100', '253', '000',
+     'Old_age', 'Offline', '-', '18446744073709551615999'),
+]
+
+
+class TestAtaAttributeTable():
+
+    def test_legacy_list_behaviour(self):
+        table = AtaAttributeTable(rows)
+
+        assert len(table) == 256
+        assert table[0] is None
+        assert table[-1] is None
+        assert [attr.num for attr in table if attr is not None] == [1, 9, 194, 240]
+        assert len(table[190:200]) == 10
+
+        legacy = [None] * 256
+        for row in rows:
+            legacy[row[0]] = Attribute(*row)
+        for attr, expected in zip(table, legacy):
+            if expected is None:
+                assert attr is None
+            else:
+                assert attr.__getstate__() == expected.__getstate__()
+                assert repr(attr) == repr(expected)
+
+    def test_lookup(self):
+        table = AtaAttributeTable(rows)
+
+        assert table.by_id(9).raw == '40871 (186 120 0)'
+        assert table.by_id(300) is None
+        assert table.by_name('Temperature_Celsius').num == 194
+        assert table.by_name('Unknown') is None
+        assert table.has(194) and not table.has(190)
+        assert table.raw_int(194) == 38
+        assert table.raw_int(240) == 18446744073709551615999
+        assert table[194].thresh is None
+
+    def test_columns(self):
+        table = AtaAttributeTable(rows)
+
+        assert list(table.ids) == [1, 9, 194, 240]
+        assert list(table.values) == [82, 54, 38, 100]
+        assert list(table.threshs) == [44, 0, -1, 0]
+        assert list(table.primaries)[:3] == [176373483, 40871, 38]
+        assert list(table.minimums) == [-32768, -32768, 20, -32768]
+        assert list(table.raw48s)[:2] == [176373483, 40871 + (120 << 32) + (186 << 40)]
+        assert table.names[2] == 'Temperature_Celsius'
+
+    def test_assignment(self):
+        table = AtaAttributeTable(rows)
+
+        table[9] = Attribute(9, 'Power_On_Hours', 0x0032, '053', '053', '000',
+                             'Old_age', 'Always', '-', '40900')
+        assert table[9].value_int == 53
+        assert table.raw_int(9) == 40900
+
+        table[1] = None
+        assert table[1] is None
+        assert table.by_name('Raw_Read_Error_Rate') is None
+        assert table.by_name('Temperature_Celsius').raw_int == 38
+
+        # Non canonical values are kept as they were
+        table.set(5, 'Odd', 0, '1', '0200', 'xyz', 'Old_age', 'Always', '-', '007')
+        assert (table[5]._value, table[5]._worst, table[5]._thresh, table[5].raw) == \
+            ('1', '0200', 'xyz', '007')
+
+    def test_copy(self):
+        table = AtaAttributeTable(rows)
+
+        for clone in [pickle.loads(pickle.dumps(table)), copy.deepcopy(table)]:
+            assert clone == table
+            assert clone.rows() == rows
+
+    def test_decoded(self):
+        table = AtaAttributeTable(rows)
+
+        assert table.decoded(194) == RawValue(primary=38, minimum=20, maximum=45)
+        assert table.decoded(194) == table[194].raw_value
+        assert table.decoded(240).primary == 18446744073709551615999
+        assert table.decoded(240).raw48 is None
+        assert table.decoded(100) is None
+
+
+class TestDecodeRaw():
+
+    @pytest.mark.parametrize("num, raw, expected", [
+        (5, '0', RawValue(primary=0, raw48=0)),
+        (5, '0x00000000001a', RawValue(primary=26, raw48=26)),
+        (194, '35 (Min/Max 20/45)', RawValue(primary=35, minimum=20, maximum=45)),
+        (194, '-5 (Min/Max -10/45 #2)', RawValue(primary=-5, minimum=-10, maximum=45)),
+        (194, '31 (0 22 0 0 0)', RawValue(primary=31, raw48=31 + (22 << 32))),
+        (240, '1369 (143 119 0)', RawValue(primary=1369, raw48=1369 + (119 << 32) + (143 << 40))),
+        (175, '2379 (861 65535)', RawValue(primary=2379, raw48=2379 + (65535 << 16) + (861 << 32))),
+        (3, '347 (Average 348)', RawValue(primary=347, raw48=347 + (348 << 16))),
+        (9, '12345h+06m+07.123s', RawValue(primary=12345, hours=12345, minutes=6, seconds=7.123)),
+        (9, '4711h+05m', RawValue(primary=4711, hours=4711, minutes=5)),
+        (9, '4711h+05m+00.000s (28 0 0)', RawValue(primary=4711, hours=4711, minutes=5, seconds=0)),
+        (235, '1/2', RawValue(primary=1, raw48=(1 << 24) + 2)),
+        (1, 'unknown 12 format', RawValue(primary=12)),
+        (1, '-', RawValue()),
+    ])
+    def test_formats(self, num, raw, expected):
+        assert decode_raw(num, raw) == expected
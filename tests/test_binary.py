@@ -0,0 +1,124 @@
+# SPDX-FileCopyrightText: 2026 pySMART contributors
+# SPDX-License-Identifier: LGPL-2.1-or-later
+
+import json
+import os
+import pickle
+
+import pytest
+
+from pySMART import Device, DeviceList, binary
+from pySMART.interface import AtaAttributes, NvmeAttributes, SCSIAttributes
+from pySMART.testentry import TestEntry as SelfTestEntry
+
+from .smartctlfile import SmartctlFile
+
+single_device_tests_main_path = './tests/dataset/singletests/'
+
+folders = [single_device_tests_main_path +
+           p for p in os.listdir(single_device_tests_main_path)]
+
+
+def create_device(folder: str) -> Device:
+    with open(os.path.join(folder, 'device.json')) as json_file:
+        data = json.load(json_file)
+    return Device(data['name'], interface=data.get('interface'), smartctl=SmartctlFile(folder))
+
+
+class TestBinary():
+
+    @pytest.mark.parametrize("folder", folders)
+    def test_device_roundtrip(self, folder):
+        dev = create_device(folder)
+
+        clone = binary.loads(binary.dumps(dev))
+
+        assert isinstance(clone, Device)
+        assert clone.__getstate__() == dev.__getstate__()
+        assert type(clone.if_attributes) is type(dev.if_attributes)
+        assert clone.dev_interface == dev.dev_interface
+        assert clone.attributes == dev.attributes
+        assert all(isinstance(test, SelfTestEntry) for test in clone.tests)
+
+    @pytest.mark.parametrize("folder", folders)
+    def test_json_roundtrip(self, folder):
+        # The binary format goes through __setstate__, which also loads json payloads
+        dev = create_device(folder)
+        state = json.loads(json.dumps(dev._full_state()))
+
+        clone = Device.__new__(Device)
+        clone.__setstate__(state)
+
+        assert json.loads(json.dumps(clone._full_state())) == state
+        assert clone.temperatures == dev.temperatures
+
+        # Plain __getstate__ payloads load too
+        public = json.loads(json.dumps(dev.__getstate__()))
+        clone = Device.__new__(Device)
+        clone.__setstate__(public)
+        assert json.loads(json.dumps(clone.__getstate__())) == public
+
+    def test_public_state_shape(self):
+        # The reconstruction data stays out of the public __getstate__ json
+        dev = create_device(single_device_tests_main_path + 'sas_ssd_0_issue_57')
+        assert sorted(dev.__getstate__()) == [
+            'alternate_paths', 'attributes', 'capacity', 'diagnostics', 'firmware', 'if_attributes',
+            'interface', 'is_ssd', 'messages', 'model', 'name', 'path', 'rotation_rate', 'serial',
+            'smart_capable', 'smart_enabled', 'smart_status', 'temperature', 'test_capabilities',
+            'tests', 'wwn']
+        assert list(dev.if_attributes.__getstate__()) == ['legacyDiagnostics']
+        assert 'format' not in dev.tests[0].__getstate__()
+        assert dev.tests[0]._full_state()['format'] == 'scsi'
+
+    def test_pickle_keeps_interface_objects(self):
+        for folder, cls in [('sata_hdd_0_issue42', AtaAttributes),
+                            ('nvme_0', NvmeAttributes),
+                            ('sas_hdd_0_issue_51', SCSIAttributes)]:
+            dev = create_device(single_device_tests_main_path + folder)
+
+            clone = pickle.loads(pickle.dumps(dev))
+
+            assert isinstance(clone.if_attributes, cls)
+            assert clone.if_attributes.__getstate__() == dev.if_attributes.__getstate__()
+            assert repr(clone) == repr(dev)
+            assert clone.family == dev.family and clone.snapshot.collected_at == dev.snapshot.collected_at
+
+    def test_device_list_roundtrip(self):
+        devlist = DeviceList(init=False)
+        devlist.devices = [create_device(folder) for folder in folders]
+
+        payload = binary.dumps(devlist)
+        clone = binary.loads(payload)
+
+        assert isinstance(clone, DeviceList)
+        assert [d.__getstate__() for d in clone.devices] == \
+            [d.__getstate__() for d in devlist.devices]
+        # Far smaller than the json payload
+        assert len(payload) * 4 < len(json.dumps([d.__getstate__() for d in devlist.devices]))
+
+    @pytest.mark.parametrize("value", [
+        None, True, False, 0, 127, 128, -1, -2 ** 70, 2 ** 70, 1.5, -0.25, '', 'ü',
+        [None] * 10 + [1], [1, None, 'a'], {}, {1: 'a', 'x': [True, False]},
+        [{'a': 1, 'b': 2}, {'a': 3, 'b': 4}, {'b': 5, 'a': 6}],
+        ['s{0}'.format(i % 150) for i in range(300)],
+    ])
+    def test_encode_values(self, value):
+        assert binary.decode(binary.encode(value)) == value
+
+    def test_unsupported_values(self):
+        with pytest.raises(TypeError):
+            binary.encode(object())
+        with pytest.raises(TypeError):
+            binary.dumps({})
+
+    def test_invalid_payloads(self):
+        payload = binary.dumps(create_device(single_device_tests_main_path + 'nvme_0'))
+
+        with pytest.raises(ValueError):
+            binary.loads(b'{"json": true}')
+        with pytest.raises(ValueError):
+            binary.loads(payload[:len(payload) // 2])
+        newer = bytearray(payload)
+        newer[len(binary.MAGIC)] = binary.VERSION + 1
+        with pytest.raises(ValueError):
+            binary.loads(bytes(newer))
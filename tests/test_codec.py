@@ -0,0 +1,78 @@
+# SPDX-FileCopyrightText: 2026 pySMART contributors
+# SPDX-License-Identifier: LGPL-2.1-or-later
+
+import math
+import random
+
+import pytest
+
+from pySMART import codec
+
+
+class TestCodec():
+
+    @pytest.mark.parametrize("values", [
+        [],
+        [0],
+        [None, None, 3],
+        [1000 + i for i in range(100)],
+        [5] * 1000,
+        [-2 ** 70, 2 ** 70, 0, -1, 1, None],
+    ])
+    def test_ints(self, values):
+        assert codec.decode_values(codec.encode_values(values)) == values
+
+    @pytest.mark.parametrize("values", [
+        [],
+        [0.0, -0.0, 0.0],
+        [None, 1.5, None, 1.5],
+        [1.5] * 100 + [2.25],
+        [math.inf, -math.inf, 1e-300, 1e300],
+        [random.Random(1).random() for _ in range(100)],
+    ])
+    def test_floats(self, values):
+        decoded = codec.decode_values(codec.encode_values(values, floats=True), floats=True)
+        assert [math.copysign(1, v) if v == 0 else v for v in decoded] == \
+            [math.copysign(1, v) if v == 0 else v for v in values]
+
+    def test_float_nan(self):
+        decoded = codec.decode_values(codec.encode_values([math.nan, 1.0], floats=True), floats=True)
+        assert math.isnan(decoded[0]) and decoded[1] == 1.0
+
+    def test_timestamps(self):
+        rng = random.Random(2)
+        timestamps = [1.7e9 + 60 * i + rng.random() / 100 for i in range(1000)]
+
+        data = codec.encode_timestamps(timestamps)
+
+        decoded = list(codec.decode_timestamps(data))
+        assert all(abs(a - b) <= 0.0005 for a, b in zip(decoded, timestamps))
+        assert len(decoded) == 1000
+        # Millisecond jitter on a steady interval: a couple of bytes each
+        assert len(data) < 2.5 * len(timestamps)
+        # A perfectly steady interval collapses into a run
+        assert len(codec.encode_timestamps([60.0 * i for i in range(10000)])) < 10
+
+    def test_counters(self):
+        # A counter moving at a steady rate, then stopping
+        values = [123456789 + 7 * i for i in range(5000)] + [123456789 + 7 * 5000] * 5000
+
+        data = codec.encode_values(values)
+
+        assert codec.decode_values(data) == values
+        assert len(data) < 20
+
+    def test_streaming(self):
+        encoder = codec.IntEncoder()
+        for value in range(10):
+            encoder.append(value)
+        first = encoder.finish()
+        encoder.append(None)
+        encoder.append(100)
+
+        assert list(codec.decode_ints(first)) == list(range(10))
+        assert list(codec.decode_ints(encoder.finish())) == list(range(10)) + [None, 100]
+        assert encoder.count == 12
+
+        decoded = codec.decode_ints(encoder.finish())
+        assert next(decoded) == 0 and next(decoded) == 1
@@ -0,0 +1,164 @@
+# SPDX-FileCopyrightText: 2026 pySMART contributors
+# SPDX-License-Identifier: LGPL-2.1-or-later
+
+import io
+import json
+import os
+import socket
+import time
+
+import pytest
+
+from pySMART import Device, DeviceList
+from pySMART.daemon import Client, Daemon, DaemonError, RemoteDevice, RemoteDeviceList, _frame, _Handler
+from pySMART.history import HistoryStore
+
+from .smartctlfile import SmartctlFile
+
+pytestmark = pytest.mark.skipif(not hasattr(socket, 'AF_UNIX'), reason='Unix sockets are not supported')
+
+single_device_tests_main_path = './tests/dataset/singletests/'
+
+
+def create_device(folder: str) -> Device:
+    folder = single_device_tests_main_path + folder
+    with open(os.path.join(folder, 'device.json')) as json_file:
+        data = json.load(json_file)
+    return Device(data['name'], interface=data.get('interface'), smartctl=SmartctlFile(folder))
+
+
+def create_list(*folders: str) -> DeviceList:
+    devlist = DeviceList(init=False)
+    devlist.devices = [create_device(folder) for folder in folders]
+    return devlist
+
+
+def wait_generation(client: Client, generation: int) -> None:
+    deadline = time.monotonic() + 10
+    while client.status()['generation'] < generation and time.monotonic() < deadline:
+        time.sleep(0.01)
+
+
+class TestDaemon():
+
+    def test_devices(self, tmp_path):
+        path = str(tmp_path / 's.sock')
+        local = create_list('sata_hdd_0_issue42', 'nvme_0')
+        daemon = Daemon(path, local, interval=3600, history=HistoryStore(str(tmp_path / 'h')))
+        daemon.start()
+        try:
+            with Client(path) as client:
+                wait_generation(client, 2)
+                status = client.status()
+                assert status['devices'] == 2 and status['collections'] == 1 and status['history']
+
+                devlist = client.devices()
+                assert isinstance(devlist, RemoteDeviceList) and devlist.generation == 2
+                hdd, nvme = local.devices
+                remote = next(device for device in devlist.devices if device.name == hdd.name)
+                assert isinstance(remote, RemoteDevice)
+                assert (remote.name, remote.serial, remote.temperature) == (hdd.name, hdd.serial, hdd.temperature)
+                assert remote.if_attributes.legacyAttributes[5].raw == hdd.if_attributes.legacyAttributes[5].raw
+                assert devlist.devices[0].if_attributes.percentageUsed == nvme.if_attributes.percentageUsed
+
+                # Nothing new: the devices are kept as they are
+                devices = list(devlist.devices)
+                devlist.update()
+                assert devlist.devices == devices and devlist.devices[1] is remote
+
+                # Found by serial or path too
+                assert client.device(nvme.serial).name == nvme.name
+                assert client.device(hdd.dev_reference).serial == hdd.serial
+                assert remote.update(return_changes=True) is not None
+                with pytest.raises(KeyError):
+                    client.device('missing')
+
+                generation, changes = client.changes()
+                assert generation == 2 and changes == {}
+
+                with pytest.raises(NotImplementedError):
+                    remote.run_selftest()
+                with pytest.raises(NotImplementedError):
+                    remote.smart_toggle('on')
+        finally:
+            daemon.stop()
+        assert not os.path.exists(path)
+
+    def test_history(self, tmp_path):
+        path = str(tmp_path / 's.sock')
+        daemon = Daemon(path, create_list('sata_hdd_0_issue42'), interval=3600,
+                        history=HistoryStore(str(tmp_path / 'h')))
+        daemon.start()
+        try:
+            with Client(path) as client:
+                wait_generation(client, 2)
+                serial = client.devices().devices[0].serial
+                assert 'temperature' in client.series(serial)
+
+                found = client.history(serial, ['temperature', 'ata.5.raw'])
+                temperature = found['temperature']
+                assert len(temperature) == 1 and temperature.timestamps[0] > 0
+                assert list(found['ata.5.raw'].values) == [0]
+
+                aggregates = client.aggregate(serial, 'temperature', step=3600)
+                assert aggregates.step == 3600 and aggregates.count == [1]
+                assert aggregates.maximum == list(temperature.values)
+
+                with pytest.raises(ValueError):
+                    client.call('reboot')
+        finally:
+            daemon.stop()
+
+        # Without a store, history requests are refused
+        daemon = Daemon(path, create_list('nvme_0'), interval=3600)
+        daemon.listen()
+        try:
+            with Client(path) as client:
+                assert client.status()['history'] is False
+                with pytest.raises(ValueError):
+                    client.series('any')
+        finally:
+            daemon.stop()
+        with pytest.raises(DaemonError):
+            Client(path, timeout=1).status()
+
+    def test_single_daemon(self, tmp_path):
+        path = str(tmp_path / 's.sock')
+        # A socket file left behind by a daemon that did not stop cleanly is replaced
+        stale = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        stale.bind(path)
+        stale.close()
+        daemon = Daemon(path, create_list('nvme_0'), interval=3600)
+        daemon.listen()
+        try:
+            # The socket of a running daemon is not taken over
+            with pytest.raises(DaemonError, match='already running'):
+                Daemon(path, create_list('nvme_0'), interval=3600).listen()
+            with Client(path) as client:
+                assert client.status()['devices'] == 1
+        finally:
+            daemon.stop()
+
+    def test_client_gone(self):
+        class GoneStream(io.BytesIO):
+            def write(self, data):
+                raise BrokenPipeError('client gone')
+
+        class Server():
+            owner = Daemon('unused', create_list('nvme_0'), interval=3600)
+
+        handler = _Handler.__new__(_Handler)
+        handler.server = Server()
+        handler.rfile = io.BytesIO(_frame({'op': 'status'}) * 2)
+        handler.wfile = GoneStream()
+        # The connection is dropped, without a traceback
+        handler.handle()
+        assert handler.rfile.tell() == len(_frame({'op': 'status'}))
+
+    def test_unsupported_platform(self, tmp_path, monkeypatch):
+        monkeypatch.delattr(socket, 'AF_UNIX')
+        daemon = Daemon(str(tmp_path / 's.sock'), create_list('nvme_0'), interval=3600)
+        with pytest.raises(DaemonError, match='not supported'):
+            daemon.listen()
+        with pytest.raises(DaemonError, match='not supported'):
+            Client(str(tmp_path / 's.sock')).status()
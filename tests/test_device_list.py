@@ -1,15 +1,46 @@
 # SPDX-FileCopyrightText: 2021 Rafael Leira, Naudit HPCN S.L.
 # SPDX-License-Identifier: LGPL-2.1-or-later
 
+import asyncio
 import json
 import os
 import pytest
+import threading
+import time
+from typing import Optional
 
-from pySMART import Device, DeviceList
+from pySMART import Device, DeviceList, DeviceError, binary
+from pySMART.quarantine import Quarantine, QuarantinedError
 from pySMART.utils import get_object_properties
 
 from .smartctlfile import SmartctlFile
 
+
+class SlowSmartctlFile(SmartctlFile):
+    """Smartctl mockup that takes `delay` seconds to answer calls about `slow_device`
+    (only the ones with `slow_option`, if set), or that blocks them until `released`
+    is set if `delay` is None
+    """
+
+    def __init__(self, smartctl_path, slow_device: str, delay: Optional[float],
+                 slow_option: Optional[str] = None):
+        super().__init__(smartctl_path)
+        self.slow_device = slow_device
+        self.delay = delay
+        self.slow_option = slow_option
+        self.slow_calls = 0
+        self.released = threading.Event()
+
+    def generic_call(self, params, pass_options=False, options=None):
+        if self.slow_device in params and (self.slow_option is None or self.slow_option in params):
+            self.slow_calls += 1
+            if self.delay is None:
+                self.released.wait()
+            else:
+                time.sleep(self.delay)
+        return super().generic_call(params, pass_options, options)
+
+
 # discover tests
 
 single_device_tests_main_path = './tests/dataset/listingtests/'
@@ -32,11 +63,9 @@ class TestListDevice():
     def create_list_device(self, folder: str, data: dict) -> DeviceList:
         sf = SmartctlFile(folder)
 
-        if 'init' not in data:
-            return DeviceList(smartctl=sf)
-
-        else:
-            return DeviceList(init=data['init'], smartctl=sf)
+        return DeviceList(init=data.get('init', True),
+                          smartctl=sf,
+                          deduplicate=data.get('deduplicate', False))
 
     @pytest.mark.parametrize("folder", folders)
     def test_list_devices(self, folder):
@@ -47,3 +76,238 @@ class TestListDevice():
 
         # Check that the number of devices is correct
         assert len(device_data.devices) == data['count']
+
+    @pytest.mark.parametrize("folder", folders)
+    def test_list_alternate_paths(self, folder):
+
+        data = self.get_device_data(folder)
+
+        device_data: DeviceList = self.create_list_device(folder, data)
+
+        if 'alternate_paths' in data:
+            for dev in device_data.devices:
+                assert dev.alternate_paths == data['alternate_paths'].get(
+                    dev.name, [])
+
+    @pytest.mark.parametrize("max_workers", [1, 4])
+    @pytest.mark.parametrize("folder", folders)
+    def test_iter_devices(self, folder, max_workers):
+
+        data = self.get_device_data(folder)
+
+        device_data: DeviceList = self.create_list_device(folder, data)
+        streamed = list(device_data.iter_devices(max_workers=max_workers))
+
+        assert all(isinstance(dev, Device) for dev in streamed)
+        assert sorted(dev.name for dev in streamed) == [
+            dev.name for dev in device_data.devices]
+        # Streaming does not fill the list
+        assert len(device_data.devices) == data['count']
+
+    @pytest.mark.parametrize("folder", folders)
+    def test_aiter_devices(self, folder):
+
+        data = self.get_device_data(folder)
+
+        device_data: DeviceList = self.create_list_device(folder, data)
+
+        async def collect():
+            return [dev async for dev in device_data.aiter_devices(max_workers=2)]
+
+        streamed = asyncio.run(collect())
+
+        assert sorted(dev.name for dev in streamed) == [
+            dev.name for dev in device_data.devices]
+
+    def test_iter_devices_errors(self):
+        # Without deduplication, the second path has no dataset: it must fail
+        folder = single_device_tests_main_path + 'linux_multipath_sas'
+        device_list = DeviceList(init=False, smartctl=SmartctlFile(folder))
+
+        streamed = list(device_list.iter_devices())
+        errors = [dev for dev in streamed if isinstance(dev, DeviceError)]
+
+        assert len(streamed) == 2
+        assert len(errors) == 1 and errors[0].name == '/dev/sdzz'
+
+        with pytest.raises(Exception):
+            list(device_list.iter_devices(catch_errors=False))
+
+    def test_identity_queries_in_parallel(self):
+        folder = single_device_tests_main_path + 'linux_multipath_sas'
+        # Both paths must be identified at the same time to pass the barrier
+        barrier = threading.Barrier(2, timeout=5)
+
+        class ParallelSmartctlFile(SmartctlFile):
+            def generic_call(self, params, pass_options=False, options=None):
+                if '--info' in params:
+                    barrier.wait()
+                return super().generic_call(params, pass_options, options)
+
+        device_list = DeviceList(smartctl=ParallelSmartctlFile(folder), deduplicate=True, init=False)
+        device_list.initialize(max_workers=2)
+
+        assert not barrier.broken
+        assert [(dev.name, dev.alternate_paths) for dev in device_list.devices] == [('sdzy', ['/dev/sdzz'])]
+
+    def test_initialize_deadline(self):
+        folder = single_device_tests_main_path + 'linux_multiple_devices'
+        # The slow device never answers: only the deadline can end the collection
+        sf = SlowSmartctlFile(folder, '/dev/nvme1', None)
+        try:
+            device_list = DeviceList(init=False, smartctl=sf)
+            device_list.initialize(max_workers=3, deadline=1)
+
+            assert sf.slow_calls == 1 and not sf.released.is_set()
+            assert sorted(dev.name for dev in device_list.devices) == [
+                'bus/0', 'nvme0']
+            assert device_list.timed_out == ['/dev/nvme1']
+        finally:
+            sf.released.set()
+
+    def test_deadline_includes_identity_queries(self):
+        folder = single_device_tests_main_path + 'linux_multiple_devices'
+        # The identity query of the slow device never answers (unless the deadline is ignored)
+        sf = SlowSmartctlFile(folder, '/dev/nvme1', None, slow_option='--info')
+        safety = threading.Timer(10, sf.released.set)
+        safety.start()
+        try:
+            device_list = DeviceList(init=False, smartctl=sf, deduplicate=True)
+            device_list.initialize(max_workers=3, deadline=1)
+
+            # Nothing is grouped before the deadline, so nothing is collected
+            assert not sf.released.is_set() and sf.slow_calls == 1
+            assert device_list.devices == []
+            assert sorted(device_list.timed_out) == ['/dev/bus/0', '/dev/nvme0', '/dev/nvme1']
+        finally:
+            safety.cancel()
+            sf.released.set()
+
+    def test_deadline_reuses_stale_devices(self):
+        folder = single_device_tests_main_path + 'linux_multiple_devices'
+        sf = SlowSmartctlFile(folder, '/dev/nvme1', 0)
+
+        device_list = DeviceList(smartctl=sf)
+        assert not any(dev.stale for dev in device_list.devices)
+
+        sf.delay = None
+        try:
+            device_list.initialize(max_workers=3, deadline=1)
+            assert len(device_list.devices) == 3
+            assert device_list.timed_out == []
+            assert [dev.name for dev in device_list.devices if dev.stale] == [
+                'nvme1']
+
+            device_list.update(max_workers=3, deadline=1)
+            assert [dev.name for dev in device_list.devices if dev.stale] == [
+                'nvme1']
+
+            device_list.update(max_workers=3, deadline=1, reuse_stale=False)
+            assert [dev.name for dev in device_list.devices] == ['bus/0', 'nvme0']
+            assert device_list.timed_out == ['/dev/nvme1']
+        finally:
+            sf.released.set()
+
+    def test_quarantine_serves_last_known_data(self):
+        folder = single_device_tests_main_path + 'linux_multiple_devices'
+        sf = SlowSmartctlFile(folder, '/dev/nvme1', 0.6)
+        quarantine = Quarantine(max_failures=2, slow_threshold=0.3,
+                                base_backoff=3600)
+
+        device_list = DeviceList(smartctl=sf, quarantine=quarantine)
+        assert len(device_list.devices) == 3
+        device_list.update()
+        assert list(quarantine.quarantined) == ['nvme1']
+
+        # Quarantined devices are not queried anymore
+        calls = sf.slow_calls
+        device_list.update()
+        device_list.initialize()
+        assert sf.slow_calls == calls
+
+        assert len(device_list.devices) == 3
+        assert [dev.name for dev in device_list.devices if dev.stale] == [
+            'nvme1']
+        assert [err.name for err in device_list.iter_devices()
+                if isinstance(err, DeviceError) and err.quarantined] == ['/dev/nvme1']
+        with pytest.raises(QuarantinedError):
+            list(device_list.iter_devices(catch_errors=False))
+
+        # Without last known data, skipped devices are reported
+        cold = DeviceList(smartctl=sf, quarantine=quarantine)
+        assert [dev.name for dev in cold.devices] == ['bus/0', 'nvme0']
+        assert cold.quarantined == ['/dev/nvme1'] and cold.timed_out == []
+        assert sf.slow_calls == calls
+
+    def test_quarantine_skips_identity_queries(self):
+        folder = single_device_tests_main_path + 'linux_multipath_sas'
+        sf = SlowSmartctlFile(folder, '/dev/sdzy', 0)
+        quarantine = Quarantine(max_failures=1, base_backoff=3600)
+        quarantine.record('sdzy', 0, OSError('smartctl hung'))
+
+        device_list = DeviceList(init=False, smartctl=sf, deduplicate=True, quarantine=quarantine)
+        streamed = list(device_list.iter_devices())
+
+        # The quarantined path is not even identified: the other one is queried alone
+        assert sf.slow_calls == 0
+        assert [(err.name, err.quarantined) for err in streamed] == [('/dev/sdzy', True), ('/dev/sdzz', False)]
+
+    def test_from_snapshot_warm_start(self):
+        folder = single_device_tests_main_path + 'linux_multiple_devices'
+        device_list = DeviceList(smartctl=SmartctlFile(folder))
+        # The binary format keeps the collection times
+        payload = binary.dumps(device_list)
+
+        sf = SlowSmartctlFile(folder, '/dev/nvme1', 0.2)
+        warm = DeviceList.from_snapshot(payload, smartctl=sf)
+
+        # Served at once, from the persisted data
+        assert [dev.name for dev in warm.devices] == [
+            dev.name for dev in device_list.devices]
+        assert [dev.serial for dev in warm.devices] == [
+            dev.serial for dev in device_list.devices]
+        assert all(dev.stale for dev in warm.devices)
+
+        warm.revalidation.join(timeout=5)
+        assert not warm.revalidation.is_alive()
+        assert not any(dev.stale for dev in warm.devices)
+        assert all(dev.snapshot.collected_at > old.snapshot.collected_at
+                   for dev, old in zip(warm.devices, device_list.devices))
+
+    def test_from_snapshot_fastest_first(self):
+        folder = single_device_tests_main_path + 'linux_multiple_devices'
+        device_list = DeviceList(smartctl=SmartctlFile(folder))
+        payload = [dev.__getstate__() for dev in device_list.devices]
+        durations = {'bus/0': 5.0, 'nvme0': None, 'nvme1': 0.01}
+        for state in payload:
+            state['collect_duration'] = durations[state['name']]
+
+        order = []
+
+        class RecordingSmartctlFile(SmartctlFile):
+            def generic_call(self, params, pass_options=False, options=None):
+                if params[-1] not in order:
+                    order.append(params[-1])
+                return super().generic_call(params, pass_options, options)
+
+        warm = DeviceList.from_snapshot(payload, smartctl=RecordingSmartctlFile(folder))
+        warm.revalidation.join(timeout=5)
+
+        assert order == ['/dev/nvme1', '/dev/bus/0', '/dev/nvme0']
+
+    def test_from_snapshot_binary(self):
+        folder = single_device_tests_main_path + 'linux_multiple_devices'
+        device_list = DeviceList(smartctl=SmartctlFile(folder))
+        sf = SlowSmartctlFile(folder, '/dev/nvme1', 0)
+
+        warm = DeviceList.from_snapshot(binary.dumps(device_list), smartctl=sf,
+                                        revalidate=False)
+
+        assert warm.revalidation is None
+        assert sf.slow_calls == 0
+        assert all(dev.stale and dev.smartctl is sf for dev in warm.devices)
+        assert [dev.__getstate__()['if_attributes'] for dev in warm.devices] == \
+            [dev.__getstate__()['if_attributes'] for dev in device_list.devices]
+
+        with pytest.raises(ValueError):
+            DeviceList.from_snapshot(binary.dumps(device_list.devices[0]))
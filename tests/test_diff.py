@@ -0,0 +1,144 @@
+# SPDX-FileCopyrightText: 2026 pySMART contributors
+# SPDX-License-Identifier: LGPL-2.1-or-later
+
+import copy
+import json
+import os
+
+import pytest
+
+from pySMART import Device
+from pySMART.diff import SnapshotDiff, diff_snapshots
+from pySMART.interface.ata.table import AtaAttributeTable
+from pySMART.testentry import TestEntry as SelfTestEntry
+
+from .smartctlfile import SmartctlFile
+
+single_device_tests_main_path = './tests/dataset/singletests/'
+
+folders = [single_device_tests_main_path +
+           p for p in os.listdir(single_device_tests_main_path)]
+
+
+def create_device(folder: str) -> Device:
+    with open(os.path.join(folder, 'device.json')) as json_file:
+        data = json.load(json_file)
+    return Device(data['name'], interface=data.get('interface'), smartctl=SmartctlFile(folder))
+
+
+class TestDiff():
+
+    @pytest.mark.parametrize("folder", folders)
+    def test_same_output_no_changes(self, folder):
+        dev = create_device(folder)
+        old = dev.snapshot
+
+        changes = dev.update(return_changes=True)
+
+        assert isinstance(changes, SnapshotDiff)
+        assert not changes
+        assert dev.snapshot is not old
+        assert dev.update() is None
+
+    def test_fields_and_health(self):
+        dev = create_device(single_device_tests_main_path + 'sata_hdd_0_issue42')
+        old = dev.snapshot
+
+        changes = diff_snapshots(old, old.replace(assessment='FAIL', firmware='NEW'))
+
+        assert changes.fields == {'assessment': (old.assessment, 'FAIL'),
+                                  'firmware': (old.firmware, 'NEW')}
+        assert changes.health_changed
+        assert not diff_snapshots(old, old.replace(firmware='NEW')).health_changed
+        assert not diff_snapshots(old, old)
+
+    def test_ata_attributes(self):
+        dev = create_device(single_device_tests_main_path + 'sata_hdd_0_issue42')
+        old = dev.snapshot
+        if_attributes = copy.deepcopy(old.if_attributes)
+        table = if_attributes.legacyAttributes
+        attr = table[194]
+        table.set(194, attr.name, attr.flags, '050', attr._worst, attr._thresh, attr.type,
+                  attr.updated, attr.when_failed, '50')
+
+        changes = diff_snapshots(old, old.replace(if_attributes=if_attributes))
+
+        assert list(changes.attributes) == [194]
+        before, after = changes.attributes[194]
+        assert before.raw == attr.raw
+        assert after.value == '050' and after.raw == '50'
+        assert not changes.fields
+
+    def test_table_changed(self):
+        dev = create_device(single_device_tests_main_path + 'sata_hdd_0_issue42')
+        table = dev.attributes
+        other = AtaAttributeTable(table.rows())
+
+        assert table.changed(other) == []
+        other.remove(194)
+        assert table.changed(other) == [194]
+        assert other.changed(table) == [194]
+
+    def test_new_tests(self):
+        dev = create_device(single_device_tests_main_path + 'sata_hdd_0_issue42')
+        old = dev.snapshot
+        assert old.tests
+        newest = SelfTestEntry('ata', 1, 'Short offline', 'Completed without error', '00%',
+                               '99999', None)
+
+        changes = diff_snapshots(old, old.replace(tests=[newest] + old.tests[:-1]))
+
+        assert changes.new_tests == [newest]
+        # The same entries, renumbered: nothing new
+        assert not diff_snapshots(old, old.replace(tests=list(old.tests)))
+
+    def test_nvme_counters_and_errors(self):
+        dev = create_device(single_device_tests_main_path + 'nvme_0')
+        old = dev.snapshot
+        if_attributes = copy.deepcopy(old.if_attributes)
+        if_attributes.percentageUsed = (if_attributes.percentageUsed or 0) + 1
+        error = copy.copy(if_attributes.errors[0]) if if_attributes.errors else None
+
+        if error is not None:
+            error.errCount += 1
+            if_attributes.errors.insert(0, error)
+
+        changes = diff_snapshots(old, old.replace(if_attributes=if_attributes))
+
+        assert changes.counters['percentageUsed'] == (old.if_attributes.percentageUsed,
+                                                      if_attributes.percentageUsed)
+        assert changes.new_errors == ([error] if error is not None else [])
+
+    @pytest.mark.parametrize("folder", ['sata_hdd_0_issue42', 'nvme_0', 'sas_ssd_0_issue_57'])
+    def test_first_seen_interface(self, folder):
+        new = create_device(single_device_tests_main_path + folder).snapshot
+        if_attributes = new.if_attributes
+
+        changes = diff_snapshots(new.replace(if_attributes=None), new)
+
+        # Every known value is reported, whatever the interface
+        assert changes
+        if folder.startswith('sata'):
+            assert all(old is None for old, _ in changes.attributes.values())
+            assert sorted(changes.attributes) == sorted(if_attributes.legacyAttributes.ids)
+        elif folder.startswith('nvme'):
+            assert changes.counters['percentageUsed'] == (None, if_attributes.percentageUsed)
+            assert changes.new_errors == list(if_attributes.errors)
+        else:
+            diagnostics = if_attributes.diagnostics
+            assert changes.counters and all(old is None for old, _ in changes.counters.values())
+            assert all(getattr(diagnostics, name) == value for name, (_, value) in changes.counters.items())
+
+    def test_as_dict(self):
+        dev = create_device(single_device_tests_main_path + 'sata_hdd_0_issue42')
+        old = dev.snapshot
+        if_attributes = copy.deepcopy(old.if_attributes)
+        if_attributes.legacyAttributes.remove(194)
+
+        changes = diff_snapshots(old, old.replace(if_attributes=if_attributes, assessment='FAIL'))
+        data = json.loads(json.dumps(changes.as_dict()))
+
+        assert data['fields'] == {'assessment': [old.assessment, 'FAIL']}
+        assert data['attributes']['194'][1] is None
+        assert data['attributes']['194'][0]['name'] == 'Temperature_Celsius'
+        assert 'new_tests' not in data
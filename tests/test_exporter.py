@@ -0,0 +1,114 @@
+# SPDX-FileCopyrightText: 2026 pySMART contributors
+# SPDX-License-Identifier: LGPL-2.1-or-later
+
+import gzip
+import json
+import os
+import time
+import urllib.request
+
+from pySMART import Device, DeviceList
+from pySMART.exporter import OPENMETRICS_TYPE, TEXT_TYPE, Exporter, render
+
+from .smartctlfile import SmartctlFile
+
+single_device_tests_main_path = './tests/dataset/singletests/'
+
+
+def create_device(folder: str) -> Device:
+    folder = single_device_tests_main_path + folder
+    with open(os.path.join(folder, 'device.json')) as json_file:
+        data = json.load(json_file)
+    return Device(data['name'], interface=data.get('interface'), smartctl=SmartctlFile(folder))
+
+
+def create_list(*folders: str) -> DeviceList:
+    devlist = DeviceList(init=False)
+    devlist.devices = [create_device(folder) for folder in folders]
+    return devlist
+
+
+class TestExporter():
+
+    def test_render(self):
+        hdd, nvme, sas = (create_device(folder) for folder in ['sata_hdd_0_issue42', 'nvme_0', 'sas_hdd_0_issue_51'])
+        text = render([hdd, nvme, sas.snapshot.replace(assessment='FAIL')])
+        lines = text.splitlines()
+
+        hdd_labels = 'device="{0}",serial="{1}"'.format(hdd.name, hdd.serial)
+        nvme_labels = 'device="{0}",serial="{1}"'.format(nvme.name, nvme.serial)
+        sas_labels = 'device="{0}",serial="{0}"'.format(sas.serial)
+        assert 'pysmart_device_info{{{0},model="{1}",firmware="{2}",interface="ata",wwn="{3}"}} 1'.format(
+            hdd_labels, hdd.model, hdd.firmware, hdd.wwn) in lines
+        assert 'pysmart_ata_attribute_raw{{{0},id="5",name="Reallocated_Sector_Ct"}} 0'.format(hdd_labels) in lines
+        assert 'pysmart_ata_attribute_value{{{0},id="199",name="UDMA_CRC_Error_Count"}} 200'.format(
+            hdd_labels) in lines
+        assert 'pysmart_temperature_celsius{{{0}}} {1}'.format(hdd_labels, hdd.temperature) in lines
+        assert 'pysmart_nvme_percentage_used{{{0}}} {1}'.format(
+            nvme_labels, nvme.if_attributes.percentageUsed) in lines
+        assert 'pysmart_temperature_sensor_celsius{{{0},sensor="1"}} 42'.format(nvme_labels) in lines
+        assert 'pysmart_scsi_reallocated_sector_ct{{{0}}} 0'.format(sas_labels) in lines
+        assert 'pysmart_health{{{0},state="FAIL"}} 1'.format(sas_labels) in lines
+        assert 'pysmart_health{{{0},state="PASS"}} 0'.format(sas_labels) in lines
+        assert 'pysmart_selftest_running{{{0}}} 1'.format(hdd_labels) in lines
+        assert 'pysmart_selftest_failed{{{0}}} 0'.format(hdd_labels) in lines
+
+        # Every family is declared once, before its samples
+        declared = [line.split()[2] for line in lines if line.startswith('# TYPE')]
+        assert len(declared) == len(set(declared))
+        family = None
+        for line in lines:
+            if line.startswith('# TYPE'):
+                family = line.split()[2]
+            elif not line.startswith('#'):
+                assert line.startswith(family + '{')
+        # Labels are escaped
+        assert 'serial="a\\"b\\\\c"' in render([hdd.snapshot.replace(serial='a"b\\c')])
+
+    def test_collect_and_cache(self, monkeypatch):
+        exporter = Exporter(create_list('sata_hdd_0_issue42', 'nvme_0'), interval=3600)
+        # Rendered at once from the last known values, before any collection
+        text = exporter.exposition(openmetrics=False)
+        assert b'pysmart_exporter_devices 2\n' in text and b'pysmart_exporter_collections 0\n' in text
+        assert exporter.exposition() == text + b'# EOF\n'
+        assert gzip.decompress(exporter.exposition(compressed=True)) == exporter.exposition()
+
+        exporter.collect()
+        text = exporter.exposition()
+        assert b'pysmart_exporter_collections 1\n' in text and b'pysmart_exporter_collection_errors 0\n' in text
+        # Cached between collections
+        assert exporter.exposition() is text
+
+        def broken(**kwargs):
+            raise RuntimeError('broken')
+        monkeypatch.setattr(exporter.devices, 'update', broken)
+        exporter.collect()
+        assert b'pysmart_exporter_collection_errors 1\n' in exporter.exposition()
+        assert b'pysmart_ata_attribute_raw' in exporter.exposition()
+        assert repr(exporter) == '<Exporter devices:2 collections:2 interval:3600>'
+
+    def test_serve(self):
+        exporter = Exporter(create_list('sata_hdd_0_issue42'), interval=3600)
+        exporter.start()
+        server = exporter.serve(port=0)
+        try:
+            deadline = time.monotonic() + 10
+            while b'pysmart_exporter_collections 1\n' not in exporter.exposition() and time.monotonic() < deadline:
+                time.sleep(0.01)
+            url = 'http://127.0.0.1:{0}/metrics'.format(server.server_address[1])
+
+            with urllib.request.urlopen(url) as response:
+                assert response.headers['Content-Type'] == TEXT_TYPE
+                assert response.read() == exporter.exposition(openmetrics=False)
+
+            request = urllib.request.Request(url, headers={
+                'Accept': 'application/openmetrics-text;version=1.0.0,text/plain;q=0.5',
+                'Accept-Encoding': 'gzip'})
+            with urllib.request.urlopen(request) as response:
+                assert response.headers['Content-Type'] == OPENMETRICS_TYPE
+                assert response.headers['Content-Encoding'] == 'gzip'
+                body = gzip.decompress(response.read())
+            assert body == exporter.exposition() and body.endswith(b'\n# EOF\n')
+        finally:
+            exporter.stop()
+        assert exporter._thread is None and exporter._servers == []
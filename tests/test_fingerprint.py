@@ -0,0 +1,99 @@
+# SPDX-FileCopyrightText: 2026 pySMART contributors
+# SPDX-License-Identifier: LGPL-2.1-or-later
+
+import json
+import os
+import shutil
+
+from pySMART import Device
+
+from .smartctlfile import SmartctlFile
+
+single_device_tests_main_path = './tests/dataset/singletests/'
+
+
+class CountingSmartctlFile(SmartctlFile):
+    """SmartctlFile counting the calls made"""
+
+    def __init__(self, smartctl_path, options=()):
+        super().__init__(smartctl_path, options)
+        self.calls = 0
+
+    def generic_call(self, params, pass_options=False, options=None):
+        self.calls += 1
+        return super().generic_call(params, pass_options, options)
+
+
+def copy_dataset(folder: str, tmp_path) -> str:
+    path = str(tmp_path / folder)
+    shutil.copytree(single_device_tests_main_path + folder, path)
+    return path
+
+
+def create_device(folder: str) -> Device:
+    with open(os.path.join(folder, 'device.json')) as json_file:
+        data = json.load(json_file)
+    return Device(data['name'], interface=data.get('interface'), smartctl=CountingSmartctlFile(folder))
+
+
+def edit_output(folder: str, filename: str, old: bytes, new: bytes) -> None:
+    path = os.path.join(folder, filename)
+    with open(path, 'rb') as f:
+        raw = f.read()
+    assert old in raw
+    with open(path, 'wb') as f:
+        f.write(raw.replace(old, new, 1))
+
+
+class TestFingerprint():
+
+    def test_same_output_is_not_parsed(self):
+        dev = create_device(single_device_tests_main_path + 'sas_ssd_0_issue_57')
+        old = dev.snapshot
+        calls = dev.smartctl.calls
+
+        changes = dev.update(return_changes=True)
+
+        # Only the --all query: no classification, no parsing
+        assert dev.smartctl.calls == calls + 1
+        assert not changes
+        assert dev.snapshot is not old
+        assert dev.snapshot.collected_at >= old.collected_at
+        assert dev.if_attributes is old.if_attributes
+        assert dev.tests == old.tests and dev.tests is not old.tests
+
+    def test_changed_output_is_parsed(self, tmp_path):
+        folder = copy_dataset('sata_hdd_0_issue42', tmp_path)
+        dev = create_device(folder)
+        old = dev.snapshot
+
+        edit_output(folder, '_-d_ata_--all__dev_sdau', b'Local Time is:    Sat Jul 24 16:19:15',
+                    b'Local Time is:    Tue Jul 27 09:00:00')
+        dev.update()
+        assert dev.if_attributes is old.if_attributes
+
+        edit_output(folder, '_-d_ata_--all__dev_sdau', b'Always       -       38 (0 16 0 0 0)',
+                    b'Always       -       39 (0 16 0 0 0)')
+        changes = dev.update(return_changes=True)
+        assert dev.if_attributes is not old.if_attributes
+        assert list(changes.attributes) == [194]
+        assert dev.attributes[194].raw.startswith('39')
+
+    def test_reused_parse_overrides_local_changes(self):
+        dev = create_device(single_device_tests_main_path + 'nvme_0')
+        model = dev.model
+
+        dev.model = 'Other model'
+        dev.update()
+
+        assert dev.model == model
+
+    def test_extra_queries_are_not_reused(self):
+        # Power on hours missing from --all: they are queried on every parse
+        dev = create_device(single_device_tests_main_path + 'sas_hdd_0_issue_51')
+        old = dev.snapshot
+
+        dev.update()
+
+        assert dev.if_attributes is not old.if_attributes
+        assert dev.diagnostics.Power_On_Hours == old.if_attributes.diagnostics.Power_On_Hours
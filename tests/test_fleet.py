@@ -0,0 +1,151 @@
+# SPDX-FileCopyrightText: 2026 pySMART contributors
+# SPDX-License-Identifier: LGPL-2.1-or-later
+
+import copy
+import json
+import os
+
+import pytest
+
+from pySMART import Device, DeviceList, FleetMatrix
+from pySMART.interface import AtaAttributes, NvmeAttributes, SCSIAttributes
+
+from .smartctlfile import SmartctlFile
+
+np = pytest.importorskip('numpy')
+
+single_device_tests_main_path = './tests/dataset/singletests/'
+
+folders = sorted(single_device_tests_main_path + p for p in os.listdir(single_device_tests_main_path))
+
+
+def create_device(folder: str) -> Device:
+    with open(os.path.join(folder, 'device.json')) as json_file:
+        data = json.load(json_file)
+    return Device(data['name'], interface=data.get('interface'), smartctl=SmartctlFile(folder))
+
+
+def with_raw(dev: Device, raws, **changes):
+    """A snapshot of dev with raw values of ATA attributes changed."""
+    if_attributes = copy.deepcopy(dev.if_attributes)
+    table = if_attributes.legacyAttributes
+    for row in table.rows():
+        if row[0] in raws:
+            table.set(*row[:9], str(raws[row[0]]))
+    return dev.snapshot.replace(if_attributes=if_attributes, **changes)
+
+
+def nan_equal(value, expected) -> bool:
+    return (expected is None and np.isnan(value)) or value == expected
+
+
+class TestFleet():
+
+    def test_matches_devices(self):
+        devlist = DeviceList(init=False)
+        devlist.devices = [create_device(folder) for folder in folders]
+        fleet = devlist.matrix()
+
+        assert len(fleet) == len(devlist.devices)
+        assert fleet.value.shape == fleet.raw.shape == (len(fleet), len(fleet.ata_ids))
+        assert all(fleet.serials[row] == serial for serial, row in fleet.rows.items())
+        for row, dev in enumerate(devlist.devices):
+            if_attributes = dev.if_attributes
+            if isinstance(if_attributes, AtaAttributes):
+                table = if_attributes.legacyAttributes
+                for num in fleet.ata_ids:
+                    attr = table[num]
+                    if attr is None:
+                        assert np.isnan(fleet.attribute(num, 'value')[row])
+                        continue
+                    assert fleet.attribute(num, 'value')[row] == attr.value_int
+                    assert fleet.attribute(num, 'worst')[row] == attr.worst
+                    assert nan_equal(fleet.attribute(num, 'thresh')[row], attr.thresh)
+                    assert nan_equal(fleet.attribute(num)[row], table.decoded(num).primary)
+            else:
+                assert np.isnan(fleet.value[row]).all()
+            if isinstance(if_attributes, NvmeAttributes):
+                for name in fleet.nvme_fields:
+                    assert nan_equal(fleet.counter(name)[row], getattr(if_attributes, name))
+            else:
+                assert np.isnan(fleet.nvme[row]).all()
+            if isinstance(if_attributes, SCSIAttributes):
+                assert nan_equal(fleet.counter('Power_On_Hours')[row],
+                                 if_attributes.diagnostics.Power_On_Hours)
+            else:
+                assert np.isnan(fleet.scsi[row]).all()
+
+    def test_vectorized_queries(self):
+        devices = [create_device(single_device_tests_main_path + folder)
+                   for folder in ['sata_hdd_0_issue42', 'sata_ssd_0_issue_49', 'nvme_0', 'sas_hdd_0_issue_51']]
+        fleet = FleetMatrix(devices)
+
+        temperature = fleet.attribute(194)
+        assert list(fleet.serials[temperature > 0]) == \
+            [dev.serial for dev in devices if dev.attributes[194] is not None]
+        worn = fleet.serials[fleet.counter('percentageUsed') >= 0]
+        assert list(worn) == [devices[2].serial]
+        # Attributes no device reports
+        assert np.isnan(fleet.attribute(255)).all()
+        with pytest.raises(ValueError):
+            fleet.attribute(5, 'flags')
+        with pytest.raises(KeyError):
+            fleet.counter('unknown')
+
+    def test_reindex(self):
+        devices = [create_device(single_device_tests_main_path + folder)
+                   for folder in ['sata_hdd_0_issue42', 'nvme_0']]
+        before = FleetMatrix([devices[0].snapshot.replace(firmware='old')])
+        after = FleetMatrix(devices)
+
+        aligned = before.reindex(after.serials)
+        assert list(aligned.serials) == list(after.serials)
+        assert (aligned.attribute(194)[:1] == after.attribute(194)[:1]).all()
+        assert np.isnan(aligned.raw[1]).all() and np.isnan(aligned.nvme[1]).all()
+        assert len(FleetMatrix([]).reindex(['a'])) == 1
+
+    def test_empty(self):
+        fleet = FleetMatrix([])
+        assert fleet.value.shape == (0, 0) and fleet.nvme.shape == (0, len(fleet.nvme_fields))
+        assert len(fleet.attribute(5)) == 0
+
+    def test_outliers(self):
+        hdd = create_device(single_device_tests_main_path + 'sata_hdd_0_issue42')
+        ssd = create_device(single_device_tests_main_path + 'sata_ssd_0_issue_49')
+        temperatures = [35, 36, 36, 37, 35, 36, 37, 36, 51, 36]
+        population = [with_raw(hdd, {190: temperature, 199: 312 if i == 3 else 0}, serial='HDD{0}'.format(i))
+                      for i, temperature in enumerate(temperatures)]
+        # Another model (a population of its own) and another firmware (too small to score)
+        siblings = [ssd.snapshot.replace(serial='SSD{0}'.format(i), _temperature=70) for i in range(3)]
+        other = [with_raw(hdd, {190: 80}, serial='FW', firmware='XX')]
+        fleet = FleetMatrix(population + siblings + other)
+
+        outliers = fleet.outliers()
+        assert [(o.serial, o.series) for o in outliers] == [('HDD8', 'temperature'), ('HDD3', 'ata.199.raw')]
+        assert (outliers[0].value, outliers[0].median) == (51, 36)
+        # Most of the population has no CRC errors: scored on the mean absolute deviation
+        assert (outliers[1].value, outliers[1].median) == (312, 0) and outliers[1].score > 3.5
+        assert repr(outliers[0]) == '<Outlier HDD8 temperature 51 (median 36) score:{0:.1f}>'.format(
+            outliers[0].score)
+
+        scores = fleet.zscores(['temperature', 'nvme.errorEntries'])
+        assert scores.shape == (len(fleet), 2)
+        assert np.isnan(scores[:, 1]).all() and np.isnan(scores[-1, 0])
+        assert (scores[10:13, 0] == 0).all()
+        assert scores[0, 0] < 0 < scores[3, 0]
+
+        # Grouped by model only, the other firmware is the hottest of its population
+        assert fleet.outliers(by=('model',))[0].serial == 'FW'
+        with pytest.raises(ValueError):
+            fleet.zscores(by=('serial',))
+        with pytest.raises(KeyError):
+            fleet.zscores(['ata.5.flags'])
+
+    def test_column(self):
+        fleet = FleetMatrix([create_device(single_device_tests_main_path + folder)
+                             for folder in ['sata_hdd_0_issue42', 'nvme_0']])
+        assert fleet.column('temperature')[0] == fleet.temperature[0]
+        assert fleet.column('ata.194.value')[0] == fleet.attribute(194, 'value')[0]
+        assert fleet.column('nvme.percentageUsed')[1] == fleet.counter('percentageUsed')[1]
+        assert np.isnan(fleet.column('scsi.Reads_GB')).all()
+        assert list(fleet.reindex(['x', fleet.serials[1]]).models) == [None, fleet.models[1]]
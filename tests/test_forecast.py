@@ -0,0 +1,142 @@
+# SPDX-FileCopyrightText: 2026 pySMART contributors
+# SPDX-License-Identifier: LGPL-2.1-or-later
+
+import copy
+import json
+import os
+
+import pytest
+
+from pySMART import Device, HistoryStore
+from pySMART.forecast import DAY, REALLOCATED_LIMIT, fit_trends, forecast
+
+from .smartctlfile import SmartctlFile
+
+np = pytest.importorskip('numpy')
+
+single_device_tests_main_path = './tests/dataset/singletests/'
+
+NOW = 1.8e9
+
+
+def create_device(folder: str) -> Device:
+    folder = single_device_tests_main_path + folder
+    with open(os.path.join(folder, 'device.json')) as json_file:
+        data = json.load(json_file)
+    return Device(data['name'], interface=data.get('interface'), smartctl=SmartctlFile(folder))
+
+
+def with_value(dev: Device, num: int, value: int):
+    """A snapshot of dev with the normalized value of an ATA attribute changed."""
+    if_attributes = copy.deepcopy(dev.if_attributes)
+    table = if_attributes.legacyAttributes
+    row = next(row for row in table.rows() if row[0] == num)
+    table.set(num, row[1], row[2], str(value), *row[4:])
+    return dev.snapshot.replace(if_attributes=if_attributes)
+
+
+def with_raw(dev: Device, num: int, raw: int):
+    """A snapshot of dev with the raw value of an ATA attribute changed."""
+    if_attributes = copy.deepcopy(dev.if_attributes)
+    table = if_attributes.legacyAttributes
+    row = next(row for row in table.rows() if row[0] == num)
+    table.set(num, *row[1:9], str(raw))
+    return dev.snapshot.replace(if_attributes=if_attributes)
+
+
+class TestForecast():
+
+    def test_fit_trends(self):
+        times = NOW + np.arange(10) * DAY
+        trends = fit_trends([(times, 5 + 2 * np.arange(10)),
+                             (times, [7] * 10),
+                             ([NOW], [1]),
+                             ([], []),
+                             (times, 3 - 0.5 * np.arange(10) + np.tile([0.1, -0.1], 5))], origin=NOW)
+
+        assert list(trends.samples) == [10, 10, 1, 0, 10]
+        assert trends.slope[0] == pytest.approx(2) and trends.level[0] == pytest.approx(5)
+        assert trends.r2[0] == pytest.approx(1) and trends.stderr[0] == pytest.approx(0, abs=1e-9)
+        assert trends.slope[1] == 0 and trends.r2[1] == 1
+        assert np.isnan(trends.slope[2:4]).all() and np.isnan(trends.r2[2:4]).all()
+        assert trends.slope[4] == pytest.approx(-0.5, abs=0.05)
+        assert 0.9 < trends.r2[4] < 1 and trends.stderr[4] > 0
+        assert len(fit_trends([])) == 0
+
+    def test_nvme_from_writes(self, tmp_path):
+        store = HistoryStore(str(tmp_path))
+        dev = create_device('nvme_0')
+        nvme = dev.if_attributes
+        # 10% used after writing 1000 units, then 10 units a day (0.1% a day)
+        snapshot = None
+        for day in range(30):
+            if_attributes = copy.deepcopy(nvme)
+            if_attributes.dataUnitsWritten = 1000 + 10 * day
+            if_attributes.percentageUsed = 10 + (day * 10 // 100)
+            snapshot = dev.snapshot.replace(collected_at=NOW - (29 - day) * DAY, if_attributes=if_attributes)
+            store.append(snapshot)
+
+        result = forecast(store, [snapshot], now=NOW, step=DAY)[dev.serial]
+        assert result.series == 'nvme.dataUnitsWritten' and result.samples == 30
+        rate = 12 / 1290 * 10
+        assert result.rate == pytest.approx(rate)
+        assert result.days_left(NOW) == pytest.approx((100 - 12) / rate)
+        assert result.confidence == pytest.approx(1)
+        assert result.eta_earliest == pytest.approx(result.eta) == pytest.approx(result.eta_latest)
+        assert 'nvme.dataUnitsWritten 12 -> 100' in repr(result)
+
+    def test_ata(self, tmp_path):
+        store = HistoryStore(str(tmp_path))
+        ssd = create_device('sata_ssd_1_issue_72')
+        hdd = create_device('sata_hdd_0_issue42')
+        # Wear_Leveling_Count goes down by one a week, with some noise
+        for day in range(60):
+            value = 100 - day // 7
+            store.append(with_value(ssd, 177, value).replace(collected_at=NOW - (59 - day) * DAY))
+            store.append(hdd.snapshot.replace(collected_at=NOW - (59 - day) * DAY))
+        current = with_value(ssd, 177, 92)
+
+        results = forecast(store, [current, hdd], now=NOW)
+        wear = results[ssd.serial]
+        assert (wear.series, wear.current, wear.threshold) == ('ata.177.value', 92, 10)
+        assert wear.rate == pytest.approx(-1 / 7, rel=0.05)
+        assert wear.days_left(NOW) == pytest.approx(82 * 7, rel=0.05)
+        assert wear.eta_earliest < wear.eta < wear.eta_latest
+        assert 0.9 < wear.confidence < 1
+
+        # Flat reallocated sectors: never reached
+        reallocated = results[hdd.serial]
+        assert (reallocated.series, reallocated.threshold) == ('ata.5.raw', REALLOCATED_LIMIT)
+        assert reallocated.rate == 0 and reallocated.eta is None and reallocated.days_left() is None
+        assert reallocated.confidence == 1 and 'never' in repr(reallocated)
+
+    def test_reallocated_sectors(self, tmp_path):
+        store = HistoryStore(str(tmp_path))
+        hdd = create_device('sata_hdd_0_issue42')
+        # One more reallocated sector every 5 days, the normalized value staying at 100
+        for day in range(60):
+            store.append(with_raw(hdd, 5, 10 + day // 5).replace(collected_at=NOW - (59 - day) * DAY))
+        current = with_raw(hdd, 5, 21)
+
+        result = forecast(store, [current], now=NOW)[hdd.serial]
+        assert (result.series, result.current, result.threshold) == ('ata.5.raw', 21, REALLOCATED_LIMIT)
+        assert result.rate == pytest.approx(1 / 5, rel=0.05)
+        assert result.days_left(NOW) == pytest.approx(79 * 5, rel=0.05)
+        assert result.eta_earliest < result.eta < result.eta_latest
+
+        result = forecast(store, [current], now=NOW, reallocated_limit=41)[hdd.serial]
+        assert result.threshold == 41 and result.days_left(NOW) == pytest.approx(20 * 5, rel=0.05)
+        assert forecast(store, [current], now=NOW, reallocated_limit=20)[hdd.serial].days_left(NOW) == 0
+
+    def test_no_history(self, tmp_path):
+        store = HistoryStore(str(tmp_path))
+        devices = [create_device(folder) for folder in ['nvme_0', 'sas_hdd_0_issue_51', 'sata_hdd_0_issue42']]
+        results = forecast(store, devices, now=NOW)
+
+        # The SAS HDD has no wear indicator
+        assert set(results) == {devices[0].serial, devices[2].serial}
+        assert all(result.eta is None and result.samples == 0 and result.confidence == 0
+                   for result in results.values())
+        # Already worn out: reached, whatever the trend
+        worn = with_raw(devices[2], 5, REALLOCATED_LIMIT)
+        assert forecast(store, [worn], now=NOW)[devices[2].serial].days_left(NOW) == 0
@@ -0,0 +1,108 @@
+# SPDX-FileCopyrightText: 2026 pySMART contributors
+# SPDX-License-Identifier: LGPL-2.1-or-later
+
+import copy
+import json
+import os
+
+import pytest
+
+from pySMART import Device, DeviceList, FleetMatrix
+from pySMART.health import FACTORS, WEIGHTS, score
+
+from .smartctlfile import SmartctlFile
+
+np = pytest.importorskip('numpy')
+
+single_device_tests_main_path = './tests/dataset/singletests/'
+
+
+def create_device(folder: str) -> Device:
+    folder = single_device_tests_main_path + folder
+    with open(os.path.join(folder, 'device.json')) as json_file:
+        data = json.load(json_file)
+    return Device(data['name'], interface=data.get('interface'), smartctl=SmartctlFile(folder))
+
+
+def with_raw(dev: Device, raws, **changes):
+    """A snapshot of dev with raw values of ATA attributes changed."""
+    if_attributes = copy.deepcopy(dev.if_attributes)
+    table = if_attributes.legacyAttributes
+    for row in table.rows():
+        if row[0] in raws:
+            table.set(*row[:9], str(raws[row[0]]))
+    return dev.snapshot.replace(if_attributes=if_attributes, **changes)
+
+
+def with_value(dev: Device, num: int, value: int):
+    """A snapshot of dev with the normalized value of an ATA attribute changed."""
+    if_attributes = copy.deepcopy(dev.if_attributes)
+    table = if_attributes.legacyAttributes
+    row = next(row for row in table.rows() if row[0] == num)
+    table.set(num, row[1], row[2], str(value), *row[4:])
+    return dev.snapshot.replace(if_attributes=if_attributes)
+
+
+class TestHealth():
+
+    def test_interfaces(self):
+        hdd = create_device('sata_hdd_0_issue42')
+        ssd = create_device('sata_ssd_1_issue_72')
+        nvme = create_device('nvme_0')
+        sas = create_device('sas_hdd_0_issue_51')
+
+        # 10 reallocated sectors, at 60 degrees
+        sick_hdd = with_raw(hdd, {5: 10, 190: 60, 194: 60})
+        nvme_attributes = copy.deepcopy(nvme.if_attributes)
+        nvme_attributes.percentageUsed = 50
+        nvme_attributes.criticalWarning = 1
+        nvme_attributes.availableSpare = nvme_attributes.availableSpareThreshold
+        sas_attributes = copy.deepcopy(sas.if_attributes)
+        sas_attributes.diagnostics.Reallocated_Sector_Ct = 8
+        sas_attributes.diagnostics._Uncorrected_Reads = 2
+        snapshots = [hdd.snapshot, sick_hdd, with_value(ssd, 177, 92), nvme.snapshot.replace(if_attributes=nvme_attributes),
+                     sas.snapshot.replace(if_attributes=sas_attributes), sas.snapshot.replace(assessment='FAIL')]
+
+        scores = score(snapshots)
+        assert len(scores) == 6 and scores.penalties.shape == (6, len(FACTORS))
+        assert scores.score[0] == 100 and scores.risk[0] == 0 and scores[hdd.serial].factors == {}
+
+        sick = scores.ranked()
+        # The failed SAS drive and the NVMe drive with a critical warning are at the top
+        assert [health.score for health in sick[:2]] == [0, 0]
+        assert sick[0].factors == {'failing': 1, 'spare': pytest.approx(0.8), 'wear': pytest.approx(0.4)}
+        assert sick[1].factors == {'assessment': 1}
+
+        rows = [scores._health(row) for row in range(len(scores))]
+        # Media defects and temperature, combined as independent risks
+        assert rows[1].factors == {'media': pytest.approx(0.3), 'temperature': pytest.approx(0.15)}
+        assert rows[1].risk == pytest.approx(1 - 0.7 * 0.85)
+        assert rows[4].factors == {'media': pytest.approx(0.3)}
+        # SSD wear leveling: 177 at 92
+        assert rows[2].factors == {'wear': pytest.approx(0.08 * WEIGHTS['wear'])}
+        assert repr(rows[2]).startswith('<Health {0} score:93.6 risk:0.06 wear:0.06'.format(ssd.serial))
+
+    def test_weights(self):
+        hdd = create_device('sata_hdd_0_issue42')
+        snapshot = with_raw(hdd, {5: 10, 190: 60, 194: 60})
+        scores = score(FleetMatrix([snapshot]), weights={'temperature': 0, 'media': 1})
+        assert scores[hdd.serial].factors == {'media': pytest.approx(0.5)}
+        assert scores.score[0] == pytest.approx(50)
+        with pytest.raises(ValueError):
+            score([snapshot], weights={'noise': 1})
+        with pytest.raises(ValueError):
+            score([snapshot], weights={'media': 2})
+        with pytest.raises(KeyError):
+            scores['missing']
+
+    def test_device_list(self):
+        devlist = DeviceList(init=False)
+        devlist.devices = [create_device('sata_hdd_0_issue42'), create_device('nvme_0')]
+        scores = devlist.health()
+        assert list(scores.serials) == [dev.serial for dev in devlist.devices]
+        assert repr(scores) == '<HealthScores devices:2>'
+
+        fleet = devlist.matrix()
+        assert list(fleet.assessments) == ['PASS', 'PASS'] and list(fleet.ssd) == [False, True]
+        moved = fleet.reindex(['missing', devlist.devices[1].serial])
+        assert list(moved.assessments) == [None, 'PASS'] and list(moved.ssd) == [False, True]
@@ -0,0 +1,333 @@
+# SPDX-FileCopyrightText: 2026 pySMART contributors
+# SPDX-License-Identifier: LGPL-2.1-or-later
+
+import json
+import os
+import struct
+import sys
+import time
+from array import array
+
+import pytest
+
+from pySMART import Device, HistoryStore
+from pySMART.history import MAGIC, MISSING_INT, samples
+
+from .smartctlfile import SmartctlFile
+
+single_device_tests_main_path = './tests/dataset/singletests/'
+
+DAY = 86400.0
+
+
+def create_device(folder: str, history=None) -> Device:
+    folder = single_device_tests_main_path + folder
+    with open(os.path.join(folder, 'device.json')) as json_file:
+        data = json.load(json_file)
+    return Device(data['name'], interface=data.get('interface'), smartctl=SmartctlFile(folder),
+                  history=history)
+
+
+def record(store: HistoryStore, device: Device, times, **changes) -> None:
+    for timestamp in times:
+        store.append(device.snapshot.replace(collected_at=timestamp, **changes))
+
+
+class TestHistory():
+
+    def test_samples(self):
+        ata = samples(create_device('sata_hdd_0_issue42').snapshot)
+        nvme = samples(create_device('nvme_0').snapshot)
+        scsi = samples(create_device('sas_hdd_0_issue_51').snapshot)
+
+        assert ata['ata.194.value'] == 38 and 'ata.5.raw' in ata
+        assert nvme['nvme.percentageUsed'] == create_device('nvme_0').if_attributes.percentageUsed
+        assert 'scsi.Power_On_Hours' in scsi and 'temperature' in scsi
+
+    def test_device_records_updates(self, tmp_path):
+        store = HistoryStore(str(tmp_path))
+        dev = create_device('nvme_0', history=store)
+        dev.update()
+
+        assert store.devices() == [dev.serial]
+        series = store.query(dev.serial, 'temperature')
+        assert list(series.values) == [dev.temperature] * 2
+        assert list(series.timestamps) == sorted(series.timestamps)
+        assert 'nvme.powerOnHours' in store.series(dev.serial)
+
+    @pytest.mark.parametrize("compress", [True, False])
+    def test_segments_and_ranges(self, tmp_path, compress):
+        store = HistoryStore(str(tmp_path), segment_rows=10, compress=compress)
+        dev = create_device('sata_hdd_0_issue42')
+        record(store, dev, [1000.0 + i for i in range(25)])
+
+        directory = os.path.join(str(tmp_path), dev.serial)
+        assert len([name for name in os.listdir(directory) if name.endswith('.seg')]) == 2
+
+        # Ranges crossing segments and the active log
+        series = store.query(dev.serial, 'ata.194.raw', start=1005, end=1021.5)
+        assert list(series.timestamps) == [1000.0 + i for i in range(5, 22)]
+        assert list(series.values) == [dev.attributes[194].raw_int] * 17
+        assert len(store.query(dev.serial, 'ata.194.raw')) == 25
+        assert len(store.query(dev.serial, 'unknown')) == 0
+
+        # Everything sealed: same answer
+        store.flush()
+        assert list(store.query(dev.serial, 'ata.194.raw', start=1005, end=1021.5).timestamps) == \
+            list(series.timestamps)
+
+        # A new store reads the files left by this one
+        assert len(HistoryStore(str(tmp_path)).query(dev.serial, 'temperature')) == 25
+
+    @pytest.mark.parametrize("compress", [True, False])
+    def test_missing_and_float_values(self, tmp_path, compress):
+        store = HistoryStore(str(tmp_path), segment_rows=4, compress=compress)
+        dev = create_device('nvme_0')
+        record(store, dev, [1.0, 2.0])
+        record(store, dev, [3.0, 4.0], temperatures={})
+        record(store, dev, [5.0], temperatures={1: 40.5})
+
+        series = store.query(dev.serial, 'temperatures.1')
+        assert list(series.timestamps) == [1.0, 2.0, 5.0]
+        assert list(series.values) == [dev.temperatures[1]] * 2 + [40.5]
+        assert series.values.typecode == 'd'
+
+    def test_retention_and_max_bytes(self, tmp_path):
+        now = time.time()
+        store = HistoryStore(str(tmp_path), retention=30 * DAY, segment_rows=10, rollups=())
+        dev = create_device('sata_hdd_0_issue42')
+        record(store, dev, [now - 60 * DAY + i for i in range(10)])
+        record(store, dev, [now - DAY + i for i in range(10)])
+
+        # Pruned when the second segment was sealed
+        assert store.prune(now=now) == 0
+        assert store.query(dev.serial, 'temperature').timestamps[0] == pytest.approx(now - DAY, abs=1e-3)
+
+        record(store, dev, [now + i for i in range(30)])
+        store.max_bytes = store.size() // 2
+        store.prune(now=now)
+        assert store.size() <= store.max_bytes
+        assert store.query(dev.serial, 'temperature').timestamps[-1] == pytest.approx(now + 29, abs=1e-3)
+
+    def test_seal_prunes_its_directory(self, tmp_path, monkeypatch):
+        now = time.time()
+        store = HistoryStore(str(tmp_path), segment_rows=10, rollups=())
+        dev = create_device('sata_hdd_0_issue42')
+        other = create_device('nvme_0')
+        record(store, dev, [now - 60 * DAY + i for i in range(10)])
+        record(store, other, [now - 60 * DAY + i for i in range(10)])
+        store.retention = 30 * DAY
+        store.max_bytes = store.size() * 4
+
+        # Seals only expire their own directory, without listing the others or walking the store
+        walks = []
+        monkeypatch.setattr(os, 'walk', lambda *args: walks.append(args) or iter(()))
+        monkeypatch.setattr(store, '_directories', lambda: pytest.fail('store listed'))
+        record(store, dev, [now + i for i in range(30)])
+        assert walks == []
+        assert store.query(dev.serial, 'temperature').timestamps[0] == pytest.approx(now, abs=1e-3)
+        assert len(store.query(other.serial, 'temperature')) == 10
+        monkeypatch.undo()
+
+        # The running size matches the files on disk, and bounds the store
+        assert store.size() == HistoryStore(str(tmp_path)).size()
+        store.max_bytes = store.size() // 2
+        record(store, dev, [now + 30 + i for i in range(10)])
+        assert store.size() == HistoryStore(str(tmp_path)).size() <= store.max_bytes
+        assert len(store.query(other.serial, 'temperature')) == 0
+
+    def test_interrupted_seal(self, tmp_path):
+        store = HistoryStore(str(tmp_path), segment_rows=3, rollups=())
+        dev = create_device('nvme_0')
+        record(store, dev, [1.0, 2.0, 3.0, 4.0])
+        directory = os.path.join(str(tmp_path), dev.serial)
+        segment = [name for name in os.listdir(directory) if name.endswith('.seg')][0]
+
+        # A crash after the full log was renamed: its segment is written on the next use
+        os.remove(os.path.join(directory, segment))
+        with open(os.path.join(directory, 'sealing.jsonl'), 'w') as f:
+            for timestamp in [1.0, 2.0, 3.0]:
+                f.write(json.dumps([timestamp, {'temperature': 1}]) + '\n')
+        # And the last line of the active log is truncated
+        with open(os.path.join(directory, 'active.jsonl'), 'a') as f:
+            f.write('[5.0, {"temper')
+
+        store = HistoryStore(str(tmp_path), segment_rows=3, rollups=())
+        assert list(store.query(dev.serial, 'temperature').timestamps) == [1.0, 2.0, 3.0, 4.0]
+        assert sorted(os.listdir(directory)) == [segment, 'active.jsonl']
+        record(store, dev, [6.0])
+        assert list(store.query(dev.serial, 'temperature').timestamps) == [1.0, 2.0, 3.0, 4.0, 6.0]
+
+        # A crash after the segment was written: the log is only removed
+        with open(os.path.join(directory, 'sealing.jsonl'), 'w') as f:
+            for timestamp in [1.0, 2.0, 3.0]:
+                f.write(json.dumps([timestamp, {'temperature': 1}]) + '\n')
+        store = HistoryStore(str(tmp_path), segment_rows=3, rollups=())
+        assert list(store.query(dev.serial, 'temperature').timestamps) == [1.0, 2.0, 3.0, 4.0, 6.0]
+        assert 'sealing.jsonl' not in os.listdir(directory)
+
+    def test_clock_going_back(self, tmp_path):
+        store = HistoryStore(str(tmp_path), segment_rows=3, rollups=())
+        dev = create_device('nvme_0')
+        record(store, dev, [10.0, 11.0, 12.0])
+        # Older than the sealed rows: still kept, and queries stay sorted
+        record(store, dev, [5.0, 6.0])
+
+        series = store.query(dev.serial, 'temperature')
+        assert list(series.timestamps) == [5.0, 6.0, 10.0, 11.0, 12.0]
+        assert list(HistoryStore(str(tmp_path)).query(dev.serial, 'temperature').timestamps) == \
+            list(series.timestamps)
+        record(store, dev, [7.0])
+        assert list(store.query(dev.serial, 'temperature', start=6.0).timestamps) == [6.0, 7.0, 10.0, 11.0, 12.0]
+
+    def test_active_log_values(self, tmp_path):
+        os.makedirs(os.path.join(str(tmp_path), 'disk'))
+        with open(os.path.join(str(tmp_path), 'disk', 'active.jsonl'), 'w') as f:
+            f.write(json.dumps([2.0, {'a.1': 3, 'a': -1.5e-3, 'b': None}], separators=(',', ':')) + '\n')
+            f.write(json.dumps([1.0, {'a': 7, 'b': float('inf'), 'c': float('nan')}], separators=(',', ':')) + '\n')
+            f.write('[3.0,{"a":4,"b"')
+
+        store = HistoryStore(str(tmp_path))
+        found = store.query_many('disk', ['a', 'b', 'c', 'd'])
+        assert list(found['a']) == [(1.0, 7), (2.0, -1.5e-3)] and found['a'].values.typecode == 'd'
+        assert list(found['b']) == [(1.0, float('inf'))]
+        assert len(found['c']) == len(found['d']) == 0
+        assert list(store.query('disk', 'a.1', start=1.5, end=2.0)) == [(2.0, 3)]
+        assert store.series('disk') == ['a', 'a.1', 'b', 'c']
+
+    def test_invalid_segment(self, tmp_path):
+        store = HistoryStore(str(tmp_path))
+        os.makedirs(os.path.join(str(tmp_path), 'disk'))
+        with open(os.path.join(str(tmp_path), 'disk', '000000000001000-000000000002000.seg'), 'wb') as f:
+            f.write(b'not a segment at all')
+
+        with pytest.raises(ValueError):
+            store.query('disk', 'temperature')
+
+    def test_compression(self, tmp_path):
+        dev = create_device('nvme_0')
+        sizes = []
+        for compress in [True, False]:
+            store = HistoryStore(str(tmp_path / str(compress)), segment_rows=1000, compress=compress,
+                                 rollups=())
+            for i in range(1000):
+                store.append(dev.snapshot.replace(collected_at=1.7e9 + 60 * i))
+            sizes.append(store.size())
+            series = store.query(dev.serial, 'nvme.powerOnHours')
+            assert list(series.values) == [dev.if_attributes.powerOnHours] * 1000
+            assert series.timestamps[-1] == 1.7e9 + 60 * 999
+
+        assert sizes[0] * 20 < sizes[1]
+
+    def test_version_1_segment(self, tmp_path):
+        # Raw columns described by (typecode, offset) pairs, timestamps right after the header
+        timestamps = array('d', [10.0, 20.0])
+        column = array('q', [5, MISSING_INT])
+        if sys.byteorder != 'little':
+            timestamps.byteswap()
+            column.byteswap()
+        data = bytearray(MAGIC + bytes([1, 0, 0, 0]))
+        data += timestamps.tobytes()
+        offset = len(data)
+        data += column.tobytes()
+        footer = json.dumps({'rows': 2, 'first': 10.0, 'last': 20.0,
+                             'columns': {'temperature': ['q', offset]}}).encode()
+        data += footer + struct.pack('<I', len(footer)) + MAGIC
+        os.makedirs(os.path.join(str(tmp_path), 'disk'))
+        with open(os.path.join(str(tmp_path), 'disk', '000000000010000-000000000020000.seg'), 'wb') as f:
+            f.write(data)
+
+        series = HistoryStore(str(tmp_path)).query('disk', 'temperature')
+        assert list(series) == [(10.0, 5)]
+
+    def test_rollups(self, tmp_path):
+        store = HistoryStore(str(tmp_path), rollups=(3600, DAY))
+        dev = create_device('nvme_0')
+        # Two days of 10 minute polls, temperature going up by one every poll
+        times = [2 * DAY + 600 * i for i in range(288)]
+        for i, timestamp in enumerate(times):
+            store.append(dev.snapshot.replace(collected_at=timestamp, temperatures={1: 20 + i % 7}))
+
+        hourly = store.aggregate(dev.serial, 'temperatures.1', step=3600)
+        assert len(hourly) == 48 and hourly.step == 3600
+        assert hourly.timestamps[0] == 2 * DAY and hourly.timestamps[-1] == 4 * DAY - 3600
+        assert hourly.count == [6] * 48
+        assert (hourly.minimum[0], hourly.maximum[0], hourly.last[0]) == (20, 25, 25)
+        assert hourly.average[0] == pytest.approx(sum(range(20, 26)) / 6)
+
+        # Daily values from the daily rollups (including the bucket being filled),
+        # 6 hour ones from the hourly rollups, and 15 minute ones from the samples
+        daily = store.aggregate(dev.serial, 'temperatures.1', step=DAY)
+        assert list(daily.timestamps) == [2 * DAY, 3 * DAY] and daily.count == [144, 144]
+        assert (min(daily.minimum), max(daily.maximum)) == (20, 26)
+        quarters = store.aggregate(dev.serial, 'temperatures.1', start=2 * DAY, end=3 * DAY - 1, step=6 * 3600)
+        assert len(quarters) == 4 and sum(quarters.count) == 144
+        assert store.aggregate(dev.serial, 'temperatures.1', step=900).count[:2] == [2, 1]
+
+        # Same answers without the rollups
+        raw = HistoryStore(str(tmp_path), rollups=())
+        assert raw.aggregate(dev.serial, 'temperatures.1', step=DAY).average == daily.average
+        samples_only = raw.aggregate(dev.serial, 'temperatures.1', start=times[-2])
+        assert samples_only.step is None and samples_only.last == [20 + 286 % 7, 20 + 287 % 7]
+
+    def test_rollups_recovery(self, tmp_path):
+        dev = create_device('nvme_0')
+        store = HistoryStore(str(tmp_path), rollups=())
+        record(store, dev, [600.0 * i for i in range(12)])
+
+        # Rollups added to an existing store: built from the samples
+        store = HistoryStore(str(tmp_path), rollups=(3600,))
+        record(store, dev, [7200.0, 9000.0])
+        assert store.aggregate(dev.serial, 'temperature', step=3600).count == [6, 6, 2]
+
+        # Reopened: the open bucket is rebuilt from the samples, nothing counted twice
+        store = HistoryStore(str(tmp_path), rollups=(3600,))
+        record(store, dev, [9600.0, 11000.0])
+        assert store.aggregate(dev.serial, 'temperature', step=3600).count == [6, 6, 3, 1]
+        # Late samples are recorded, but not in written rollups
+        record(store, dev, [100.0])
+        assert store.aggregate(dev.serial, 'temperature', step=3600).count == [6, 6, 3, 1]
+
+    def test_aggregate_many(self, tmp_path):
+        nvme, hdd = create_device('nvme_0'), create_device('sata_hdd_0_issue42')
+        store = HistoryStore(str(tmp_path), rollups=(3600, DAY))
+        for i in range(30):
+            record(store, nvme, [DAY + 600 * i], temperatures={1: 20 + i % 7})
+            record(store, hdd, [DAY + 600 * i + 1])
+        expected = {key: store.aggregate(key, 'temperatures.1', start=DAY + 3600, step=3600)
+                    for key in [nvme.serial, hdd.serial]}
+        assert expected[nvme.serial].count == [6, 6, 6, 6] and len(expected[hdd.serial]) == 0
+
+        # Reopened: the open buckets are read for the series only, with the same answers
+        store = HistoryStore(str(tmp_path), rollups=(3600, DAY))
+        found = store.aggregate_many([nvme.serial, hdd.serial, 'missing'], 'temperatures.1',
+                                     start=DAY + 3600, step=3600)
+        for key, aggregates in expected.items():
+            assert found[key].timestamps == aggregates.timestamps and found[key].count == aggregates.count
+            assert found[key].average == aggregates.average and found[key].last == aggregates.last
+        assert len(found['missing']) == 0
+        daily = store.aggregate_many([nvme.serial], 'temperatures.1', step=DAY)[nvme.serial]
+        assert daily.count == [30] and (daily.minimum, daily.maximum) == ([20], [26])
+        record(store, hdd, [DAY + 18000])
+        assert store.aggregate(hdd.serial, 'temperature', step=3600).count == [6] * 5 + [1]
+
+        # Pending samples over several buckets (rollups added later): rebuilt as a whole
+        store = HistoryStore(str(tmp_path), rollups=(3600, 7200))
+        assert store.aggregate_many([nvme.serial], 'temperature', step=7200)[nvme.serial].count == [12, 12, 6]
+
+    def test_rollup_retention(self, tmp_path):
+        now = time.time()
+        store = HistoryStore(str(tmp_path), retention=DAY, segment_rows=10, rollups=(3600,),
+                             rollup_retention=100 * DAY)
+        dev = create_device('sata_hdd_0_issue42')
+        record(store, dev, [now - 30 * DAY + 3600 * i for i in range(20)])
+        record(store, dev, [now + i for i in range(10)])
+        store.flush()
+
+        # Samples are gone, hourly aggregates are still there
+        assert store.query(dev.serial, 'temperature').timestamps[0] == pytest.approx(now, abs=1e-3)
+        hourly = store.aggregate(dev.serial, 'temperature', step=3600)
+        assert len(hourly) == 21 and hourly.count[-1] == 10
+
+        with pytest.raises(ValueError):
+            HistoryStore(str(tmp_path), rollups=(0,))
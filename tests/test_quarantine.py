@@ -0,0 +1,74 @@
+# SPDX-FileCopyrightText: 2026 pySMART contributors
+# SPDX-License-Identifier: LGPL-2.1-or-later
+
+from pySMART.quarantine import Quarantine
+
+
+class FakeClock():
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestQuarantine():
+
+    def test_quarantine_after_failures(self):
+        clock = FakeClock()
+        q = Quarantine(max_failures=2, slow_threshold=10,
+                       base_backoff=60, clock=clock)
+
+        q.record('sda', 1, RuntimeError('crash'))
+        assert q.allow('sda')
+        assert q.quarantined == {}
+
+        # Slow calls count as failures too
+        q.record('sda', 11)
+        assert not q.allow('sda')
+        assert list(q.quarantined) == ['sda']
+        assert q.retry_in('sda') == 60
+        assert q.state('sda').last_error.startswith('Slow call')
+
+    def test_exponential_backoff(self):
+        clock = FakeClock()
+        q = Quarantine(max_failures=1, base_backoff=60,
+                       max_backoff=200, clock=clock)
+
+        expected = [60, 120, 200, 200]
+        for backoff in expected:
+            q.record('sda', 1, RuntimeError('crash'))
+            assert q.retry_in('sda') == backoff
+            clock.now += backoff
+            # Back-off expired: the next call is a probe
+            assert q.allow('sda')
+
+    def test_release_on_success(self):
+        clock = FakeClock()
+        q = Quarantine(max_failures=1, base_backoff=60, clock=clock)
+
+        q.record('sda', 1, RuntimeError('crash'))
+        clock.now += 60
+        q.record('sda', 1)
+
+        assert q.allow('sda')
+        assert not q.state('sda').quarantined
+        assert q.state('sda').quarantines == 0
+        assert q.state('sda').__getstate__()['failures'] == 0
+
+    def test_single_probe(self):
+        clock = FakeClock()
+        q = Quarantine(max_failures=1, base_backoff=60, clock=clock)
+
+        q.record('sda', 1, RuntimeError('crash'))
+        clock.now += 60
+        # Only the first caller probes the device
+        assert q.allow('sda')
+        assert not q.allow('sda') and not q.allow('sda')
+
+        # A probe that never reports is replaced after the back-off
+        clock.now += 60
+        assert q.allow('sda') and not q.allow('sda')
+
+        q.record('sda', 1, RuntimeError('crash'))
+        assert q.retry_in('sda') == 120 and not q.allow('sda')
@@ -0,0 +1,211 @@
+# SPDX-FileCopyrightText: 2026 pySMART contributors
+# SPDX-License-Identifier: LGPL-2.1-or-later
+
+import copy
+import json
+import os
+
+import pytest
+
+import pySMART.rules
+from pySMART import AnomalyDetector, Device, DeviceList, HistoryStore, RuleEngine
+from pySMART.testentry import TestEntry as SelfTest
+from pySMART.rules import DEFAULT_RULES, SMART_WARNINGS, Rule, check, field_value
+
+from .smartctlfile import SmartctlFile
+
+single_device_tests_main_path = './tests/dataset/singletests/'
+
+
+def create_device(folder: str, rules=None) -> Device:
+    folder = single_device_tests_main_path + folder
+    with open(os.path.join(folder, 'device.json')) as json_file:
+        data = json.load(json_file)
+    return Device(data['name'], interface=data.get('interface'), smartctl=SmartctlFile(folder), rules=rules)
+
+
+def with_attributes(dev: Device, raws=None, when_failed=None):
+    """The ATA attributes of dev with raw values or when_failed columns changed."""
+    if_attributes = copy.deepcopy(dev.if_attributes)
+    table = if_attributes.legacyAttributes
+    for row in table.rows():
+        row = list(row)
+        if raws and row[0] in raws:
+            row[9] = str(raws[row[0]])
+        if when_failed and row[0] in when_failed:
+            row[8] = when_failed[row[0]]
+        table.set(*row)
+    return if_attributes
+
+
+class TestRules():
+
+    def test_smart_warnings(self):
+        dev = create_device('sata_hdd_0_issue42')
+        assert dev.assessment == 'PASS' and dev.messages == []
+        dev.if_attributes = with_attributes(dev, when_failed={197: 'FAILING_NOW', 5: 'In_the_past', 9: 'Sometimes'})
+
+        alerts = check(SMART_WARNINGS, dev.snapshot)
+        assert [(a.field, a.rule, a.severity) for a in alerts] == [
+            ('ata.5.when_failed', 'attribute_failed_in_the_past', 'warning'),
+            ('ata.9.when_failed', 'attribute_failed', 'warning'),
+            ('ata.197.when_failed', 'attribute_failing_now', 'critical')]
+
+        dev._make_smart_warnings()
+        reallocated, hours, pending = dev.attributes[5], dev.attributes[9], dev.attributes[197]
+        assert dev.messages == [
+            "Reallocated_Sector_Ct failed in the past with value {0}. [Threshold: {1}]".format(
+                reallocated.worst, reallocated.thresh),
+            "Power_On_Hours says it failed 'Sometimes'. [V={0},W={1},T={2}]".format(
+                hours.value, hours.worst, hours.thresh),
+            "Current_Pending_Sector is failing now with value {0}. [Threshold: {1}]".format(
+                pending.value, pending.thresh)]
+        assert dev.assessment == 'FAIL'
+
+    def test_field_value(self):
+        dev = create_device('sata_hdd_0_issue42')
+        snapshot = dev.snapshot.replace(if_attributes=with_attributes(dev, raws={5: 8}))
+        assert field_value(snapshot, 'ata.5.raw') == 8
+        assert field_value(snapshot, 'ata.5.value') == 100
+        assert field_value(snapshot, 'ata.5.when_failed') == '-'
+        assert field_value(snapshot, 'assessment') == 'PASS'
+        assert field_value(snapshot, 'tests.latest') == 'Self-test routine in progress'
+        assert field_value(snapshot, 'tests.failed') == 0
+        for missing in ['ata.300.raw', 'ata.x.raw', 'ata.5.foo', 'nvme.criticalWarning', 'tests.foo', 'foo', 'if_attributes']:
+            assert field_value(snapshot, missing) is None
+        assert field_value(None, 'assessment') is None
+
+        with pytest.raises(ValueError):
+            Rule('bad', 'ata.5.raw', '=~', 0)
+        with pytest.raises(ValueError):
+            RuleEngine([Rule('twice', 'assessment', '==', 'FAIL'), Rule('twice', 'assessment', '==', 'WARN')])
+
+    def test_hold_and_resolve(self):
+        events = []
+        engine = RuleEngine([Rule('hot', 'temperatures.*', '>', 50, hold=600, message='{name} at {value}C')],
+                            callback=events.append)
+        dev = create_device('nvme_0')
+        key = dev.serial
+
+        def evaluate(at, temperature):
+            return engine.evaluate(dev.snapshot.replace(collected_at=at, temperatures={1: temperature}))
+
+        assert evaluate(0, 40) == []
+        # Hot, but not for long enough yet
+        assert evaluate(100, 60) == [] and engine.active() == []
+        # Still hot, unchanged: the pending state is checked again
+        fired = evaluate(800, 61)
+        assert [(a.state, a.field, a.value, a.message) for a in fired] == [
+            ('firing', 'temperatures.1', 61, '{0} at 61C'.format(key))]
+        assert engine.active() == [(key, 'hot', 'temperatures.1')] == engine.active(key)
+        assert evaluate(900, 62) == []
+        # Back to normal
+        resolved = evaluate(1000, 40)
+        assert [(a.state, a.value, a.previous) for a in resolved] == [('resolved', 40, 62)]
+        assert engine.active() == [] and events == fired + resolved == list(engine.recent)
+        assert repr(resolved[0]) == '<Alert resolved warning hot {0} temperatures.1: 40 (was 62)>'.format(key)
+
+        # A short spike never fires
+        assert evaluate(1100, 70) == [] and evaluate(1200, 40) == []
+
+    def test_incremental(self, monkeypatch):
+        engine = RuleEngine(DEFAULT_RULES + [Rule('reallocated_slowly', 'ata.5.raw', 'increased', cooldown=3600)])
+        dev = create_device('sata_hdd_0_issue42')
+
+        def evaluate(at, **raws):
+            if_attributes = with_attributes(dev, raws={int(num[1:]): raw for num, raw in raws.items()})
+            return engine.evaluate(dev.snapshot.replace(collected_at=at, if_attributes=if_attributes))
+
+        assert evaluate(0, a5=0) == []
+        # Only the fields of the changed attribute are evaluated
+        calls = []
+        value = pySMART.rules.field_value
+        monkeypatch.setattr(pySMART.rules, 'field_value', lambda *args: calls.append(args[1]) or value(*args))
+        alerts = evaluate(1, a5=8)
+        assert set(calls) == {'ata.5.raw', 'ata.5.when_failed'}
+        assert [(a.rule, a.value, a.previous, a.message) for a in alerts] == [
+            ('reallocated_sectors', 8, 0, 'ata.5.raw increased from 0 to 8'),
+            ('reallocated_slowly', 8, 0, 'ata.5.raw increased from 0 to 8')]
+        monkeypatch.undo()
+
+        # Cooled down rules do not fire again, others fire on every increase
+        assert [a.rule for a in evaluate(2, a5=9)] == ['reallocated_sectors']
+        assert evaluate(3, a5=9) == []
+        assert [a.rule for a in evaluate(3700, a5=10)] == ['reallocated_sectors', 'reallocated_slowly']
+        # State rules of other attributes
+        assert [(a.rule, a.state) for a in evaluate(3800, a5=10, a197=2)] == [('pending_sectors', 'firing')]
+        assert engine.active() == [(dev.serial, 'pending_sectors', 'ata.197.raw')]
+
+        engine.forget(dev.serial)
+        assert engine.active() == []
+        engine.remove('pending_sectors')
+        assert [rule.name for rule in engine.rules] == [rule.name for rule in DEFAULT_RULES
+                                                        if rule.name != 'pending_sectors'] + ['reallocated_slowly']
+        assert evaluate(3900, a5=10, a197=3) == []
+
+    def test_interfaces(self):
+        engine = RuleEngine(DEFAULT_RULES)
+
+        nvme = create_device('nvme_0')
+        if_attributes = copy.deepcopy(nvme.if_attributes)
+        if_attributes.criticalWarning = 4
+        alerts = engine.evaluate(nvme.snapshot.replace(if_attributes=if_attributes))
+        assert [(a.rule, a.severity, a.value) for a in alerts] == [('nvme_critical_warning', 'critical', 4)]
+
+        sas = create_device('sas_hdd_0_issue_51')
+        assert engine.evaluate(sas) == []
+        if_attributes = copy.deepcopy(sas.if_attributes)
+        if_attributes.diagnostics.Reallocated_Sector_Ct = 3
+        alerts = engine.evaluate(sas.snapshot.replace(if_attributes=if_attributes))
+        assert [(a.rule, a.value, a.previous) for a in alerts] == [('scsi_grown_defects_increased', 3, 0),
+                                                                   ('scsi_grown_defects', 3, 0)]
+        if_attributes = copy.deepcopy(if_attributes)
+        if_attributes.diagnostics.Reallocated_Sector_Ct = 4
+        alerts = engine.evaluate(sas.snapshot.replace(if_attributes=if_attributes))
+        assert [a.rule for a in alerts] == ['scsi_grown_defects_increased']
+
+        hdd = create_device('sata_hdd_0_issue42')
+        assert engine.evaluate(hdd) == []
+        failed = SelfTest('ata', 1, 'Extended offline', 'Completed: read failure', '1234', '567')
+        alerts = engine.evaluate(hdd.snapshot.replace(tests=[failed] + hdd.tests))
+        assert [(a.rule, a.severity, a.message) for a in alerts] == [
+            ('self_test_failed', 'critical', 'Self-test failed: 1 failed tests in the log')]
+        # Still failed when the log shifts, resolved once the failure left it
+        passed = SelfTest('ata', 1, 'Short offline', 'Completed without error', '1240', '-')
+        assert engine.evaluate(hdd.snapshot.replace(tests=[passed, failed])) == []
+        alerts = engine.evaluate(hdd.snapshot.replace(tests=[passed]))
+        assert [(a.rule, a.state) for a in alerts] == [('self_test_failed', 'resolved')]
+
+        # A failure already in the log the first time a device is seen
+        alerts = RuleEngine(DEFAULT_RULES).evaluate(hdd.snapshot.replace(tests=[failed]))
+        assert [a.rule for a in alerts] == ['self_test_failed']
+
+    def test_device_updates(self):
+        engine = RuleEngine([Rule('updated', 'assessment', '==', 'PASS')])
+        dev = create_device('sata_hdd_0_issue42', rules=engine)
+        dev.update()
+        assert engine.active() == [(dev.serial, 'updated', 'assessment')]
+
+        devlist = DeviceList(init=False, rules=engine)
+        assert devlist.rules is engine
+        clone = DeviceList.from_snapshot([dev.__getstate__()], revalidate=False, rules=engine)
+        assert clone.devices[0].rules is engine
+        assert repr(engine) == '<RuleEngine rules:1 devices:1 firing:1>'
+
+    def test_failing_callbacks(self, tmp_path, caplog):
+        def callback(event):
+            raise RuntimeError('pager down')
+
+        store = HistoryStore(str(tmp_path))
+        engine = RuleEngine([Rule('updated', 'assessment', '==', 'PASS')], callback=callback)
+        dev = create_device('sata_hdd_0_issue42', rules=engine)
+        # Every series seen once is an anomaly
+        dev.detector = AnomalyDetector(warmup=1, threshold=0, callback=callback)
+        dev.history = store
+        dev.detector.observe(dev.snapshot.replace(collected_at=1.0))
+
+        # Logged: the update, the history and the rule states are kept
+        assert dev.update() is None
+        assert len(store.query(dev.serial, 'temperature')) == 1
+        assert engine.active() == [(dev.serial, 'updated', 'assessment')]
+        assert 'Anomaly detection failed' in caplog.text and 'Rule evaluation failed' in caplog.text
@@ -0,0 +1,133 @@
+# SPDX-FileCopyrightText: 2026 pySMART contributors
+# SPDX-License-Identifier: LGPL-2.1-or-later
+
+import json
+import os
+
+import pytest
+
+from pySMART import Device
+from pySMART.serialize import from_dict, to_dict
+from pySMART.snapshot import DeviceSnapshot
+from pySMART.smartctl import Smartctl
+from pySMART.utils import get_object_properties
+
+from .smartctlfile import SmartctlFile
+
+single_device_tests_main_path = './tests/dataset/singletests/'
+
+folders = [single_device_tests_main_path +
+           p for p in os.listdir(single_device_tests_main_path)]
+
+
+class CountingSmartctlFile(SmartctlFile):
+    """SmartctlFile counting the calls made"""
+
+    def __init__(self, smartctl_path, options=()):
+        super().__init__(smartctl_path, options)
+        self.calls = 0
+
+    def generic_call(self, params, pass_options=False, options=None):
+        self.calls += 1
+        return super().generic_call(params, pass_options, options)
+
+
+class NoSmartctl(Smartctl):
+    """Fails on any smartctl call"""
+
+    def generic_call(self, params, pass_options=False, options=None):
+        raise AssertionError('unexpected smartctl call: {0}'.format(params))
+
+
+def get_device_data(folder: str):
+    with open(os.path.join(folder, 'device.json')) as json_file:
+        return json.load(json_file)
+
+
+def create_device(folder: str) -> Device:
+    data = get_device_data(folder)
+    return Device(data['name'], interface=data.get('interface'), smartctl=SmartctlFile(folder))
+
+
+class TestSerialize():
+
+    @pytest.mark.parametrize("folder", folders)
+    def test_same_output_as_get_object_properties(self, folder):
+        dev = create_device(folder)
+
+        assert to_dict(dev.if_attributes) == get_object_properties(dev.if_attributes)
+        assert to_dict(dev.diagnostics) == get_object_properties(dev.diagnostics)
+        for test in dev.tests:
+            assert to_dict(test) == get_object_properties(test)
+        for attr in dev.attributes:
+            assert to_dict(attr) == get_object_properties(attr)
+
+    @pytest.mark.parametrize("folder", folders)
+    def test_same_output_as_dataset(self, folder):
+        dev = create_device(folder)
+        values = get_device_data(folder)['values']
+
+        data = json.loads(json.dumps(to_dict(dev)))
+
+        assert {key: data[key] for key in values} == values
+        assert data['wwn'] == dev.wwn
+        assert data['alternate_paths'] == []
+        assert data['stale'] is False
+
+    @pytest.mark.parametrize("folder", folders)
+    def test_roundtrip(self, folder):
+        data = json.loads(json.dumps(to_dict(create_device(folder))))
+
+        dev = from_dict(Device, data)
+        dev.smartctl = NoSmartctl()
+
+        assert json.loads(json.dumps(to_dict(dev))) == data
+
+    def test_roundtrip_then_update(self):
+        folder = single_device_tests_main_path + 'sata_hdd_0_issue42'
+        dev = from_dict(Device, json.loads(json.dumps(to_dict(create_device(folder)))))
+        assert dev.history is None and dev.detector is None and dev.rules is None
+
+        dev.smartctl = SmartctlFile(folder)
+        dev.update()
+        assert to_dict(dev)['serial'] == dev.serial and not dev.stale
+
+    def test_roundtrip_objects(self):
+        dev = create_device(single_device_tests_main_path + 'sata_hdd_0_issue42')
+
+        table = from_dict(type(dev.attributes), to_dict(dev.attributes))
+        assert table == dev.attributes
+        snap = from_dict(DeviceSnapshot, to_dict(dev.snapshot))
+        assert snap.model == dev.model
+        assert snap.if_attributes.legacyAttributes == dev.attributes
+        assert from_dict(DeviceSnapshot, None) is None
+
+    def test_result_is_a_copy(self):
+        dev = create_device(single_device_tests_main_path + 'nvme_0')
+
+        data = to_dict(dev)
+        data['messages'].append('changed')
+        data['test_capabilities']['short'] = 'changed'
+        data['if_attributes']['errors'].clear()
+
+        assert 'changed' not in dev.messages
+        assert dev.test_capabilities['short'] != 'changed'
+        assert to_dict(dev) != data
+
+    def test_unsupported_types(self):
+        with pytest.raises(TypeError):
+            to_dict(object())
+        with pytest.raises(TypeError):
+            from_dict(object, {})
+        assert to_dict(None) is None
+
+    def test_dev_interface_classified_once_per_update(self):
+        folder = single_device_tests_main_path + 'sas_hdd_0_issue_51'
+        data = get_device_data(folder)
+        sf = CountingSmartctlFile(folder)
+        dev = Device(data['name'], interface=data.get('interface'), smartctl=sf)
+
+        calls = sf.calls
+        assert dev.dev_interface == 'sas'
+        to_dict(dev)
+        assert sf.calls == calls
@@ -0,0 +1,53 @@
+# SPDX-FileCopyrightText: 2026 pySMART contributors
+# SPDX-License-Identifier: LGPL-2.1-or-later
+
+import copy
+import pickle
+
+import pytest
+
+from pySMART import Attribute
+from pySMART.testentry import TestEntry as SelfTestEntry
+from pySMART.interface.nvme import NvmeError, NvmeSelfTest
+from pySMART.utils import get_object_properties, instance_vars
+
+records = [
+    Attribute(1, 'Raw_Read_Error_Rate', 15, '082', '066', '044',
+              'Pre-fail', 'Always', '-', '176373483'),
+    SelfTestEntry('ata', 1, 'Short offline', 'Completed without error', '46660', '-',
+              remain='00%'),
+    NvmeError(0, 1356, 0, 0x12, 0xc005, 0x28, nsid=0),
+    NvmeSelfTest(0, 'Extended', 'Completed without error', 3441,
+                 failingLBA=0, nsid=1, seg=0, sct='0x0', code='0x00'),
+]
+
+
+class TestSlottedRecords():
+
+    @pytest.mark.parametrize("record", records)
+    def test_no_instance_dict(self, record):
+        assert not hasattr(record, '__dict__')
+        with pytest.raises(AttributeError):
+            record.unknown_field = 1
+
+    @pytest.mark.parametrize("record", records)
+    def test_pickle_roundtrip(self, record):
+        for clone in [pickle.loads(pickle.dumps(record)), copy.deepcopy(record)]:
+            assert type(clone) is type(record)
+            assert instance_vars(clone) == instance_vars(record)
+            assert clone.__getstate__() == record.__getstate__()
+            assert str(clone) == str(record)
+
+    def test_getstate(self):
+        assert records[0].__getstate__()['raw_int'] == 176373483
+        assert records[1].__getstate__()['lba'] == '-'
+        # NvmeError/NvmeSelfTest states are still their instance variables
+        assert records[2].__getstate__() == {
+            'num': 0, 'errCount': 1356, 'sqId': 0, 'cmdId': 0x12, 'status': 0xc005,
+            'peLoc': 0x28, 'lba': None, 'nsid': 0, 'vs': None, 'cs': None}
+
+    def test_object_properties(self):
+        props = get_object_properties(records[0])
+        assert props['_value'] == '082'
+        assert props['value_int'] == 82
+        assert props['worst'] == 66
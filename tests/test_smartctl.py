@@ -0,0 +1,113 @@
+# SPDX-FileCopyrightText: 2026 pySMART contributors
+# SPDX-License-Identifier: LGPL-2.1-or-later
+
+import os
+import pytest
+import shutil
+import time
+
+from subprocess import TimeoutExpired
+
+from pySMART import Device
+from pySMART.smartctl import Smartctl
+
+from .smartctlfile import SmartctlFile
+
+
+class TestSmartctl():
+
+    @pytest.mark.skipif(os.name != 'posix' or shutil.which('sleep') is None,
+                        reason="Requires a posix 'sleep' command")
+    def test_deadline_kills_running_call(self):
+        sm = Smartctl(smartctl_path=shutil.which('sleep'))
+
+        start = time.monotonic()
+        with sm.deadline(time.monotonic() + 0.2):
+            with pytest.raises(TimeoutExpired):
+                sm.generic_call(['5'])
+
+            # Once expired, new calls fail without spawning anything
+            with pytest.raises(TimeoutExpired):
+                sm.generic_call(['5'])
+
+        assert time.monotonic() - start < 2
+
+        # The deadline only applies inside the with block
+        assert sm.generic_call(['0'])[1] == 0
+
+    @pytest.mark.skipif(os.name != 'posix' or shutil.which('echo') is None,
+                        reason="Requires a posix 'echo' command")
+    def test_per_call_options(self):
+        sm = Smartctl(smartctl_path=shutil.which('echo'),
+                      options=['-T', 'permissive'])
+
+        assert sm.info('/dev/sda', 'ata', options=['--nocheck=standby']) == [
+            '-T permissive --nocheck=standby -d ata --info /dev/sda']
+        assert sm.all('/dev/sda') == ['-T permissive --all /dev/sda']
+        # Options are only passed to the queries using them
+        assert sm.scan() == ['--scan-open']
+
+        other = sm.with_options(['-T', 'verypermissive'])
+        assert other.all('/dev/sda') == ['-T verypermissive --all /dev/sda']
+        assert sm.options == ('-T', 'permissive')
+
+    def test_add_options_deprecated(self):
+        sm = Smartctl(options=['-T', 'permissive'])
+
+        with pytest.warns(DeprecationWarning):
+            sm.add_options(['-n', 'standby'])
+
+        assert sm.options == ('-T', 'permissive', '-n', 'standby')
+
+
+class RecordingSmartctlFile(SmartctlFile):
+    """Records the options of every query, ignoring them for the file lookup"""
+
+    def __init__(self, smartctl_path):
+        super().__init__(smartctl_path)
+        self.calls = []
+        self.queries = []
+
+    def generic_call(self, params, pass_options=False, options=None):
+        if pass_options:
+            self.calls.append(tuple(self._final_options(options)))
+        self.queries.append((' '.join(params), tuple(self._final_options(options)) if pass_options else None))
+        return super().generic_call(params)
+
+
+class TestDeviceOptions():
+
+    def test_device_options_do_not_leak(self):
+        sf = RecordingSmartctlFile(
+            './tests/dataset/singletests/sata_hdd_0_issue42')
+
+        first = Device('/dev/sdau', interface='ata',
+                       smart_options='-T permissive', smartctl=sf)
+        Device('/dev/sdau', interface='ata', smartctl=sf)
+        first.update()
+
+        assert sf.options == ()
+        assert first.smart_options == ('-T', 'permissive')
+        assert sf.calls == [('-T', 'permissive'), ('-T', 'permissive'), (), (), ('-T', 'permissive')]
+
+    def test_device_options_on_every_query(self):
+        sf = RecordingSmartctlFile(
+            './tests/dataset/singletests/megaraid_jbod_sas_hdd_0_issue_85')
+
+        Device('/dev/sdd', smart_options='-T permissive', smartctl=sf)
+
+        options = dict(sf.queries)
+        assert options['-d scsi -l sasphy /dev/sdd'] == ('-T', 'permissive')
+        assert options['-d scsi -l background /dev/sdd'] == ('-T', 'permissive')
+        assert options['-d scsi --all /dev/sdd'] == ('-T', 'permissive')
+
+    def test_decode_ascii_output(self):
+        sm = Smartctl()
+        folder = './tests/dataset/singletests/sata_hdd_0_issue42'
+        with open(os.path.join(folder, '_-d_ata_--all__dev_sdau'), 'rb') as f:
+            raw = f.read()
+
+        # The ascii fast path gives what the encoding detection gives
+        assert raw.isascii()
+        assert sm._decode_output(raw) == raw.decode('ascii').splitlines()
+        assert sm._decode_output('Température'.encode('utf-8')) == ['Température']
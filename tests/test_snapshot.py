@@ -0,0 +1,117 @@
+# SPDX-FileCopyrightText: 2026 pySMART contributors
+# SPDX-License-Identifier: LGPL-2.1-or-later
+
+import copy
+import pickle
+import threading
+
+import pytest
+
+from pySMART import Device
+from pySMART.snapshot import DeviceSnapshot
+
+from .smartctlfile import SmartctlFile
+
+sata_folder = './tests/dataset/singletests/sata_hdd_0_issue42'
+nvme_folder = './tests/dataset/singletests/nvme_0'
+
+
+class TestDeviceSnapshot():
+
+    def create_device(self) -> Device:
+        return Device('/dev/sdau', interface='ata', smartctl=SmartctlFile(sata_folder))
+
+    def test_properties_delegate_to_snapshot(self):
+        dev = self.create_device()
+        snap = dev.snapshot
+
+        assert isinstance(snap, DeviceSnapshot)
+        assert snap.collected_at is not None
+        assert dev.model == snap.model
+        assert dev.serial == snap.serial
+        assert dev.assessment == snap.assessment
+        assert dev.temperature == snap.temperature
+        assert dev.attributes == snap.attributes
+        assert dev.tests is snap.tests
+        assert dev.size == snap.size
+        assert dev.vendor == snap.vendor
+
+    def test_snapshot_is_immutable(self):
+        snap = self.create_device().snapshot
+
+        with pytest.raises(AttributeError):
+            snap.model = 'other'
+        with pytest.raises(AttributeError):
+            del snap.model
+        with pytest.raises(TypeError):
+            DeviceSnapshot(unknown_field=1)
+
+    def test_update_publishes_new_snapshot(self):
+        dev = self.create_device()
+        old = dev.snapshot
+        old_tests = list(old.tests)
+        old_capabilities = dict(old.test_capabilities)
+
+        dev.update()
+
+        assert dev.snapshot is not old
+        # The previous snapshot is left untouched
+        assert old.tests == old_tests
+        assert old.tests is not dev.tests
+        assert old.test_capabilities == old_capabilities
+        assert dev.snapshot.model == old.model
+
+    def test_setter_copies_on_write(self):
+        dev = self.create_device()
+        old = dev.snapshot
+
+        dev.model = 'Other model'
+
+        assert dev.model == 'Other model'
+        assert dev.snapshot.model == 'Other model'
+        assert old.model != 'Other model'
+
+    def test_failed_update_keeps_snapshot(self):
+        dev = self.create_device()
+        old = dev.snapshot
+
+        dev.smartctl = SmartctlFile('./tests/dataset/singletests/none')
+        with pytest.raises(Exception):
+            dev.update()
+
+        assert dev.snapshot is old
+
+    def test_pickle(self):
+        snap = Device('/dev/nvme0', interface='nvme',
+                      smartctl=SmartctlFile(nvme_folder)).snapshot
+
+        for clone in [pickle.loads(pickle.dumps(snap)), copy.deepcopy(snap)]:
+            assert isinstance(clone, DeviceSnapshot)
+            assert clone.serial == snap.serial
+            assert clone.temperatures == snap.temperatures
+            assert clone.temperature == snap.temperature
+
+    def test_concurrent_reads(self):
+        dev = self.create_device()
+        expected = (dev.serial, len(dev.tests), dev.temperature)
+        errors = []
+        done = threading.Event()
+
+        def reader():
+            while not done.is_set():
+                snap = dev.snapshot
+                if (snap.serial, len(snap.tests), snap.temperature) != expected:
+                    errors.append(snap)
+
+        threads = [threading.Thread(target=reader) for _ in range(2)]
+        for thread in threads:
+            thread.start()
+        try:
+            for _ in range(20):
+                dev.update()
+        finally:
+            done.set()
+            for thread in threads:
+                thread.join()
+
+        assert errors == []